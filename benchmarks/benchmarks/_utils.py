@@ -0,0 +1,24 @@
+"""
+Helpers shared by the benchmarks.
+"""
+
+import os
+
+import numpy as np
+
+# Smoke mode: only run the smallest problem size of every benchmark. Meant for
+# CI, to check that the benchmarks still run without spending time on them.
+QUICK = os.environ.get("SIMPEG_BENCHMARK_QUICK", "0").lower() not in ("", "0", "false")
+
+
+def sizes(*values):
+    """Problem sizes of a parameterized benchmark.
+
+    Only the first (smallest) size is kept in smoke mode.
+    """
+    return list(values[:1]) if QUICK else list(values)
+
+
+def random_vector(size, seed=42):
+    """Reproducible random vector."""
+    return np.random.default_rng(seed=seed).normal(size=size)
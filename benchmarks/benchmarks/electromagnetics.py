@@ -0,0 +1,191 @@
+"""
+Benchmarks of the DC resistivity, FDEM, TDEM and 1D EM simulations.
+"""
+
+import numpy as np
+import discretize
+from simpeg import maps
+from simpeg.electromagnetics import frequency_domain as fdem
+from simpeg.electromagnetics import time_domain as tdem
+from simpeg.electromagnetics.static import resistivity as dc
+
+from ._utils import sizes, random_vector
+
+
+def _padded_mesh(n_core, cell_size=10.0, n_pad=4):
+    h = [(cell_size, n_pad, -1.3), (cell_size, n_core), (cell_size, n_pad, 1.3)]
+    return discretize.TensorMesh([h, h, h], origin="CCC")
+
+
+class _PDESensitivities:
+    """Products with the sensitivities of a PDE simulation.
+
+    Subclasses implement ``make_simulation``. The fields are computed once in
+    the setup, so the timings of the products don't include them.
+    """
+
+    def setup(self, *params):
+        self.simulation = self.make_simulation(*params)
+        n_params = self.simulation.sigmaMap.nP
+        self.model = np.log(1e-2) + 0.1 * random_vector(n_params)
+        self.vector = random_vector(n_params, seed=1)
+        self.residual = random_vector(self.simulation.survey.nD, seed=2)
+        self.fields = self.simulation.fields(self.model)
+
+    def time_fields(self, *params):
+        self.simulation.fields(self.model)
+
+    def peakmem_fields(self, *params):
+        self.simulation.fields(self.model)
+
+    def time_Jvec(self, *params):
+        self.simulation.Jvec(self.model, self.vector, f=self.fields)
+
+    def time_Jtvec(self, *params):
+        self.simulation.Jtvec(self.model, self.residual, f=self.fields)
+
+    def peakmem_Jtvec(self, *params):
+        self.simulation.Jtvec(self.model, self.residual, f=self.fields)
+
+
+class DC3D(_PDESensitivities):
+    """3D DC resistivity with dipole-dipole lines."""
+
+    params = (sizes(8, 16, 24), ["nodal", "cell_centered"])
+    param_names = ["n_core_cells_per_axis", "formulation"]
+
+    def make_simulation(self, n, formulation):
+        mesh = _padded_mesh(n)
+        extent = 0.4 * n * 10.0
+        electrodes = np.linspace(-extent, extent, n + 1)
+        sources = []
+        for a, b in zip(electrodes[:-3], electrodes[1:-2]):
+            m = electrodes[electrodes > b][:-1]
+            locations_m = np.c_[m, np.zeros((m.size, 2))]
+            locations_n = locations_m + [electrodes[1] - electrodes[0], 0, 0]
+            receivers = dc.receivers.Dipole(locations_m, locations_n)
+            sources.append(dc.sources.Dipole([receivers], [a, 0, 0], [b, 0, 0]))
+        simulation_class = (
+            dc.Simulation3DNodal
+            if formulation == "nodal"
+            else dc.Simulation3DCellCentered
+        )
+        return simulation_class(
+            mesh, survey=dc.Survey(sources), sigmaMap=maps.ExpMap(mesh)
+        )
+
+    def time_getJtJdiag(self, n, formulation):
+        self.simulation._Jmatrix = None
+        self.simulation._gtgdiag = None
+        self.simulation.getJtJdiag(self.model, f=self.fields)
+
+
+class FDEM3D(_PDESensitivities):
+    """3D FDEM with a magnetic dipole source."""
+
+    params = (sizes(6, 10, 14), ["e", "b"])
+    param_names = ["n_core_cells_per_axis", "formulation"]
+
+    def make_simulation(self, n, formulation):
+        mesh = _padded_mesh(n)
+        x = np.linspace(-10.0, 10.0, 3)
+        locations = np.c_[x, np.zeros((3, 1)), np.full((3, 1), 5.0)]
+        sources = []
+        for frequency in [1e2, 1e3]:
+            receivers = [
+                fdem.receivers.PointMagneticFluxDensitySecondary(
+                    locations, orientation="z", component=component
+                )
+                for component in ["real", "imag"]
+            ]
+            sources.append(
+                fdem.sources.MagDipole(
+                    receivers, frequency=frequency, location=[0.0, 0.0, 10.0]
+                )
+            )
+        simulation_class = (
+            fdem.Simulation3DElectricField
+            if formulation == "e"
+            else fdem.Simulation3DMagneticFluxDensity
+        )
+        return simulation_class(
+            mesh, survey=fdem.Survey(sources), sigmaMap=maps.ExpMap(mesh)
+        )
+
+
+class TDEM3D(_PDESensitivities):
+    """3D TDEM with a magnetic dipole source."""
+
+    params = (sizes(6, 10, 14), ["b", "e"])
+    param_names = ["n_core_cells_per_axis", "formulation"]
+
+    def make_simulation(self, n, formulation):
+        mesh = _padded_mesh(n)
+        receivers = [
+            tdem.receivers.PointMagneticFluxTimeDerivative(
+                np.array([[15.0, 0.0, 5.0]]),
+                times=np.logspace(-4, -3, 10),
+                orientation="z",
+            )
+        ]
+        source = tdem.sources.MagDipole(receivers, location=[0.0, 0.0, 10.0])
+        simulation_class = (
+            tdem.Simulation3DMagneticFluxDensity
+            if formulation == "b"
+            else tdem.Simulation3DElectricField
+        )
+        return simulation_class(
+            mesh,
+            survey=tdem.Survey([source]),
+            sigmaMap=maps.ExpMap(mesh),
+            time_steps=[(1e-5, 10), (5e-5, 10), (2.5e-4, 10)],
+        )
+
+
+class EM1DSounding:
+    """1D FDEM and TDEM soundings over a layered earth."""
+
+    params = (sizes(10, 40, 100), ["fdem", "tdem"])
+    param_names = ["n_layers", "method"]
+
+    def setup(self, n_layers, method):
+        thicknesses = np.full(n_layers - 1, 5.0)
+        mapping = maps.ExpMap(nP=n_layers)
+        location = np.array([0.0, 0.0, 30.0])
+        if method == "fdem":
+            receivers = [
+                fdem.receivers.PointMagneticFieldSecondary(
+                    location + [10.0, 0, 0],
+                    orientation="z",
+                    data_type="ppm",
+                    component=component,
+                )
+                for component in ["real", "imag"]
+            ]
+            sources = [
+                fdem.sources.MagDipole(receivers, frequency=f, location=location)
+                for f in np.logspace(2, 5, 6)
+            ]
+            self.simulation = fdem.Simulation1DLayered(
+                survey=fdem.Survey(sources), thicknesses=thicknesses, sigmaMap=mapping
+            )
+        else:
+            receivers = [
+                tdem.receivers.PointMagneticFluxTimeDerivative(
+                    location, times=np.logspace(-5, -2, 30), orientation="z"
+                )
+            ]
+            source = tdem.sources.CircularLoop(
+                receivers, location=location, radius=10.0
+            )
+            self.simulation = tdem.Simulation1DLayered(
+                survey=tdem.Survey([source]), thicknesses=thicknesses, sigmaMap=mapping
+            )
+        self.model = np.log(1e-2) + 0.1 * random_vector(n_layers)
+
+    def time_dpred(self, n_layers, method):
+        self.simulation.dpred(self.model)
+
+    def time_getJ(self, n_layers, method):
+        self.simulation._J = None
+        self.simulation.getJ(self.model)
@@ -0,0 +1,133 @@
+"""
+Benchmarks of full, small inversions.
+"""
+
+import numpy as np
+import discretize
+from simpeg import (
+    data_misfit,
+    directives,
+    inverse_problem,
+    inversion,
+    maps,
+    optimization,
+    regularization,
+    simulation,
+)
+from simpeg.electromagnetics.static import resistivity as dc
+from simpeg.potential_fields import gravity
+
+from ._utils import sizes
+
+
+def _build_inversion(sim, mesh, model, reference_model, n_iterations):
+    data = sim.make_synthetic_data(
+        model, relative_error=0.05, noise_floor=1e-3, add_noise=True, random_seed=1
+    )
+    dmis = data_misfit.L2DataMisfit(data=data, simulation=sim)
+    reg = regularization.WeightedLeastSquares(mesh, reference_model=reference_model)
+    opt = optimization.ProjectedGNCG(maxIter=n_iterations, maxIterCG=20)
+    opt.print_type = None
+    inv_prob = inverse_problem.BaseInvProblem(dmis, reg, opt)
+    directive_list = [
+        directives.BetaEstimate_ByEig(beta0_ratio=1e1, random_seed=1),
+        directives.BetaSchedule(coolingFactor=2, coolingRate=1),
+        directives.TargetMisfit(),
+    ]
+    return inversion.BaseInversion(inv_prob, directiveList=directive_list)
+
+
+class _Inversion:
+    """Full inversion of synthetic data.
+
+    Subclasses implement ``make_problem``, returning the simulation, the mesh,
+    the true model and the reference model, which is also the starting model.
+    A new inversion is built before every run, since inversions are stateful.
+    """
+
+    number = 1
+    repeat = (1, 3, 60.0)
+    timeout = 600
+    n_iterations = 5
+
+    def setup(self, *params):
+        sim, mesh, model, self.m0 = self.make_problem(*params)
+        self.inversion = _build_inversion(sim, mesh, model, self.m0, self.n_iterations)
+
+    def time_run(self, *params):
+        self.inversion.run(self.m0)
+
+    def peakmem_run(self, *params):
+        self.inversion.run(self.m0)
+
+
+class LinearInversion(_Inversion):
+    """Inversion of the 1D linear problem with exponential sinusoid kernels."""
+
+    params = sizes(100, 1000, 5000)
+    param_names = ["n_cells"]
+
+    def make_problem(self, n_cells):
+        mesh = discretize.TensorMesh([n_cells])
+        sim = simulation.ExponentialSinusoidSimulation(
+            mesh=mesh, n_kernels=20, model_map=maps.IdentityMap(mesh)
+        )
+        model = np.zeros(n_cells)
+        model[n_cells // 4 : n_cells // 2] = 1.0
+        return sim, mesh, model, np.zeros(n_cells)
+
+
+class GravityInversion(_Inversion):
+    """Inversion of gravity data over a buried block."""
+
+    params = sizes(10, 16, 24)
+    param_names = ["n_cells_per_axis"]
+
+    def make_problem(self, n):
+        h = [(10.0, n)]
+        mesh = discretize.TensorMesh([h, h, h], origin="CCN")
+        extent = 0.4 * n * 10.0
+        x = np.linspace(-extent, extent, n)
+        xx, yy = np.meshgrid(x, x)
+        receivers = gravity.receivers.Point(
+            np.c_[xx.ravel(), yy.ravel(), np.full(xx.size, 5.0)]
+        )
+        survey = gravity.survey.Survey(gravity.sources.SourceField([receivers]))
+        sim = gravity.simulation.Simulation3DIntegral(
+            mesh,
+            survey=survey,
+            rhoMap=maps.IdentityMap(nP=mesh.n_cells),
+            engine="choclo",
+        )
+        center = mesh.cell_centers
+        model = np.zeros(mesh.n_cells)
+        model[np.all(np.abs(center - [0, 0, -0.3 * n * 10.0]) < 20.0, axis=1)] = 0.2
+        return sim, mesh, model, np.zeros(mesh.n_cells)
+
+
+class DCInversion(_Inversion):
+    """Inversion of a 2D DC resistivity dipole-dipole line."""
+
+    params = sizes(16, 32, 48)
+    param_names = ["n_core_cells"]
+    n_iterations = 3
+
+    def make_problem(self, n):
+        h = [(5.0, 6, -1.3), (5.0, n), (5.0, 6, 1.3)]
+        mesh = discretize.TensorMesh([h, [(5.0, 6, -1.3), (5.0, n // 2)]], "CN")
+        electrodes = np.linspace(-2.0 * n, 2.0 * n, n // 2 + 1)
+        spacing = electrodes[1] - electrodes[0]
+        sources = []
+        for a in electrodes[:-3]:
+            m = electrodes[electrodes > a + spacing][:-1]
+            receivers = dc.receivers.Dipole(
+                np.c_[m, np.zeros_like(m)], np.c_[m + spacing, np.zeros_like(m)]
+            )
+            sources.append(dc.sources.Dipole([receivers], [a, 0], [a + spacing, 0]))
+        sim = dc.Simulation2DNodal(
+            mesh, survey=dc.Survey(sources), sigmaMap=maps.ExpMap(mesh)
+        )
+        model = np.full(mesh.n_cells, np.log(1e-2))
+        block = np.all(np.abs(mesh.cell_centers - [0, -3.0 * n / 4]) < n / 2, axis=1)
+        model[block] = np.log(1e-1)
+        return sim, mesh, model, np.full(mesh.n_cells, np.log(1e-2))
@@ -0,0 +1,47 @@
+"""
+Benchmarks of chains of mappings and their derivatives.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import discretize
+from simpeg import maps
+
+from ._utils import sizes, random_vector
+
+
+class ComboMapDeriv:
+    """Evaluation and derivative of a chain of mappings on a tensor mesh."""
+
+    params = sizes(20, 40, 60)
+    param_names = ["n_cells_per_axis"]
+
+    def setup(self, n):
+        mesh = discretize.TensorMesh([n, n, n])
+        active = mesh.cell_centers[:, 2] < 0.75
+        n_active = int(active.sum())
+        wires = maps.Wires(("sigma", n_active), ("mu", n_active))
+        self.mapping = (
+            maps.ExpMap(mesh)
+            * maps.InjectActiveCells(mesh, active, np.log(1e-8))
+            * maps.LinearMap(2.0 * sp.identity(n_active), b=-np.ones(n_active))
+            * wires.sigma
+        )
+        self.model = random_vector(wires.nP)
+        self.vector = random_vector(wires.nP, seed=1)
+        self.adjoint_vector = random_vector(mesh.n_cells, seed=2)
+
+    def time_transform(self, n):
+        self.mapping * self.model
+
+    def time_deriv(self, n):
+        self.mapping.deriv(self.model)
+
+    def time_deriv_vector(self, n):
+        self.mapping.deriv(self.model, self.vector)
+
+    def time_deriv_adjoint(self, n):
+        self.mapping.deriv(self.model).T @ self.adjoint_vector
+
+    def peakmem_deriv(self, n):
+        self.mapping.deriv(self.model)
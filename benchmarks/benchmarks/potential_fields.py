@@ -0,0 +1,284 @@
+"""
+Benchmarks of the integral gravity and magnetic simulations.
+"""
+
+import numpy as np
+import discretize
+from simpeg import maps
+from simpeg.data import Data
+from simpeg.potential_fields import WindowedEquivalentSources, gravity, magnetics
+
+from ._utils import sizes, random_vector
+
+
+def _mesh_and_receivers(n_cells_per_axis, n_receivers_per_axis):
+    h = [(10.0, n_cells_per_axis)]
+    mesh = discretize.TensorMesh([h, h, h], origin="CCN")
+    extent = 0.4 * n_cells_per_axis * 10.0
+    x = np.linspace(-extent, extent, n_receivers_per_axis)
+    xx, yy = np.meshgrid(x, x)
+    locations = np.c_[xx.ravel(), yy.ravel(), np.full(xx.size, 5.0)]
+    return mesh, locations
+
+
+def _gravity_simulation(n_cells_per_axis, store_sensitivities, **kwargs):
+    mesh, locations = _mesh_and_receivers(n_cells_per_axis, n_cells_per_axis)
+    receivers = gravity.receivers.Point(locations, components="gz")
+    survey = gravity.survey.Survey(gravity.sources.SourceField([receivers]))
+    return gravity.simulation.Simulation3DIntegral(
+        mesh,
+        survey=survey,
+        rhoMap=maps.IdentityMap(nP=mesh.n_cells),
+        store_sensitivities=store_sensitivities,
+        **{"engine": "choclo", **kwargs},
+    )
+
+
+def _magnetic_simulation(
+    n_cells_per_axis, store_sensitivities, model_type="scalar", amplitude=False
+):
+    mesh, locations = _mesh_and_receivers(n_cells_per_axis, n_cells_per_axis)
+    components = ["bx", "by", "bz"] if amplitude else "tmi"
+    receivers = magnetics.receivers.Point(locations, components=components)
+    source = magnetics.sources.UniformBackgroundField(
+        receiver_list=[receivers], amplitude=50_000, inclination=60, declination=10
+    )
+    n_params = mesh.n_cells if model_type == "scalar" else 3 * mesh.n_cells
+    return magnetics.simulation.Simulation3DIntegral(
+        mesh,
+        survey=magnetics.survey.Survey(source),
+        chiMap=maps.IdentityMap(nP=n_params),
+        model_type=model_type,
+        is_amplitude_data=amplitude,
+        store_sensitivities=store_sensitivities,
+        engine="choclo",
+    )
+
+
+def _clear(simulation, attribute):
+    """Remove a cached attribute so that it's computed again."""
+    if hasattr(simulation, attribute):
+        delattr(simulation, attribute)
+
+
+class GravityForward:
+    """Forward modelling without storing the sensitivities."""
+
+    params = sizes(10, 20, 30)
+    param_names = ["n_cells_per_axis"]
+
+    def setup(self, n):
+        self.simulation = _gravity_simulation(n, "forward_only")
+        self.model = np.abs(random_vector(self.simulation.rhoMap.nP))
+        # compile the numba kernels outside of the timings
+        _gravity_simulation(4, "forward_only").dpred(np.ones(64))
+
+    def time_dpred(self, n):
+        self.simulation.dpred(self.model)
+
+    def peakmem_dpred(self, n):
+        self.simulation.dpred(self.model)
+
+
+class GravitySensitivities:
+    """Construction of the sensitivity matrix and products with it."""
+
+    params = sizes(10, 20, 30)
+    param_names = ["n_cells_per_axis"]
+
+    def setup(self, n):
+        self.simulation = _gravity_simulation(n, "ram")
+        n_params = self.simulation.rhoMap.nP
+        self.model = np.abs(random_vector(n_params))
+        self.vector = random_vector(n_params, seed=1)
+        self.residual = random_vector(self.simulation.survey.nD, seed=2)
+        # build the sensitivities outside of the timings of the products
+        self.simulation.G
+
+    def time_G(self, n):
+        _clear(self.simulation, "_G")
+        self.simulation.G
+
+    def peakmem_G(self, n):
+        _clear(self.simulation, "_G")
+        self.simulation.G
+
+    def time_Jvec_Jtvec(self, n):
+        self.simulation.Jvec(self.model, self.vector)
+        self.simulation.Jtvec(self.model, self.residual)
+
+    def time_getJtJdiag(self, n):
+        _clear(self.simulation, "_gtg_diagonal")
+        self.simulation.getJtJdiag(self.model)
+
+
+class MagneticForward:
+    """Forward modelling without storing the sensitivities."""
+
+    params = (sizes(10, 20, 30), ["scalar", "vector"])
+    param_names = ["n_cells_per_axis", "model_type"]
+
+    def setup(self, n, model_type):
+        self.simulation = _magnetic_simulation(n, "forward_only", model_type)
+        self.model = 1e-3 * np.abs(random_vector(self.simulation.chiMap.nP))
+        small = _magnetic_simulation(4, "forward_only", model_type)
+        small.dpred(np.ones(small.chiMap.nP))
+
+    def time_dpred(self, n, model_type):
+        self.simulation.dpred(self.model)
+
+    def peakmem_dpred(self, n, model_type):
+        self.simulation.dpred(self.model)
+
+
+class MagneticSensitivities:
+    """Construction of the sensitivity matrix and products with it."""
+
+    params = sizes(10, 20, 30)
+    param_names = ["n_cells_per_axis"]
+
+    def setup(self, n):
+        self.simulation = _magnetic_simulation(n, "ram")
+        n_params = self.simulation.chiMap.nP
+        self.model = 1e-3 * np.abs(random_vector(n_params))
+        self.vector = random_vector(n_params, seed=1)
+        self.residual = random_vector(self.simulation.survey.nD, seed=2)
+        self.simulation.G
+
+    def time_G(self, n):
+        _clear(self.simulation, "_G")
+        self.simulation.G
+
+    def peakmem_G(self, n):
+        _clear(self.simulation, "_G")
+        self.simulation.G
+
+    def time_Jvec_Jtvec(self, n):
+        self.simulation.Jvec(self.model, self.vector)
+        self.simulation.Jtvec(self.model, self.residual)
+
+    def time_getJtJdiag(self, n):
+        _clear(self.simulation, "_gtg_diagonal")
+        self.simulation.getJtJdiag(self.model)
+
+
+class MagneticAmplitude:
+    """Amplitude data with stored sensitivities and computed on the fly."""
+
+    params = (sizes(10, 20), ["ram", "forward_only"])
+    param_names = ["n_cells_per_axis", "store_sensitivities"]
+
+    def setup(self, n, store_sensitivities):
+        self.simulation = _magnetic_simulation(n, store_sensitivities, amplitude=True)
+        n_params = self.simulation.chiMap.nP
+        self.model = 1e-3 * np.abs(random_vector(n_params))
+        self.vector = random_vector(n_params, seed=1)
+        self.residual = random_vector(self.simulation.survey.nD // 3, seed=2)
+        self.simulation.dpred(self.model)
+
+    def time_Jvec_Jtvec(self, n, store_sensitivities):
+        self.simulation.Jvec(self.model, self.vector)
+        self.simulation.Jtvec(self.model, self.residual)
+
+    def peakmem_Jvec_Jtvec(self, n, store_sensitivities):
+        self.simulation.Jvec(self.model, self.vector)
+        self.simulation.Jtvec(self.model, self.residual)
+
+    def time_getJtJdiag(self, n, store_sensitivities):
+        _clear(self.simulation, "_gtg_diagonal")
+        self.simulation.getJtJdiag(self.model)
+
+
+class MagneticGradientTensor:
+    """Sensitivity matrix for a new regional field from the stored tensor."""
+
+    params = (sizes(10, 20), [False, True])
+    param_names = ["n_cells_per_axis", "store_gradient_tensor"]
+
+    def setup(self, n, store_gradient_tensor):
+        self.simulation = _magnetic_simulation(n, "ram")
+        self.simulation.store_gradient_tensor = store_gradient_tensor
+        self.simulation.G
+
+    def time_G_new_inclination(self, n, store_gradient_tensor):
+        source_field = self.simulation.survey.source_field
+        source_field.inclination = -source_field.inclination
+        _clear(self.simulation, "_G")
+        self.simulation.G
+
+
+class GravityGeoana:
+    """Sensitivity matrix built with geoana, in blocks of receivers."""
+
+    params = (sizes(8, 12, 16), [1, 2])
+    param_names = ["n_cells_per_axis", "n_processes"]
+
+    def setup(self, n, n_processes):
+        self.simulation = _gravity_simulation(
+            n, "ram", engine="geoana", n_processes=n_processes
+        )
+        # start the worker pool outside of the timings
+        self.simulation.linear_operator()
+
+    def time_linear_operator(self, n, n_processes):
+        self.simulation.linear_operator()
+
+
+class GravityFFT:
+    """Dense and FFT sensitivities of receivers above the centers of the cells."""
+
+    params = (sizes(10, 20, 30), ["ram", "fft"])
+    param_names = ["n_cells_per_axis", "store_sensitivities"]
+
+    def setup(self, n, store_sensitivities):
+        self.simulation = _gravity_simulation(n, store_sensitivities)
+        mesh = self.simulation.mesh
+        x, y = mesh.cell_centers_x, mesh.cell_centers_y
+        xx, yy = np.meshgrid(x, y)
+        locations = np.c_[xx.ravel(), yy.ravel(), np.full(xx.size, 5.0)]
+        self.simulation.survey.source_field.receiver_list[0].locations = locations
+        n_params = self.simulation.rhoMap.nP
+        self.model = np.abs(random_vector(n_params))
+        self.residual = random_vector(self.simulation.survey.nD, seed=2)
+        self.simulation.G
+
+    def time_G(self, n, store_sensitivities):
+        _clear(self.simulation, "_G")
+        self.simulation.G
+
+    def peakmem_G(self, n, store_sensitivities):
+        _clear(self.simulation, "_G")
+        self.simulation.G
+
+    def time_Jvec_Jtvec(self, n, store_sensitivities):
+        self.simulation.Jvec(self.model, self.model)
+        self.simulation.Jtvec(self.model, self.residual)
+
+
+class WindowedEquivalentSourcesFit:
+    """Fit and predictions of equivalent sources in overlapping windows."""
+
+    params = (sizes(20_000, 80_000), [None, 50.0])
+    param_names = ["n_data", "block_size"]
+
+    def setup(self, n_data, block_size):
+        rng = np.random.default_rng(seed=0)
+        x, y = rng.uniform(-2_000, 2_000, size=(2, n_data))
+        locations = np.c_[x, y, np.full(n_data, 50.0)]
+        receivers = gravity.receivers.Point(locations, components="gz")
+        survey = gravity.survey.Survey(gravity.sources.SourceField([receivers]))
+        self.data = Data(survey, dobs=random_vector(n_data))
+        self.sources = WindowedEquivalentSources(
+            window_size=500, cell_size=50, depth=100, block_size=block_size
+        )
+        x, y = np.meshgrid(
+            np.linspace(-2_000, 2_000, 81), np.linspace(-2_000, 2_000, 81)
+        )
+        self.grid = np.c_[x.ravel(), y.ravel(), np.full(x.size, 100.0)]
+        self.sources.fit(self.data)
+
+    def time_fit(self, n_data, block_size):
+        self.sources.fit(self.data)
+
+    def time_predict(self, n_data, block_size):
+        self.sources.predict(self.grid)
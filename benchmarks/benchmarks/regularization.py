@@ -0,0 +1,53 @@
+"""
+Benchmarks of the evaluation and derivatives of regularizations.
+"""
+
+import numpy as np
+import discretize
+from simpeg import regularization
+
+from ._utils import sizes, random_vector
+
+
+class Regularization:
+    """Least-squares and sparse regularizations on tensor and tree meshes."""
+
+    params = (
+        sizes(20, 40, 60),
+        ["tensor", "tree"],
+        ["WeightedLeastSquares", "Sparse"],
+    )
+    param_names = ["n_cells_per_axis", "mesh", "regularization"]
+
+    def setup(self, n, mesh_type, name):
+        if mesh_type == "tensor":
+            mesh = discretize.TensorMesh([n, n, n])
+        else:
+            # closest power of two, refined around a point
+            n_base = 2 ** int(np.ceil(np.log2(n)))
+            mesh = discretize.TreeMesh([n_base, n_base, n_base], diagonal_balance=True)
+            mesh.refine_points(
+                [0.5, 0.5, 0.5], level=int(np.log2(n_base)), padding_cells_by_level=[2]
+            )
+        self.regularization = getattr(regularization, name)(mesh)
+        if name == "Sparse":
+            self.regularization.norms = [0.0, 1.0, 1.0, 1.0]
+        self.model = random_vector(mesh.n_cells)
+        self.vector = random_vector(mesh.n_cells, seed=1)
+        # build the operators and weights outside of the timings
+        self.regularization.deriv2(self.model, self.vector)
+
+    def time_call(self, n, mesh_type, name):
+        self.regularization(self.model)
+
+    def time_deriv(self, n, mesh_type, name):
+        self.regularization.deriv(self.model)
+
+    def time_deriv2_vector(self, n, mesh_type, name):
+        self.regularization.deriv2(self.model, self.vector)
+
+    def time_deriv2(self, n, mesh_type, name):
+        self.regularization.deriv2(self.model)
+
+    def peakmem_deriv2(self, n, mesh_type, name):
+        self.regularization.deriv2(self.model)
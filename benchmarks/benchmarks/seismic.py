@@ -0,0 +1,54 @@
+"""
+Benchmarks of the straight-ray tomography simulations.
+"""
+
+import numpy as np
+import discretize
+from simpeg import maps
+from simpeg.seismic import straight_ray_tomography as tomo
+
+from ._utils import sizes, random_vector
+
+
+class StraightRayTomography:
+    """Cross-hole tomography between two boreholes."""
+
+    params = (sizes(32, 64, 128), ["tensor", "tree"])
+    param_names = ["n_cells_per_axis", "mesh"]
+
+    def setup(self, n, mesh_type):
+        if mesh_type == "tensor":
+            mesh = discretize.TensorMesh([n, n])
+        else:
+            mesh = discretize.TreeMesh([n, n], diagonal_balance=True)
+            mesh.refine_points(
+                [0.5, 0.5], level=int(np.log2(n)), padding_cells_by_level=[n // 8]
+            )
+        depths = np.linspace(0.01, 0.99, n)
+        receivers = tomo.Rx(np.c_[np.full(n, 0.99), depths])
+        sources = [
+            tomo.Src(location=[0.01, z], receiver_list=[receivers]) for z in depths
+        ]
+        self.survey = tomo.Survey(sources)
+        self.mesh = mesh
+        self.simulation = tomo.Simulation2DIntegral(
+            mesh, survey=self.survey, slownessMap=maps.IdentityMap(mesh)
+        )
+        self.model = 1.0 + 0.1 * np.abs(random_vector(mesh.n_cells))
+        self.vector = random_vector(mesh.n_cells, seed=1)
+        self.simulation.A
+
+    def time_ray_tracing(self, n, mesh_type):
+        simulation = tomo.Simulation2DIntegral(
+            self.mesh, survey=self.survey, slownessMap=maps.IdentityMap(self.mesh)
+        )
+        simulation.A
+
+    def peakmem_ray_tracing(self, n, mesh_type):
+        simulation = tomo.Simulation2DIntegral(
+            self.mesh, survey=self.survey, slownessMap=maps.IdentityMap(self.mesh)
+        )
+        simulation.A
+
+    def time_Jvec(self, n, mesh_type):
+        self.simulation.Jvec(self.model, self.vector)
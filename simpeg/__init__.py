@@ -33,6 +33,7 @@ Base Surveys, Sources and Receivers
   survey.BaseTimeRx
   survey.BaseSrc
   survey.BaseSurvey
+  survey.BaseArraySurvey
   survey.BaseTimeSurvey
 
 Models
@@ -147,6 +148,7 @@ from . import models
 from . import inverse_problem
 from . import inversion
 from . import regularization
+from . import profiling
 from . import survey
 from . import simulation
 from . import typing
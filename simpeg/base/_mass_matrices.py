@@ -0,0 +1,298 @@
+"""
+Linear operators from cell properties to the entries of inner product matrices.
+
+The face and edge inner product matrices of a mesh are linear in the physical
+property. For a fixed tensor type, their sparsity pattern is fixed and their
+nonzero entries are a sparse linear operator applied to the property, which
+lets simulations refresh their property mass matrices with a single sparse
+matrix-vector product on every model update.
+"""
+
+import sys
+import threading
+import weakref
+
+import numpy as np
+import scipy.sparse as sp
+
+# Operators of each mesh, shared by all the simulations on the mesh
+_mesh_operators = weakref.WeakKeyDictionary()
+_mesh_operators_lock = threading.Lock()
+
+
+def get_inner_product_operator(mesh, projection_type, n_prop):
+    """Operator of a mesh from a property to its face or edge inner product.
+
+    The operator only depends on the mesh, so it is computed once per mesh and
+    shared by all the simulations using it. ``None`` is returned when the
+    operator is not available for the mesh or the size of the property.
+
+    Parameters
+    ----------
+    mesh : discretize.base.BaseMesh
+        Mesh of the inner product.
+    projection_type : {"F", "E"}
+        Whether to build the face (``"F"``) or the edge (``"E"``) inner product.
+    n_prop : int
+        Size of the property.
+
+    Returns
+    -------
+    InnerProductOperator or None
+    """
+    key = (projection_type, n_prop)
+    with _mesh_operators_lock:
+        operators = _mesh_operators.setdefault(mesh, {})
+        if key not in operators:
+            try:
+                operators[key] = InnerProductOperator(mesh, projection_type, n_prop)
+            except (NotImplementedError, ValueError):
+                operators[key] = None
+        return operators[key]
+
+
+class InnerProductOperator:
+    """Sparse operator mapping a cell property to an inner product matrix.
+
+    Parameters
+    ----------
+    mesh : discretize.base.BaseMesh
+        Mesh of the inner product.
+    projection_type : {"F", "E"}
+        Whether to build the face (``"F"``) or the edge (``"E"``) inner product.
+    n_prop : int
+        Size of the property; the number of cells times 1 for isotropic, the
+        mesh dimension for diagonal anisotropic or 3 (2D) or 6 (3D) for full
+        tensor properties.
+
+    Notes
+    -----
+    When the inner product matrix is diagonal, the operator is the derivative
+    of the matrix diagonal with respect to the property. Otherwise, the cells
+    are colored so that cells of the same color share no element, and the
+    inner product of every color and every tensor component is evaluated once
+    to read the contribution of each cell to each nonzero entry.
+    """
+
+    def __init__(self, mesh, projection_type, n_prop):
+        if projection_type == "F":
+            inner_product = mesh.get_face_inner_product
+            inner_product_deriv = mesh.get_face_inner_product_deriv
+        elif projection_type == "E":
+            inner_product = mesh.get_edge_inner_product
+            inner_product_deriv = mesh.get_edge_inner_product_deriv
+        else:
+            raise ValueError(
+                f"projection_type must be either 'F' or 'E', got {projection_type!r}"
+            )
+        n_cells = mesh.n_cells
+        if n_prop % n_cells != 0:
+            raise ValueError(
+                f"The size of the property ({n_prop}) must be a multiple of the "
+                f"number of cells ({n_cells})"
+            )
+
+        # a generic property has no cancellation in the sparsity pattern
+        rng = np.random.default_rng(seed=0)
+        sample = rng.uniform(1.0, 2.0, n_prop)
+        M = sp.csr_matrix(inner_product(model=sample))
+        M.sum_duplicates()
+        M.sort_indices()
+        n = M.shape[0]
+        self.shape = M.shape
+        self.indptr = M.indptr
+        self.indices = M.indices
+        self.is_diagonal = M.nnz == n and np.array_equal(self.indices, np.arange(n))
+
+        if self.is_diagonal:
+            operator = inner_product_deriv(model=sample)(np.ones(n))
+        else:
+            deriv = inner_product_deriv(model=sample)(rng.uniform(1.0, 2.0, n))
+            operator = _probe_inner_product(inner_product, M, deriv, n_cells, n_prop)
+        self.operator = sp.csr_matrix(operator)
+
+        rows = np.repeat(np.arange(n), np.diff(self.indptr))
+        self._row_sum = sp.csr_matrix(
+            (np.ones(M.nnz), (rows, np.arange(M.nnz))), shape=(n, M.nnz)
+        )
+
+        # Buffers of the matrix-vector products: the products of the property
+        # values with the operator entries, and the values of the last matrix
+        # and inverse returned
+        self._lock = threading.Lock()
+        self._products = np.empty(self.operator.nnz)
+        self._last_values = {}
+        self._reduce_rows = bool(np.all(np.diff(self.operator.indptr) > 0))
+
+    @property
+    def n_prop(self):
+        """Size of the property.
+
+        Returns
+        -------
+        int
+        """
+        return self.operator.shape[1]
+
+    def matrix(self, prop):
+        """Inner product matrix of a property.
+
+        The returned matrix shares its index arrays with the operator. Its
+        values are written in the buffer of the previously returned matrix
+        once nothing references that matrix or its values anymore, and are
+        only allocated otherwise.
+
+        Parameters
+        ----------
+        prop : (n_prop, ) numpy.ndarray
+            The property.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        with self._lock:
+            data = self._values(prop, "matrix")
+            return self._from_values(data)
+
+    def inverse(self, prop):
+        """Inverse of the inner product matrix of a property.
+
+        Parameters
+        ----------
+        prop : (n_prop, ) numpy.ndarray
+            The property.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        if not self.is_diagonal:
+            raise NotImplementedError(
+                "Only diagonal inner product matrices can be inverted"
+            )
+        with self._lock:
+            data = self._values(prop, "inverse")
+            np.reciprocal(data, out=data)
+            return self._from_values(data)
+
+    def _values(self, prop, kind):
+        """Nonzero entries of the matrix of a property, written in a free buffer."""
+        dtype = np.result_type(prop, self.operator.data)
+        data = self._last_values.get(kind, None)
+        # only this dictionary, the local name and the argument of getrefcount
+        # refer to the values of a matrix that was released
+        if data is None or sys.getrefcount(data) > 3 or data.dtype != dtype:
+            data = np.empty(self.operator.shape[0], dtype=dtype)
+            self._last_values[kind] = data
+        if not self._reduce_rows:
+            data[:] = self.operator @ prop
+            return data
+        products = self._products
+        if products.dtype != dtype:
+            products = self._products = np.empty(self.operator.nnz, dtype=dtype)
+        np.take(prop, self.operator.indices, out=products)
+        products *= self.operator.data
+        np.add.reduceat(products, self.operator.indptr[:-1], out=data)
+        return data
+
+    def _from_values(self, data):
+        return sp.csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+    def deriv(self, u):
+        """Derivative of the inner product times a vector with respect to the property.
+
+        Parameters
+        ----------
+        u : (n, ) numpy.ndarray
+            The vector multiplied by the inner product matrix.
+
+        Returns
+        -------
+        (n, n_prop) scipy.sparse.csr_matrix
+        """
+        if self.is_diagonal:
+            return sp.diags(u, format="csr") @ self.operator
+        return self._row_sum @ (sp.diags(u[self.indices]) @ self.operator)
+
+
+def _probe_inner_product(inner_product, M, deriv, n_cells, n_prop):
+    """Extract the contribution of every property value to every entry of M.
+
+    ``deriv`` is the derivative of the inner product times a generic vector,
+    whose sparsity pattern gives the elements touched by every cell.
+    """
+    deriv = sp.csr_matrix(deriv)
+    touched = sp.csr_matrix(
+        (np.ones(deriv.nnz), deriv.indices % n_cells, deriv.indptr),
+        shape=(deriv.shape[0], n_cells),
+    )
+    touched.sum_duplicates()
+    touched.data[:] = 1.0
+    colors = _color_graph(touched.T @ touched)
+
+    # 1 based positions of the nonzero entries of M, 0 flags missing entries
+    positions = sp.csr_matrix(
+        (np.arange(1, M.nnz + 1, dtype=float), M.indices, M.indptr), shape=M.shape
+    )
+    cells = np.arange(1, n_cells + 1)
+    rows, cols, values = [], [], []
+    for color in range(colors.max() + 1):
+        in_color = colors == color
+        # the single cell of this color touching each element, or -1
+        owner = (touched @ np.where(in_color, cells, 0)).astype(int) - 1
+        for i_comp in range(n_prop // n_cells):
+            model = np.zeros(n_prop)
+            model[i_comp * n_cells : (i_comp + 1) * n_cells] = in_color
+            M_color = sp.coo_matrix(inner_product(model=model))
+            M_color.sum_duplicates()
+            keep = M_color.data != 0
+            row, col = M_color.row[keep], M_color.col[keep]
+            rows.append(np.asarray(positions[row, col]).ravel().astype(int) - 1)
+            cols.append(i_comp * n_cells + owner[row])
+            values.append(M_color.data[keep])
+    return sp.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(M.nnz, n_prop),
+    )
+
+
+def _color_graph(graph):
+    """Color the vertices of a graph so that neighbors have different colors.
+
+    Every color is a maximal independent set of the remaining vertices, found
+    with Luby's algorithm.
+
+    Parameters
+    ----------
+    graph : (n, n) scipy.sparse.spmatrix
+        Symmetric adjacency matrix with positive entries.
+
+    Returns
+    -------
+    (n, ) numpy.ndarray of int
+        Color of every vertex.
+    """
+    graph = sp.csr_matrix(graph, dtype=float, copy=True)
+    graph.setdiag(0.0)
+    graph.eliminate_zeros()
+    graph.data[:] = 1.0
+    n = graph.shape[0]
+    priorities = np.random.default_rng(seed=0).permutation(n) + 1.0
+
+    colors = np.full(n, -1)
+    uncolored = np.ones(n, dtype=bool)
+    color = 0
+    while uncolored.any():
+        candidates = uncolored.copy()
+        selected = np.zeros(n, dtype=bool)
+        while candidates.any():
+            priority = np.where(candidates, priorities, 0.0)
+            neighbor_max = (graph @ sp.diags(priority)).max(axis=1).toarray().ravel()
+            new = candidates & (priority > neighbor_max)
+            selected |= new
+            candidates &= ~new & ~(graph @ new > 0)
+        colors[selected] = color
+        uncolored &= ~selected
+        color += 1
+    return colors
@@ -5,11 +5,19 @@ import scipy.sparse as sp
 from discretize.utils import Zero, TensorType
 import discretize.base
 from ..simulation import BaseSimulation
-from .. import props
+from .. import props, profiling
+from ..typing import RandomSeed
 from scipy.constants import mu_0
 
-from ..utils import validate_type
-from ..utils.solver_utils import get_default_solver
+from ..utils import mkvc, validate_string, validate_type
+from ..utils.cache_utils import discard_cached_items
+from ..utils.solver_utils import FactorizationCache, get_default_solver
+from ..utils.storage_utils import (
+    FieldsStorage,
+    MemmapFieldsStorage,
+    ZarrFieldsStorage,
+)
+from ._mass_matrices import get_inner_product_operator
 
 
 def __inner_mat_mul_op(M, u, v=None, adjoint=False):
@@ -104,6 +112,13 @@ def with_property_mass_matrices(property_name):
         arg = property_name.lower()
         arg = arg[0].upper() + arg[1:]
 
+        def get_operator(self, projection_type):
+            # only worth precomputing for properties updated with the model
+            if getattr(self, f"{arg.lower()}Map") is None:
+                return None
+            prop = getattr(self, arg.lower())
+            return self._get_inner_product_operator(projection_type, np.size(prop))
+
         @property
         def Mcc_prop(self):
             """
@@ -141,7 +156,11 @@ def with_property_mass_matrices(property_name):
             stash_name = f"_Mf_{arg}"
             if getattr(self, stash_name, None) is None:
                 prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_face_inner_product(model=prop)
+                operator = get_operator(self, "F")
+                if operator is None:
+                    M_prop = self.mesh.get_face_inner_product(model=prop)
+                else:
+                    M_prop = operator.matrix(mkvc(prop))
                 setattr(self, stash_name, M_prop)
             return getattr(self, stash_name)
 
@@ -155,7 +174,11 @@ def with_property_mass_matrices(property_name):
             stash_name = f"_Me_{arg}"
             if getattr(self, stash_name, None) is None:
                 prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_edge_inner_product(model=prop)
+                operator = get_operator(self, "E")
+                if operator is None:
+                    M_prop = self.mesh.get_edge_inner_product(model=prop)
+                else:
+                    M_prop = operator.matrix(mkvc(prop))
                 setattr(self, stash_name, M_prop)
             return getattr(self, stash_name)
 
@@ -200,9 +223,13 @@ def with_property_mass_matrices(property_name):
             stash_name = f"_MfI_{arg}"
             if getattr(self, stash_name, None) is None:
                 prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_face_inner_product(
-                    model=prop, invert_matrix=True
-                )
+                operator = get_operator(self, "F")
+                if operator is None or not operator.is_diagonal:
+                    M_prop = self.mesh.get_face_inner_product(
+                        model=prop, invert_matrix=True
+                    )
+                else:
+                    M_prop = operator.inverse(mkvc(prop))
                 setattr(self, stash_name, M_prop)
             return getattr(self, stash_name)
 
@@ -216,9 +243,13 @@ def with_property_mass_matrices(property_name):
             stash_name = f"_MeI_{arg}"
             if getattr(self, stash_name, None) is None:
                 prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_edge_inner_product(
-                    model=prop, invert_matrix=True
-                )
+                operator = get_operator(self, "E")
+                if operator is None or not operator.is_diagonal:
+                    M_prop = self.mesh.get_edge_inner_product(
+                        model=prop, invert_matrix=True
+                    )
+                else:
+                    M_prop = operator.inverse(mkvc(prop))
                 setattr(self, stash_name, M_prop)
             return getattr(self, stash_name)
 
@@ -278,20 +309,29 @@ def with_property_mass_matrices(property_name):
             stash_name = f"_Mf_{arg}_deriv"
             if getattr(self, stash_name, None) is None:
                 prop = getattr(self, arg.lower())
-                t_type = TensorType(self.mesh, prop)
-
-                M_deriv_func = self.mesh.get_face_inner_product_deriv(model=prop)
                 prop_deriv = getattr(self, f"{arg.lower()}Deriv")
-                # t_type == 3 for full tensor model, t_type < 3 for scalar, isotropic, or axis-aligned anisotropy.
-                if t_type < 3 and self.mesh._meshType.lower() in (
-                    "cyl",
-                    "tensor",
-                    "tree",
-                ):
-                    M_prop_deriv = M_deriv_func(np.ones(self.mesh.n_faces)) @ prop_deriv
-                    setattr(self, stash_name, M_prop_deriv)
+                operator = get_operator(self, "F")
+                if operator is not None:
+                    if operator.is_diagonal:
+                        M_prop_deriv = operator.operator @ prop_deriv
+                        setattr(self, stash_name, M_prop_deriv)
+                    else:
+                        setattr(self, stash_name, (operator.deriv, prop_deriv))
                 else:
-                    setattr(self, stash_name, (M_deriv_func, prop_deriv))
+                    t_type = TensorType(self.mesh, prop)
+                    M_deriv_func = self.mesh.get_face_inner_product_deriv(model=prop)
+                    # t_type == 3 for full tensor model, t_type < 3 for scalar, isotropic, or axis-aligned anisotropy.
+                    if t_type < 3 and self.mesh._meshType.lower() in (
+                        "cyl",
+                        "tensor",
+                        "tree",
+                    ):
+                        M_prop_deriv = (
+                            M_deriv_func(np.ones(self.mesh.n_faces)) @ prop_deriv
+                        )
+                        setattr(self, stash_name, M_prop_deriv)
+                    else:
+                        setattr(self, stash_name, (M_deriv_func, prop_deriv))
 
             return __inner_mat_mul_op(
                 getattr(self, stash_name), u, v=v, adjoint=adjoint
@@ -310,20 +350,29 @@ def with_property_mass_matrices(property_name):
             stash_name = f"_Me_{arg}_deriv"
             if getattr(self, stash_name, None) is None:
                 prop = getattr(self, arg.lower())
-                t_type = TensorType(self.mesh, prop)
-
-                M_deriv_func = self.mesh.get_edge_inner_product_deriv(model=prop)
                 prop_deriv = getattr(self, f"{arg.lower()}Deriv")
-                # t_type == 3 for full tensor model, t_type < 3 for scalar, isotropic, or axis-aligned anisotropy.
-                if t_type < 3 and self.mesh._meshType.lower() in (
-                    "cyl",
-                    "tensor",
-                    "tree",
-                ):
-                    M_prop_deriv = M_deriv_func(np.ones(self.mesh.n_edges)) @ prop_deriv
-                    setattr(self, stash_name, M_prop_deriv)
+                operator = get_operator(self, "E")
+                if operator is not None:
+                    if operator.is_diagonal:
+                        M_prop_deriv = operator.operator @ prop_deriv
+                        setattr(self, stash_name, M_prop_deriv)
+                    else:
+                        setattr(self, stash_name, (operator.deriv, prop_deriv))
                 else:
-                    setattr(self, stash_name, (M_deriv_func, prop_deriv))
+                    t_type = TensorType(self.mesh, prop)
+                    M_deriv_func = self.mesh.get_edge_inner_product_deriv(model=prop)
+                    # t_type == 3 for full tensor model, t_type < 3 for scalar, isotropic, or axis-aligned anisotropy.
+                    if t_type < 3 and self.mesh._meshType.lower() in (
+                        "cyl",
+                        "tensor",
+                        "tree",
+                    ):
+                        M_prop_deriv = (
+                            M_deriv_func(np.ones(self.mesh.n_edges)) @ prop_deriv
+                        )
+                        setattr(self, stash_name, M_prop_deriv)
+                    else:
+                        setattr(self, stash_name, (M_deriv_func, prop_deriv))
             return __inner_mat_mul_op(
                 getattr(self, stash_name), u, v=v, adjoint=adjoint
             )
@@ -434,16 +483,38 @@ class BasePDESimulation(BaseSimulation):
         pairs of keyword arguments and parameter values for the solver. Please visit
         `pymatsolver <https://pymatsolver.readthedocs.io/en/latest/>`__ to learn more
         about solvers and their parameters.
+    reuse_symbolic_factorization : bool, optional
+        Whether the factorizations of the system matrices reuse the ordering and
+        symbolic analysis of the previous factorizations of the same matrix.
+    fields_dtype : {numpy.float64, numpy.float32}, optional
+        Precision used to store the fields. With ``numpy.float32``, real fields
+        are stored as ``float32`` and complex fields as ``complex64``, while the
+        systems are still solved in double precision.
+    fields_storage : {"memory", "memmap", "zarr"} or simpeg.utils.storage_utils.FieldsStorage, optional
+        Backend storing the fields. ``"memmap"`` and ``"zarr"`` keep them in
+        temporary files rather than in memory.
 
     """
 
-    def __init__(self, mesh, solver=None, solver_opts=None, **kwargs):
+    def __init__(
+        self,
+        mesh,
+        solver=None,
+        solver_opts=None,
+        reuse_symbolic_factorization=True,
+        fields_dtype=np.float64,
+        fields_storage="memory",
+        **kwargs,
+    ):
         self.mesh = mesh
         super().__init__(**kwargs)
         self.solver = solver
         if solver_opts is None:
             solver_opts = {}
         self.solver_opts = solver_opts
+        self.reuse_symbolic_factorization = reuse_symbolic_factorization
+        self.fields_dtype = fields_dtype
+        self.fields_storage = fields_storage
 
     @property
     def mesh(self):
@@ -461,6 +532,17 @@ class BasePDESimulation(BaseSimulation):
     @mesh.setter
     def mesh(self, value):
         self._mesh = validate_type("mesh", value, discretize.base.BaseMesh, cast=False)
+        self._factorization_cache = None
+
+    def _get_inner_product_operator(self, projection_type, n_prop):
+        """Precomputed operator from a property to its face or edge inner product.
+
+        The operator only depends on the mesh, so it is computed once per mesh
+        and reused for every model and every simulation on the mesh. ``None``
+        is returned when the operator is not available for the mesh or the
+        size of the property.
+        """
+        return get_inner_product_operator(self.mesh, projection_type, n_prop)
 
     @property
     def solver(self):
@@ -487,8 +569,13 @@ class BasePDESimulation(BaseSimulation):
         if self._solver is None:
             # do not cache this, in case the user wants to
             # change it after the first time it is requested.
-            return get_default_solver(warn=True)
-        return self._solver
+            solver = get_default_solver(warn=True)
+        else:
+            solver = self._solver
+        if profiling.is_enabled():
+            # record factorizations and solves while profiling
+            solver = profiling._traced_solver(solver)
+        return solver
 
     @solver.setter
     def solver(self, cls):
@@ -522,6 +609,177 @@ class BasePDESimulation(BaseSimulation):
     def solver_opts(self, value):
         self._solver_opts = validate_type("solver_opts", value, dict, cast=False)
 
+    @property
+    def reuse_symbolic_factorization(self):
+        """Whether to reuse the symbolic analysis of the system matrices.
+
+        The system matrices of a simulation keep the same sparsity pattern for
+        every model, frequency or time step length. When ``True``, they are
+        assembled in a fixed layout and their factorizations only redo the
+        numeric phase, for the solvers supporting it. See
+        :class:`simpeg.utils.solver_utils.FactorizationCache`.
+
+        Returns
+        -------
+        bool
+        """
+        return self._reuse_symbolic_factorization
+
+    @reuse_symbolic_factorization.setter
+    def reuse_symbolic_factorization(self, value):
+        self._reuse_symbolic_factorization = validate_type(
+            "reuse_symbolic_factorization", value, bool
+        )
+
+    @property
+    def fields_dtype(self):
+        """Precision used to store the fields.
+
+        The fields are only used by the projections onto the receivers and by
+        the derivative operators, for which single precision is usually
+        sufficient. With ``numpy.float32``, real fields are stored as
+        ``float32`` and complex fields as ``complex64``, halving their memory,
+        and they are upcast to double precision when they are accessed. The
+        systems are always solved in double precision. Use
+        :meth:`fields_dtype_error` to check the accuracy of ``dpred``,
+        ``Jvec`` and ``Jtvec`` with single precision fields.
+
+        Returns
+        -------
+        numpy.float32 or numpy.float64
+        """
+        return self._fields_dtype
+
+    @fields_dtype.setter
+    def fields_dtype(self, value):
+        if value is not np.float32 and value is not np.float64:
+            raise TypeError("fields_dtype must be either np.float32 or np.float64.")
+        if getattr(self, "_fields_dtype", value) is not value:
+            # drop the quantities computed from the stored fields
+            for prop in self._delete_on_model_update:
+                if hasattr(self, prop):
+                    delattr(self, prop)
+            discard_cached_items(self)
+        self._fields_dtype = value
+
+    @property
+    def fields_storage(self):
+        """Backend storing the fields.
+
+        With ``"memory"``, the fields are held in NumPy arrays. With
+        ``"memmap"`` and ``"zarr"``, they are held in memory-mapped files or
+        in compressed zarr arrays, chunked by source and time step, and the
+        sensitivities read the fields of the next source in the background.
+        A :class:`simpeg.utils.storage_utils.FieldsStorage` instance can be
+        given to set the options of the backend.
+
+        Returns
+        -------
+        simpeg.utils.storage_utils.FieldsStorage
+        """
+        return self._fields_storage
+
+    @fields_storage.setter
+    def fields_storage(self, value):
+        if isinstance(value, str):
+            value = validate_string(
+                "fields_storage", value, ["memory", "memmap", "zarr"]
+            )
+            value = {
+                "memory": FieldsStorage,
+                "memmap": MemmapFieldsStorage,
+                "zarr": ZarrFieldsStorage,
+            }[value]()
+        self._fields_storage = validate_type(
+            "fields_storage", value, FieldsStorage, cast=False
+        )
+
+    def fields_dtype_error(
+        self,
+        m,
+        fields_dtype=np.float32,
+        v=None,
+        w=None,
+        random_seed: RandomSeed | None = None,
+    ):
+        """Relative errors caused by storing the fields with a lower precision.
+
+        Computes ``dpred``, ``Jvec`` and ``Jtvec`` with the fields stored in
+        double precision and in ``fields_dtype``, and returns the relative norm
+        of their differences. The :attr:`fields_dtype` of the simulation is
+        restored afterwards.
+
+        Parameters
+        ----------
+        m : (n_param,) numpy.ndarray
+            The model.
+        fields_dtype : {numpy.float32, numpy.float64}, optional
+            Precision of the fields to validate.
+        v : (n_param,) numpy.ndarray, optional
+            Vector multiplied by the sensitivities. Random if ``None``.
+        w : (n_data,) numpy.ndarray, optional
+            Vector multiplied by the adjoint of the sensitivities. Random if
+            ``None``.
+        random_seed : None or :class:`~simpeg.typing.RandomSeed`, optional
+            Random seed used to generate `v` and `w`. It can either be an int
+            or a predefined Numpy random number generator (see
+            ``numpy.random.default_rng``).
+
+        Returns
+        -------
+        dict
+            Relative errors of ``"dpred"``, ``"Jvec"`` and ``"Jtvec"``.
+        """
+        rng = np.random.default_rng(seed=random_seed)
+        if v is None:
+            v = rng.standard_normal(len(m))
+        if w is None:
+            w = rng.standard_normal(self.survey.nD)
+
+        original = self.fields_dtype
+        results = []
+        try:
+            for dtype in (np.float64, fields_dtype):
+                self.fields_dtype = dtype
+                f = self.fields(m)
+                results.append(
+                    (self.dpred(m, f=f), self.Jvec(m, v, f=f), self.Jtvec(m, w, f=f))
+                )
+        finally:
+            self.fields_dtype = original
+
+        return {
+            name: np.linalg.norm(low - double) / np.linalg.norm(double)
+            for name, double, low in zip(("dpred", "Jvec", "Jtvec"), *results)
+        }
+
+    @property
+    def factorization_cache(self):
+        """Layouts, symbolic analysis and timings of the system factorizations.
+
+        Returns
+        -------
+        simpeg.utils.solver_utils.FactorizationCache
+        """
+        if getattr(self, "_factorization_cache", None) is None:
+            self._factorization_cache = FactorizationCache()
+        return self._factorization_cache
+
+    def _factor_system(self, key, A, previous=None):
+        """Factorize a system matrix with the solver of the simulation.
+
+        ``previous`` is a factorization of the same system matrix that is no
+        longer needed, it is refactored in place when possible and cleaned
+        otherwise.
+        """
+        if not self.reuse_symbolic_factorization:
+            if previous is not None:
+                previous.clean()
+            return self.solver(A, **self.solver_opts)
+        return self.factorization_cache.factor(
+            key, A, self.solver, previous=previous, **self.solver_opts
+        )
+
     @property
     def Vol(self):
         return self.Mcc
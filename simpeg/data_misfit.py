@@ -1,5 +1,5 @@
 import numpy as np
-from .utils import Counter, sdiag, timeIt, Identity, validate_type
+from .utils import Counter, ModelCache, sdiag, timeIt, Identity, validate_type
 from .data import Data
 from .simulation import BaseSimulation
 from .objective_function import L2ObjectiveFunction
@@ -34,13 +34,25 @@ class BaseDataMisfit(L2ObjectiveFunction):
         Print debugging information.
     counter : None or simpeg.utils.Counter
         Assign a SimPEG ``Counter`` object to store iterations and run-times.
+    fields_cache : None or simpeg.utils.ModelCache, optional
+        Cache of fields and predicted data used when they are not provided.
+        It is set by :class:`simpeg.inverse_problem.BaseInvProblem`.
     """
 
-    def __init__(self, data, simulation, debug=False, counter=None, **kwargs):
+    def __init__(
+        self,
+        data,
+        simulation,
+        debug=False,
+        counter=None,
+        fields_cache=None,
+        **kwargs,
+    ):
         super().__init__(has_fields=True, debug=debug, counter=counter, **kwargs)
 
         self.data = data
         self.simulation = simulation
+        self.fields_cache = fields_cache
 
     @property
     def data(self):
@@ -74,6 +86,34 @@ class BaseDataMisfit(L2ObjectiveFunction):
             "simulation", value, BaseSimulation, cast=False
         )
 
+    @property
+    def fields_cache(self):
+        """Cache of fields and predicted data for the simulation.
+
+        When set, fields and predicted data that are not provided to the
+        data misfit are looked up in this cache before being computed, and
+        stored in it afterwards.
+
+        Returns
+        -------
+        None or simpeg.utils.ModelCache
+        """
+        return self._fields_cache
+
+    @fields_cache.setter
+    def fields_cache(self, value):
+        if value is not None:
+            value = validate_type("fields_cache", value, ModelCache, cast=False)
+        self._fields_cache = value
+
+    def _get_fields(self, m):
+        """Fields of the simulation for a model, reusing cached ones."""
+        if self.fields_cache is None:
+            return self.simulation.fields(m)
+        return self.fields_cache.get_or_compute(
+            self.simulation, m, "fields", lambda: self.simulation.fields(m)
+        )
+
     @property
     def debug(self):
         """Print debugging information.
@@ -225,7 +265,14 @@ class BaseDataMisfit(L2ObjectiveFunction):
         (n_data, ) numpy.ndarray
             The data residual vector.
         """
-        dpred = self.simulation.dpred(m, f=f)
+        if self.fields_cache is None or f is not None:
+            # Fields passed explicitly may differ from the cached ones
+            dpred = self.simulation.dpred(m, f=f)
+        else:
+            f = self._get_fields(m)
+            dpred = self.fields_cache.get_or_compute(
+                self.simulation, m, "dpred", lambda: self.simulation.dpred(m, f=f)
+            )
         if np.isnan(dpred).any() or np.isinf(dpred).any():
             msg = (
                 f"The `{type(self.simulation).__name__}.dpred()` method "
@@ -296,7 +343,7 @@ class L2DataMisfit(BaseDataMisfit):
         """
 
         if f is None:
-            f = self.simulation.fields(m)
+            f = self._get_fields(m)
 
         return 2 * self.simulation.Jtvec(
             m, self.W.T * (self.W * self.residual(m, f=f)), f=f
@@ -333,7 +380,7 @@ class L2DataMisfit(BaseDataMisfit):
         """
 
         if f is None:
-            f = self.simulation.fields(m)
+            f = self._get_fields(m)
 
         return 2 * self.simulation.Jtvec_approx(
             m, self.W * (self.W * self.simulation.Jvec_approx(m, v, f=f)), f=f
@@ -44,6 +44,7 @@ Directives to save inversion results
    :toctree: generated/
 
    SaveEveryIteration
+   SaveInversionStateEveryIteration
    SaveModelEveryIteration
    SaveOutputDictEveryIteration
    SaveOutputEveryIteration
@@ -108,6 +109,7 @@ from .directives import (
     TargetMisfit,
     SaveEveryIteration,
     SaveModelEveryIteration,
+    SaveInversionStateEveryIteration,
     SaveOutputEveryIteration,
     SaveOutputDictEveryIteration,
     UpdatePreconditioner,
@@ -5,6 +5,7 @@ import warnings
 import os
 import scipy.sparse as sp
 from ..typing import RandomSeed
+from ..profiling import _trace_methods
 from ..data_misfit import BaseDataMisfit
 from ..objective_function import BaseObjectiveFunction, ComboObjectiveFunction
 from ..maps import IdentityMap, Wires
@@ -31,6 +32,7 @@ from ..utils import (
     eigenvalue_by_power_iteration,
     validate_string,
 )
+from ..utils.io_utils import write_archive
 from ..utils.code_utils import (
     deprecate_class,
     deprecate_property,
@@ -68,6 +70,14 @@ class InversionDirective:
     _REGISTRY = {}
 
     _regPair = [WeightedLeastSquares, BaseRegularization, ComboObjectiveFunction]
+
+    # Methods recorded as spans while a simpeg.profiling.Profiler is active
+    _traced_methods = ("initialize", "endIter", "finish")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _trace_methods(cls, cls._traced_methods, "directive")
+
     _dmisfitPair = [BaseDataMisfit, ComboObjectiveFunction]
 
     def __init__(self, inversion=None, dmisfit=None, reg=None, verbose=False, **kwargs):
@@ -222,6 +232,13 @@ class InversionDirective:
         """
         return [objfcts.simulation for objfcts in self.dmisfit.objfcts]
 
+    def _cached_fields(self, simulation, m):
+        """Fields of a simulation already computed by the inverse problem, or None."""
+        cache = getattr(self.invProb, "fields_cache", None)
+        if cache is None:
+            return None
+        return cache.get(simulation, m)
+
     def initialize(self):
         """Initialize inversion parameter(s) according to directive."""
         pass
@@ -254,6 +271,9 @@ class InversionDirective:
         return True
 
 
+_trace_methods(InversionDirective, InversionDirective._traced_methods, "directive")
+
+
 class DirectiveList(object):
     """Directives list
 
@@ -1777,6 +1797,38 @@ class SaveModelEveryIteration(SaveEveryIteration):
         )
 
 
+class SaveInversionStateEveryIteration(SaveEveryIteration):
+    """SaveInversionStateEveryIteration
+
+    This directive saves the state of the inverse problem (model, trade-off
+    parameter, misfits and iteration) as a binary archive at each iteration,
+    so that a long inversion can be restarted from its last iteration. The
+    default directory is the current directory and the archives are saved as
+    ``###-InversionState-YYYY-MM-DD-HH-MM``. Read them with
+    :func:`simpeg.utils.io_utils.read_archive`.
+    """
+
+    def __init__(self, directory=".", name="InversionState", **kwargs):
+        super().__init__(directory=directory, name=name, **kwargs)
+
+    def initialize(self):
+        print(
+            "simpeg.SaveInversionStateEveryIteration will save your inversion "
+            "state as: '{0!s}###-{1!s}'".format(
+                self.directory + os.path.sep, self.fileName
+            )
+        )
+
+    def endIter(self):
+        write_archive(
+            "{0!s}{1:03d}-{2!s}".format(
+                self.directory + os.path.sep, self.opt.iter, self.fileName
+            ),
+            inv_prob=self.invProb,
+            overwrite=True,
+        )
+
+
 class SaveOutputEveryIteration(SaveEveryIteration):
     """SaveOutputEveryIteration"""
 
@@ -2476,7 +2528,7 @@ class UpdatePreconditioner(InversionDirective):
                 )
                 JtJdiag += np.sum(np.power((dmisfit.W * sim.getJ(m)), 2), axis=0)
             else:
-                JtJdiag += sim.getJtJdiag(m, W=dmisfit.W)
+                JtJdiag += sim.getJtJdiag(m, W=dmisfit.W, f=self._cached_fields(sim, m))
 
         diagA = JtJdiag + self.invProb.beta * regDiag
         diagA[diagA != 0] = diagA[diagA != 0] ** -1.0
@@ -2506,7 +2558,7 @@ class UpdatePreconditioner(InversionDirective):
                 )
                 JtJdiag += np.sum(np.power((dmisfit.W * sim.getJ(m)), 2), axis=0)
             else:
-                JtJdiag += sim.getJtJdiag(m, W=dmisfit.W)
+                JtJdiag += sim.getJtJdiag(m, W=dmisfit.W, f=self._cached_fields(sim, m))
 
         diagA = JtJdiag + self.invProb.beta * regDiag
         diagA[diagA != 0] = diagA[diagA != 0] ** -1.0
@@ -2842,7 +2894,9 @@ class UpdateSensitivityWeights(InversionDirective):
                     )
                 jtj_diag += mkvc(np.sum((dmisfit.W * sim.getJ(m)) ** 2.0, axis=0))
             else:
-                jtj_diag += sim.getJtJdiag(m, W=dmisfit.W)
+                jtj_diag += sim.getJtJdiag(
+                    m, W=dmisfit.W, f=self._cached_fields(sim, m)
+                )
 
         # Compute and sum root-mean squared sensitivities for all objective functions
         wr = np.zeros_like(self.invProb.model)
@@ -5,6 +5,7 @@
 ###############################################################################
 
 import copy
+import warnings
 
 import numpy as np
 
@@ -30,6 +31,8 @@ class PGI_UpdateParameters(InversionDirective):
     It updates:
         - the reference model and weights in the smallness (L2-approximation of PGI)
         - the GMM as a MAP estimate between the prior and the current model
+    With `warm_start_gmm`, the GMM is fully fitted once, then each following
+    update runs `warm_start_max_iter` EM steps from the previous estimate.
     For more details, please consult:
      - https://doi.org/10.1093/gji/ggz389
     """
@@ -49,6 +52,8 @@ class PGI_UpdateParameters(InversionDirective):
     )
     fixed_membership = None  # keep the membership of specific cells fixed
     keep_ref_fixed_in_Smooth = True  # keep mref fixed in the Smoothness
+    warm_start_gmm = False  # after the first fit, continue EM from the last update
+    warm_start_max_iter = 5  # EM steps for each warm started update
 
     def initialize(self):
         pgi_reg = self.reg.get_functions_of_type(PGIsmallness)
@@ -58,6 +63,7 @@ class PGI_UpdateParameters(InversionDirective):
                 "in the objective function."
             )
         self.pgi_reg = pgi_reg[0]
+        self._clfupdate = None
 
     def endIter(self):
         if self.opt.iter > 0 and self.opt.iter % self.update_rate == 0:
@@ -65,7 +71,21 @@ class PGI_UpdateParameters(InversionDirective):
             modellist = self.pgi_reg.wiresmap * m
             model = np.c_[[a * b for a, b in zip(self.pgi_reg.maplist, modellist)]].T
 
-            if self.update_gmm and isinstance(
+            if (
+                self.update_gmm
+                and self.warm_start_gmm
+                and getattr(self, "_clfupdate", None) is not None
+            ):
+                # Few EM steps starting from the previous estimate
+                clfupdate = self._clfupdate
+                clfupdate.fixed_membership = self.fixed_membership
+                with warnings.catch_warnings():
+                    warnings.filterwarnings(
+                        "ignore", message="Initialization .* did not converge"
+                    )
+                    clfupdate.fit(model)
+
+            elif self.update_gmm and isinstance(
                 self.pgi_reg.gmmref, GaussianMixtureWithNonlinearRelationships
             ):
                 clfupdate = GaussianMixtureWithNonlinearRelationshipsWithPrior(
@@ -118,6 +138,11 @@ class PGI_UpdateParameters(InversionDirective):
             else:
                 clfupdate = copy.deepcopy(self.pgi_reg.gmmref)
 
+            if self.warm_start_gmm and isinstance(clfupdate, GaussianMixtureWithPrior):
+                clfupdate.warm_start = True
+                clfupdate.max_iter = self.warm_start_max_iter
+                self._clfupdate = clfupdate
+
             self.pgi_reg.gmm = clfupdate
             membership = self.pgi_reg.gmm.predict(model)
 
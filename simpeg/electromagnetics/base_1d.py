@@ -6,6 +6,7 @@ from scipy import sparse as sp
 from scipy.special import roots_legendre
 
 from ..simulation import BaseSimulation
+from ..survey import BaseArraySurvey
 
 # from .time_domain.sources import MagDipole as t_MagDipole, CircularLoop as t_CircularLoop
 # from .frequency_domain.sources import MagDipole as f_MagDipole, CircularLoop as f_CircularLoop
@@ -28,6 +29,9 @@ for filter_name in libdlf.hankel.__all__:
     if "j0" in hankel_filter.values and "j1" in hankel_filter.values:
         HANKEL_FILTERS[filter_name] = hankel_filter
 
+# Defined at the module level so simulations can be pickled
+HankelFilter = namedtuple("HankelFilter", "base j0 j1")
+
 ###############################################################################
 #                                                                             #
 #                             Base EM1D Simulation                            #
@@ -127,17 +131,20 @@ class BaseEM1DSimulation(BaseSimulation):
             topo = np.r_[0.0, 0.0, 0.0]
         self.topo = topo
 
-        for src in self.survey.source_list:
-            if np.any(src.location[..., 2] < self.topo[2]):
+        # The lowest sounding of an array survey is checked for all of them
+        sources, heights = self._sounding_sources()
+        dz = 0.0 if heights is None else heights.min()
+        for src in sources:
+            if np.any(src.location[..., 2] + dz < self.topo[2]):
                 raise ValueError("Source must be located above the topography")
             for rx in src.receiver_list:
                 if rx.use_source_receiver_offset:
-                    if np.any(src.location[2] + rx.locations[:, 2] < self.topo[2]):
+                    if np.any(src.location[2] + dz + rx.locations[:, 2] < self.topo[2]):
                         raise ValueError(
                             "Receiver must be located above the topography"
                         )
                 else:
-                    if np.any(rx.locations[:, 2] < self.topo[2]):
+                    if np.any(rx.locations[:, 2] + dz < self.topo[2]):
                         raise ValueError(
                             "Receiver must be located above the topography"
                         )
@@ -168,8 +175,7 @@ class BaseEM1DSimulation(BaseSimulation):
             "hankel_filter", value, list(HANKEL_FILTERS.keys())
         )
         base, j0, j1 = HANKEL_FILTERS[self._hankel_filter]()
-        hank = namedtuple("HankelFilter", "base j0 j1")
-        self._fhtfilt = hank(base, j0, j1)
+        self._fhtfilt = HankelFilter(base, j0, j1)
         self._coefficients_set = False
 
     _hankel_pts_per_dec = 0  # Default: Standard DLF
@@ -359,15 +365,55 @@ class BaseEM1DSimulation(BaseSimulation):
             out = out + self.thicknessesDeriv.T @ (Js["dthick"].T @ v)
         return out
 
-    def _compute_hankel_coefficients(self):
+    def _sounding_sources(self):
+        """Sources of a single sounding and the height of every sounding.
+
+        The soundings of an array survey repeat the template sources, so their
+        coefficients are computed from the sources of the first sounding and
+        the height of each sounding above it. The sources of other surveys are
+        returned as a single sounding, with ``None`` for the heights.
+
+        Returns
+        -------
+        sources : list of simpeg.survey.BaseSrc
+        heights : (n_soundings) numpy.ndarray or None
+        """
         survey = self.survey
+        if not isinstance(survey, BaseArraySurvey):
+            return survey.source_list, None
+        cache = getattr(self, "_sounding_cache", None)
+        if cache is None or cache[0] is not survey:
+            locations = survey.source_locations
+            cache = (
+                survey,
+                survey.get_sounding_sources(0),
+                locations[:, 2] - locations[0, 2],
+            )
+            self._sounding_cache = cache
+        return cache[1], cache[2]
+
+    def _iter_sources(self):
+        """Iterate over the sources of every sounding, in the survey order.
+
+        Array surveys yield the sources of their first sounding for every
+        sounding, so the sources of :py:attr:`survey.source_list` are never
+        built.
+        """
+        sources, heights = self._sounding_sources()
+        for _ in range(1 if heights is None else len(heights)):
+            yield from sources
+
+    def _compute_hankel_coefficients(self):
+        sources, heights = self._sounding_sources()
         C0s = []
         C1s = []
         lambs = []
         Is = []
+        # whether the coefficients depend on the height of the sounding
+        shifted = []
         n_w_past = 0
         i_count = 0
-        for src in survey.source_list:
+        for src in sources:
             # doing the check for source type by checking its name
             # to avoid importing and checking "isinstance"
             class_name = type(src).__name__
@@ -557,24 +603,39 @@ class BaseEM1DSimulation(BaseSimulation):
                 C0s.append(np.exp(-lambd * (z + h)[:, None]) * C0 / offsets[:, None])
                 C1s.append(np.exp(-lambd * (z + h)[:, None]) * C1 / offsets[:, None])
                 lambs.append(lambd)
+                shifted.append(np.full(len(lambd), self.hMap is None or is_wire_loop))
                 n_w_past += n_w
                 for _ in range(rx.locations.shape[0]):
                     Is.append(np.ones(n_w, dtype=int) * i_count)
                     i_count += 1
 
-        # Store these on the simulation for faster future executions
-        self._lambs = np.vstack(lambs)
-        self._unique_lambs, inv_lambs = np.unique(self._lambs, return_inverse=True)
-        self._inv_lambs = inv_lambs.reshape(self._lambs.shape)
-        self._C0s = np.vstack(C0s)
-        self._C1s = np.vstack(C1s)
+        lambs = np.vstack(lambs)
+        C0s = np.vstack(C0s)
+        C1s = np.vstack(C1s)
         Is = np.hstack(Is)
         n_row = Is.size
         n_col = Is.max() + 1
         Js = np.arange(n_row)
         data = np.ones(n_row, dtype=int)
-        self._W = sp.coo_matrix((data, (Is, Js)), shape=(n_col, n_row))
-        self._W = self._W.tocsr()
+        W = sp.coo_matrix((data, (Is, Js)), shape=(n_col, n_row))
+        if heights is not None:
+            # Repeat the first sounding, moving the sources and receivers by
+            # the height of each sounding: exp(-lambd * (z + h)) changes by
+            # exp(-2 * lambd * dh)
+            dh = heights[:, None] * np.hstack(shifted)
+            damping = np.exp(-2 * lambs * dh[..., None])
+            C0s = (C0s * damping).reshape(-1, lambs.shape[1])
+            C1s = (C1s * damping).reshape(-1, lambs.shape[1])
+            lambs = np.tile(lambs, (len(heights), 1))
+            W = sp.kron(sp.identity(len(heights), dtype=int), W)
+
+        # Store these on the simulation for faster future executions
+        self._lambs = lambs
+        self._unique_lambs, inv_lambs = np.unique(self._lambs, return_inverse=True)
+        self._inv_lambs = inv_lambs.reshape(self._lambs.shape)
+        self._C0s = C0s
+        self._C1s = C1s
+        self._W = W.tocsr()
 
     @property
     def _delete_on_model_update(self):
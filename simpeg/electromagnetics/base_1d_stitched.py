@@ -0,0 +1,522 @@
+import atexit
+import multiprocessing
+import os
+
+import numpy as np
+from scipy import sparse as sp
+from scipy.constants import mu_0
+
+from .. import props
+from ..simulation import BaseSimulation
+from ..utils import (
+    validate_integer,
+    validate_ndarray_with_shape,
+    validate_string,
+)
+from .base_1d import HANKEL_FILTERS
+
+__all__ = ["BaseStitchedEM1DSimulation"]
+
+###############################################################################
+#                                                                             #
+#                        Base Stitched EM1D Simulation                        #
+#                                                                             #
+###############################################################################
+
+
+class BaseStitchedEM1DSimulation(BaseSimulation):
+    """Base class for simulating many 1D soundings at once.
+
+    Every sounding of the survey is a layered Earth with its own conductivity
+    model, below the location of the sounding. All soundings share the same
+    layer thicknesses, which lets the reflection coefficients of a whole chunk
+    of soundings be computed in a single call, and the Hankel (and Fourier)
+    filters be applied to the chunk as batched matrix products. The filter
+    coefficients are computed once on a single sounding simulation of the first
+    sounding, and the other soundings only differ from it by their height.
+
+    Parameters
+    ----------
+    survey : simpeg.survey.BaseArraySurvey
+        Survey repeating the same sources and receivers at every sounding.
+    sigma, rho : None, (n_sounding * n_layer, ) numpy.ndarray, optional
+        Electrical conductivity (S/m) or resistivity (Ohm m) of the layers,
+        ordered by sounding then by layer from the top.
+    sigmaMap, rhoMap : None, simpeg.maps.IdentityMap, optional
+        Mappings from the model to the conductivity or resistivity.
+    thicknesses : (n_layer - 1, ) numpy.ndarray
+        Thicknesses of the layers, shared by all soundings, in meters.
+    mu : float or (n_sounding * n_layer, ) numpy.ndarray, optional
+        Magnetic permeability of the layers (H/m).
+    h : None, (n_sounding, ) numpy.ndarray, optional
+        Height of the sources above the topography at every sounding. If
+        ``None``, the heights are given by the source locations.
+    hMap : None, simpeg.maps.IdentityMap, optional
+        Mapping from the model to the source heights.
+    topo : (3, ) or (n_sounding, 3) numpy.ndarray, optional
+        Topography below every sounding. Defaults to zero elevation.
+    hankel_filter : str, optional
+        Name of the Hankel filter in :mod:`libdlf.hankel`.
+    n_points_per_path : int, optional
+        Number of integration points for each segment of line current sources.
+    n_soundings_per_chunk : None or int, optional
+        Number of soundings evaluated together. Sensitivities are evaluated in
+        chunks this many times smaller than the number of layers. The default
+        of ``None`` sizes the chunks from the number of reflection coefficients
+        of a sounding, so the kernels of a chunk stay small enough to be fast.
+    n_processes : None or int, optional
+        Number of processes evaluating the chunks. The default of 1 does not
+        start any process, and ``None`` uses the number of cpus.
+
+    Notes
+    -----
+    The sensitivities to the layer conductivities and to the source heights
+    are block diagonal, with one block per sounding, and are stored as
+    :class:`scipy.sparse.bsr_matrix`. They can be combined with mappings from
+    a 2D or 3D mesh to the layers of each sounding, for laterally constrained
+    regularizations.
+
+    Batching soundings pays off when a sounding has few reflection
+    coefficients, as in the frequency domain. Time domain soundings already
+    evaluate the kernels on about a hundred frequencies, and larger chunks only
+    make the kernels slower, so they are evaluated a few soundings at a time.
+
+    The worker processes are started with the ``forkserver`` method (or
+    ``spawn`` where it isn't available), so when using several processes the
+    calls to the simulation must be protected with an
+    ``if __name__ == "__main__":`` block.
+    """
+
+    _formulation = "1D"
+    _template_class = None
+
+    sigma, sigmaMap, sigmaDeriv = props.Invertible(
+        "Electrical conductivity of the layers of every sounding (S/m)"
+    )
+    rho, rhoMap, rhoDeriv = props.Invertible(
+        "Electrical resistivity of the layers of every sounding (Ohm m)"
+    )
+    props.Reciprocal(sigma, rho)
+
+    mu = props.PhysicalProperty("Magnetic permeability of the layers (H/m)")
+
+    h, hMap, hDeriv = props.Invertible(
+        "Source height above the topography of every sounding (m)", optional=True
+    )
+
+    def __init__(
+        self,
+        survey=None,
+        sigma=None,
+        sigmaMap=None,
+        rho=None,
+        rhoMap=None,
+        thicknesses=None,
+        mu=mu_0,
+        h=None,
+        hMap=None,
+        topo=None,
+        hankel_filter="key_101_2009",
+        n_points_per_path=3,
+        n_soundings_per_chunk=None,
+        n_processes=1,
+        **kwargs,
+    ):
+        super().__init__(survey=survey, **kwargs)
+        self.sigma = sigma
+        self.rho = rho
+        self.sigmaMap = sigmaMap
+        self.rhoMap = rhoMap
+        self.mu = mu
+        self.h = h
+        self.hMap = hMap
+        if thicknesses is None:
+            thicknesses = np.array([])
+        self.thicknesses = thicknesses
+        if topo is None:
+            topo = np.r_[0.0, 0.0, 0.0]
+        self.topo = topo
+        self.hankel_filter = hankel_filter
+        self.n_points_per_path = n_points_per_path
+        self.n_soundings_per_chunk = n_soundings_per_chunk
+        self.n_processes = n_processes
+
+        heights = self.survey.source_locations[:, 2] - np.atleast_2d(self.topo)[:, 2]
+        if np.any(heights < 0.0):
+            raise ValueError("Sources must be located above the topography")
+
+    @property
+    def thicknesses(self):
+        """Thicknesses of the layers, shared by all soundings.
+
+        Returns
+        -------
+        (n_layer - 1, ) numpy.ndarray of float
+        """
+        return self._thicknesses
+
+    @thicknesses.setter
+    def thicknesses(self, value):
+        self._thicknesses = validate_ndarray_with_shape(
+            "thicknesses", value, shape=("*",)
+        )
+        self._template = None
+
+    @property
+    def topo(self):
+        """Topography below every sounding.
+
+        Returns
+        -------
+        (3, ) or (n_sounding, 3) numpy.ndarray of float
+        """
+        return self._topo
+
+    @topo.setter
+    def topo(self, value):
+        self._topo = validate_ndarray_with_shape("topo", value, shape=[(3,), ("*", 3)])
+        self._template = None
+
+    @property
+    def hankel_filter(self):
+        """The hankel filter used.
+
+        Returns
+        -------
+        str
+        """
+        return self._hankel_filter
+
+    @hankel_filter.setter
+    def hankel_filter(self, value):
+        self._hankel_filter = validate_string(
+            "hankel_filter", value, list(HANKEL_FILTERS.keys())
+        )
+        self._template = None
+
+    @property
+    def n_points_per_path(self):
+        """The number of integration points for each segment of line current sources.
+
+        Returns
+        -------
+        int
+        """
+        return self._n_points_per_path
+
+    @n_points_per_path.setter
+    def n_points_per_path(self, value):
+        self._n_points_per_path = validate_integer(
+            "n_points_per_path", value, min_val=1
+        )
+        self._template = None
+
+    @property
+    def n_soundings_per_chunk(self):
+        """Number of soundings evaluated together.
+
+        ``None`` sizes the chunks from the number of reflection coefficients
+        of a sounding.
+
+        Returns
+        -------
+        None or int
+        """
+        return self._n_soundings_per_chunk
+
+    @n_soundings_per_chunk.setter
+    def n_soundings_per_chunk(self, value):
+        if value is not None:
+            value = validate_integer("n_soundings_per_chunk", value, min_val=1)
+        self._n_soundings_per_chunk = value
+
+    @property
+    def n_processes(self):
+        """Number of processes evaluating the chunks of soundings.
+
+        Returns
+        -------
+        None or int
+        """
+        return self._n_processes
+
+    @n_processes.setter
+    def n_processes(self, value):
+        if value is not None:
+            value = validate_integer("n_processes", value, min_val=1)
+        self._n_processes = value
+
+    @property
+    def n_sounding(self):
+        """Number of soundings.
+
+        Returns
+        -------
+        int
+        """
+        return self.survey.n_soundings
+
+    @property
+    def n_layer(self):
+        """Number of layers of every sounding.
+
+        Returns
+        -------
+        int
+        """
+        return int(self.thicknesses.size + 1)
+
+    @property
+    def _template_kwargs(self):
+        """Extra arguments of the single sounding simulation."""
+        return {}
+
+    @property
+    def template_simulation(self):
+        """Single sounding simulation of the first sounding.
+
+        It holds the filter coefficients shared by all soundings.
+
+        Returns
+        -------
+        simpeg.electromagnetics.base_1d.BaseEM1DSimulation
+        """
+        if getattr(self, "_template", None) is None:
+            survey = type(self.survey)(
+                self.survey.source_templates, self.survey.source_locations[:1]
+            )
+            template = self._template_class(
+                survey=survey,
+                thicknesses=self.thicknesses,
+                topo=np.atleast_2d(self.topo)[0],
+                hankel_filter=self.hankel_filter,
+                n_points_per_path=self.n_points_per_path,
+                **self._template_kwargs,
+            )
+            template.get_coefficients()
+            self._template = template
+        return self._template
+
+    def _n_kernel_values(self):
+        """Number of reflection coefficients evaluated for a single sounding."""
+        raise NotImplementedError
+
+    def _chunk_size(self, derivatives=()):
+        """Number of soundings of the chunks."""
+        chunk = self.n_soundings_per_chunk
+        if chunk is None:
+            n_values = self._n_kernel_values() * self.n_layer
+            if "ds" in derivatives:
+                n_values *= self.n_layer
+            return max(1, _KERNEL_VALUES_PER_CHUNK // n_values)
+        if "ds" in derivatives:
+            chunk = max(1, chunk // self.n_layer)
+        return chunk
+
+    def _height_changes(self):
+        """Change of the source height of every sounding from the first one."""
+        heights = self.survey.source_locations[:, 2] - np.atleast_2d(self.topo)[:, 2]
+        if self.h is not None:
+            return np.broadcast_to(self.h, (self.n_sounding,)) - heights[0]
+        return heights - heights[0]
+
+    def _evaluate(self, derivatives=()):
+        """Evaluate the soundings by chunks.
+
+        Parameters
+        ----------
+        derivatives : tuple of str
+            Derivatives to compute, among ``"ds"`` and ``"dh"``.
+
+        Returns
+        -------
+        dict
+            The predicted data ``"d"``, of shape ``(n_sounding, n_data)``, and
+            the requested derivatives; ``"ds"`` of shape
+            ``(n_sounding, n_data, n_layer)`` and ``"dh"`` of shape
+            ``(n_sounding, n_data)``, where ``n_data`` is the number of data
+            of a sounding.
+        """
+        template = self.template_simulation
+        shape = (self.n_sounding, self.n_layer)
+        sigma = np.reshape(self.sigma, shape)
+        mu = np.broadcast_to(np.reshape(self.mu, -1), (np.prod(shape),)).reshape(shape)
+        delta_h = self._height_changes()
+
+        chunk = self._chunk_size(derivatives)
+        tasks = (
+            (
+                self._evaluate_soundings,
+                template,
+                sigma[i : i + chunk],
+                mu[i : i + chunk],
+                delta_h[i : i + chunk],
+                derivatives,
+            )
+            for i in range(0, self.n_sounding, chunk)
+        )
+        if self.n_processes == 1:
+            results = [_evaluate_chunk(task) for task in tasks]
+        else:
+            pool = _get_worker_pool(self.n_processes or os.cpu_count())
+            results = pool.map(_evaluate_chunk, tasks)
+        return {
+            key: np.concatenate([result[key] for result in results])
+            for key in results[0]
+        }
+
+    def fields(self, m):
+        """Predicted data of every sounding.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model.
+
+        Returns
+        -------
+        (n_data, ) numpy.ndarray
+            Predicted data, ordered by sounding.
+        """
+        self.model = m
+        return self._evaluate()["d"].reshape(-1)
+
+    def dpred(self, m, f=None):
+        """
+        Return predicted data.
+        Predicted data, (`_pred`) are computed when
+        self.fields is called.
+        """
+        if f is None:
+            f = self.fields(m)
+
+        return f
+
+    def getJ(self, m, f=None):
+        """Block diagonal sensitivities of the data.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model.
+        f : None, optional
+            Unused, present for consistency with the other simulations.
+
+        Returns
+        -------
+        dict of scipy.sparse.bsr_matrix
+            Sensitivities to the layer conductivities, ``"ds"``, of shape
+            ``(n_data, n_sounding * n_layer)`` and to the source heights,
+            ``"dh"``, of shape ``(n_data, n_sounding)``, for the properties
+            that have mappings.
+        """
+        self.model = m
+        if getattr(self, "_J", None) is None:
+            derivatives = []
+            if self.sigmaMap is not None or self.rhoMap is not None:
+                derivatives.append("ds")
+            if self.hMap is not None:
+                derivatives.append("dh")
+            self._J = {}
+            if not derivatives:
+                return self._J
+            results = self._evaluate(tuple(derivatives))
+
+            n_sounding = self.n_sounding
+            indices = np.arange(n_sounding)
+            indptr = np.arange(n_sounding + 1)
+            if "ds" in results:
+                self._J["ds"] = sp.bsr_matrix(
+                    (results["ds"], indices, indptr),
+                    shape=(self.survey.nD, n_sounding * self.n_layer),
+                )
+            if "dh" in results:
+                self._J["dh"] = sp.bsr_matrix(
+                    (results["dh"][:, :, None], indices, indptr),
+                    shape=(self.survey.nD, n_sounding),
+                )
+        return self._J
+
+    def _mapped_sensitivities(self, m, f=None):
+        """Sensitivities to the model through the mapping of each property."""
+        Js = self.getJ(m, f=f)
+        out = []
+        if "ds" in Js:
+            out.append((Js["ds"], self.sigmaDeriv))
+        if "dh" in Js:
+            out.append((Js["dh"], self.hDeriv))
+        return out
+
+    def Jvec(self, m, v, f=None):
+        out = 0.0
+        for J, deriv in self._mapped_sensitivities(m, f=f):
+            out = out + J @ (deriv @ v)
+        return out
+
+    def Jtvec(self, m, v, f=None):
+        out = 0.0
+        for J, deriv in self._mapped_sensitivities(m, f=f):
+            out = out + deriv.T @ (J.T @ v)
+        return out
+
+    def getJtJdiag(self, m, W=None, f=None):
+        if getattr(self, "_gtgdiag", None) is None:
+            if W is None:
+                W = np.ones(self.survey.nD)
+            else:
+                W = W.diagonal() ** 2
+            out = 0.0
+            for J, deriv in self._mapped_sensitivities(m, f=f):
+                J = sp.csr_matrix(J @ deriv)
+                out = out + np.asarray(J.multiply(J).T @ W).reshape(-1)
+            self._gtgdiag = out
+        return self._gtgdiag
+
+    @property
+    def _delete_on_model_update(self):
+        return super()._delete_on_model_update + ["_J", "_gtgdiag"]
+
+
+# Number of values of the reflection coefficient kernels of a chunk,
+# above which the kernels are bound by memory and chunking stops paying off
+_KERNEL_VALUES_PER_CHUNK = 2**20
+
+# Pools of processes shared by all the stitched simulations, by number of processes
+_worker_pools = {}
+
+
+def _get_worker_pool(n_processes):
+    """
+    Return the persistent pool with a given number of processes.
+
+    The pool is started on the first call and reused afterwards, until
+    :func:`_close_worker_pools` is called, which happens when the interpreter
+    exits. The workers are started from a ``forkserver`` (or ``spawn`` where
+    it isn't available).
+    """
+    pool = _worker_pools.get(n_processes)
+    if pool is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+        else:
+            context = multiprocessing.get_context("spawn")
+        pool = context.Pool(processes=n_processes)
+        _worker_pools[n_processes] = pool
+    return pool
+
+
+@atexit.register
+def _close_worker_pools():
+    """
+    Stop the workers of the persistent pools and wait for them to exit.
+    """
+    while _worker_pools:
+        _, pool = _worker_pools.popitem()
+        pool.terminate()
+        pool.join()
+
+
+def _evaluate_chunk(task):
+    """Evaluate a chunk of soundings, possibly in a worker process."""
+    evaluate, template, sigma, mu, delta_h, derivatives = task
+    return evaluate(template, sigma, mu, delta_h, derivatives)
@@ -30,6 +30,7 @@ Simulations
   :toctree: generated/
 
   Simulation1DLayered
+  Simulation1DLayeredStitched
   Simulation3DElectricField
   Simulation3DMagneticFluxDensity
   Simulation3DCurrentDensity
@@ -68,6 +69,7 @@ Surveys
   :toctree: generated/
 
   survey.Survey
+  survey.ArraySurvey
 
 Fields
 ======
@@ -92,7 +94,7 @@ Base Classes
 
 """
 
-from .survey import Survey
+from .survey import Survey, ArraySurvey
 from . import sources
 from . import receivers
 from .simulation import (
@@ -102,6 +104,7 @@ from .simulation import (
     Simulation3DMagneticField,
 )
 from .simulation_1d import Simulation1DLayered
+from .simulation_1d_stitched import Simulation1DLayeredStitched
 from .fields import (
     Fields3DElectricField,
     Fields3DMagneticFluxDensity,
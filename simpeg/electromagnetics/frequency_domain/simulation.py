@@ -194,7 +194,7 @@ class BaseFDEMSimulation(BaseEMSimulation):
         for i_f, freq in enumerate(self.survey.frequencies):
             A = self.getA(freq)
             rhs = self.getRHS(freq)
-            Ainv = self.solver(A, **self.solver_opts)
+            Ainv = self._factor_system(("A", i_f), A, previous=self.Ainv[i_f])
             u = Ainv * rhs
             if not self.forward_only:
                 self.Ainv[i_f] = Ainv
@@ -244,8 +244,9 @@ class BaseFDEMSimulation(BaseEMSimulation):
         Jv = np.full(self.survey.nD, fill_value=np.nan)
 
         for nf, freq in enumerate(self.survey.frequencies):
-            for src in self.survey.get_sources_by_frequency(freq):
-                u_src = f[src, self._solutionType]
+            sources = self.survey.get_sources_by_frequency(freq)
+            # read the fields of the next source while solving for this one
+            for src, u_src in zip(sources, f.stream(sources, self._solutionType)):
                 dA_dm_v = self.getADeriv(freq, u_src, v, adjoint=False)
                 dRHS_dm_v = self.getRHSDeriv(freq, src, v)
                 du_dm_v = self.Ainv[nf] * (-dA_dm_v + dRHS_dm_v)
@@ -299,8 +300,9 @@ class BaseFDEMSimulation(BaseEMSimulation):
         Jtv = np.zeros(m.size)
 
         for nf, freq in enumerate(self.survey.frequencies):
-            for src in self.survey.get_sources_by_frequency(freq):
-                u_src = f[src, self._solutionType]
+            sources = self.survey.get_sources_by_frequency(freq)
+            # read the fields of the next source while solving for this one
+            for src, u_src in zip(sources, f.stream(sources, self._solutionType)):
                 df_duT_sum = 0
                 df_dmT_sum = 0
                 for rx in src.receiver_list:
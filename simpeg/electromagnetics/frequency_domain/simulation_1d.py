@@ -74,7 +74,8 @@ class Simulation1DLayered(BaseEM1DSimulation):
         frequencies = np.array(survey.frequencies)
         # Compute coefficients for Hankel transform
         i_freq = []
-        for src in survey.source_list:
+        sources, heights = self._sounding_sources()
+        for src in sources:
             class_name = type(src).__name__
             is_wire_loop = class_name == "LineCurrent"
             i_f = np.searchsorted(frequencies, src.frequency)
@@ -84,7 +85,11 @@ class Simulation1DLayered(BaseEM1DSimulation):
                     i_freq.append([i_f] * rx.locations.shape[0] * n_quad_points)
                 else:
                     i_freq.append([i_f] * rx.locations.shape[0])
-        self._i_freq = np.hstack(i_freq)
+        i_freq = np.hstack(i_freq)
+        if heights is not None:
+            # every sounding of an array survey repeats the first one
+            i_freq = np.tile(i_freq, len(heights))
+        self._i_freq = i_freq
         self._coefficients_set = True
 
     def dpred(self, m, f=None):
@@ -151,7 +156,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
                 C1s_dh = C1s.copy()
                 h_vec = self.h
                 i = 0
-                for i_src, src in enumerate(self.survey.source_list):
+                for i_src, src in enumerate(self._iter_sources()):
                     class_name = type(src).__name__
                     is_wire_loop = class_name == "LineCurrent"
 
@@ -184,7 +189,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
                 v_dh = np.zeros((self.survey.nSrc, v_dh_temp.shape[0]))
 
                 i = 0
-                for i_src, src in enumerate(self.survey.source_list):
+                for i_src, src in enumerate(self._iter_sources()):
                     class_name = type(src).__name__
                     is_wire_loop = class_name == "LineCurrent"
                     if is_wire_loop:
@@ -251,7 +256,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
             out = np.zeros(self.survey.nD)
         else:
             out = np.zeros((self.survey.nD, v.shape[1]))
-        for src in self.survey.source_list:
+        for src in self._iter_sources():
             class_name = type(src).__name__
             is_wire_loop = class_name == "LineCurrent"
             for i_rx, rx in enumerate(src.receiver_list):
@@ -0,0 +1,93 @@
+import numpy as np
+
+from geoana.kernels.tranverse_electric_reflections import rTE_forward, rTE_gradient
+
+from ...utils import validate_type
+from ..base_1d_stitched import BaseStitchedEM1DSimulation
+from .simulation_1d import Simulation1DLayered
+from .survey import ArraySurvey
+
+
+def _evaluate_soundings(simulation, sigma, mu, delta_h, derivatives):
+    """Evaluate a chunk of frequency domain soundings.
+
+    The reflection coefficients of all soundings are computed together by
+    stacking the soundings along the frequency axis of the kernels.
+    """
+    i_freq, lambs, unique_lambs, inv_lambs, C0s, C1s, W = simulation.get_coefficients()
+    j0 = simulation._fhtfilt.j0
+    j1 = simulation._fhtfilt.j1
+
+    frequencies = np.array(simulation.survey.frequencies)
+    n_sounding, n_layer = sigma.shape
+    n_frequency = len(frequencies)
+    n_row = C0s.shape[0]
+
+    frequencies = np.tile(frequencies, n_sounding)
+    sig = np.repeat(sigma.T, n_frequency, axis=1)
+    mu = np.repeat(mu.T, n_frequency, axis=1)
+
+    rTE = rTE_forward(frequencies, unique_lambs, sig, mu, simulation.thicknesses)
+    rTE = rTE.reshape(n_sounding, n_frequency, -1)[:, i_freq[:, None], inv_lambs]
+
+    # both the source and the receiver move with the height of the sounding
+    damping = np.exp(-2 * lambs * delta_h[:, None, None])
+    C0s = C0s * damping
+    C1s = C1s * damping
+
+    v = W @ ((C0s * rTE) @ j0 + (C1s * rTE) @ j1).T
+    primary = simulation._project_to_data(np.zeros(W.shape[0], dtype=complex))
+    out = {"d": simulation._project_to_data(v).T + primary}
+
+    if "dh" in derivatives:
+        v = W @ ((-2 * lambs * C0s * rTE) @ j0 + (-2 * lambs * C1s * rTE) @ j1).T
+        out["dh"] = simulation._project_to_data(v).T
+
+    if "ds" in derivatives:
+        rTE_ds = rTE_gradient(
+            frequencies, unique_lambs, sig, mu, simulation.thicknesses
+        )[0]
+        rTE_ds = rTE_ds.reshape(n_layer, n_sounding, n_frequency, -1)[
+            :, :, i_freq[:, None], inv_lambs
+        ]
+        v = (C0s * rTE_ds) @ j0 + (C1s * rTE_ds) @ j1
+        v = W @ v.reshape(-1, n_row).T
+        out["ds"] = (
+            simulation._project_to_data(v)
+            .reshape(-1, n_layer, n_sounding)
+            .transpose(2, 0, 1)
+        )
+    return out
+
+
+class Simulation1DLayeredStitched(BaseStitchedEM1DSimulation):
+    """
+    Simulation class for simulating the FEM response of many soundings over
+    1D layered Earths sharing the same layer thicknesses.
+    """
+
+    _template_class = Simulation1DLayered
+    _evaluate_soundings = staticmethod(_evaluate_soundings)
+
+    @property
+    def survey(self):
+        """The simulations survey.
+
+        Returns
+        -------
+        simpeg.electromagnetics.frequency_domain.survey.ArraySurvey
+        """
+        if self._survey is None:
+            raise AttributeError("Simulation must have a survey set")
+        return self._survey
+
+    @survey.setter
+    def survey(self, value):
+        if value is not None:
+            value = validate_type("survey", value, ArraySurvey, cast=False)
+        self._survey = value
+        self._template = None
+
+    def _n_kernel_values(self):
+        unique_lambs = self.template_simulation.get_coefficients()[2]
+        return len(self.survey.frequencies) * len(unique_lambs)
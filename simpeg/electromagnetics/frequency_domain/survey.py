@@ -1,4 +1,4 @@
-from ...survey import BaseSurvey
+from ...survey import BaseSurvey, BaseArraySurvey
 from .sources import BaseFDEMSrc
 from ...utils import validate_list_of_types
 
@@ -97,3 +97,82 @@ class Survey(BaseSurvey):
             frequency in self._frequency_dict
         ), "The requested frequency is not in this survey."
         return self._frequency_dict[frequency]
+
+
+class ArraySurvey(BaseArraySurvey, Survey):
+    """Frequency domain electromagnetic survey stored as arrays
+
+    A compact survey for airborne and other surveys repeating the same
+    sounding at many locations. Only the sounding locations and the
+    receiver offsets are stored as arrays; the FDEM sources and receivers
+    are built from the templates when first requested, and are not pickled.
+
+    Parameters
+    ----------
+    source_templates : BaseFDEMSrc or list of BaseFDEMSrc
+        FDEM sources, with their receivers, defining a single sounding;
+        usually one source per frequency. Receiver locations are relative to
+        the location of their source if they use source-receiver offsets, and
+        absolute otherwise.
+    source_locations : (n_soundings, 3) numpy.ndarray
+        Locations of the template sources at each sounding.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from simpeg.electromagnetics import frequency_domain as fdem
+    >>> rx = fdem.receivers.PointMagneticFieldSecondary(
+    ...     np.array([[7.86, 0.0, 0.0]]),
+    ...     orientation="z",
+    ...     component="both",
+    ...     data_type="ppm",
+    ...     use_source_receiver_offset=True,
+    ... )
+    >>> sources = [
+    ...     fdem.sources.MagDipole([rx], frequency=f, location=np.zeros(3))
+    ...     for f in [382.0, 1822.0, 7970.0]
+    ... ]
+    >>> locations = np.c_[np.linspace(0, 1000, 101), np.zeros(101), np.full(101, 30.0)]
+    >>> survey = fdem.survey.ArraySurvey(sources, locations)
+    >>> survey.nSrc, survey.nD
+    (303, 606)
+    """
+
+    _source_type = BaseFDEMSrc
+
+    @property
+    def _frequencies(self):
+        return sorted({src.frequency for src in self.source_templates})
+
+    @property
+    def _frequency_dict(self):
+        if getattr(self, "_frequency_sources", None) is None:
+            self._frequency_sources = {freq: [] for freq in self._frequencies}
+            for src in self.source_list:
+                self._frequency_sources[src.frequency].append(src)
+        return self._frequency_sources
+
+    @property
+    def num_frequencies(self):
+        """Number of frequencies
+
+        Returns
+        -------
+        int
+            Number of frequencies
+        """
+        return len(self._frequencies)
+
+    @property
+    def num_sources_by_frequency(self):
+        """Number of sources at each frequency
+
+        Returns
+        -------
+        list of int
+            Number of sources associated with each frequency
+        """
+        num_sources = {freq: 0 for freq in self._frequencies}
+        for src in self.source_templates:
+            num_sources[src.frequency] += self.n_soundings
+        return num_sources
@@ -14,9 +14,12 @@ Simulations
   Simulation1DElectricField
   Simulation1DMagneticField
   Simulation1DPrimarySecondary
+  Simulation1DRecursiveMultiStation
   Simulation2DElectricField
   Simulation2DMagneticField
+  Simulation2DTETM
   Simulation3DPrimarySecondary
+  Simulation3DPrimarySecondaryMultiMesh
 
 Receivers
 =========
@@ -81,4 +84,6 @@ from .simulation import (
 )
 from . import sources
 from . import receivers
-from .simulation_1d import Simulation1DRecursive
+from .simulation_1d import Simulation1DRecursive, Simulation1DRecursiveMultiStation
+from .simulation_2d import Simulation2DTETM
+from .simulation_multi_mesh import Simulation3DPrimarySecondaryMultiMesh
@@ -27,6 +27,23 @@ def _centers_to_widths(centers):
     return d
 
 
+def _boundary_fields_1d(sim, model, props, cached=None):
+    """Fields of a 1D boundary simulation, reused while its properties are unchanged.
+
+    ``cached`` is a ``(values, fields)`` tuple returned by a previous call, the
+    1D problems are only solved again if one of the physical properties named
+    in ``props`` changed since then.
+    """
+    if model is not None:
+        sim.model = model
+    values = [np.copy(getattr(sim, prop)) for prop in props]
+    if cached is not None and all(
+        np.array_equal(new, old) for new, old in zip(values, cached[0])
+    ):
+        return cached
+    return values, sim.fields()
+
+
 ###################################
 # 1D problems
 ###################################
@@ -322,13 +339,13 @@ class Simulation2DElectricField(BaseFDEMSimulation):
                 self._sim_left = Simulation1DElectricField(
                     TensorMesh((h_l,), (mesh.nodes_y[0],)),
                     survey=survey,
-                    solver=self.solver,
+                    solver=self._solver,
                     **map_l_kwargs,
                 )
                 self._sim_right = Simulation1DElectricField(
                     TensorMesh((h_r,), (mesh.nodes_y[0],)),
                     survey=survey,
-                    solver=self.solver,
+                    solver=self._solver,
                     **map_r_kwargs,
                 )
             else:
@@ -444,6 +461,7 @@ class Simulation2DElectricField(BaseFDEMSimulation):
         if getattr(self, "_boundary_fields", None) is None:
             if model is None:
                 model = self.model
+            cached = getattr(self, "_boundary_fields_cache", (None, None))
             sim = self._sim_left
             if self.muiMap is None:
                 try:
@@ -455,7 +473,7 @@ class Simulation2DElectricField(BaseFDEMSimulation):
                     sim.sigma = self._P_l @ self.sigma
                 except Exception:
                     sim.sigma = self.sigma
-            f_left = sim.fields(model)
+            left = _boundary_fields_1d(sim, model, ("sigma", "mui"), cached[0])
 
             sim = self._sim_right
             if self.muiMap is None:
@@ -468,9 +486,12 @@ class Simulation2DElectricField(BaseFDEMSimulation):
                     sim.sigma = self._P_r @ self.sigma
                 except Exception:
                     sim.sigma = self.sigma
-            f_right = sim.fields(model)
+            right = _boundary_fields_1d(sim, model, ("sigma", "mui"), cached[1])
 
-            self._boundary_fields = (f_left, f_right)
+            # kept across model updates, the 1D problems are only solved
+            # again when the boundary columns of the model change
+            self._boundary_fields_cache = (left, right)
+            self._boundary_fields = (left[1], right[1])
         return self._boundary_fields
 
     @property
@@ -548,13 +569,13 @@ class Simulation2DMagneticField(BaseFDEMSimulation):
                 self._sim_left = Simulation1DMagneticField(
                     TensorMesh((h_l,), (mesh.nodes_y[0],)),
                     survey=survey,
-                    solver=self.solver,
+                    solver=self._solver,
                     **map_l_kwargs,
                 )
                 self._sim_right = Simulation1DMagneticField(
                     TensorMesh((h_r,), (mesh.nodes_y[0],)),
                     survey=survey,
-                    solver=self.solver,
+                    solver=self._solver,
                     **map_r_kwargs,
                 )
             else:
@@ -666,6 +687,7 @@ class Simulation2DMagneticField(BaseFDEMSimulation):
         if getattr(self, "_boundary_fields", None) is None:
             if model is None:
                 model = self.model
+            cached = getattr(self, "_boundary_fields_cache", (None, None))
             sim = self._sim_left
             if self.muMap is None:
                 try:
@@ -677,7 +699,7 @@ class Simulation2DMagneticField(BaseFDEMSimulation):
                     sim.rho = self._P_l @ self.rho
                 except Exception:
                     sim.rho = self.rho
-            f_left = sim.fields(model)
+            left = _boundary_fields_1d(sim, model, ("rho", "mu"), cached[0])
 
             sim = self._sim_right
             if self.muMap is None:
@@ -690,9 +712,12 @@ class Simulation2DMagneticField(BaseFDEMSimulation):
                     sim.rho = self._P_r @ self.rho
                 except Exception:
                     sim.rho = self.rho
-            f_right = sim.fields(model)
+            right = _boundary_fields_1d(sim, model, ("rho", "mu"), cached[1])
 
-            self._boundary_fields = (f_left, f_right)
+            # kept across model updates, the 1D problems are only solved
+            # again when the boundary columns of the model change
+            self._boundary_fields_cache = (left, right)
+            self._boundary_fields = (left[1], right[1])
         return self._boundary_fields
 
     @property
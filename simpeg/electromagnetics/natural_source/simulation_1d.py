@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.sparse as sp
 from scipy.constants import mu_0
 
 from ...simulation import BaseSimulation
@@ -6,6 +7,164 @@ from ... import props
 from ...utils import validate_type
 from ..frequency_domain.survey import Survey
 from .receivers import Impedance
+from ...utils.cache_utils import discard_cached_items
+
+
+def _layer_quantities(frequencies, thicknesses, sigmas):
+    """Layer quantities of the impedance recursion.
+
+    The layer axis is moved first and ordered from the top layer, followed by
+    the leading axes of ``sigmas`` and the frequencies.
+    """
+    omega = 2 * np.pi * np.asarray(frequencies)
+    sigmas = np.asarray(sigmas, dtype=float)
+    thicknesses = np.broadcast_to(
+        np.asarray(thicknesses, dtype=float),
+        sigmas.shape[:-1] + (sigmas.shape[-1] - 1,),
+    )
+    sigmas = np.moveaxis(sigmas[..., ::-1], -1, 0)[..., None]
+    thicknesses = np.moveaxis(thicknesses[..., ::-1], -1, 0)[..., None]
+
+    alphas = np.sqrt(1j * omega * mu_0 * sigmas)
+    ratios = alphas / sigmas
+    tanhs = np.tanh(alphas[:-1] * thicknesses)
+    return omega, sigmas, thicknesses, alphas, ratios, tanhs
+
+
+def _recursive_impedances(frequencies, thicknesses, sigmas):
+    """Complex impedances at the surface of layered Earth models.
+
+    The recursion runs over the layers and is vectorized over the frequencies
+    and any leading axes of ``sigmas``, e.g. one model per station.
+
+    Parameters
+    ----------
+    frequencies : (n_freq, ) numpy.ndarray
+        Frequencies in Hz.
+    thicknesses : (..., n_layer-1) numpy.ndarray
+        Layer thicknesses in meters, starting from the bottom.
+    sigmas : (..., n_layer) numpy.ndarray
+        Layer conductivities in S/m, starting from the bottom.
+
+    Returns
+    -------
+    (..., n_freq) numpy.ndarray
+        Complex impedances at the surface.
+    """
+    _, _, _, _, ratios, tanhs = _layer_quantities(frequencies, thicknesses, sigmas)
+
+    Z = -ratios[-1]
+    # Work from lowest layer to top layer
+    for ii in range(len(ratios) - 2, -1, -1):
+        top = Z / ratios[ii] - tanhs[ii]
+        bot = 1 - Z / ratios[ii] * tanhs[ii]
+        Z = ratios[ii] * top / bot
+    return Z
+
+
+def _recursive_impedances_deriv(frequencies, thicknesses, sigmas):
+    """Complex impedances at the surface of layered Earth models and their derivatives.
+
+    Parameters
+    ----------
+    frequencies : (n_freq, ) numpy.ndarray
+        Frequencies in Hz.
+    thicknesses : (..., n_layer-1) numpy.ndarray
+        Layer thicknesses in meters, starting from the bottom.
+    sigmas : (..., n_layer) numpy.ndarray
+        Layer conductivities in S/m, starting from the bottom.
+
+    Returns
+    -------
+    Z : (..., n_freq) numpy.ndarray
+        Complex impedances at the surface.
+    Z_dsigma : (..., n_freq, n_layer) numpy.ndarray
+        Derivative of the impedances with respect to the conductivities.
+    Z_dthick : (..., n_freq, n_layer-1) numpy.ndarray
+        Derivative of the impedances with respect to the thicknesses.
+    """
+    omega, sigmas, thicknesses, alphas, ratios, tanhs = _layer_quantities(
+        frequencies, thicknesses, sigmas
+    )
+    n_layer = len(sigmas)
+
+    # Z_{i+1} / ratio_i and Z_i / ratio_i of each layer, kept for the
+    # backward pass
+    inv_ratios = 1 / ratios
+    z_ratios = np.empty_like(tanhs)
+    quotients = np.empty_like(tanhs)
+    bots = np.empty_like(tanhs)
+    Z = -ratios[-1]
+    # Work from lowest layer to top layer
+    for ii in range(n_layer - 2, -1, -1):
+        z_ratios[ii] = Z * inv_ratios[ii]
+        bots[ii] = 1 - z_ratios[ii] * tanhs[ii]
+        quotients[ii] = (z_ratios[ii] - tanhs[ii]) / bots[ii]
+        Z = ratios[ii] * quotients[ii]
+
+    # Backpropagate from the surface impedance to the layer quantities
+    gZ = 1.0
+    gratios = np.empty_like(ratios)
+    gtanhs = np.empty_like(tanhs)
+    for ii in range(n_layer - 1):
+        gtop = ratios[ii] / bots[ii] * gZ
+        gbot = -quotients[ii] * gtop
+        gratios[ii] = quotients[ii] * gZ
+        gZ = inv_ratios[ii] * (gtop - tanhs[ii] * gbot)
+        gratios[ii] -= z_ratios[ii] * gZ
+        gtanhs[ii] = -z_ratios[ii] * gbot - gtop
+    gratios[-1] = -gZ
+    d_thick = (1 - tanhs**2) * alphas[:-1] * gtanhs
+
+    galphas = gratios / sigmas
+    galphas[:-1] += (1 - tanhs**2) * thicknesses * gtanhs
+
+    d_sigma = -ratios / sigmas * gratios
+    d_sigma += (0.5j * omega * mu_0) / alphas * galphas
+
+    # d_mu would be this below when it gets activated:
+    # d_mu = (0.5j * omega * sigmas) / alphas * galphas
+    return (
+        Z,
+        np.moveaxis(d_sigma[::-1], 0, -1),
+        np.moveaxis(d_thick[::-1], 0, -1),
+    )
+
+
+def _impedance_data(component, frequency, Z):
+    """Data of an impedance receiver from the complex impedances."""
+    if component == "real":
+        return np.real(Z)
+    elif component == "imag":
+        return np.imag(Z)
+    elif component == "apparent_resistivity":
+        return np.abs(Z) ** 2 / (2 * np.pi * frequency * mu_0)
+    elif component == "phase":
+        return (180.0 / np.pi) * np.arctan(np.imag(Z) / np.real(Z))
+
+
+def _impedance_data_deriv(component, frequency, Z, Z_deriv):
+    """Derivative of the data of an impedance receiver.
+
+    ``Z`` must broadcast against ``Z_deriv``, the derivative of the complex
+    impedances with respect to the model.
+    """
+    if component == "real":
+        return np.real(Z_deriv)
+    elif component == "imag":
+        return np.imag(Z_deriv)
+    elif component == "apparent_resistivity":
+        return (np.pi * frequency * mu_0) ** -1 * (
+            np.real(Z) * np.real(Z_deriv) + np.imag(Z) * np.imag(Z_deriv)
+        )
+    elif component == "phase":
+        C = 180 / np.pi
+        real = np.real(Z)
+        imag = np.imag(Z)
+        bot = real**2 + imag**2
+        d_real_dm = np.real(Z_deriv)
+        d_imag_dm = np.imag(Z_deriv)
+        return C * (-imag / bot * d_real_dm + real / bot * d_imag_dm)
 
 
 class Simulation1DRecursive(BaseSimulation):
@@ -89,6 +248,7 @@ class Simulation1DRecursive(BaseSimulation):
                             f"{type(self).__name__} does not support {type(rx).__name__} receivers, only implemented for 'Impedance'."
                         )
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def fix_Jmatrix(self):
@@ -124,24 +284,7 @@ class Simulation1DRecursive(BaseSimulation):
         Z : (n_freq, ) np.ndarray
             complex impedances at surface
         """
-        frequencies = np.asarray(frequencies)
-        thicknesses = np.asarray(thicknesses)[::-1]
-        sigmas = np.asarray(sigmas)[::-1]
-        omega = 2 * np.pi * frequencies
-        n_layer = len(sigmas)
-
-        # layer quantities
-        alphas = np.sqrt(1j * omega * mu_0 * sigmas[:, None])
-        ratios = alphas / sigmas[:, None]
-        tanhs = np.tanh(alphas[:-1] * thicknesses[:, None])
-
-        Z = -ratios[-1]
-        # Work from lowest layer to top layer
-        for ii in range(n_layer - 2, -1, -1):
-            top = Z / ratios[ii] - tanhs[ii]
-            bot = 1 - Z / ratios[ii] * tanhs[ii]
-            Z = ratios[ii] * top / bot
-        return Z
+        return _recursive_impedances(frequencies, thicknesses, sigmas)
 
     def _get_recursive_impedances_deriv(self, frequencies, thicknesses, sigmas):
         """
@@ -166,54 +309,7 @@ class Simulation1DRecursive(BaseSimulation):
         Z_dsigma : (n_freq, n_layer-1) np.ndarray
             Derivative of complex impedances at surface with respect to thicknesses
         """
-        frequencies = np.asarray(frequencies)
-        thicknesses = np.asarray(thicknesses)[::-1]
-        sigmas = np.asarray(sigmas)[::-1]
-        omega = 2 * np.pi * frequencies
-        n_layer = len(sigmas)
-
-        # Bottom layer quantities
-        alphas = np.sqrt(1j * omega * mu_0 * sigmas[:, None])
-        ratios = alphas / sigmas[:, None]
-        tanhs = np.tanh(alphas[:-1] * thicknesses[:, None])
-
-        tops = np.empty_like(tanhs)
-        bots = np.empty_like(tanhs)
-        Zs = np.empty_like(ratios)
-        Zs[-1] = -ratios[-1]
-        # Work from lowest layer to top layer
-        for ii in range(n_layer - 2, -1, -1):
-            tops[ii] = Zs[ii + 1] / ratios[ii] - tanhs[ii]
-            bots[ii] = 1 - Zs[ii + 1] / ratios[ii] * tanhs[ii]
-            Zs[ii] = ratios[ii] * (tops[ii] / bots[ii])
-
-        gZ = 1.0
-        gratios = np.empty_like(ratios)
-        gtanhs = np.empty_like(tanhs)
-        for ii in range(n_layer - 1):
-            gratios[ii] = (tops[ii] / bots[ii]) * gZ
-            gtop = ratios[ii] / bots[ii] * gZ
-            gbot = -Zs[ii] / bots[ii] * gZ
-
-            gZ = -tanhs[ii] / ratios[ii] * gbot
-            gratios[ii] += Zs[ii + 1] * tanhs[ii] / ratios[ii] ** 2 * gbot
-            gtanhs[ii] = -Zs[ii + 1] / ratios[ii] * gbot
-
-            gZ += gtop / ratios[ii]
-            gratios[ii] -= Zs[ii + 1] / ratios[ii] ** 2 * gtop
-            gtanhs[ii] -= gtop
-        gratios[-1] = -gZ
-        d_thick = (1 - tanhs**2) * alphas[:-1] * gtanhs
-
-        galphas = gratios / sigmas[:, None]
-        galphas[:-1] += (1 - tanhs**2) * thicknesses[:, None] * gtanhs
-
-        d_sigma = -ratios / sigmas[:, None] * gratios
-        d_sigma += (0.5j * omega * mu_0) / alphas * galphas
-
-        # d_mu would be this below when it gets activated:
-        # d_mu = (0.5j * omega * sigmas[:, None]) / alphas * galphas
-        return Zs[0], d_sigma[::-1].T, d_thick[::-1].T
+        return _recursive_impedances_deriv(frequencies, thicknesses, sigmas)
 
     def fields(self, m):
         # The layered simulation does not have fields.
@@ -238,19 +334,7 @@ class Simulation1DRecursive(BaseSimulation):
         for src in self.survey.source_list:
             i_freq = np.searchsorted(self.survey.frequencies, src.frequency)
             for rx in src.receiver_list:
-                if rx.component == "real":
-                    d.append(np.real(Z[i_freq]))
-                elif rx.component == "imag":
-                    d.append(np.imag(Z[i_freq]))
-                elif rx.component == "apparent_resistivity":
-                    d.append(
-                        np.abs(Z[i_freq]) ** 2 / (2 * np.pi * src.frequency * mu_0)
-                    )
-                elif rx.component == "phase":
-                    d.append(
-                        (180.0 / np.pi)
-                        * np.arctan(np.imag(Z[i_freq]) / np.real(Z[i_freq]))
-                    )
+                d.append(_impedance_data(rx.component, src.frequency, Z[i_freq]))
 
         return np.array(d)
 
@@ -284,23 +368,9 @@ class Simulation1DRecursive(BaseSimulation):
             i_freq = np.searchsorted(self.survey.frequencies, src.frequency)
             Js_row = Js[i_freq]
             for rx in src.receiver_list:
-                if rx.component == "real":
-                    Jrows = np.real(Js_row)
-                elif rx.component == "imag":
-                    Jrows = np.imag(Js_row)
-                elif rx.component == "apparent_resistivity":
-                    Jrows = (np.pi * src.frequency * mu_0) ** -1 * (
-                        np.real(Z[i_freq]) * np.real(Js_row)
-                        + np.imag(Z[i_freq]) * np.imag(Js_row)
-                    )
-                elif rx.component == "phase":
-                    C = 180 / np.pi
-                    real = np.real(Z[i_freq])
-                    imag = np.imag(Z[i_freq])
-                    bot = real**2 + imag**2
-                    d_real_dm = np.real(Js_row)
-                    d_imag_dm = np.imag(Js_row)
-                    Jrows = C * (-imag / bot * d_real_dm + real / bot * d_imag_dm)
+                Jrows = _impedance_data_deriv(
+                    rx.component, src.frequency, Z[i_freq], Js_row
+                )
                 end = start + rx.nD
                 J[start:end] = Jrows
                 start = end
@@ -359,3 +429,215 @@ class Simulation1DRecursive(BaseSimulation):
         else:
             toDelete = toDelete + ["_Jmatrix", "_gtgdiag"]
         return toDelete
+
+
+class Simulation1DRecursiveMultiStation(Simulation1DRecursive):
+    r"""Simulation class for 1D MT soundings at many stations at once.
+
+    Each location of the receivers of the survey is a station, with its own
+    layered Earth model. The impedance recursion of
+    :class:`Simulation1DRecursive` is carried for all the stations and
+    frequencies at once, as array operations over a station axis, and so are
+    its analytic sensitivities. As the data of a station only depend on its
+    own layers, the sensitivity matrix is block sparse.
+
+    Parameters
+    ----------
+    survey : simpeg.electromagnetics.frequency_domain.survey.Survey
+        The survey, with :class:`~.receivers.Impedance` receivers.
+    sigma, rho : (n_stations * n_layer) numpy.ndarray, optional
+        Conductivity or resistivity of the layers of every station. The layers
+        of a station are contiguous and start from the bottom, and the stations
+        are ordered as :attr:`station_locations`.
+    sigmaMap, rhoMap : simpeg.maps.IdentityMap, optional
+        Mapping from the model to the conductivity or resistivity.
+    thicknesses : (n_layer - 1) numpy.ndarray
+        Thicknesses of the layers, starting from the bottom, shared by all the
+        stations.
+    fix_Jmatrix : bool, optional
+        Whether to fix the sensitivity matrix.
+    """
+
+    def __init__(
+        self,
+        survey=None,
+        sigma=None,
+        sigmaMap=None,
+        rho=None,
+        rhoMap=None,
+        thicknesses=None,
+        fix_Jmatrix=False,
+        **kwargs,
+    ):
+        if kwargs.get("thicknessesMap", None) is not None:
+            raise NotImplementedError(
+                f"{type(self).__name__} does not support inverting for the layer "
+                "thicknesses."
+            )
+        super().__init__(
+            survey=survey,
+            sigma=sigma,
+            sigmaMap=sigmaMap,
+            rho=rho,
+            rhoMap=rhoMap,
+            thicknesses=thicknesses,
+            fix_Jmatrix=fix_Jmatrix,
+            **kwargs,
+        )
+
+    @Simulation1DRecursive.survey.setter
+    def survey(self, value):
+        Simulation1DRecursive.survey.fset(self, value)
+        self._stations = None
+
+    def _get_stations(self):
+        if getattr(self, "_stations", None) is None:
+            receivers = [
+                (src, rx) for src in self.survey.source_list for rx in src.receiver_list
+            ]
+            locations = np.vstack([rx.locations_e for _, rx in receivers])
+            unique, first, inverse = np.unique(
+                locations, axis=0, return_index=True, return_inverse=True
+            )
+            # number the stations in their order of appearance in the survey
+            order = np.argsort(first)
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            station_index = rank[inverse.reshape(-1)]
+            offsets = np.cumsum([0] + [rx.nD for _, rx in receivers])
+            receiver_stations = [
+                (src, rx, station_index[start:end])
+                for (src, rx), start, end in zip(receivers, offsets[:-1], offsets[1:])
+            ]
+            self._stations = (unique[order], receiver_stations)
+        return self._stations
+
+    @property
+    def station_locations(self):
+        """Locations of the stations, in the order of the model.
+
+        The stations are the unique locations of the receivers, in their
+        order of appearance in the survey.
+
+        Returns
+        -------
+        (n_stations, dim) numpy.ndarray
+        """
+        return self._get_stations()[0]
+
+    @property
+    def n_stations(self):
+        """Number of stations.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.station_locations)
+
+    def _station_sigmas(self):
+        n_layer = len(self.thicknesses) + 1
+        sigma = self.sigma
+        if sigma.size != self.n_stations * n_layer:
+            raise ValueError(
+                f"sigma must have {self.n_stations * n_layer} values, {n_layer} "
+                f"layers for each of the {self.n_stations} stations, got "
+                f"{sigma.size}."
+            )
+        return sigma.reshape(self.n_stations, n_layer)
+
+    def dpred(self, m, f=None):
+        """Compute the data of all the stations.
+
+        Parameters
+        ----------
+        m : (n_param,) numpy.ndarray
+            The model.
+        f : None, optional
+            The layered simulation does not have fields.
+
+        Returns
+        -------
+        (n_data,) numpy.ndarray
+            The predicted data.
+        """
+        self.model = m
+        frequencies = self.survey.frequencies
+        Z = _recursive_impedances(frequencies, self.thicknesses, self._station_sigmas())
+
+        d = []
+        for src, rx, stations in self._get_stations()[1]:
+            i_freq = np.searchsorted(frequencies, src.frequency)
+            d.append(_impedance_data(rx.component, src.frequency, Z[stations, i_freq]))
+        return np.concatenate(d)
+
+    def getJ(self, m, f=None):
+        """Compute and store the sensitivity matrix with respect to the conductivity.
+
+        Each row only has non-zero values for the layers of the station of
+        its datum.
+
+        Parameters
+        ----------
+        m : (n_param,) numpy.ndarray
+            The model.
+        f : None, optional
+            The layered simulation does not have fields.
+
+        Returns
+        -------
+        (n_data, n_stations * n_layer) scipy.sparse.csr_matrix
+            Sensitivity of the data to the conductivity of the layers.
+        """
+        self.model = m
+        if getattr(self, "_Jmatrix", None) is not None:
+            return self._Jmatrix
+
+        frequencies = self.survey.frequencies
+        sigmas = self._station_sigmas()
+        n_layer = sigmas.shape[1]
+        Z, Z_dsigma, _ = _recursive_impedances_deriv(
+            frequencies, self.thicknesses, sigmas
+        )
+
+        rows = []
+        columns = []
+        for src, rx, stations in self._get_stations()[1]:
+            i_freq = np.searchsorted(frequencies, src.frequency)
+            rows.append(
+                _impedance_data_deriv(
+                    rx.component,
+                    src.frequency,
+                    Z[stations, i_freq, None],
+                    Z_dsigma[stations, i_freq],
+                )
+            )
+            columns.append(stations[:, None] * n_layer + np.arange(n_layer))
+        rows = np.concatenate(rows)
+        self._Jmatrix = sp.csr_matrix(
+            (
+                rows.reshape(-1),
+                np.concatenate(columns).reshape(-1),
+                np.arange(0, rows.size + 1, n_layer),
+            ),
+            shape=(self.survey.nD, sigmas.size),
+        )
+        return self._Jmatrix
+
+    def getJtJdiag(self, m, W=None, f=None):
+        if getattr(self, "_gtgdiag", None) is None:
+            J = sp.csr_matrix(self.getJ(m, f=f) @ self.sigmaDeriv)
+            if W is None:
+                W = np.ones(self.survey.nD)
+            else:
+                W = W.diagonal() ** 2
+            self._gtgdiag = np.asarray(J.power(2).T @ W).reshape(-1)
+        return self._gtgdiag
+
+    def Jvec(self, m, v, f=None):
+        J = self.getJ(m, f=None)
+        return J @ (self.sigmaDeriv @ v)
+
+    def Jtvec(self, m, v, f=None):
+        J = self.getJ(m, f=None)
+        return self.sigmaDeriv.T @ (J.T @ v)
@@ -0,0 +1,180 @@
+import numpy as np
+import scipy.sparse as sp
+
+from ... import maps
+from ...meta import MetaSimulation, MultiprocessingMetaSimulation
+from ...props import HasModel
+from ...utils import validate_integer
+from .simulation import Simulation2DElectricField, Simulation2DMagneticField
+from .sources import Planewave
+from .survey import Survey
+
+
+class Simulation2DTETM(MetaSimulation):
+    r"""2D NSEM simulation of both polarizations and all frequencies of a survey.
+
+    The ``xy`` oriented receivers of the survey are simulated with a
+    :class:`Simulation2DElectricField` and the ``yx`` oriented ones with a
+    :class:`Simulation2DMagneticField`, with one simulation per polarization
+    and frequency. The simulations run one after the other, or concurrently
+    on ``n_processes`` worker processes through a
+    :class:`~simpeg.meta.MultiprocessingMetaSimulation`. Each worker keeps
+    its simulations, and the factorizations of their system matrices, between
+    calls to ``fields``, ``Jvec`` and ``Jtvec``.
+
+    The simulations only solve their 1D boundary problems again when the
+    conductivity of the boundary columns changes, and the data of all the
+    simulations are assembled in the data order of ``survey``.
+
+    Parameters
+    ----------
+    mesh : discretize.TensorMesh or discretize.TreeMesh
+        2D mesh on which the model is defined.
+    survey : simpeg.electromagnetics.natural_source.survey.Survey
+        The survey, whose receivers must be ``xy`` or ``yx`` oriented.
+    sigmaMap : simpeg.maps.IdentityMap, optional
+        Mapping from the model to the conductivity on ``mesh``.
+    n_processes : int, optional
+        Number of worker processes. By default the simulations run in the
+        current process. See :class:`~simpeg.meta.MultiprocessingMetaSimulation`
+        for how to use multiprocessing on your operating system, and call
+        :meth:`join` once done with the simulation.
+    **kwargs
+        Passed to each 2D simulation, e.g. ``solver`` or ``solver_opts``.
+    """
+
+    def __init__(self, mesh, survey, sigmaMap=None, n_processes=None, **kwargs):
+        self.mesh = mesh
+        if sigmaMap is None:
+            sigmaMap = maps.IdentityMap(mesh)
+        modes = {
+            "xy": (Simulation2DElectricField, "sigmaMap", sigmaMap),
+            "yx": (
+                Simulation2DMagneticField,
+                "rhoMap",
+                maps.ReciprocalMap() * sigmaMap,
+            ),
+        }
+        for src in survey.source_list:
+            for rx in src.receiver_list:
+                if getattr(rx, "orientation", None) not in modes:
+                    raise TypeError(
+                        f"{type(self).__name__} only supports xy and yx oriented "
+                        f"receivers, got {type(rx).__name__} with orientation "
+                        f"{getattr(rx, 'orientation', None)!r}."
+                    )
+
+        survey_slices = survey.get_all_slices()
+        data_order = []
+        simulations = []
+        mappings = []
+        for orientation, (simulation_class, map_name, mapping) in modes.items():
+            for frequency in survey.frequencies:
+                # new sources, holding the receivers of this polarization only
+                source_list = []
+                for src in survey.get_sources_by_frequency(frequency):
+                    receiver_list = [
+                        rx for rx in src.receiver_list if rx.orientation == orientation
+                    ]
+                    if not receiver_list:
+                        continue
+                    source_list.append(Planewave(receiver_list, frequency))
+                    data_order += [
+                        np.arange(survey.nD)[survey_slices[src, rx]]
+                        for rx in receiver_list
+                    ]
+                if not source_list:
+                    continue
+                simulations.append(
+                    simulation_class(
+                        mesh,
+                        survey=Survey(source_list),
+                        **{map_name: maps.IdentityMap(nP=mesh.n_cells)},
+                        **kwargs,
+                    )
+                )
+                mappings.append(mapping)
+
+        self.simulations = simulations
+        self.mappings = mappings
+        self._pool = None
+        self.model = None
+        self.survey = survey
+        self._data_order = np.concatenate(data_order)
+        self._data_offsets = np.cumsum(np.r_[0, [sim.survey.nD for sim in simulations]])
+        if n_processes is not None:
+            n_processes = validate_integer("n_processes", n_processes, min_val=1)
+            self._pool = MultiprocessingMetaSimulation(
+                simulations, mappings, n_processes=n_processes
+            )
+
+    @property
+    def mesh(self):
+        """Mesh on which the model is defined.
+
+        Returns
+        -------
+        discretize.base.BaseMesh
+        """
+        return self._mesh
+
+    @mesh.setter
+    def mesh(self, value):
+        self._mesh = value
+
+    @MetaSimulation.model.setter
+    def model(self, value):
+        if getattr(self, "_pool", None) is None:
+            MetaSimulation.model.fset(self, value)
+        else:
+            # the simulations of the workers receive the model
+            HasModel.model.fset(self, value)
+            self._pool.model = self._model
+
+    def _run(self, method, *args, **kwargs):
+        if self._pool is None:
+            return getattr(MetaSimulation, method)(self, *args, **kwargs)
+        return getattr(self._pool, method)(*args, **kwargs)
+
+    def _to_survey_order(self, d):
+        out = np.empty_like(d)
+        out[self._data_order] = d
+        return out
+
+    def fields(self, m):
+        self.model = m
+        return self._run("fields", m)
+
+    def dpred(self, m=None, f=None):
+        if m is not None:
+            self.model = m
+        return self._to_survey_order(self._run("dpred", m=m, f=f))
+
+    def Jvec(self, m, v, f=None):
+        self.model = m
+        return self._to_survey_order(self._run("Jvec", m, v, f=f))
+
+    def Jtvec(self, m, v, f=None):
+        self.model = m
+        return self._run("Jtvec", m, v[self._data_order], f=f)
+
+    def getJtJdiag(self, m, W=None, f=None):
+        self.model = m
+        if W is not None:
+            try:
+                W = W.diagonal()
+            except (AttributeError, TypeError, ValueError):
+                pass
+            W = sp.diags(np.asarray(W)[self._data_order])
+        return self._run("getJtJdiag", m, W=W, f=f)
+
+    def join(self, timeout=None):
+        """Stop the worker processes, if any.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Passed to :meth:`multiprocessing.Process.join`.
+        """
+        if self._pool is not None:
+            self._pool.join(timeout=timeout)
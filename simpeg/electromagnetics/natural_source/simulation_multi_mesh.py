@@ -0,0 +1,224 @@
+import numpy as np
+from discretize.utils import volume_average
+
+from ... import maps
+from ...meta import MetaSimulation
+from ...utils import validate_float, validate_integer, validate_type
+from .simulation import Simulation3DPrimarySecondary
+from .sources import PlanewaveXYPrimary
+from .survey import Survey
+from .utils.mesh_utils import frequency_band_mesh
+
+
+class Simulation3DPrimarySecondaryMultiMesh(MetaSimulation):
+    r"""3D NSEM simulation solving each frequency band on its own mesh.
+
+    A single mesh for all the frequencies must be fine enough for the skin
+    depth of the highest frequency and large enough for the lowest one. This
+    simulation splits the frequencies of the survey into bands, and solves
+    each band with a :class:`Simulation3DPrimarySecondary` on a TreeMesh
+    designed for it by
+    :func:`~simpeg.electromagnetics.natural_source.utils.mesh_utils.frequency_band_mesh`:
+    cells as fine as the model near the receivers, which grow away from them
+    faster for the high frequencies, over an extent that shrinks with the
+    skin depths of the band.
+
+    The conductivity on the model mesh is volume averaged onto the mesh of
+    each band, and the data and sensitivities of the bands are assembled in
+    the order of the data of ``survey``.
+
+    Parameters
+    ----------
+    mesh : discretize.TensorMesh or discretize.TreeMesh
+        Mesh on which the model is defined.
+    survey : simpeg.electromagnetics.natural_source.survey.Survey
+        The survey, whose sources must be
+        :class:`~simpeg.electromagnetics.natural_source.sources.PlanewaveXYPrimary`.
+    sigmaPrimary : (mesh.n_cells) numpy.ndarray
+        Background conductivity on ``mesh``, used for the primary fields.
+    sigmaMap : simpeg.maps.IdentityMap, optional
+        Mapping from the model to the conductivity on ``mesh``.
+    n_bands : int, optional
+        Number of frequency bands. Each band holds about the same number of
+        frequencies.
+    band_meshes : list of discretize.base.BaseMesh, optional
+        Meshes of the bands, from the lowest to the highest frequencies. If
+        given, ``n_bands`` is the number of meshes and no mesh is designed.
+    sigma_background : float, optional
+        Conductivity used for the skin depths when designing the meshes.
+        Defaults to the largest value of ``sigmaPrimary``, which gives the
+        smallest skin depths.
+    padding_skin_depths : float, optional
+        Distance between the receivers and the boundaries of the mesh of
+        each band, in skin depths of its lowest frequency.
+    depth_skin_depths : float, optional
+        Depth of the finest cells below the receivers in the mesh of each
+        band, in skin depths of its highest frequency.
+    **kwargs
+        Passed to the :class:`Simulation3DPrimarySecondary` of each band,
+        e.g. ``solver`` or ``solver_opts``.
+    """
+
+    def __init__(
+        self,
+        mesh,
+        survey,
+        sigmaPrimary,
+        sigmaMap=None,
+        n_bands=3,
+        band_meshes=None,
+        sigma_background=None,
+        padding_skin_depths=2.0,
+        depth_skin_depths=1.0,
+        **kwargs,
+    ):
+        self.mesh = mesh
+        sigmaPrimary = np.asarray(sigmaPrimary, dtype=float)
+        if sigmaPrimary.shape != (mesh.n_cells,):
+            raise ValueError(
+                f"sigmaPrimary must have {mesh.n_cells} values, one per cell of "
+                f"the mesh, got an array of shape {sigmaPrimary.shape}."
+            )
+        if sigmaMap is None:
+            sigmaMap = maps.IdentityMap(mesh)
+        for src in survey.source_list:
+            if not isinstance(src, PlanewaveXYPrimary):
+                raise TypeError(
+                    f"{type(self).__name__} requires PlanewaveXYPrimary sources, "
+                    f"got {type(src).__name__}."
+                )
+
+        if band_meshes is not None:
+            n_bands = len(band_meshes)
+        n_bands = validate_integer("n_bands", n_bands, min_val=1)
+        frequencies = np.asarray(survey.frequencies, dtype=float)
+        bands = np.array_split(np.sort(frequencies), min(n_bands, len(frequencies)))
+        if band_meshes is not None and len(bands) != len(band_meshes):
+            raise ValueError(
+                f"{len(band_meshes)} band meshes were given for {len(bands)} "
+                "frequencies, a band needs at least one frequency."
+            )
+        if sigma_background is None:
+            sigma_background = sigmaPrimary.max()
+        sigma_background = validate_float(
+            "sigma_background", sigma_background, min_val=0.0, inclusive_min=False
+        )
+
+        receiver_locations = np.vstack(
+            [
+                (
+                    np.vstack(rx.locations)
+                    if isinstance(rx.locations, tuple)
+                    else rx.locations
+                )
+                for src in survey.source_list
+                for rx in src.receiver_list
+            ]
+        )
+        survey_slices = survey.get_all_slices()
+        data_order = []
+        simulations = []
+        mappings = []
+        for i, band in enumerate(bands):
+            if band_meshes is None:
+                band_mesh = frequency_band_mesh(
+                    mesh,
+                    receiver_locations,
+                    band,
+                    sigma_background,
+                    padding_skin_depths=padding_skin_depths,
+                    depth_skin_depths=depth_skin_depths,
+                )
+            else:
+                band_mesh = band_meshes[i]
+            # new sources, as the primary fields are cached on the sources
+            source_list = []
+            for src in survey.source_list:
+                if src.frequency in band:
+                    source_list.append(
+                        PlanewaveXYPrimary(src.receiver_list, src.frequency)
+                    )
+                    data_order += [
+                        np.arange(survey.nD)[survey_slices[src, rx]]
+                        for rx in src.receiver_list
+                    ]
+            averaging = volume_average(mesh, band_mesh)
+            simulations.append(
+                Simulation3DPrimarySecondary(
+                    band_mesh,
+                    survey=Survey(source_list),
+                    sigmaPrimary=averaging @ sigmaPrimary,
+                    sigmaMap=maps.IdentityMap(nP=band_mesh.n_cells),
+                    **kwargs,
+                )
+            )
+            mappings.append(maps.LinearMap(averaging) * sigmaMap)
+
+        self.simulations = simulations
+        self.mappings = mappings
+        self.model = None
+        self.survey = survey
+        self.bands = bands
+        self._data_order = np.concatenate(data_order)
+        self._data_offsets = np.cumsum(np.r_[0, [sim.survey.nD for sim in simulations]])
+
+    @property
+    def mesh(self):
+        """Mesh on which the model is defined.
+
+        Returns
+        -------
+        discretize.base.BaseMesh
+        """
+        return self._mesh
+
+    @mesh.setter
+    def mesh(self, value):
+        self._mesh = value
+
+    @property
+    def bands(self):
+        """Frequencies of each band, from the lowest to the highest.
+
+        Returns
+        -------
+        list of numpy.ndarray
+        """
+        return self._bands
+
+    @bands.setter
+    def bands(self, value):
+        self._bands = validate_type("bands", value, list, cast=False)
+
+    @property
+    def band_meshes(self):
+        """Meshes of the bands, from the lowest to the highest frequencies.
+
+        Returns
+        -------
+        list of discretize.base.BaseMesh
+        """
+        return [sim.mesh for sim in self.simulations]
+
+    def _to_survey_order(self, d):
+        out = np.empty_like(d)
+        out[self._data_order] = d
+        return out
+
+    def dpred(self, m=None, f=None):
+        return self._to_survey_order(super().dpred(m=m, f=f))
+
+    def Jvec(self, m, v, f=None):
+        return self._to_survey_order(super().Jvec(m, v, f=f))
+
+    def Jtvec(self, m, v, f=None):
+        return super().Jtvec(m, v[self._data_order], f=f)
+
+    def getJtJdiag(self, m, W=None, f=None):
+        if W is not None:
+            try:
+                W = W.diagonal()
+            except (AttributeError, TypeError, ValueError):
+                pass
+            W = np.asarray(W)[self._data_order]
+        return super().getJtJdiag(m, W=W, f=f)
@@ -21,6 +21,7 @@ from .data_utils import (
     resample_data,
     extract_data_info,
 )
+from .mesh_utils import frequency_band_mesh
 from .edi_files_utils import EDIimporter, _findLatLong, _findLine, _findEDIcomp
 from .test_utils import (
     getAppResPhs,
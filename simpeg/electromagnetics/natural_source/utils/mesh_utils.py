@@ -0,0 +1,113 @@
+import numpy as np
+from discretize import TreeMesh
+
+from .data_utils import skindepth
+
+
+def frequency_band_mesh(
+    mesh,
+    receiver_locations,
+    frequencies,
+    sigma_background,
+    padding_skin_depths=2.0,
+    depth_skin_depths=1.0,
+    padding_cells=2,
+):
+    """Design a TreeMesh to simulate a band of frequencies.
+
+    The finest cells of the band mesh have the smallest widths of the cells of
+    ``mesh`` along each axis, and their nodes are aligned on the nodes of
+    ``mesh`` closest to the receivers, so the model is resolved near the
+    receivers as well as on ``mesh``. They fill a box around the receivers
+    that goes ``depth_skin_depths`` skin depths of the highest frequency below
+    them, and the cells double in size every ``padding_cells`` cells away
+    from this box. The mesh extends ``padding_skin_depths`` skin depths of the
+    lowest frequency around the receivers, without going beyond ``mesh``.
+
+    Parameters
+    ----------
+    mesh : discretize.TensorMesh or discretize.TreeMesh
+        Mesh on which the model is defined.
+    receiver_locations : (n_loc, 3) numpy.ndarray
+        Locations of the receivers.
+    frequencies : array_like of float
+        Frequencies of the band.
+    sigma_background : float
+        Conductivity used to compute the skin depths.
+    padding_skin_depths : float, optional
+        Distance between the receivers and the boundaries of the mesh, in
+        skin depths of the lowest frequency.
+    depth_skin_depths : float, optional
+        Depth of the finest cells below the receivers, in skin depths of the
+        highest frequency.
+    padding_cells : int, optional
+        Number of cells of each refinement level around the finest cells.
+
+    Returns
+    -------
+    discretize.TreeMesh
+        Mesh of the band.
+    """
+    frequencies = np.atleast_1d(frequencies)
+    receiver_locations = np.atleast_2d(receiver_locations)
+    rho = 1.0 / sigma_background
+    skin_depth_min = skindepth(rho, frequencies.max())
+    skin_depth_max = skindepth(rho, frequencies.min())
+
+    padding = padding_skin_depths * skin_depth_max
+    lower = receiver_locations.min(axis=0) - padding
+    upper = receiver_locations.max(axis=0) + padding
+    # the surface below the receivers, or their center horizontally
+    anchors = np.r_[(lower[:2] + upper[:2]) / 2, receiver_locations[:, 2].max()]
+
+    widths = []
+    origin = []
+    for axis in range(3):
+        nodes = mesh.nodes_x, mesh.nodes_y, mesh.nodes_z
+        n_cells, axis_origin = _aligned_axis(
+            nodes[axis], mesh.h[axis].min(), lower[axis], upper[axis], anchors[axis]
+        )
+        widths.append(np.full(n_cells, mesh.h[axis].min()))
+        origin.append(axis_origin)
+
+    band_mesh = TreeMesh(widths, origin=origin, diagonal_balance=True)
+    below = receiver_locations - [0.0, 0.0, depth_skin_depths * skin_depth_min]
+    band_mesh.refine_bounding_box(
+        np.vstack([receiver_locations, below]),
+        padding_cells_by_level=padding_cells,
+        finalize=True,
+    )
+    return band_mesh
+
+
+def _aligned_axis(nodes, width, lower, upper, anchor):
+    """Number of cells and origin of an axis of a band mesh.
+
+    The axis has a power of two of cells of ``width``, within ``nodes``. Its
+    nodes go through the node of ``nodes`` closest to ``anchor``, which is a
+    node of as many coarse levels of the tree as possible, and the axis covers
+    as much of ``[lower, upper]`` as possible.
+    """
+    node = nodes[np.argmin(np.abs(nodes - anchor))]
+    n_fit = 2 ** np.floor(np.log2(max((nodes[-1] - nodes[0]) / width, 2)))
+    n_cells = int(min(2 ** np.ceil(np.log2(max((upper - lower) / width, 2))), n_fit))
+
+    # number of cells between the origin and the node, keeping the axis in nodes
+    shifts = np.arange(
+        np.ceil((node - nodes[-1]) / width + n_cells - 1e-6),
+        np.floor((node - nodes[0]) / width + 1e-6) + 1,
+    ).astype(int)
+    shifts = shifts[(shifts >= 0) & (shifts <= n_cells)]
+    # level of the coarsest cells that have the node on their boundaries
+    levels = np.array(
+        [
+            (int(shift) & -int(shift)).bit_length() if 0 < shift < n_cells else 0
+            for shift in shifts
+        ]
+    )
+    # part of [lower, upper] outside of the axis
+    outside = np.maximum(node - shifts * width - lower, 0.0) + np.maximum(
+        upper - (node + (n_cells - shifts) * width), 0.0
+    )
+    shift = shifts[np.lexsort((-levels, np.round(outside / width, 6)))[0]]
+    return n_cells, node - shift * width
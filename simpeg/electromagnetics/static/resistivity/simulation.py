@@ -14,6 +14,7 @@ from .survey import Survey
 from .fields import Fields3DCellCentered, Fields3DNodal
 from .utils import _mini_pole_pole
 from discretize.utils import make_boundary_bool
+from ....utils.cache_utils import discard_cached_items
 
 
 class BaseDCSimulation(BaseElectricalPDESimulation):
@@ -60,6 +61,7 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
         if value is not None:
             value = validate_type("survey", value, Survey, cast=False)
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def storeJ(self):
@@ -101,10 +103,8 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
             self.model = m
 
         f = self.fieldsPair(self)
-        if self.Ainv is not None:
-            self.Ainv.clean()
         A = self.getA()
-        self.Ainv = self.solver(A, **self.solver_opts)
+        self.Ainv = self._factor_system("A", A, previous=self.Ainv)
         RHS = self.getRHS()
 
         f[:, self._solutionType] = self.Ainv * RHS
@@ -349,6 +349,11 @@ class Simulation3DCellCentered(BaseDCSimulation):
         self._bc_type = validate_string(
             "bc_type", value, ["Dirichlet", "Neumann", ("Robin", "Mixed")]
         )
+        # The system is symmetric positive definite, except when its first
+        # row is replaced to remove the null space of the Neumann conditions
+        spd = self._bc_type != "Neumann"
+        self.solver_opts["is_symmetric"] = spd
+        self.solver_opts["is_positive_definite"] = spd
 
     def getA(self, resistivity=None):
         """
@@ -517,6 +522,11 @@ class Simulation3DNodal(BaseDCSimulation):
         self._bc_type = validate_string(
             "bc_type", value, ["Neumann", ("Robin", "Mixed")]
         )
+        # The system is symmetric positive definite, except when its first
+        # row is replaced to remove the null space of the Neumann conditions
+        spd = self._bc_type != "Neumann"
+        self.solver_opts["is_symmetric"] = spd
+        self.solver_opts["is_positive_definite"] = spd
 
     def getA(self, resistivity=None):
         """
@@ -570,9 +580,11 @@ class Simulation3DNodal(BaseDCSimulation):
                 if v.ndim > 1:
                     u = u[:, None]
                 if not adjoint:
-                    out += u * (self._MBC_sigma @ v)
+                    bc_term = u * (self._MBC_sigma @ v)
                 else:
-                    out += self._MBC_sigma.T @ (u * v)
+                    bc_term = self._MBC_sigma.T @ (u * v)
+                # MeSigmaDeriv drops the column axis of single column inputs
+                out += bc_term.reshape(out.shape)
         return out
 
     def setBC(self):
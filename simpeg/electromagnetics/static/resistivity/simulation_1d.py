@@ -11,6 +11,7 @@ from .survey import Survey
 
 from ....utils import validate_type, validate_string
 from scipy.interpolate import InterpolatedUnivariateSpline as iuSpline
+from ....utils.cache_utils import discard_cached_items
 
 HANKEL_FILTERS = {}
 for filter_name in libdlf.hankel.__all__:
@@ -170,6 +171,7 @@ class Simulation1DLayers(BaseSimulation):
         if value is not None:
             value = validate_type("survey", value, Survey, cast=False)
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def storeJ(self):
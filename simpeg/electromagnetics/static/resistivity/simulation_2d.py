@@ -22,6 +22,7 @@ from .utils import _mini_pole_pole
 from scipy.special import k0e, k1e, k0
 from discretize.utils import make_boundary_bool
 import discretize.base
+from ....utils.cache_utils import discard_cached_items
 
 
 class BaseDCSimulation2D(BaseElectricalPDESimulation):
@@ -155,6 +156,7 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
         if value is not None:
             value = validate_type("survey", value, Survey, cast=False)
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def nky(self):
@@ -224,17 +226,12 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
             print(">> Compute fields")
         if m is not None:
             self.model = m
-        if self.Ainv[0] is not None:
-            for i in range(self.nky):
-                self.Ainv[i].clean()
         f = self.fieldsPair(self)
         kys = self._quad_points
         f._quad_weights = self._quad_weights
         for iky, ky in enumerate(kys):
             A = self.getA(ky)
-            if self.Ainv[iky] is not None:
-                self.Ainv[iky].clean()
-            self.Ainv[iky] = self.solver(A, **self.solver_opts)
+            self.Ainv[iky] = self._factor_system(("A", iky), A, previous=self.Ainv[iky])
             RHS = self.getRHS(ky)
             u = self.Ainv[iky] * RHS
             f[:, self._solutionType, iky] = u
@@ -493,6 +490,8 @@ class Simulation2DCellCentered(BaseDCSimulation2D):
         V = sdiag(self.mesh.cell_volumes)
         self.Div = V @ self.mesh.face_divergence
         self.Grad = self.Div.T
+        self.solver_opts["is_symmetric"] = True
+        self.solver_opts["is_positive_definite"] = True
         self.bc_type = bc_type
 
     @property
@@ -13,6 +13,7 @@ from ..induced_polarization import (
 )
 from ..induced_polarization import Simulation3DNodal as BaseSimulation3DNodal
 from .survey import Survey
+from ....utils.cache_utils import discard_cached_items
 
 
 class BaseSIPSimulation(BaseIPSimulation):
@@ -75,6 +76,7 @@ class BaseSIPSimulation(BaseIPSimulation):
         if value is not None:
             value = validate_type("survey", value, Survey, cast=False)
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def actinds(self):
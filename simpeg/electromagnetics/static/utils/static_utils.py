@@ -1,5 +1,7 @@
 import numpy as np
+import scipy.sparse as sp
 from scipy.interpolate import LinearNDInterpolator, interp1d
+from scipy.sparse.csgraph import connected_components
 from scipy.spatial import cKDTree
 import discretize
 import matplotlib.pyplot as plt
@@ -957,10 +959,18 @@ def generate_survey_from_abmn_locations(
     locations_n=None,
     data_type=None,
     output_sorting=False,
+    tolerance=1e-3,
 ):
     """
     Use A, B, M and N electrode locations to construct a 2D or 3D DC/IP survey.
 
+    Rows sharing the same A and B electrode locations are grouped into a single
+    source. Locations are quantized to ``tolerance`` and grouped in a single
+    pass, so the cost grows with the number of rows rather than with the product
+    of the number of rows and sources. Sources are ordered by their first
+    appearance in the rows; within a source, pole receivers come before dipole
+    receivers.
+
     Parameters
     ----------
     locations_a : numpy.array
@@ -981,6 +991,8 @@ def generate_survey_from_abmn_locations(
         If False, the function will output a simpeg.electromagnetic.static.survey.Survey object.
         If True, the function will output a tuple containing the survey object and a numpy array
         (n,) that will sort the data vector to match the order of the electrodes in the survey.
+    tolerance : float, optional
+        Distance below which electrode locations are considered equal.
 
 
     Returns
@@ -1018,63 +1030,36 @@ def generate_survey_from_abmn_locations(
             "Arrays containing A, B, M and N electrode locations must be same shape."
         )
 
-    # Set up keeping track of sorting of rows and unique sources
-    n_rows = np.shape(locations_a)[0]
-    k = np.arange(0, n_rows)
-    out_indices = []
-    unique_ab, ab_index = np.unique(
-        np.c_[locations_a, locations_b], axis=0, return_index=True
+    # Group the rows by their quantized A and B locations, then merge the
+    # groups whose locations are within the tolerance across a rounding boundary
+    n_rows = len(locations_a)
+    ab_keys = np.round(np.c_[locations_a, locations_b] / tolerance).astype(np.int64)
+    _, first_rows, inverse = np.unique(
+        ab_keys, axis=0, return_index=True, return_inverse=True
+    )
+    groups = _merge_close_locations(
+        locations_a.reshape(n_rows, -1)[first_rows],
+        locations_b.reshape(n_rows, -1)[first_rows],
+        tolerance,
+    )
+    # Number the sources in order of first appearance
+    group_first_rows = np.full(groups.max() + 1, n_rows)
+    np.minimum.at(group_first_rows, groups, first_rows)
+    source_index = np.empty(len(group_first_rows), dtype=int)
+    source_index[np.argsort(group_first_rows)] = np.arange(len(group_first_rows))
+    source_index = source_index[groups[inverse.reshape(-1)]]
+
+    survey, out_indices = _survey_from_source_index(
+        source_index,
+        locations_a,
+        locations_b,
+        locations_m,
+        locations_n,
+        data_type=data_type,
+        tolerance=tolerance,
     )
-    ab_index = np.sort(ab_index)
-
-    # Loop over all unique source locations
-    source_list = []
-    for ind in ab_index:
-        # Get source location
-        src_loc_a = mkvc(locations_a[ind, :])
-        src_loc_b = mkvc(locations_b[ind, :])
-
-        # Get receiver locations
-        rx_index = np.where(
-            (
-                (np.sqrt(np.sum((locations_a - src_loc_a) ** 2, axis=1)) < 1e-3)
-                & (np.sqrt(np.sum((locations_b - src_loc_b) ** 2, axis=1)) < 1e-3)
-            )
-        )[0]
-
-        rx_loc_m = locations_m[rx_index, :]
-        rx_loc_n = locations_n[rx_index, :]
-
-        # Extract pole and dipole receivers
-        k_ii = k[rx_index]
-        is_pole_rx = np.all(np.isclose(rx_loc_m, rx_loc_n, atol=1e-3), axis=1)
-        rx_list = []
-
-        if any(is_pole_rx):
-            rx_list += [dc.receivers.Pole(rx_loc_m[is_pole_rx, :], data_type=data_type)]
-            out_indices.append(k_ii[is_pole_rx])
-
-        if any(~is_pole_rx):
-            rx_list += [
-                dc.receivers.Dipole(
-                    rx_loc_m[~is_pole_rx, :],
-                    rx_loc_n[~is_pole_rx, :],
-                    data_type=data_type,
-                )
-            ]
-            out_indices.append(k_ii[~is_pole_rx])
-
-        # Define Pole or Dipole Sources
-        if np.all(np.isclose(src_loc_a, src_loc_b, atol=1e-3)):
-            source_list.append(dc.sources.Pole(rx_list, src_loc_a))
-        else:
-            source_list.append(dc.sources.Dipole(rx_list, src_loc_a, src_loc_b))
-
-    # Create outputs
-    out_indices = np.hstack(out_indices)
-    survey = dc.survey.Survey(source_list)
 
-    if any(k != out_indices):
+    if np.any(out_indices != np.arange(len(out_indices))):
         warnings.warn(
             "Ordering of ABMN locations changed when generating survey. "
             "Associated data vectors will need sorting. Set output_sorting to "
@@ -1088,6 +1073,105 @@ def generate_survey_from_abmn_locations(
         return survey
 
 
+def _merge_close_locations(locations_a, locations_b, tolerance):
+    """Label the pairs of A and B locations that are within the tolerance.
+
+    Pairs are connected when both their A and their B locations are closer
+    than ``tolerance``, and the connected pairs get the same label.
+
+    Parameters
+    ----------
+    locations_a, locations_b : (n, dim) numpy.ndarray
+        A and B electrode locations.
+    tolerance : float
+        Distance below which electrode locations are considered equal.
+
+    Returns
+    -------
+    (n,) numpy.ndarray of int
+        Label of each pair of locations, from 0 to the number of labels.
+    """
+    n = len(locations_a)
+    tree = cKDTree(np.c_[locations_a, locations_b])
+    # both distances are below the tolerance only if the joint one is below
+    # sqrt(2) times the tolerance
+    pairs = tree.query_pairs(np.sqrt(2) * tolerance, output_type="ndarray")
+    i, j = pairs.T
+    close = (np.linalg.norm(locations_a[i] - locations_a[j], axis=1) < tolerance) & (
+        np.linalg.norm(locations_b[i] - locations_b[j], axis=1) < tolerance
+    )
+    graph = sp.coo_matrix((np.ones(close.sum()), (i[close], j[close])), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def _survey_from_source_index(
+    source_index,
+    locations_a,
+    locations_b,
+    locations_m,
+    locations_n,
+    data_type,
+    tolerance=1e-3,
+):
+    """Build a DC survey from rows already assigned to sources.
+
+    Parameters
+    ----------
+    source_index : (n,) numpy.ndarray of int
+        Index of the source of each row, numbered from 0 without gaps.
+    locations_a, locations_b, locations_m, locations_n : (n, dim) numpy.ndarray
+        A, B, M and N electrode locations of each row.
+    data_type : str
+        Data type of the receivers.
+    tolerance : float, optional
+        Distance below which electrode locations are considered equal.
+
+    Returns
+    -------
+    simpeg.electromagnetics.static.resistivity.survey.Survey
+        The survey, with one source per index.
+    (n,) numpy.ndarray of int
+        Rows in the order of the data of the survey.
+    """
+    is_pole_rx = np.all(np.isclose(locations_m, locations_n, atol=tolerance), axis=1)
+    is_pole_src = np.all(np.isclose(locations_a, locations_b, atol=tolerance), axis=1)
+
+    # Sort by source, pole receivers first, keeping the order of the rows
+    keys = 2 * source_index + ~is_pole_rx
+    sort_index = np.argsort(keys, kind="stable")
+    keys = keys[sort_index]
+    starts = np.r_[0, np.flatnonzero(np.diff(keys)) + 1]
+    ends = np.r_[starts[1:], len(keys)]
+    _, first_rows = np.unique(source_index, return_index=True)
+
+    source_list = []
+    rx_list = []
+    for start, end in zip(starts, ends):
+        rows = sort_index[start:end]
+        if keys[start] % 2 == 0:
+            rx_list.append(dc.receivers.Pole(locations_m[rows], data_type=data_type))
+        else:
+            rx_list.append(
+                dc.receivers.Dipole(
+                    locations_m[rows], locations_n[rows], data_type=data_type
+                )
+            )
+
+        # Close the source once all its receivers are built
+        if end == len(keys) or keys[end] // 2 != keys[start] // 2:
+            row = first_rows[keys[start] // 2]
+            if is_pole_src[row]:
+                source_list.append(dc.sources.Pole(rx_list, locations_a[row]))
+            else:
+                source_list.append(
+                    dc.sources.Dipole(rx_list, locations_a[row], locations_b[row])
+                )
+            rx_list = []
+
+    return dc.survey.Survey(source_list), sort_index
+
+
 def generate_dcip_survey(endl, survey_type, a, b, n, dim=3, **kwargs):
     """
     Load in endpoints and survey specifications to generate Tx, Rx location
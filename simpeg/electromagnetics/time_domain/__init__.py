@@ -30,6 +30,7 @@ Simulations
   :toctree: generated/
 
   Simulation1DLayered
+  Simulation1DLayeredStitched
   Simulation3DMagneticFluxDensity
   Simulation3DElectricField
   Simulation3DMagneticField
@@ -81,6 +82,7 @@ Surveys
   :toctree: generated/
 
   survey.Survey
+  survey.ArraySurvey
 
 Fields
 ======
@@ -115,13 +117,14 @@ from .simulation import (
     Simulation3DCurrentDensity,
 )
 from .simulation_1d import Simulation1DLayered
+from .simulation_1d_stitched import Simulation1DLayeredStitched
 from .fields import (
     Fields3DMagneticFluxDensity,
     Fields3DElectricField,
     Fields3DMagneticField,
     Fields3DCurrentDensity,
 )
-from .survey import Survey
+from .survey import Survey, ArraySurvey
 from . import sources
 from . import receivers
 
@@ -852,7 +852,7 @@ class Fields3DCurrentDensity(FieldsTDEM):
         )
 
     def _dbdt(self, jSolution, source_list, tInd):
-        dhdt = mkvc(self._dhdt(jSolution, source_list, tInd))
+        dhdt = self._dhdt(jSolution, source_list, tInd)
         return self.simulation.MeI * (self.simulation.MeMu * dhdt)
 
     def _dbdtDeriv_u(self, tInd, src, dun_dm_v, adjoint=False):
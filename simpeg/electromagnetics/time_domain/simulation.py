@@ -13,6 +13,7 @@ from .fields import (
     FieldsDerivativesEB,
     FieldsDerivativesHJ,
 )
+from ...utils.cache_utils import discard_cached_items
 
 
 class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
@@ -78,6 +79,7 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         if value is not None:
             value = validate_type("survey", value, Survey, cast=False)
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def dt_threshold(self):
@@ -117,8 +119,10 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
 
         f = self.fieldsPair(self)
 
-        # set initial fields
-        f[:, self._fieldType + "Solution", 0] = self.getInitialFields()
+        # set initial fields, the previous solution is kept in double precision
+        # in case the fields are stored in single precision
+        sol = self.getInitialFields()
+        f[:, self._fieldType + "Solution", 0] = sol
 
         if self.verbose:
             print("{}\nCalculating fields(m)\n{}".format("*" * 50, "*" * 50))
@@ -128,17 +132,13 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         for tInd, dt in enumerate(self.time_steps):
             # keep factors if dt is the same as previous step b/c A will be the
             # same
-            if Ainv is not None and (
+            if Ainv is None or (
                 tInd > 0 and abs(dt - self.time_steps[tInd - 1]) > self.dt_threshold
             ):
-                Ainv.clean()
-                Ainv = None
-
-            if Ainv is None:
                 A = self.getAdiag(tInd)
                 if self.verbose:
                     print("Factoring...   (dt = {:e})".format(dt))
-                Ainv = self.solver(A, **self.solver_opts)
+                Ainv = self._factor_system("Adiag", A, previous=Ainv)
                 if self.verbose:
                     print("Done")
 
@@ -149,7 +149,7 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
                 print("    Solving...   (tInd = {:d})".format(tInd + 1))
 
             # taking a step
-            sol = Ainv * (rhs - Asubdiag * f[:, (self._fieldType + "Solution"), tInd])
+            sol = Ainv * (rhs - Asubdiag * sol)
 
             if self.verbose:
                 print("    Done...")
@@ -229,17 +229,18 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         for tInd, dt in zip(range(self.nT), self.time_steps):
             # keep factors if dt is the same as previous step b/c A will be the
             # same
-            if Adiaginv is not None and (tInd > 0 and dt != self.time_steps[tInd - 1]):
-                Adiaginv.clean()
-                Adiaginv = None
-
-            if Adiaginv is None:
+            if Adiaginv is None or (tInd > 0 and dt != self.time_steps[tInd - 1]):
                 A = self.getAdiag(tInd)
-                Adiaginv = self.solver(A, **self.solver_opts)
+                Adiaginv = self._factor_system("Adiag", A, previous=Adiaginv)
 
             Asubdiag = self.getAsubdiag(tInd)
 
-            for i, src in enumerate(self.survey.source_list):
+            # read the fields of the next source while stepping this one
+            sources = self.survey.source_list
+            fields_n = zip(
+                f.stream(sources, ftype, tInd), f.stream(sources, ftype, tInd + 1)
+            )
+            for i, (src, (u_src, un_src)) in enumerate(zip(sources, fields_n)):
                 # here, we are lagging by a timestep, so filling in as we go
                 for projField in set([rx.projField for rx in src.receiver_list]):
                     df_dmFun = getattr(f, "_%sDeriv" % projField, None)
@@ -251,14 +252,12 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
                         tInd, src, dun_dm_v[:, i], v
                     )
 
-                un_src = f[src, ftype, tInd + 1]
-
                 # cell centered on time mesh
                 dA_dm_v = self.getAdiagDeriv(tInd, un_src, v)
                 # on nodes of time mesh
                 dRHS_dm_v = self.getRHSDeriv(tInd + 1, src, v)
 
-                dAsubdiag_dm_v = self.getAsubdiagDeriv(tInd, f[src, ftype, tInd], v)
+                dAsubdiag_dm_v = self.getAsubdiagDeriv(tInd, u_src, v)
 
                 JRHS = dRHS_dm_v - dAsubdiag_dm_v - dA_dm_v
 
@@ -382,27 +381,29 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
 
         for tInd in reversed(range(self.nT)):
             # tInd = tIndP - 1
-            if AdiagTinv is not None and (
+            # refactor if we need to
+            if AdiagTinv is None or (
                 tInd <= self.nT and self.time_steps[tInd] != self.time_steps[tInd + 1]
             ):
-                AdiagTinv.clean()
-                AdiagTinv = None
-
-            # refactor if we need to
-            if AdiagTinv is None:  # and tInd > -1:
                 Adiag = self.getAdiag(tInd)
-                AdiagTinv = self.solver(Adiag.T.tocsr(), **self.solver_opts)
+                AdiagTinv = self._factor_system(
+                    "AdiagT", Adiag.T.tocsr(), previous=AdiagTinv
+                )
 
             if tInd < self.nT - 1:
                 Asubdiag = self.getAsubdiag(tInd + 1)
 
-            for isrc, src in enumerate(self.survey.source_list):
+            # read the fields of the next source while solving for this one
+            sources = self.survey.source_list
+            fields_n = zip(
+                f.stream(sources, ftype, tInd), f.stream(sources, ftype, tInd + 1)
+            )
+            for isrc, (src, (u_src, un_src)) in enumerate(zip(sources, fields_n)):
                 # solve against df_duT_v
                 if tInd >= self.nT - 1:
                     # last timestep (first to be solved)
-                    ATinv_df_duT_v[isrc, :] = (
-                        AdiagTinv
-                        * df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1]
+                    ATinv_df_duT_v[isrc, :] = AdiagTinv * mkvc(
+                        df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1]
                     )
                 elif tInd > -1:
                     ATinv_df_duT_v[isrc, :] = AdiagTinv * (
@@ -411,14 +412,13 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
                     )
 
                 dAsubdiagT_dm_v = self.getAsubdiagDeriv(
-                    tInd, f[src, ftype, tInd], ATinv_df_duT_v[isrc, :], adjoint=True
+                    tInd, u_src, ATinv_df_duT_v[isrc, :], adjoint=True
                 )
 
                 dRHST_dm_v = self.getRHSDeriv(
                     tInd + 1, src, ATinv_df_duT_v[isrc, :], adjoint=True
                 )  # on nodes of time mesh
 
-                un_src = f[src, ftype, tInd + 1]
                 # cell centered on time mesh
                 dAT_dm_v = self.getAdiagDeriv(
                     tInd, un_src, ATinv_df_duT_v[isrc, :], adjoint=True
@@ -1198,6 +1198,11 @@ class Simulation3DElectricField(BaseTDEMSimulation):
     fieldsPair = Fields3DElectricField  #: A Fields3DElectricField
     Fields_Derivs = FieldsDerivativesEB
 
+    def __init__(self, mesh, survey=None, **kwargs):
+        super().__init__(mesh=mesh, survey=survey, **kwargs)
+        self.solver_opts["is_symmetric"] = True
+        self.solver_opts["is_positive_definite"] = True
+
     # @profile
     def Jtvec(self, m, v, f=None):
         # Doctring inherited from parent class.
@@ -1271,27 +1276,27 @@ class Simulation3DElectricField(BaseTDEMSimulation):
 
         for tInd in reversed(range(self.nT)):
             # tInd = tIndP - 1
-            if AdiagTinv is not None and (
+            # refactor if we need to
+            if AdiagTinv is None or (
                 tInd <= self.nT and self.time_steps[tInd] != self.time_steps[tInd + 1]
             ):
-                AdiagTinv.clean()
-                AdiagTinv = None
-
-            # refactor if we need to
-            if AdiagTinv is None:  # and tInd > -1:
                 Adiag = self.getAdiag(tInd)
-                AdiagTinv = self.solver(Adiag.T, **self.solver_opts)
+                AdiagTinv = self._factor_system("AdiagT", Adiag.T, previous=AdiagTinv)
 
             if tInd < self.nT - 1:
                 Asubdiag = self.getAsubdiag(tInd + 1)
 
-            for isrc, src in enumerate(self.survey.source_list):
+            # read the fields of the next source while solving for this one
+            sources = self.survey.source_list
+            fields_n = zip(
+                f.stream(sources, ftype, tInd), f.stream(sources, ftype, tInd + 1)
+            )
+            for isrc, (src, (u_src, un_src)) in enumerate(zip(sources, fields_n)):
                 # solve against df_duT_v
                 if tInd >= self.nT - 1:
                     # last timestep (first to be solved)
-                    ATinv_df_duT_v[isrc, :] = (
-                        AdiagTinv
-                        * df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1]
+                    ATinv_df_duT_v[isrc, :] = AdiagTinv * mkvc(
+                        df_duT_v[src, "{}Deriv".format(self._fieldType), tInd + 1]
                     )
                 elif tInd > -1:
                     ATinv_df_duT_v[isrc, :] = AdiagTinv * (
@@ -1300,14 +1305,13 @@ class Simulation3DElectricField(BaseTDEMSimulation):
                     )
 
                 dAsubdiagT_dm_v = self.getAsubdiagDeriv(
-                    tInd, f[src, ftype, tInd], ATinv_df_duT_v[isrc, :], adjoint=True
+                    tInd, u_src, ATinv_df_duT_v[isrc, :], adjoint=True
                 )
 
                 dRHST_dm_v = self.getRHSDeriv(
                     tInd + 1, src, ATinv_df_duT_v[isrc, :], adjoint=True
                 )  # on nodes of time mesh
 
-                un_src = f[src, ftype, tInd + 1]
                 # cell centered on time mesh
                 dAT_dm_v = self.getAdiagDeriv(
                     tInd, un_src, ATinv_df_duT_v[isrc, :], adjoint=True
@@ -1843,6 +1847,11 @@ class Simulation3DMagneticField(BaseTDEMSimulation):
     fieldsPair = Fields3DMagneticField  #: Fields object pair
     Fields_Derivs = FieldsDerivativesHJ
 
+    def __init__(self, mesh, survey=None, **kwargs):
+        super().__init__(mesh=mesh, survey=survey, **kwargs)
+        self.solver_opts["is_symmetric"] = True
+        self.solver_opts["is_positive_definite"] = True
+
     def getAdiag(self, tInd):
         r"""Diagonal system matrix for the given time-step index.
 
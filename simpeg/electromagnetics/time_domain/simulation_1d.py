@@ -27,6 +27,9 @@ for filter_name in libdlf.fourier.__all__:
     if "cos" in fourier_filter.values:
         COS_FILTERS[filter_name] = fourier_filter
 
+# Defined at the module level so simulations can be pickled
+CosineFilter = namedtuple("CosineFilter", "base cos")
+
 
 class Simulation1DLayered(BaseEM1DSimulation):
     """
@@ -73,8 +76,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
             "time_filter", value, list(COS_FILTERS.keys())
         )
         filt = COS_FILTERS[self._time_filter]()
-        cos_filt = namedtuple("CosineFilter", "base cos")
-        self._fftfilt = cos_filt(filt[0], filt[-1])
+        self._fftfilt = CosineFilter(filt[0], filt[-1])
         self._coefficients_set = False
 
     def get_coefficients(self):
@@ -105,14 +107,15 @@ class Simulation1DLayered(BaseEM1DSimulation):
         if self._coefficients_set:
             return
         self._compute_hankel_coefficients()
-        survey = self.survey
+        # every sounding of an array survey shares the coefficients of the first
+        sources, _ = self._sounding_sources()
 
         t_min = np.inf
         t_max = -np.inf
         x, w = roots_legendre(251)
         # loop through source and receiver lists to find the minimum and maximum
         # evaluation times for the step response
-        for src in survey.source_list:
+        for src in sources:
             for rx in src.receiver_list:
                 wave = src.waveform
                 if isinstance(wave, StepOffWaveform):
@@ -153,7 +156,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
             splines.append(sp)
         # As will go from frequency to time domain
         As = []
-        for src in survey.source_list:
+        for src in sources:
             for rx in src.receiver_list:
                 #######
                 # Fourier Transform coefficients
@@ -273,7 +276,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
                 C1s_dh = C1s.copy()
                 h_vec = self.h
                 i = 0
-                for i_src, src in enumerate(self.survey.source_list):
+                for i_src, src in enumerate(self._iter_sources()):
                     h = h_vec[i_src]
                     nD = sum(rx.locations.shape[0] for rx in src.receiver_list)
                     ip1 = i + nD
@@ -298,7 +301,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
                 v_dh = np.zeros((self.survey.nSrc, *v_dh_temp.shape))
 
                 i = 0
-                for i_src, src in enumerate(self.survey.source_list):
+                for i_src, src in enumerate(self._iter_sources()):
                     nD = sum(rx.locations.shape[0] for rx in src.receiver_list)
                     ip1 = i + nD
                     v_dh[i_src, i:ip1] = v_dh_temp[i:ip1]
@@ -355,7 +358,8 @@ class Simulation1DLayered(BaseEM1DSimulation):
         i_dat = 0
         i_A = 0
         i = 0
-        for src in self.survey.source_list:
+        n_A = len(As)
+        for src in self._iter_sources():
             for rx in src.receiver_list:
                 i_datp1 = i_dat + rx.nD
                 n_locs = rx.locations.shape[0]
@@ -377,5 +381,5 @@ class Simulation1DLayered(BaseEM1DSimulation):
                     out[i_dat:i_datp1] = d.reshape(-1, order="F")
                 i_dat = i_datp1
                 i = i_p1
-                i_A += 1
+                i_A = (i_A + 1) % n_A
         return out
@@ -0,0 +1,117 @@
+import numpy as np
+
+from geoana.kernels.tranverse_electric_reflections import rTE_forward, rTE_gradient
+
+from ...utils import validate_string, validate_type
+from ..base_1d_stitched import BaseStitchedEM1DSimulation
+from .simulation_1d import COS_FILTERS, Simulation1DLayered
+from .survey import ArraySurvey
+
+
+def _evaluate_soundings(simulation, sigma, mu, delta_h, derivatives):
+    """Evaluate a chunk of time domain soundings.
+
+    The reflection coefficients of all soundings are computed together by
+    stacking the soundings along the frequency axis of the kernels.
+    """
+    _, frequencies, lambs, unique_lambs, inv_lambs, C0s, C1s = (
+        simulation.get_coefficients()
+    )
+    W = simulation._W
+    j0 = simulation._fhtfilt.j0
+    j1 = simulation._fhtfilt.j1
+
+    n_sounding, n_layer = sigma.shape
+    n_frequency = len(frequencies)
+    n_row = C0s.shape[0]
+    n_rx = W.shape[0]
+
+    frequencies = np.tile(frequencies, n_sounding)
+    sig = np.repeat(sigma.T, n_frequency, axis=1)
+    mu = np.repeat(mu.T, n_frequency, axis=1)
+
+    rTE = rTE_forward(frequencies, unique_lambs, sig, mu, simulation.thicknesses)
+    rTE = rTE.reshape(n_sounding, n_frequency, -1)[:, :, inv_lambs]
+
+    # both the source and the receiver move with the height of the sounding
+    damping = np.exp(-2 * lambs * delta_h[:, None, None])[:, None]
+    C0s = C0s * damping
+    C1s = C1s * damping
+
+    def project(v):
+        # (..., n_frequency, n_row) -> (n_data, ...)
+        v = W @ v.reshape(-1, n_row).T
+        v = v.reshape(n_rx, -1, n_frequency).transpose(0, 2, 1)
+        return simulation._project_to_data(v)
+
+    out = {"d": project((C0s * rTE) @ j0 + (C1s * rTE) @ j1).T}
+
+    if "dh" in derivatives:
+        v = (-2 * lambs * C0s * rTE) @ j0 + (-2 * lambs * C1s * rTE) @ j1
+        out["dh"] = project(v).T
+
+    if "ds" in derivatives:
+        rTE_ds = rTE_gradient(
+            frequencies, unique_lambs, sig, mu, simulation.thicknesses
+        )[0]
+        rTE_ds = rTE_ds.reshape(n_layer, n_sounding, n_frequency, -1)[..., inv_lambs]
+        v = (C0s * rTE_ds) @ j0 + (C1s * rTE_ds) @ j1
+        out["ds"] = project(v).reshape(-1, n_layer, n_sounding).transpose(2, 0, 1)
+    return out
+
+
+class Simulation1DLayeredStitched(BaseStitchedEM1DSimulation):
+    """
+    Simulation class for simulating the TEM response of many soundings over
+    1D layered Earths sharing the same layer thicknesses.
+    """
+
+    _template_class = Simulation1DLayered
+    _evaluate_soundings = staticmethod(_evaluate_soundings)
+
+    def __init__(self, survey=None, time_filter="key_81_2009", **kwargs):
+        super().__init__(survey=survey, **kwargs)
+        self.time_filter = time_filter
+
+    @property
+    def survey(self):
+        """The survey for the simulation
+        Returns
+        -------
+        simpeg.electromagnetics.time_domain.survey.ArraySurvey
+        """
+        if self._survey is None:
+            raise AttributeError("Simulation must have a survey set")
+        return self._survey
+
+    @survey.setter
+    def survey(self, value):
+        if value is not None:
+            value = validate_type("survey", value, ArraySurvey, cast=False)
+        self._survey = value
+        self._template = None
+
+    @property
+    def time_filter(self):
+        """Name of the cosine filter of the Fourier transform.
+
+        Returns
+        -------
+        str
+        """
+        return self._time_filter
+
+    @time_filter.setter
+    def time_filter(self, value):
+        self._time_filter = validate_string(
+            "time_filter", value, list(COS_FILTERS.keys())
+        )
+        self._template = None
+
+    @property
+    def _template_kwargs(self):
+        return {"time_filter": self.time_filter}
+
+    def _n_kernel_values(self):
+        coefficients = self.template_simulation.get_coefficients()
+        return len(coefficients[1]) * len(coefficients[3])
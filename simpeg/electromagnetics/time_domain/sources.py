@@ -552,6 +552,17 @@ class TriangularWaveform(TrapezoidWaveform):
         )
         self.peak_time = peak_time
 
+    @property
+    def start_time(self):
+        """Start time
+
+        Returns
+        -------
+        float
+            The time when the transmitter current starts ramping on
+        """
+        return self.ramp_on[0]
+
     @property
     def peak_time(self):
         """Peak time
@@ -1,4 +1,4 @@
-from ...survey import BaseSurvey
+from ...survey import BaseSurvey, BaseArraySurvey
 from .sources import BaseTDEMSrc
 
 from ...utils.code_utils import validate_list_of_types
@@ -36,3 +36,40 @@ class Survey(BaseSurvey):
         self._source_list = validate_list_of_types(
             "source_list", new_list, BaseTDEMSrc, ensure_unique=True
         )
+
+
+class ArraySurvey(BaseArraySurvey, Survey):
+    """Time domain electromagnetic survey stored as arrays
+
+    A compact survey for airborne and other surveys repeating the same
+    sounding at many locations. Only the sounding locations and the
+    receiver offsets are stored as arrays; the TDEM sources and receivers
+    are built from the templates when first requested, and are not pickled.
+
+    Parameters
+    ----------
+    source_templates : BaseTDEMSrc or list of BaseTDEMSrc
+        TDEM sources, with their receivers, defining a single sounding.
+        Receiver locations are relative to the location of their source if
+        they use source-receiver offsets, and absolute otherwise.
+    source_locations : (n_soundings, 3) numpy.ndarray
+        Locations of the template sources at each sounding.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from simpeg.electromagnetics import time_domain as tdem
+    >>> rx = tdem.receivers.PointMagneticFluxTimeDerivative(
+    ...     np.zeros((1, 3)),
+    ...     np.logspace(-5, -2, 20),
+    ...     orientation="z",
+    ...     use_source_receiver_offset=True,
+    ... )
+    >>> src = tdem.sources.CircularLoop([rx], location=np.zeros(3), radius=13.0)
+    >>> locations = np.c_[np.linspace(0, 1000, 101), np.zeros(101), np.full(101, 30.0)]
+    >>> survey = tdem.survey.ArraySurvey(src, locations)
+    >>> survey.nSrc, survey.nD
+    (101, 2020)
+    """
+
+    _source_type = BaseTDEMSrc
@@ -1,32 +1,45 @@
+import threading
+import weakref
+from collections import OrderedDict
+
 import numpy as np
 from ...utils import mkvc
+from ...utils.cache_utils import model_fingerprint
 import discretize
 import warnings
 
+# Source terms of the most recently used wires of each mesh
+_source_term_cache = weakref.WeakKeyDictionary()
+_source_term_cache_lock = threading.Lock()
+_max_cached_wires = 32
+
 
 def edge_basis_function(t, a1, l1, h1, a2, l2, h2):
     """Edge basis function
 
+    The wire and cell parameters can also be arrays of equal shape, to
+    evaluate the weights of several wire segments at once.
+
     Parameters
     ----------
     t : float
         Parameterized distance along wire
-    a1 : float
+    a1 : float or numpy.ndarray
         Start of wire in first coordinate
-    l1 : float
+    l1 : float or numpy.ndarray
         Length of wire in first coordinate
-    h1 : float
+    h1 : float or numpy.ndarray
         Cell dimension in first coordinate
-    a2 : float
+    a2 : float or numpy.ndarray
         Start of wire in second coordinate
-    l2 : float
+    l2 : float or numpy.ndarray
         Length of wire in second coordinate
-    h2 : float
+    h2 : float or numpy.ndarray
         Cell dimension in second coordinate
 
     Returns
     -------
-    (4) numpy.ndarray
+    (..., 4) numpy.ndarray
         Edge weights
     """
     x1 = a1 + t * l1
@@ -35,7 +48,7 @@ def edge_basis_function(t, a1, l1, h1, a2, l2, h2):
     w1 = (x1 / h1) * (1.0 - x2 / h2)
     w2 = (1.0 - x1 / h1) * (x2 / h2)
     w3 = (x1 / h1) * (x2 / h2)
-    return np.r_[w0, w1, w2, w3]
+    return np.stack([w0, w1, w2, w3], axis=-1)
 
 
 def _simpsons_rule(a1, l1, h1, a2, l2, h2):
@@ -55,6 +68,10 @@ def getStraightLineCurrentIntegral(hx, hy, hz, ax, ay, az, bx, by, bz):
     and where J prescribes a unit line current
     between points (ax,ay,az) and (bx,by,bz).
 
+    All the parameters can also be arrays of equal shape, one entry per
+    segment and cell, in which case the weights get a trailing axis of
+    length 4.
+
     Parameters
     ----------
     hx : float
@@ -78,11 +95,11 @@ def getStraightLineCurrentIntegral(hx, hy, hz, ax, ay, az, bx, by, bz):
 
     Returns
     -------
-    sx : float
+    sx : (..., 4) numpy.ndarray
         x weight
-    sy : float
+    sy : (..., 4) numpy.ndarray
         y weight
-    sz : flat
+    sz : (..., 4) numpy.ndarray
         z weight
     """
 
@@ -92,28 +109,76 @@ def getStraightLineCurrentIntegral(hx, hy, hz, ax, ay, az, bx, by, bz):
     lz = bz - az
 
     # integration using Simpson's rule
-    sx = _simpsons_rule(ay, ly, hy, az, lz, hz) * lx
-    sy = _simpsons_rule(ax, lx, hx, az, lz, hz) * ly
-    sz = _simpsons_rule(ax, lx, hx, ay, ly, hy) * lz
+    sx = _simpsons_rule(ay, ly, hy, az, lz, hz) * np.asarray(lx)[..., None]
+    sy = _simpsons_rule(ax, lx, hx, az, lz, hz) * np.asarray(ly)[..., None]
+    sz = _simpsons_rule(ax, lx, hx, ay, ly, hy) * np.asarray(lz)[..., None]
 
     return sx, sy, sz
 
 
-def _findlast(x):
-    """Returns last element
+def _cell_index(nodes, x):
+    """Returns the cells of a 1D grid containing points
 
     Parameters
     ----------
-    array_like of int
+    nodes : (n_nodes) numpy.ndarray
+        Increasing node locations of the grid.
+    x : numpy.ndarray
+        Locations of the points.
 
     Returns
     -------
+    numpy.ndarray of int
+        Index of the cell containing each point, or -1 for the points outside
+        of the grid. Points on a node belong to the cell above it, except for
+        the last node which belongs to the last cell.
+    """
+    x = np.asarray(x)
+    ind = np.searchsorted(nodes, x, side="right") - 1
+    ind[x == nodes[-1]] = len(nodes) - 2
+    ind[(x < nodes[0]) | (x > nodes[-1])] = -1
+    return ind
+
+
+def _cached_source_term(mesh, key, compute):
+    """Return a source term of a mesh, computing it only once
+
+    Source terms are held for the most recently used wires of each mesh, for
+    as long as the mesh is alive, so that the sources sharing a wire on the
+    same mesh reuse a single computation.
 
+    Parameters
+    ----------
+    mesh : discretize.base.BaseMesh
+        The mesh of the source term.
+    key : tuple
+        Hashable description of the source term on the mesh.
+    compute : callable
+        Function without arguments that computes the source term.
+
+    Returns
+    -------
+    numpy.ndarray
+        A copy of the source term.
     """
-    if x.sum() == 0:
-        return -1
-    else:
-        return np.arange(x.size)[x][-1]
+    with _source_term_cache_lock:
+        try:
+            mesh_cache = _source_term_cache.setdefault(mesh, OrderedDict())
+        except TypeError:
+            # meshes that can't be weakly referenced aren't cached
+            mesh_cache = None
+        else:
+            value = mesh_cache.get(key)
+            if value is not None:
+                mesh_cache.move_to_end(key)
+                return value.copy()
+    value = compute()
+    if mesh_cache is not None:
+        with _source_term_cache_lock:
+            mesh_cache[key] = value
+            while len(mesh_cache) > _max_cached_wires:
+                mesh_cache.popitem(last=False)
+    return value.copy()
 
 
 def segmented_line_current_source_term(mesh, locs):
@@ -137,11 +202,21 @@ def segmented_line_current_source_term(mesh, locs):
     Notes
     -----
     You can create a closed loop by setting the first and end point to be the same.
+
+    The source term is computed once per mesh and path: later calls with the
+    same mesh object and vertices, e.g. from several sources sharing a wire,
+    return a copy of the stored result.
     """
+    locs = np.asarray(locs, dtype=float)
     if isinstance(mesh, discretize.TensorMesh):
-        return _poly_line_source_tens(mesh, locs)
+        source_term = _poly_line_source_tens
     elif isinstance(mesh, discretize.TreeMesh):
-        return _poly_line_source_tree(mesh, locs)
+        source_term = _poly_line_source_tree
+    else:
+        return None
+    return _cached_source_term(
+        mesh, ("edges", model_fingerprint(locs)), lambda: source_term(mesh, locs)
+    )
 
 
 def _poly_line_source_tens(mesh, locs):
@@ -157,18 +232,12 @@ def _poly_line_source_tens(mesh, locs):
         getSourceTermLineCurrentPolygon(x0,y0,z0,hx,hy,hz,px,py,pz)
         Christoph Schwarzbach, February 2014
 
+    The pieces of each line segment within the cells are integrated at once.
     """
     # Get some mesh properties
     nx, ny, nz = mesh.shape_cells
     hx, hy, hz = mesh.h
-    x = mesh.nodes_x
-    y = mesh.nodes_y
-    z = mesh.nodes_z
-
-    # Source points
-    px = locs[:, 0]
-    py = locs[:, 1]
-    pz = locs[:, 2]
+    nodes = [mesh.nodes_x, mesh.nodes_y, mesh.nodes_z]
 
     # discrete edge function
     sx = np.zeros((nx, ny + 1, nz + 1))
@@ -176,90 +245,50 @@ def _poly_line_source_tens(mesh, locs):
     sz = np.zeros((nx + 1, ny + 1, nz))
 
     # number of line segments
-    nP = len(px) - 1
+    nP = len(locs) - 1
 
     # check that all polygon vertices are inside the mesh
-    for ip in range(nP + 1):
-        ax = px[ip]
-        ay = py[ip]
-        az = pz[ip]
-        ix = _findlast(np.logical_and(ax >= x[: nx - 1], ax <= x[1:nx]))
-        iy = _findlast(np.logical_and(ay >= y[: ny - 1], ay <= y[1:ny]))
-        iz = _findlast(np.logical_and(az >= z[: nz - 1], az <= z[1:nz]))
-
-        if (ix < 0) or (iy < 0) or (iz < 0):
-            msg = "Polygon vertex (%.1f, %.1f, %.1f) is outside the mesh"
-            print((msg) % (ax, ay, az))
+    inside = np.all([_cell_index(nodes[i], locs[:, i]) >= 0 for i in range(3)], axis=0)
+    for ax, ay, az in locs[~inside]:
+        msg = "Polygon vertex (%.1f, %.1f, %.1f) is outside the mesh"
+        print((msg) % (ax, ay, az))
+
+    # offsets of the 4 edges of a cell, in the order of the edge weights
+    offsets = np.array([0, 1, 0, 1]), np.array([0, 0, 1, 1])
 
     # integrate each line segment
     for ip in range(nP):
-        # start and end vertices
-        ax = px[ip]
-        ay = py[ip]
-        az = pz[ip]
-        bx = px[ip + 1]
-        by = py[ip + 1]
-        bz = pz[ip + 1]
+        # start vertex and vector along the segment
+        a = locs[ip]
+        d = locs[ip + 1] - a
 
         # find intersection with mesh planes
-        dx = bx - ax
-        dy = by - ay
-        dz = bz - az
-        d = np.sqrt(dx**2 + dy**2 + dz**2)
-
-        tol = d * np.finfo(float).eps
-
-        if abs(dx) > tol:
-            tx = (x - ax) / dx
-            tx = tx[np.logical_and(tx >= 0, tx <= 1)]
-        else:
-            tx = []
-
-        if abs(dy) > tol:
-            ty = (y - ay) / dy
-            ty = ty[np.logical_and(ty >= 0, ty <= 1)]
-        else:
-            ty = []
-
-        if abs(dz) > tol:
-            tz = (z - az) / dz
-            tz = tz[np.logical_and(tz >= 0, tz <= 1)]
-        else:
-            tz = []
-
-        t = np.unique(np.r_[0.0, tx, ty, tz, 1.0])
-        nq = len(t) - 1
-        tc = 0.5 * (t[:nq] + t[1 : nq + 1])
-
-        for iq in range(nq):
-            cx = ax + tc[iq] * dx
-            cy = ay + tc[iq] * dy
-            cz = az + tc[iq] * dz
-
-            # locate cell id
-
-            ix = _findlast(np.logical_and(cx >= x[: nx - 1], cx <= x[1:nx]))
-            iy = _findlast(np.logical_and(cy >= y[: ny - 1], cy <= y[1:ny]))
-            iz = _findlast(np.logical_and(cz >= z[: nz - 1], cz <= z[1:nz]))
-
-            # local coordinates
-            hxloc = hx[ix]
-            hyloc = hy[iy]
-            hzloc = hz[iz]
-            axloc = ax + t[iq] * dx - x[ix]
-            ayloc = ay + t[iq] * dy - y[iy]
-            azloc = az + t[iq] * dz - z[iz]
-            bxloc = ax + t[iq + 1] * dx - x[ix]
-            byloc = ay + t[iq + 1] * dy - y[iy]
-            bzloc = az + t[iq + 1] * dz - z[iz]
-            # integrate
-            sxloc, syloc, szloc = getStraightLineCurrentIntegral(
-                hxloc, hyloc, hzloc, axloc, ayloc, azloc, bxloc, byloc, bzloc
-            )
-            # integrate
-            sx[ix, iy : iy + 2, iz : iz + 2] += np.reshape(sxloc, (2, 2), order="F")
-            sy[ix : ix + 2, iy, iz : iz + 2] += np.reshape(syloc, (2, 2), order="F")
-            sz[ix : ix + 2, iy : iy + 2, iz] += np.reshape(szloc, (2, 2), order="F")
+        tol = np.linalg.norm(d) * np.finfo(float).eps
+        t = [0.0, 1.0]
+        for i in range(3):
+            if abs(d[i]) > tol:
+                ti = (nodes[i] - a[i]) / d[i]
+                t.append(ti[(ti >= 0) & (ti <= 1)])
+        t = np.unique(np.hstack(t))
+
+        # locate the cell of each piece of the segment from its center
+        tc = 0.5 * (t[:-1] + t[1:])
+        ix, iy, iz = (_cell_index(nodes[i], a[i] + tc * d[i]) for i in range(3))
+
+        # local coordinates
+        cell_origin = np.c_[nodes[0][ix], nodes[1][iy], nodes[2][iz]]
+        ploc = a + t[:, None] * d
+        aloc = ploc[:-1] - cell_origin
+        bloc = ploc[1:] - cell_origin
+
+        # integrate
+        sxloc, syloc, szloc = getStraightLineCurrentIntegral(
+            hx[ix], hy[iy], hz[iz], *aloc.T, *bloc.T
+        )
+        ix, iy, iz = ix[:, None], iy[:, None], iz[:, None]
+        np.add.at(sx, (ix, iy + offsets[0], iz + offsets[1]), sxloc)
+        np.add.at(sy, (ix + offsets[0], iy, iz + offsets[1]), syloc)
+        np.add.at(sz, (ix + offsets[0], iy + offsets[1], iz), szloc)
 
     return np.r_[mkvc(sx), mkvc(sy), mkvc(sz)]
 
@@ -268,7 +297,8 @@ def _poly_line_source_tree(mesh, locs):
     """Calculate a source term for a line current source on a OctTreeMesh
 
     Given an OcTreeMesh compute the source vector for a unit current flowing
-    along the polygon with vertices px, py, pz.
+    along the polygon with vertices px, py, pz. The pieces of each line
+    segment within the cells are integrated at once.
 
     Parameters
     ----------
@@ -283,27 +313,22 @@ def _poly_line_source_tree(mesh, locs):
     (n_edges) numpy.ndarray
         Contains the source term for all x, y, and z edges of the OcTreeMesh.
     """
-
-    px = locs[:, 0]
-    py = locs[:, 1]
-    pz = locs[:, 2]
+    points = np.asarray(locs, dtype=float)
 
     # discrete edge vectors
     sx = np.zeros(mesh.ntEx)
     sy = np.zeros(mesh.ntEy)
     sz = np.zeros(mesh.ntEz)
 
-    points = np.c_[px, py, pz]
     # number of line segments
     nP = len(points) - 1
-    x0 = mesh.x0
-    dim = mesh.dim
-    for _ in range(nP + 1):
-        A = points[0]
-        xF = np.array([mesh.nodes_x[-1], mesh.nodes_y[-1], mesh.nodes_z[-1]])
-        if np.any(A < x0) or np.any(A > xF):
-            msg = "Polygon vertex ({.1f}, {.1f}, {.1f}) is outside the mesh".format(*A)
-            raise ValueError(msg)
+    xF = np.array([mesh.nodes_x[-1], mesh.nodes_y[-1], mesh.nodes_z[-1]])
+    outside = np.any((points < mesh.x0) | (points > xF), axis=1)
+    if np.any(outside):
+        msg = "Polygon vertex ({:.1f}, {:.1f}, {:.1f}) is outside the mesh".format(
+            *points[outside][0]
+        )
+        raise ValueError(msg)
 
     # Loop over each line segment
     for ip in range(nP):
@@ -315,49 +340,36 @@ def _poly_line_source_tree(mesh, locs):
         ds = B - A
 
         # Find indices of all cells intersected by the wirepath
-        srcCellIds = mesh.get_cells_along_line(A, B)
+        srcCellIds = np.asarray(mesh.get_cells_along_line(A, B))
         levels = mesh.cell_levels_by_index(srcCellIds)
         if isinstance(levels, np.ndarray) and np.any(levels != levels[0]):
             warnings.warn(
                 "Warning! Line path crosses a cell level change.", stacklevel=2
             )
 
+        edges = np.array([mesh[cell_id].edges for cell_id in srcCellIds])
+        h = mesh.h_gridded[srcCellIds]
+        x0 = mesh.cell_centers[srcCellIds] - 0.5 * h
+        xF = x0 + h
+
+        # find the exit of the path out of each cell, the cells being ordered
+        # along the path
+        ts = np.full(h.shape, np.inf)
+        forward = ds > 0
+        backward = ds < 0
+        ts[:, forward] = (xF[:, forward] - A[forward]) / ds[forward]
+        ts[:, backward] = (x0[:, backward] - A[backward]) / ds[backward]
+        t = np.minimum(ts.min(axis=1), 1)  # the last value should be 1
+        p1 = A + t[:, None] * ds  # the next intersection points
         # Starts at point A!
-        p0 = A
-        for cell_id in srcCellIds:
-            cell = mesh[cell_id]
-
-            x0 = cell.x0
-            h = cell.h
-            xF = x0 + h
-
-            edges = cell.edges
-            edges_x = edges[0:4]
-            edges_y = edges[4:8]
-            edges_z = edges[8:12]
-
-            # find next intersection along path
-            ts = np.ones(dim)
-            for i in range(dim):
-                if ds[i] > 0:
-                    ts[i] = (xF[i] - A[i]) / ds[i]
-                elif ds[i] < 0:
-                    ts[i] = (x0[i] - A[i]) / ds[i]
-                else:
-                    ts[i] = np.inf
-            t = min(*ts, 1)  # the last value should be 1
-            p1 = A + t * ds  # the next intersection point
-
-            cA = p0 - x0
-            cB = p1 - x0
-
-            cell_s = getStraightLineCurrentIntegral(*h, *cA, *cB)
-
-            sx[edges_x] += cell_s[0]
-            sy[edges_y] += cell_s[1]
-            sz[edges_z] += cell_s[2]
-
-            p0 = p1
+        p0 = np.vstack([A, p1[:-1]])
+
+        cell_s = getStraightLineCurrentIntegral(*h.T, *(p0 - x0).T, *(p1 - x0).T)
+
+        np.add.at(sx, edges[:, 0:4], cell_s[0])
+        np.add.at(sy, edges[:, 4:8], cell_s[1])
+        np.add.at(sz, edges[:, 8:12], cell_s[2])
+
     s = np.r_[sx, sy, sz]
     R = mesh._deflate_edges()
     s = R.T.dot(s)
@@ -394,8 +406,37 @@ def line_through_faces(
     -------
     (mesh.n_faces) numpy.ndarray
         Line current source on faces
+
+    Notes
+    -----
+    As for :func:`segmented_line_current_source_term`, the current is computed
+    once per mesh and path, and later calls return a copy of it.
     """
+    locations = np.asarray(locations, dtype=float)
+    key = (
+        "faces",
+        model_fingerprint(locations),
+        normalize_by_area,
+        check_divergence,
+        tolerance_divergence,
+    )
+    return _cached_source_term(
+        mesh,
+        key,
+        lambda: _line_through_faces(
+            mesh,
+            locations,
+            normalize_by_area,
+            check_divergence,
+            tolerance_divergence,
+        ),
+    )
 
+
+def _line_through_faces(
+    mesh, locations, normalize_by_area, check_divergence, tolerance_divergence
+):
+    """Compute the line current through cell faces, see :func:`line_through_faces`."""
     current = np.zeros(mesh.n_faces)
 
     def not_aligned_error(i):
@@ -406,83 +447,50 @@ def line_through_faces(
         )
 
     # pre-processing step: find closest cell centers
-    cell_centers = discretize.utils.closest_points_index(mesh, locations, "CC")
+    cell_centers = mesh.closest_points_index(locations, "CC")
     locations = mesh.gridCC[cell_centers, :]
 
-    # next step: find segments between lines
-    for i in range(locations.shape[0] - 1):
-        dimension = np.nonzero(np.abs(locations[i, :] - locations[i + 1, :]))[0]
-        if len(dimension) > 1:
-            not_aligned_error(i)
-        dimension = dimension[0]
-        direction = np.sign(locations[i, dimension] - locations[i + 1, dimension])
-
-        if dimension == 0:
-            grid_loc = "x"
-            current_inds = slice(0, mesh.n_faces_x)
-        elif dimension == 1:
-            grid_loc = "y"
-            start = mesh.n_faces_x
-            current_inds = slice(start, start + mesh.n_faces_y)
-        elif dimension == 2:
-            grid_loc = "z"
-            start = mesh.n_faces_x + mesh.n_faces_y
-            current_inds = slice(start, start + mesh.n_faces_z)
-
+    # axis of each segment between the points
+    changes = locations[1:] != locations[:-1]
+    not_aligned = np.nonzero(changes.sum(axis=1) > 1)[0]
+    if len(not_aligned) > 0:
+        not_aligned_error(not_aligned[0])
+    dimensions = np.argmax(changes, axis=1)
+
+    grid_locs = "xyz"
+    starts = np.cumsum(np.r_[0, mesh.n_faces_x, mesh.n_faces_y])
+    h_min = [h.min() for h in mesh.h]
+    closest_faces = {}
+    grids = {}
+    for dimension in np.unique(dimensions):
+        grid_loc = grid_locs[dimension]
         # interpolate to closest face
-        loca = discretize.utils.closest_points_index(
-            mesh, locations[i, :], f"F{grid_loc}"
-        )
-        locb = discretize.utils.closest_points_index(
-            mesh, locations[i + 1, :], f"F{grid_loc}"
-        )
+        closest_faces[dimension] = mesh.closest_points_index(locations, f"F{grid_loc}")
+        grids[dimension] = getattr(mesh, f"faces_{grid_loc}")
 
-        if len(loca) > 1 or len(locb) > 1:
-            raise Exception(
-                "Current across multiple faces is not implemented. "
-                "Please put path through a cell rather than along edges"
-            )
+    # next step: find segments between lines
+    for i, dimension in enumerate(dimensions):
+        direction = np.sign(locations[i, dimension] - locations[i + 1, dimension])
+        start = starts[dimension]
+        grid = grids[dimension]
+        current_inds = slice(start, start + len(grid))
 
-        grid = getattr(mesh, f"faces_{grid_loc}")
-        loca = grid[loca[0]]
-        locb = grid[locb[0]]
+        loca = grid[closest_faces[dimension][i]]
+        locb = grid[closest_faces[dimension][i + 1]]
 
         # find all faces between these points
-        if dimension == 0:
-            xlocs = np.r_[locations[i, 0], locations[i + 1, 0]]
-
-            if not (np.allclose(loca[1], locb[1]) and np.allclose(loca[2], locb[2])):
+        lower = np.empty(3)
+        upper = np.empty(3)
+        for j in range(3):
+            if j == dimension:
+                lower[j], upper[j] = np.sort(locations[i : i + 2, j])
+            elif not np.allclose(loca[j], locb[j]):
                 not_aligned_error(i)
+            else:
+                lower[j] = loca[j] - h_min[j] / 4
+                upper[j] = loca[j] + h_min[j] / 4
 
-            ylocs = loca[1] + mesh.h[1].min() / 4 * np.r_[-1, 1]
-            zlocs = loca[2] + mesh.h[2].min() / 4 * np.r_[-1, 1]
-
-        elif dimension == 1:
-            ylocs = np.r_[locations[i, 1], locations[i + 1, 1]]
-
-            if not (np.allclose(loca[0], locb[0]) and np.allclose(loca[2], locb[2])):
-                not_aligned_error(i)
-
-            xlocs = loca[0] + mesh.h[0].min() / 4 * np.r_[-1, 1]
-            zlocs = loca[2] + mesh.h[2].min() / 4 * np.r_[-1, 1]
-
-        elif dimension == 2:
-            zlocs = np.r_[locations[i, 2], locations[i + 1, 2]]
-
-            if not (np.allclose(loca[0], locb[0]) and np.allclose(loca[1], locb[1])):
-                not_aligned_error(i)
-
-            xlocs = loca[0] + mesh.h[0].min() / 4 * np.r_[-1, 1]
-            ylocs = loca[1] + mesh.h[1].min() / 4 * np.r_[-1, 1]
-
-        src_inds = (
-            (grid[:, 0] >= xlocs.min())
-            & (grid[:, 0] <= xlocs.max())
-            & (grid[:, 1] >= ylocs.min())
-            & (grid[:, 1] <= ylocs.max())
-            & (grid[:, 2] >= zlocs.min())
-            & (grid[:, 2] <= zlocs.max())
-        )
+        src_inds = np.all((grid >= lower) & (grid <= upper), axis=1)
 
         current[current_inds][src_inds] = direction
 
@@ -17,6 +17,7 @@ from .survey import SurveyVRM
 from .receivers import Point, SquareLoop
 
 from ...utils.code_utils import deprecate_property
+from ...utils.cache_utils import discard_cached_items
 
 ############################################
 # BASE VRM PROBLEM CLASS
@@ -112,6 +113,7 @@ class BaseVRMSimulation(BaseSimulation):
         if value is not None:
             value = validate_type("survey", value, SurveyVRM, cast=False)
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def refinement_factor(self):
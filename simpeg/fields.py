@@ -1,7 +1,10 @@
+from collections import OrderedDict
+
 import numpy as np
 
 from .simulation import BaseSimulation, BaseTimeSimulation
-from .utils import mkvc, validate_type
+from .utils import mkvc, validate_integer, validate_type
+from .utils.storage_utils import FieldsStorage
 
 
 class Fields:
@@ -42,6 +45,20 @@ class Fields:
         the fields object. E.g. ``float``, ``complex``,
         ``{'eSolution': complex, 'bSolution': complex}``.
 
+    Notes
+    -----
+    Aliased fields requested for several sources are evaluated for all the
+    sources at once, and kept in a least recently used cache limited to
+    :attr:`alias_cache_size` bytes. Later accesses, for any sources, return
+    copies of slices of the cached arrays. Aliased fields requested for a
+    single source are evaluated for that source only, unless they are already
+    cached or :meth:`prefetch` was called. Setting a known field clears the
+    cache.
+
+    The known fields are held by the :attr:`storage` backend of the simulation,
+    which can keep them out of memory. :meth:`stream` iterates over the
+    sources while the backend reads the fields of the next source ahead.
+
     Examples
     --------
     We want to access the fields for a discrete solution with :math:`\mathbf{e}` discretized
@@ -68,6 +85,7 @@ class Fields:
     _dtype = float
     _knownFields = {}
     _aliasFields = {}
+    _alias_cache_size = 512 * 1024**2
 
     def __init__(self, simulation, knownFields=None, aliasFields=None, dtype=None):
         self.simulation = simulation
@@ -88,6 +106,8 @@ class Fields:
             )
 
         self._fields = {}
+        self._alias_cache = OrderedDict()
+        self.storage = getattr(simulation, "fields_storage", None)
         self.startup()
 
     @property
@@ -107,6 +127,27 @@ class Fields:
             "simulation", value, BaseSimulation, cast=False
         )
 
+    @property
+    def storage(self):
+        """Backend storing the known fields.
+
+        Defaults to the ``fields_storage`` of the simulation, or to storing
+        the fields in memory.
+
+        Returns
+        -------
+        simpeg.utils.storage_utils.FieldsStorage
+        """
+        return self._storage
+
+    @storage.setter
+    def storage(self, value):
+        if value is None:
+            value = FieldsStorage()
+        if self._fields:
+            raise AttributeError("The storage can't be changed once fields are stored.")
+        self._storage = validate_type("storage", value, FieldsStorage, cast=False)
+
     @property
     def knownFields(self):
         """The field solutions and where they are discretized on the mesh.
@@ -156,18 +197,47 @@ class Fields:
 
     @property
     def dtype(self):
-        """Python data type(s) used to store the fields.
+        """Python data type(s) of the fields.
 
         the Python data type for each numerical field solution that is stored in
         the fields object. E.g. ``float``, ``complex``, ``{'eSolution': complex, 'bSolution': complex}``.
 
+        The fields are stored with a lower precision if the ``fields_dtype`` of
+        the simulation is ``numpy.float32``, and upcast to these data types when
+        they are accessed.
+
         Returns
         -------
         dtype or dict of {str : dtype}
-            Python data type(s) used to store the fields.
+            Python data type(s) of the fields.
         """
         return self._dtype
 
+    def _field_dtype(self, name):
+        if isinstance(self.dtype, dict):
+            return self.dtype[name]
+        return self.dtype
+
+    def _storage_dtype(self, name):
+        """Data type of the array storing a known field."""
+        dtype = np.dtype(self._field_dtype(name))
+        if getattr(self.simulation, "fields_dtype", np.float64) is not np.float32:
+            return dtype
+        if dtype.kind == "c":
+            return np.dtype(np.complex64)
+        if dtype.kind == "f":
+            return np.dtype(np.float32)
+        return dtype
+
+    def _stored(self, name, index):
+        """Stored values of a known field, upcast to the data type of the field."""
+        values = self.storage.read(self._fields[name], index)
+        return values.astype(self._field_dtype(name), copy=False)
+
+    def _storage_index(self, ind):
+        """Index into the stored arrays of the values of a key."""
+        return (slice(None), ind)
+
     @property
     def mesh(self):
         """Mesh used by the simulation.
@@ -190,6 +260,153 @@ class Fields:
         """
         return self.simulation.survey
 
+    @property
+    def alias_cache_size(self):
+        """Memory budget of the cache of aliased fields, in bytes.
+
+        Aliased fields larger than the budget are not cached, and are
+        evaluated for the requested sources on every access. Set it to zero
+        to disable the cache.
+
+        Returns
+        -------
+        int
+        """
+        return self._alias_cache_size
+
+    @alias_cache_size.setter
+    def alias_cache_size(self, value):
+        self._alias_cache_size = validate_integer("alias_cache_size", value, min_val=0)
+        self._evict_aliases()
+
+    @property
+    def nbytes(self):
+        """Memory used by the stored and cached fields, in bytes.
+
+        Fields kept out of memory by the :attr:`storage` backend do not count.
+
+        Returns
+        -------
+        int
+        """
+        stored = sum(self.storage.resident_nbytes(a) for a in self._fields.values())
+        return stored + sum(a.nbytes for a in self._alias_cache.values())
+
+    def clear_alias_cache(self):
+        """Drop the cached aliased fields."""
+        self._alias_cache.clear()
+
+    def prefetch(self, names):
+        """Evaluate aliased fields for all sources in bulk and cache them.
+
+        Lets receivers request every field they need in one call, rather than
+        evaluating aliases source by source.
+
+        Parameters
+        ----------
+        names : str or list of str
+            Names of the fields.
+        """
+        if isinstance(names, str):
+            names = [names]
+        for name in names:
+            if name not in self.knownFields:
+                self._cached_alias(self._nameIndex(name, "get"))
+
+    def stream(self, source_list, name):
+        """Iterate over a field source by source.
+
+        While a source is being used, the :attr:`storage` backend reads the
+        stored field of the next source in the background.
+
+        Parameters
+        ----------
+        source_list : list of simpeg.survey.BaseSrc
+            The sources.
+        name : str
+            Name of the field.
+
+        Yields
+        ------
+        numpy.ndarray
+            The field of each source, as returned by ``fields[src, name]``.
+        """
+        yield from self._stream(source_list, name, ())
+
+    def _stream(self, source_list, name, index):
+        name = self._nameIndex(name, "get")
+        for i, src in enumerate(source_list):
+            if name in self._fields and i + 1 < len(source_list):
+                ind, _, _ = self._index_name_srclist_from_key(
+                    (source_list[i + 1], name, *index), "get"
+                )
+                self.storage.prefetch(self._fields[name], self._storage_index(ind))
+            yield self[(src, name, *index)]
+
+    def _evict_aliases(self):
+        cache = self._alias_cache
+        while cache and sum(a.nbytes for a in cache.values()) > self.alias_cache_size:
+            cache.popitem(last=False)
+
+    def _alias_nbytes(self, name):
+        """Estimated memory of an aliased field for all sources, or None."""
+        alias, loc = self.aliasFields[name][:2]
+        try:
+            shape = self._storageShape(loc)
+        except KeyError:
+            return None
+        itemsize = np.dtype(self._field_dtype(alias)).itemsize
+        return int(np.prod(shape)) * itemsize
+
+    def _cached_alias(self, name, key=None, src_ind=None):
+        """Aliased field for all sources, from the cache or evaluated in bulk.
+
+        Returns ``None`` if the field does not fit in the cache, or if the
+        sources do not each own a single column of the stored field (e.g.
+        sources with two polarizations). If the index of the requested
+        sources ``src_ind`` selects a single source, the field is only
+        returned if it is already cached, and isn't evaluated for all sources.
+        The cached arrays are read-only, slice them with :func:`_from_cache`.
+        """
+        key = name if key is None else key
+        cache = self._alias_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        if src_ind is not None and np.arange(self.survey.nSrc)[src_ind].size < 2:
+            return None
+        nbytes = self._alias_nbytes(name)
+        alias = self.aliasFields[name][0]
+        if (
+            nbytes is None
+            or nbytes > self.alias_cache_size
+            or alias not in self._fields
+            or self._fields[alias].shape[1] != len(self.survey.source_list)
+        ):
+            return None
+        out = self._evaluate_alias(name, key)
+        if out is None:
+            return None
+        out.flags.writeable = False
+        cache[key] = out
+        self._evict_aliases()
+        return out
+
+    def _alias_function(self, name):
+        alias, loc, func = self.aliasFields[name]
+        if isinstance(func, str):
+            assert hasattr(self, func), (
+                "The alias field function is a string, but it does not "
+                "exist in the Fields class."
+            )
+            func = getattr(self, func)
+        return alias, func
+
+    def _evaluate_alias(self, name, key):
+        alias, func = self._alias_function(name)
+        index = (slice(None), slice(None))
+        return np.asarray(func(self._stored(alias, index), self.survey.source_list))
+
     def startup(self):
         """Run startup to connect the simulation's discrete attributes to the fields object."""
         pass
@@ -206,7 +423,8 @@ class Fields:
         sz = 0.0
         for f in self.knownFields:
             loc = self.knownFields[f]
-            sz += np.array(self._storageShape(loc)).prod() * 8.0 / (1024**2)
+            itemsize = self._storage_dtype(f).itemsize
+            sz += np.array(self._storageShape(loc)).prod() * itemsize / (1024**2)
         return "{0:e} MB".format(sz)
 
     def _storageShape(self, loc):
@@ -228,14 +446,9 @@ class Fields:
         assert name in self.knownFields, "field name is not known."
 
         loc = self.knownFields[name]
+        dtype = self._storage_dtype(name)
 
-        if isinstance(self.dtype, dict):
-            dtype = self.dtype[name]
-        else:
-            dtype = self.dtype
-
-        # field = zarr.create(self._storageShape(loc), dtype=dtype)
-        field = np.zeros(self._storageShape(loc), dtype=dtype)
+        field = self.storage.create(name, self._storageShape(loc), dtype)
 
         self._fields[name] = field
 
@@ -299,8 +512,10 @@ class Fields:
         else:
             raise Exception("Unknown setter")
 
+        self.clear_alias_cache()
         for name in newFields:
             field = self._initStore(name)
+            self.storage.discard(field)
             self._setField(field, newFields[name], name, ind)
 
     def __getitem__(self, key):
@@ -323,20 +538,17 @@ class Fields:
         # ind will always be an list, thus the output will always
         # be (len(fields), n_inds)
         if name in self._fields:
-            out = self._fields[name][:, ind]
+            out = self._stored(name, self._storage_index(ind))
         else:
             # Aliased fields
-            alias, loc, func = self.aliasFields[name]
-
-            if isinstance(func, str):
-                assert hasattr(self, func), (
-                    "The alias field function is a string, but it does not "
-                    "exist in the Fields class."
-                )
-                func = getattr(self, func)
-            if not isinstance(src_list, list):
-                src_list = [src_list]
-            out = func(self._fields[alias][:, ind], src_list)
+            out = self._cached_alias(name, src_ind=ind)
+            if out is not None:
+                out = _from_cache(out, (slice(None), ind))
+            else:
+                alias, func = self._alias_function(name)
+                if not isinstance(src_list, list):
+                    src_list = [src_list]
+                out = func(self._stored(alias, (slice(None), ind)), src_list)
         # if out.shape[0] == out.size or out.ndim == 1:
         #     out = mkvc(out, 2)
         return out
@@ -482,21 +694,75 @@ class TimeFields(Fields):
         correctShape = field[:, srcInd, timeInd].shape
         field[:, srcInd, timeInd] = val.reshape(correctShape, order="F")
 
+    def _storage_index(self, ind):
+        srcInd, timeInd = ind
+        return (slice(None), srcInd, timeInd)
+
+    def stream(self, source_list, name, time_index=None):
+        """Iterate over a field source by source, at the given time steps.
+
+        While a source is being used, the :attr:`storage` backend reads the
+        stored field of the next source in the background.
+
+        Parameters
+        ----------
+        source_list : list of simpeg.survey.BaseSrc
+            The sources.
+        name : str
+            Name of the field.
+        time_index : int or slice, optional
+            Index of the time steps. All of them if ``None``.
+
+        Yields
+        ------
+        numpy.ndarray
+            The field of each source, as returned by
+            ``fields[src, name, time_index]``.
+        """
+        if time_index is None:
+            time_index = slice(None)
+        yield from self._stream(source_list, name, (time_index,))
+
+    def _evaluate_alias(self, name, key):
+        alias, func = self._alias_function(name)
+        src_list = self.survey.source_list
+        if key != name:
+            # functions integrating over all times take two arguments
+            pointerFields = self._stored(alias, (slice(None), slice(None), slice(None)))
+            try:
+                return np.asarray(func(pointerFields, slice(None, None, None)))
+            except TypeError:
+                return None
+
+        out = None
+        for tInd in range(self.simulation.nT + 1):
+            fieldI = self._stored(alias, (slice(None), slice(None), tInd))
+            outI = np.asarray(func(fieldI, src_list, tInd))
+            if out is None:
+                shape = (outI.shape[0], len(src_list), self.simulation.nT + 1)
+                out = np.empty(shape, dtype=outI.dtype)
+            out[:, :, tInd] = outI.reshape(shape[:2])
+        return out
+
     def _getField(self, name, ind, src_list):
         srcInd, timeInd = ind
 
         if name in self._fields:
-            out = self._fields[name][:, srcInd, timeInd]
+            out = self._stored(name, self._storage_index(ind))
         else:
             # Aliased fields
-            alias, loc, func = self.aliasFields[name]
-            if isinstance(func, str):
-                assert hasattr(self, func), (
-                    "The alias field function is a string, but it does "
-                    "not exist in the Fields class."
-                )
-                func = getattr(self, func)
-            pointerFields = self._fields[alias][:, srcInd, timeInd]
+            if timeInd == slice(None, None, None):
+                out = self._cached_alias(name, key=(name, "all_times"), src_ind=srcInd)
+                if out is not None:
+                    return _from_cache(out, (slice(None), srcInd))
+            out = self._cached_alias(name, src_ind=srcInd)
+            if out is not None:
+                out = _from_cache(out[:, srcInd], (Ellipsis, timeInd))
+                shape = self._correctShape(name, ind, deflate=True)
+                return out.reshape(shape, order="F")
+
+            alias, func = self._alias_function(name)
+            pointerFields = self._stored(alias, (slice(None), srcInd, timeInd))
             pointerShape = self._correctShape(alias, ind)
             pointerFields = pointerFields.reshape(pointerShape, order="F")
 
@@ -532,3 +798,11 @@ class TimeFields(Fields):
 
         shape = self._correctShape(name, ind, deflate=True)
         return out.reshape(shape, order="F")
+
+
+def _from_cache(values, index):
+    """Values of a cached array, copied if needed so callers can modify them."""
+    out = values[index]
+    if not out.flags.writeable:
+        out = out.copy()
+    return out
@@ -1,14 +1,24 @@
+import warnings
+
 import numpy as np
 import scipy.sparse as sp
-import gc
+from concurrent.futures import Executor
 from .data_misfit import BaseDataMisfit
 from .regularization import BaseRegularization, WeightedLeastSquares, Sparse
-from .objective_function import BaseObjectiveFunction, ComboObjectiveFunction
+from .objective_function import (
+    BaseObjectiveFunction,
+    ComboObjectiveFunction,
+    _timed_call,
+)
 from .optimization import Minimize
+from .profiling import traced
 from .utils import (
     call_hooks,
     timeIt,
     Counter,
+    GarbageCollectionPolicy,
+    ModelCache,
+    model_fingerprint,
     validate_float,
     validate_type,
     validate_ndarray_with_shape,
@@ -18,7 +28,13 @@ from .utils.solver_utils import get_default_solver
 
 
 class BaseInvProblem:
-    """BaseInvProblem(dmisfit, reg, opt)"""
+    """BaseInvProblem(dmisfit, reg, opt)
+
+    Fields and predicted data computed for a model are kept in
+    :py:attr:`fields_cache`, which is shared with the data misfits and used by
+    the directives, so that they are not recomputed for models that were
+    already evaluated.
+    """
 
     def __init__(
         self,
@@ -29,6 +45,9 @@ class BaseInvProblem:
         debug=False,
         counter=None,
         print_version=True,
+        executor=None,
+        fields_cache=None,
+        gc_policy="auto",
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -45,6 +64,14 @@ class BaseInvProblem:
         self.counter = counter
         self.model = None
         self.print_version = print_version
+        self.executor = executor
+        self._fields_times = {}
+        # Models stored by getFields, to list them in the deprecated warmstart
+        self._warmstart_models = {}
+        if fields_cache is None:
+            fields_cache = ModelCache(max_models=1)
+        self.fields_cache = fields_cache
+        self.gc_policy = gc_policy
         # TODO: Remove: (and make iteration printers better!)
         self.opt.parent = self
         self.reg.parent = self
@@ -95,6 +122,173 @@ class BaseInvProblem:
             value = validate_type("counter", value, Counter, cast=False)
         self._counter = value
 
+    @property
+    def executor(self):
+        """Executor used to compute the fields of the data misfits concurrently.
+
+        When set, :py:meth:`getFields` submits the ``fields`` call of the
+        simulation of each data misfit to this executor. The fields are
+        returned in the order of the data misfits. Use a
+        :class:`concurrent.futures.ThreadPoolExecutor` here: fields computed in
+        a process pool can't reuse the factorizations stored on the
+        simulations of this process.
+
+        To also evaluate the data misfit terms concurrently, set the
+        ``executor`` of :py:attr:`dmisfit` as well.
+
+        Returns
+        -------
+        None or concurrent.futures.Executor
+        """
+        return self._executor
+
+    @executor.setter
+    def executor(self, value):
+        if value is not None:
+            value = validate_type("executor", value, Executor, cast=False)
+        self._executor = value
+
+    @property
+    def fields_times(self):
+        """Wall times spent computing the fields of each data misfit.
+
+        Returns
+        -------
+        dict of {int: float}
+            Time in seconds spent in the ``fields`` method of the simulation
+            of each data misfit during the last call to :py:meth:`getFields`,
+            keyed by the index of the data misfit.
+        """
+        return self._fields_times
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    @property
+    def fields_cache(self):
+        """Cache of the fields and predicted data computed for each model.
+
+        The cache is keyed by a fingerprint of the values of the model, so
+        fields are reused whenever a model with the same values is evaluated
+        again (e.g. by the line search, or by directives computing
+        ``getJtJdiag``). It is shared with the data misfits in
+        :py:attr:`dmisfit`. By default, it holds the fields for the last
+        evaluated model only; increase its ``max_models`` to keep more.
+
+        Simulations drop their items from the cache when their survey,
+        mappings or physical properties are set. Clear the cache with
+        ``inv_prob.fields_cache.clear()`` after modifying a simulation in any
+        other way without changing the model.
+
+        Returns
+        -------
+        simpeg.utils.ModelCache
+        """
+        return self._fields_cache
+
+    @fields_cache.setter
+    def fields_cache(self, value):
+        self._fields_cache = validate_type(
+            "fields_cache", value, ModelCache, cast=False
+        )
+        self._share_fields_cache()
+
+    @property
+    def warmstart(self):
+        """Models and fields in the fields cache, as a list of ``(m, f)`` tuples.
+
+        .. deprecated:: 0.24.0
+
+            ``warmstart`` will be removed in SimPEG v0.26.0, please use
+            :py:attr:`fields_cache` instead.
+
+        Returns
+        -------
+        list of tuple
+            Model stored by :py:meth:`getFields` and the list of fields of the
+            simulation of each data misfit, for the models still in the cache.
+        """
+        warnings.warn(
+            "'warmstart' has been deprecated and will be removed in "
+            "SimPEG v0.26.0, please use 'fields_cache' instead.",
+            FutureWarning,
+            stacklevel=2,
+        )
+        simulations = self._simulations()
+        warmstart = []
+        for fingerprint, m in list(self._warmstart_models.items()):
+            f = [self.fields_cache.get(sim, m) for sim in simulations.values()]
+            if any(fields is None for fields in f):
+                del self._warmstart_models[fingerprint]
+            else:
+                warmstart.append((m, f))
+        return warmstart
+
+    @warmstart.setter
+    def warmstart(self, value):
+        warnings.warn(
+            "'warmstart' has been deprecated and will be removed in "
+            "SimPEG v0.26.0, please use 'fields_cache' instead.",
+            FutureWarning,
+            stacklevel=2,
+        )
+        value = validate_type("warmstart", value, list, cast=False)
+        for v in value:
+            if not isinstance(v, tuple) or len(v) != 2:
+                raise TypeError("warmstart must be a list of tuples (m, f).")
+            validate_type("m", v[0], np.ndarray, cast=False)
+        self.fields_cache.clear()
+        self._warmstart_models = {}
+        simulations = self._simulations()
+        for m, f in value:
+            if not isinstance(f, list):
+                f = [f]
+            for sim, fields in zip(simulations.values(), f):
+                self.fields_cache.put(sim, m, "fields", fields)
+            self._warmstart_models[model_fingerprint(m)] = m
+
+    def _simulations(self):
+        """Simulations of the data misfits, keyed by the index of the misfit."""
+        return {
+            i: objfct.simulation
+            for i, objfct in enumerate(self.dmisfit.objfcts)
+            if hasattr(objfct, "simulation")
+        }
+
+    def _share_fields_cache(self):
+        """Share the fields cache with the data misfits."""
+        cache = getattr(self, "_fields_cache", None)
+        if cache is None:
+            return
+        for objfct in self.dmisfit.objfcts:
+            if isinstance(objfct, BaseDataMisfit):
+                objfct.fields_cache = cache
+
+    @property
+    def gc_policy(self):
+        """Policy for the garbage collection run before each evaluation.
+
+        Full garbage collections release large objects held in reference
+        cycles (like factorizations of previous models), but are expensive
+        on large heaps. With ``"auto"``, a collection is only run when the
+        memory of the process grew significantly since the last one.
+
+        Returns
+        -------
+        simpeg.utils.GarbageCollectionPolicy
+        """
+        return self._gc_policy
+
+    @gc_policy.setter
+    def gc_policy(self, value):
+        if isinstance(value, str):
+            value = GarbageCollectionPolicy(policy=value)
+        self._gc_policy = validate_type(
+            "gc_policy", value, GarbageCollectionPolicy, cast=False
+        )
+
     @property
     def dmisfit(self) -> ComboObjectiveFunction:
         """The data misfit.
@@ -111,6 +305,7 @@ class BaseInvProblem:
         if not isinstance(value, ComboObjectiveFunction):
             value = ComboObjectiveFunction(objfcts=[value])
         self._dmisfit = value
+        self._share_fields_cache()
 
     @property
     def reg(self) -> ComboObjectiveFunction:
@@ -236,70 +431,99 @@ class BaseInvProblem:
             sp.csr_matrix(self.reg.deriv2(self.model)), **solver_opts
         )
 
-    @property
-    def warmstart(self):
-        return getattr(self, "_warmstart", [])
-
-    @warmstart.setter
-    def warmstart(self, value):
-        assert type(value) is list, "warmstart must be a list."
-        for v in value:
-            assert type(v) is tuple, "warmstart must be a list of tuples (m, u)."
-            assert (
-                len(v) == 2
-            ), "warmstart must be a list of tuples (m, u). YOURS IS NOT LENGTH 2!"
-            assert isinstance(
-                v[0], np.ndarray
-            ), "first warmstart value must be a model."
-        self._warmstart = value
-
-    def getFields(self, m, store=False, deleteWarmstart=True):
-        f = None
-
-        for mtest, u_ofmtest in self.warmstart:
-            if m is mtest:
-                f = u_ofmtest
-                if self.debug:
-                    print("InvProb is Warm Starting!")
-                break
+    def getFields(self, m, store=False, deleteWarmstart=None):
+        """Fields of the simulations of each data misfit for a model.
+
+        Parameters
+        ----------
+        m : numpy.ndarray
+            The model.
+        store : bool, optional
+            Whether to store the computed fields in :py:attr:`fields_cache`,
+            so that the data misfits and the directives reuse them. Fields
+            already in the cache are reused either way.
+        deleteWarmstart : bool, optional
+            Deprecated. If True, clear :py:attr:`fields_cache` before storing
+            the new fields. Use ``fields_cache.clear()`` instead.
 
-        if f is None:
-            if isinstance(self.dmisfit, BaseDataMisfit):
-                f = self.dmisfit.simulation.fields(m)
-
-            elif isinstance(self.dmisfit, BaseObjectiveFunction):
-                f = []
-                for objfct in self.dmisfit.objfcts:
-                    if hasattr(objfct, "simulation"):
-                        f += [objfct.simulation.fields(m)]
-                    else:
-                        f += []
+        Returns
+        -------
+        list
+            Fields for the simulation of each data misfit.
+        """
+        cache = self.fields_cache
+        if deleteWarmstart is not None:
+            warnings.warn(
+                "'deleteWarmstart' has been deprecated and will be removed in "
+                "SimPEG v0.26.0, please use 'fields_cache.clear()' instead.",
+                FutureWarning,
+                stacklevel=2,
+            )
+            if deleteWarmstart and store:
+                cache.clear()
+        simulations = self._simulations()
+        cached = {i: cache.get(sim, m) for i, sim in simulations.items()}
+        to_compute = {i: sim for i, sim in simulations.items() if cached[i] is None}
+        if self.debug and len(to_compute) < len(simulations):
+            print("InvProb is Warm Starting!")
+
+        if self.executor is None:
+            results = {i: _timed_call(sim.fields, m) for i, sim in to_compute.items()}
+        else:
+            futures = {
+                i: self.executor.submit(_timed_call, sim.fields, m)
+                for i, sim in to_compute.items()
+            }
+            results = {i: future.result() for i, future in futures.items()}
+
+        self._fields_times = {i: elapsed for i, (_, elapsed) in results.items()}
+        if isinstance(self.counter, Counter):
+            for i, elapsed in self._fields_times.items():
+                self.counter.countTime(
+                    f"{self.__class__.__name__}.getFields[{i}]", elapsed
+                )
 
-        if deleteWarmstart:
-            self.warmstart = []
+        f = []
+        for i, sim in simulations.items():
+            if i in results:
+                fields = results[i][0]
+                if store:
+                    cache.put(sim, m, "fields", fields)
+            else:
+                fields = cached[i]
+            f.append(fields)
         if store:
-            self.warmstart += [(m, f)]
-
+            models = self._warmstart_models
+            fingerprint = model_fingerprint(m)
+            models.pop(fingerprint, None)
+            models[fingerprint] = m
+            while len(models) > max(cache.max_models, 1):
+                del models[next(iter(models))]
         return f
 
     def get_dpred(self, m, f):
         dpred = []
         for i, objfct in enumerate(self.dmisfit.objfcts):
             if hasattr(objfct, "simulation"):
-                dpred += [objfct.simulation.dpred(m, f=f[i])]
+                sim = objfct.simulation
+                d = self.fields_cache.get(sim, m, "dpred")
+                if d is None:
+                    d = sim.dpred(m, f=f[i])
+                    self.fields_cache.put(sim, m, "dpred", d)
+                dpred += [d]
             else:
                 dpred += []
         return np.hstack(dpred)
 
+    @traced("inversion")
     @timeIt
     def evalFunction(self, m, return_g=True, return_H=True):
         """evalFunction(m, return_g=True, return_H=True)"""
 
         self.model = m
-        gc.collect()
+        self.gc_policy()
 
-        # Store fields if doing a line-search
-        f = self.getFields(m, store=(return_g is False and return_H is False))
+        f = self.getFields(m, store=True)
 
         # if isinstance(self.dmisfit, BaseDataMisfit):
         phi_d = self.dmisfit(m, f=f)
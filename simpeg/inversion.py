@@ -2,6 +2,7 @@ import numpy as np
 
 from .optimization import IterationPrinters, StoppingCriteria
 from .directives import DirectiveList
+from .profiling import traced
 from .utils import timeIt, Counter, validate_type, validate_string
 
 
@@ -100,6 +101,7 @@ class BaseInversion(object):
         self._directiveList = value
         self._directiveList.inversion = self
 
+    @traced("inversion")
     @timeIt
     def run(self, m0):
         """run(m0)
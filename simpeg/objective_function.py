@@ -1,4 +1,7 @@
 import numbers
+import time
+from concurrent.futures import Executor
+
 import numpy as np
 import scipy.sparse as sp
 
@@ -6,7 +9,8 @@ from discretize.tests import check_derivative
 
 from .maps import IdentityMap
 from .props import BaseSimPEG
-from .utils import timeIt, Zero, Identity
+from .profiling import _trace_methods
+from .utils import timeIt, Zero, Identity, Counter, validate_type
 from .typing import RandomSeed
 
 __all__ = ["BaseObjectiveFunction", "ComboObjectiveFunction", "L2ObjectiveFunction"]
@@ -49,6 +53,13 @@ class BaseObjectiveFunction(BaseSimPEG):
 
     map_class = IdentityMap  #: Base class of expected maps.
 
+    # Methods recorded as spans while a simpeg.profiling.Profiler is active
+    _traced_methods = ("__call__", "deriv", "deriv2")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _trace_methods(cls, cls._traced_methods, "objective_function")
+
     def __init__(
         self,
         nP=None,
@@ -281,6 +292,15 @@ class BaseObjectiveFunction(BaseSimPEG):
                 "function. Only ObjectiveFunctions can be added together."
             )
         objective_functions, multipliers = [], []
+        # Keep the executor of the combos being added
+        executor = next(
+            (
+                instance.executor
+                for instance in (self, other)
+                if getattr(instance, "executor", None) is not None
+            ),
+            None,
+        )
         for instance in (self, other):
             if isinstance(instance, ComboObjectiveFunction) and instance._unpack_on_add:
                 objective_functions += instance.objfcts
@@ -289,7 +309,7 @@ class BaseObjectiveFunction(BaseSimPEG):
                 objective_functions.append(instance)
                 multipliers.append(1)
         combo = ComboObjectiveFunction(
-            objfcts=objective_functions, multipliers=multipliers
+            objfcts=objective_functions, multipliers=multipliers, executor=executor
         )
         return combo
 
@@ -297,7 +317,11 @@ class BaseObjectiveFunction(BaseSimPEG):
         return self + other
 
     def __mul__(self, multiplier):
-        return ComboObjectiveFunction(objfcts=[self], multipliers=[multiplier])
+        return ComboObjectiveFunction(
+            objfcts=[self],
+            multipliers=[multiplier],
+            executor=getattr(self, "executor", None),
+        )
 
     def __rmul__(self, multiplier):
         return self * multiplier
@@ -312,6 +336,11 @@ class BaseObjectiveFunction(BaseSimPEG):
         return self * (1.0 / denominator)
 
 
+_trace_methods(
+    BaseObjectiveFunction, BaseObjectiveFunction._traced_methods, "objective_function"
+)
+
+
 class ComboObjectiveFunction(BaseObjectiveFunction):
     r"""Composite for multiple objective functions.
 
@@ -334,6 +363,9 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
     unpack_on_add : bool
         Whether to unpack the multiple objective functions when adding them to
         another objective function, or to add them as a whole.
+    executor : None or concurrent.futures.Executor, optional
+        Executor used to evaluate the objective functions concurrently. If
+        ``None``, they are evaluated sequentially. See :py:attr:`executor`.
 
     Examples
     --------
@@ -391,6 +423,7 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
         objfcts: list[BaseObjectiveFunction] | None = None,
         multipliers=None,
         unpack_on_add=True,
+        executor=None,
     ):
         # Define default lists if None
         if objfcts is None:
@@ -416,6 +449,15 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
         self.objfcts = objfcts
         self._multipliers = multipliers
         self._unpack_on_add = unpack_on_add
+        self.executor = executor
+        self._term_times = {}
+
+    def __getstate__(self):
+        # Executors cannot be pickled (e.g. when sending the objective
+        # function to a worker process), so drop it from the state.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
 
     def __len__(self):
         return len(self.multipliers)
@@ -451,31 +493,107 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
         _check_length_objective_funcs_multipliers(self.objfcts, value)
         self._multipliers = value
 
-    def __call__(self, m, f=None):
-        """Evaluate the objective functions for a given model."""
-        fct = 0.0
+    @property
+    def executor(self):
+        """Executor used to evaluate the objective functions concurrently.
+
+        When set, every objective function with a non-zero multiplier is
+        submitted to this executor on calls to the combo objective function
+        and to its :py:meth:`deriv` and :py:meth:`deriv2` methods. Results are
+        always summed in the order of :py:attr:`objfcts`, so the concurrent
+        and serial evaluations return identical values.
+
+        A :class:`concurrent.futures.ThreadPoolExecutor` is well suited when
+        the objective functions spend their time in code that releases the
+        GIL (e.g. direct solvers or numba kernels). A
+        :class:`concurrent.futures.ProcessPoolExecutor` requires the objective
+        functions to be picklable, and any state they modify while being
+        evaluated (e.g. cached fields) is not sent back to this process. Start
+        its workers with the ``"spawn"`` method (see ``mp_context``) if numba
+        kernels run in this process, since forking a process that runs numba
+        threads is unsafe.
+
+        .. important::
+            The objective functions must be independent of each other, for
+            instance data misfits with their own simulations. Objective
+            functions that share a simulation or a mapping should not be
+            evaluated concurrently.
+
+        Returns
+        -------
+        None or concurrent.futures.Executor
+        """
+        return self._executor
+
+    @executor.setter
+    def executor(self, value):
+        if value is not None:
+            value = validate_type("executor", value, Executor, cast=False)
+        self._executor = value
+
+    @property
+    def term_times(self):
+        """Wall times spent evaluating each objective function in the last call.
+
+        Returns
+        -------
+        dict of {int: float}
+            Time in seconds spent on each objective function, keyed by its
+            index in :py:attr:`objfcts`. Objective functions with a zero
+            multiplier are not evaluated and are not included.
+        """
+        return self._term_times
+
+    def _evaluate_terms(self, method, m, *args, f=None):
+        """Evaluate a method of every objective function with a non-zero multiplier.
+
+        Returns a list of ``(multiplier, result)`` in the order of the
+        objective functions, which is the order in which they must be reduced.
+        """
+        calls = {}
         for i, phi in enumerate(self):
             multiplier, objfct = phi
             if multiplier == 0.0:  # don't evaluate the fct
                 continue
-            if f is not None and objfct.has_fields:
-                objective_func_value = objfct(m, f=f[i])
-            else:
-                objective_func_value = objfct(m)
+            fun = objfct if method == "__call__" else getattr(objfct, method)
+            kwargs = {"f": f[i]} if f is not None and objfct.has_fields else {}
+            calls[i] = (fun, kwargs)
+
+        if self.executor is None:
+            results = {
+                i: _timed_call(fun, m, *args, **kwargs)
+                for i, (fun, kwargs) in calls.items()
+            }
+        else:
+            futures = {
+                i: self.executor.submit(_timed_call, fun, m, *args, **kwargs)
+                for i, (fun, kwargs) in calls.items()
+            }
+            results = {i: future.result() for i, future in futures.items()}
+
+        self._term_times = {i: elapsed for i, (_, elapsed) in results.items()}
+        if isinstance(self.counter, Counter):
+            for i, elapsed in self._term_times.items():
+                self.counter.countTime(
+                    f"{self.__class__.__name__}.{method}"
+                    f"[{i}: {self.objfcts[i].__class__.__name__}]",
+                    elapsed,
+                )
+        return [(self.multipliers[i], results[i][0]) for i in calls]
+
+    def __call__(self, m, f=None):
+        """Evaluate the objective functions for a given model."""
+        fct = 0.0
+        for multiplier, objective_func_value in self._evaluate_terms(
+            "__call__", m, f=f
+        ):
             fct += multiplier * objective_func_value
         return fct
 
     def deriv(self, m, f=None):
         # Docstring inherited from BaseObjectiveFunction
         g = Zero()
-        for i, phi in enumerate(self):
-            multiplier, objfct = phi
-            if multiplier == 0.0:  # don't evaluate the fct
-                continue
-            if f is not None and objfct.has_fields:
-                aux = objfct.deriv(m, f=f[i])
-            else:
-                aux = objfct.deriv(m)
+        for multiplier, aux in self._evaluate_terms("deriv", m, f=f):
             if not isinstance(aux, Zero):
                 g += multiplier * aux
         return g
@@ -483,14 +601,7 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
     def deriv2(self, m, v=None, f=None):
         # Docstring inherited from BaseObjectiveFunction
         H = Zero()
-        for i, phi in enumerate(self):
-            multiplier, objfct = phi
-            if multiplier == 0.0:  # don't evaluate the fct
-                continue
-            if f is not None and objfct.has_fields:
-                objfct_H = objfct.deriv2(m, v, f=f[i])
-            else:
-                objfct_H = objfct.deriv2(m, v)
+        for multiplier, objfct_H in self._evaluate_terms("deriv2", m, v, f=f):
             H = H + multiplier * objfct_H
         return H
 
@@ -646,6 +757,17 @@ class L2ObjectiveFunction(BaseObjectiveFunction):
         return 2 * W.T * W
 
 
+def _timed_call(fun, *args, **kwargs):
+    """
+    Call a function and measure the wall time it takes.
+
+    Defined at the module level so it can be submitted to process pools.
+    """
+    start = time.perf_counter()
+    out = fun(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
 def _validate_objective_functions(objective_functions):
     """
     Validate objective functions.
@@ -15,12 +15,22 @@ Base classes and utility functions
   base.BasePFSimulation
   base.BaseEquivalentSourceLayerSimulation
   base.progress
+  base.close_worker_pools
   get_dist_wgt
 
+Equivalent sources
+==================
+
+.. autosummary::
+  :toctree: generated/
+
+  WindowedEquivalentSources
+
 
 """
 
 from . import magnetics
 from . import gravity
 
-from .base import get_dist_wgt
+from .base import get_dist_wgt, close_worker_pools
+from .equivalent_sources import WindowedEquivalentSources
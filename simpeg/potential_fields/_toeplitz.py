@@ -0,0 +1,319 @@
+"""
+Sensitivity matrices of gridded surveys as block Toeplitz operators.
+
+When the receivers lie on a horizontal grid with the same spacing as the cells
+of a :class:`discretize.TensorMesh` with uniform horizontal cell sizes, the
+block of the sensitivity matrix of each horizontal layer of cells is block
+Toeplitz with Toeplitz blocks (BTTB): its elements only depend on the
+horizontal offset between receivers and cells. The whole block is then defined
+by a single kernel over every possible offset, and its products with vectors
+are 2D convolutions that can be computed with FFTs.
+"""
+
+import copy
+
+import numpy as np
+from discretize import TensorMesh
+from scipy.sparse.linalg import LinearOperator
+
+
+class ToeplitzSensitivities:
+    r"""
+    Sensitivity matrix of a gridded survey stored as kernels of each layer.
+
+    Only the kernel of every horizontal layer of cells, evaluated on every
+    possible offset between receivers and cells, is stored. The products
+    ``G @ m`` and ``G.T @ v`` are computed as 2D convolutions with FFTs.
+    Inactive cells are masked out of the model, and receivers that don't
+    cover the full grid are gathered from the grid of predicted data.
+
+    Parameters
+    ----------
+    simulation : simpeg.potential_fields.base.BasePFSimulation
+        Gravity or magnetic integral simulation. Its mesh must be a 3D
+        :class:`discretize.TensorMesh` with uniform cell sizes along the
+        horizontal directions, and its receivers must lie at the same height
+        on a grid with the same spacing as the cells.
+
+    Notes
+    -----
+    The kernels of the :math:`n_z` layers take :math:`\mathcal{O}(n_z (n_x +
+    n_{rx}) (n_y + n_{ry}))` memory, instead of the :math:`\mathcal{O}(n_D
+    n_C)` of the full sensitivity matrix, and each product costs
+    :math:`\mathcal{O}(n_z\, n \log n)` operations.
+    """
+
+    def __init__(self, simulation):
+        mesh = simulation.mesh
+        receivers = simulation.survey.source_field.receiver_list
+        self._check_mesh(mesh)
+        locations = np.vstack([receiver.locations for receiver in receivers])
+        spacing = np.array([mesh.h[0][0], mesh.h[1][0]])
+        grid_indices, corner = self._grid_indices(locations, spacing)
+
+        self.active_cells = simulation.active_cells
+        self.shape_cells = tuple(mesh.shape_cells[::-1])  # (nz, ny, nx)
+        self.n_blocks = 3 if getattr(simulation, "model_type", None) == "vector" else 1
+        self.shape_receivers = tuple(grid_indices.max(axis=0)[::-1] + 1)  # (ny, nx)
+        self.shape_kernels = tuple(
+            n_cells + n_receivers - 1
+            for n_cells, n_receivers in zip(self.shape_cells[1:], self.shape_receivers)
+        )
+
+        # Component and position on the receivers grid of each datum
+        self.components = list(
+            dict.fromkeys(c for receiver in receivers for c in receiver.components)
+        )
+        data_components, data_grid_indices = [], []
+        start = 0
+        for receiver in receivers:
+            n_locations = receiver.locations.shape[0]
+            indices = grid_indices[start : start + n_locations]
+            flat_indices = indices[:, 1] * self.shape_receivers[1] + indices[:, 0]
+            data_components.append(
+                np.tile(
+                    [self.components.index(c) for c in receiver.components],
+                    n_locations,
+                )
+            )
+            data_grid_indices.append(np.repeat(flat_indices, len(receiver.components)))
+            start += n_locations
+        self.data_components = np.concatenate(data_components)
+        self.data_grid_indices = np.concatenate(data_grid_indices)
+
+        self.kernels = self._layer_kernels(simulation, corner, spacing)
+        self._kernels_fft = np.fft.rfft2(self.kernels, s=self.shape_kernels)
+
+    @property
+    def shape(self):
+        """Shape of the sensitivity matrix."""
+        n_active = int(np.count_nonzero(self.active_cells))
+        return (self.data_components.size, self.n_blocks * n_active)
+
+    @staticmethod
+    def _check_mesh(mesh):
+        """Check if the mesh has uniform horizontal cells."""
+        if not isinstance(mesh, TensorMesh) or mesh.dim != 3:
+            raise ValueError(
+                'store_sensitivities="fft" requires a 3D TensorMesh, '
+                f"but got a {mesh.dim}D {type(mesh).__name__}."
+            )
+        for h, direction in zip(mesh.h[:2], "xy"):
+            if not np.allclose(h, h[0], rtol=1e-6, atol=0):
+                raise ValueError(
+                    'store_sensitivities="fft" requires uniform cell sizes '
+                    f"along the {direction} direction."
+                )
+
+    @staticmethod
+    def _grid_indices(locations, spacing, rtol=1e-6):
+        """
+        Return the indices of the receivers on a grid with the cells spacing.
+
+        Returns
+        -------
+        grid_indices : (n_locations, 2) numpy.ndarray of int
+            Indices of the receivers along the x and y directions.
+        corner : (3,) numpy.ndarray
+            Location of the receiver grid node with the (0, 0) indices.
+        """
+        corner = locations.min(axis=0)
+        if not np.allclose(locations[:, 2], corner[2], atol=rtol * spacing.min()):
+            raise ValueError(
+                'store_sensitivities="fft" requires every receiver at the same height.'
+            )
+        grid_indices = (locations[:, :2] - corner[:2]) / spacing
+        rounded = np.round(grid_indices)
+        if not np.allclose(grid_indices, rounded, atol=rtol, rtol=0):
+            raise ValueError(
+                'store_sensitivities="fft" requires the receivers on a grid '
+                "with the same horizontal spacing as the cells of the mesh."
+            )
+        return rounded.astype(np.int64), corner
+
+    def _layer_kernels(self, simulation, corner, spacing):
+        """
+        Compute the kernels of each layer on every receiver-cell offset.
+
+        The kernels are the sensitivities of a single column of cells, placed
+        at the first horizontal cell of the mesh, on a grid of virtual
+        receivers that span every offset between the receivers and the cells.
+
+        Returns
+        -------
+        (n_components, n_blocks, nz, n_offsets_y, n_offsets_x) numpy.ndarray
+        """
+        mesh = simulation.mesh
+        n_z, n_y, n_x = self.shape_cells
+        n_offsets_y, n_offsets_x = self.shape_kernels
+        offsets_x = np.arange(n_offsets_x) - (n_x - 1)
+        offsets_y = np.arange(n_offsets_y) - (n_y - 1)
+        x, y = np.meshgrid(
+            corner[0] + offsets_x * spacing[0], corner[1] + offsets_y * spacing[1]
+        )
+        virtual_locations = np.c_[x.ravel(), y.ravel(), np.full(x.size, corner[2])]
+
+        # Build a simulation with a single column of cells and the virtual
+        # receivers, that evaluates the kernels like the original one
+        receiver = simulation.survey.source_field.receiver_list[0]
+        source_field = copy.copy(simulation.survey.source_field)
+        source_field.receiver_list = [
+            type(receiver)(virtual_locations, components=self.components)
+        ]
+        column_mesh = TensorMesh(
+            [[spacing[0]], [spacing[1]], mesh.h[2]], origin=mesh.origin
+        )
+        kwargs = dict(
+            survey=type(simulation.survey)(source_field),
+            engine=simulation.engine,
+            store_sensitivities="ram",
+            sensitivity_dtype=np.float64,
+        )
+        if simulation.engine == "choclo":
+            kwargs["numba_parallel"] = simulation.numba_parallel
+        if self.n_blocks == 3:
+            kwargs["model_type"] = "vector"
+        column = type(simulation)(column_mesh, **kwargs)
+        magnetization = getattr(simulation, "_M", None)
+        if self.n_blocks == 1 and magnetization is not None:
+            # Custom magnetization directions must be the same for every cell
+            if not np.allclose(magnetization, magnetization[0]):
+                raise ValueError(
+                    'store_sensitivities="fft" requires the same magnetization '
+                    "direction for every cell."
+                )
+            column.M = np.tile(magnetization[0], (n_z, 1))
+
+        kernels = np.asarray(column.G, dtype=np.float64)
+        kernels = kernels.reshape(
+            n_offsets_y, n_offsets_x, len(self.components), self.n_blocks, n_z
+        )
+        return np.ascontiguousarray(kernels.transpose(2, 3, 4, 0, 1))
+
+    def _model_to_grid(self, model):
+        """Place a model of the active cells on the full grid of cells."""
+        grid = np.zeros((self.n_blocks, self.active_cells.size))
+        grid[:, self.active_cells] = model.reshape(self.n_blocks, -1)
+        return grid.reshape(self.n_blocks, *self.shape_cells)
+
+    def _data_to_grid(self, vector):
+        """Scatter a data vector on the receivers grid of each component."""
+        grid = np.zeros((len(self.components), np.prod(self.shape_receivers)))
+        np.add.at(grid, (self.data_components, self.data_grid_indices), vector)
+        return grid.reshape(len(self.components), *self.shape_receivers)
+
+    def _pad_receivers_grid(self, grid):
+        """Place a grid of receivers values in the array of kernel offsets."""
+        n_y, n_x = self.shape_cells[1:]
+        padded = np.zeros(grid.shape[:-2] + self.shape_kernels)
+        padded[..., n_y - 1 :, n_x - 1 :] = grid
+        return padded
+
+    def dot(self, model):
+        """
+        Compute ``G @ m``.
+
+        Parameters
+        ----------
+        model : (n_blocks * n_active_cells) numpy.ndarray
+
+        Returns
+        -------
+        (nD) numpy.ndarray
+        """
+        model_fft = np.fft.rfft2(self._model_to_grid(model), s=self.shape_kernels)
+        data_fft = np.einsum("cbkyx,bkyx->cyx", self._kernels_fft, model_fft)
+        data = np.fft.irfft2(data_fft, s=self.shape_kernels)
+        n_y, n_x = self.shape_cells[1:]
+        data = data[:, n_y - 1 :, n_x - 1 :].reshape(len(self.components), -1)
+        return data[self.data_components, self.data_grid_indices]
+
+    def transpose_dot(self, vector):
+        """
+        Compute ``G.T @ v``.
+
+        Parameters
+        ----------
+        vector : (nD) numpy.ndarray
+
+        Returns
+        -------
+        (n_blocks * n_active_cells) numpy.ndarray
+        """
+        grid = self._pad_receivers_grid(self._data_to_grid(vector))
+        grid_fft = np.fft.rfft2(grid)
+        model_fft = np.einsum("cbkyx,cyx->bkyx", self._kernels_fft.conj(), grid_fft)
+        return self._correlation_to_model(model_fft)
+
+    def _correlation_to_model(self, model_fft):
+        """Crop the correlations on the cells and keep the active ones."""
+        n_y, n_x = self.shape_cells[1:]
+        model = np.fft.irfft2(model_fft, s=self.shape_kernels)[..., :n_y, :n_x]
+        model = model.reshape(self.n_blocks, -1)
+        return model[:, self.active_cells].ravel()
+
+    def gtg_diagonal(self, grid_weights):
+        r"""
+        Compute the diagonal of ``G.T @ W.T @ W @ G``.
+
+        Parameters
+        ----------
+        grid_weights : (n_components, n_components, ny, nx) numpy.ndarray
+            Weights of the products between the rows of every pair of
+            components, on the receivers grid. For data weights :math:`w_i`,
+            only the diagonal ``grid_weights[c, c]`` is not zero, and it's
+            equal to the data weights of the component ``c`` on the grid.
+
+        Returns
+        -------
+        (n_blocks * n_active_cells) numpy.ndarray
+        """
+        n_components = len(self.components)
+        model_fft = 0
+        for i in range(n_components):
+            for j in range(i, n_components):
+                if not np.any(grid_weights[i, j]):
+                    continue
+                factor = 1 if i == j else 2
+                products_fft = np.fft.rfft2(self.kernels[i] * self.kernels[j])
+                weights_fft = np.fft.rfft2(
+                    self._pad_receivers_grid(factor * grid_weights[i, j])
+                )
+                model_fft = model_fft + products_fft.conj() * weights_fft
+        if np.isscalar(model_fft):
+            return np.zeros(self.shape[1])
+        return self._correlation_to_model(model_fft)
+
+    def data_weights_to_grid(self, weights):
+        """
+        Return the grid weights of :meth:`gtg_diagonal` for data weights.
+
+        Parameters
+        ----------
+        weights : (nD) numpy.ndarray
+            Data weights: diagonal of ``W.T @ W``.
+
+        Returns
+        -------
+        (n_components, n_components, ny, nx) numpy.ndarray
+        """
+        n_components = len(self.components)
+        grid_weights = np.zeros((n_components, n_components, *self.shape_receivers))
+        diagonal = np.arange(n_components)
+        grid_weights[diagonal, diagonal] = self._data_to_grid(weights)
+        return grid_weights
+
+    def as_operator(self):
+        """
+        Return the sensitivity matrix as a LinearOperator.
+
+        Returns
+        -------
+        scipy.sparse.linalg.LinearOperator
+        """
+        return LinearOperator(
+            shape=self.shape,
+            matvec=self.dot,
+            rmatvec=self.transpose_dot,
+            dtype=np.float64,
+        )
@@ -1,6 +1,13 @@
+import atexit
+import copy
+import gc
+import multiprocessing
 import os
+import pickle
+import threading
 import warnings
-from multiprocessing.pool import Pool
+import weakref
+from multiprocessing import resource_tracker, shared_memory
 
 import discretize
 import numpy as np
@@ -10,6 +17,7 @@ from scipy.sparse import csr_matrix as csr
 from simpeg.utils import mkvc
 
 from ..simulation import LinearSimulation
+from ._toeplitz import ToeplitzSensitivities
 from ..utils import validate_active_indices, validate_integer, validate_string
 from ..utils.code_utils import deprecate_property, validate_type
 
@@ -18,6 +26,10 @@ try:
 except ImportError:
     choclo = None
 
+# Number of node values (8 per active cell and receiver) evaluated at once by
+# each call to ``evaluate_integral`` when building the linear operator
+_BLOCK_SIZE = 2**16
+
 ###############################################################################
 #                                                                             #
 #                             Base Potential Fields Simulation                #
@@ -45,18 +57,24 @@ class BasePFSimulation(LinearSimulation):
         A 3D tensor or tree mesh.
     active_cells : np.ndarray of int or bool
         Indices array denoting the active topography cells.
-    store_sensitivities : {'ram', 'disk', 'forward_only'}
-        Options for storing sensitivities. There are 3 options
+    store_sensitivities : {'ram', 'disk', 'forward_only', 'fft'}
+        Options for storing sensitivities. There are 4 options
 
         - 'ram': sensitivities are stored in the computer's RAM
         - 'disk': sensitivities are written to a directory
         - 'forward_only': you intend only do perform a forward simulation and sensitivities do not need to be stored
+        - 'fft': only the kernel of each horizontal layer of cells is stored, and products with the
+          sensitivity matrix are computed with FFTs. Requires a TensorMesh with uniform horizontal
+          cell sizes and receivers at the same height on a grid with the same spacing as the cells;
+          otherwise, a warning is issued and the sensitivities are stored in RAM like with 'ram'.
 
     n_processes : None or int, optional
         The number of processes to use in the internal multiprocessing pool for forward
         modeling. The default value of 1 will not use multiprocessing. Any other setting
-        will. `None` implies setting by the number of cpus. If engine is
-        ``"choclo"``, then this argument will be ignored.
+        will. `None` implies setting by the number of cpus. The pool is started
+        once and reused by later forward modelings of every simulation, and
+        the active nodes are passed to its processes through shared memory.
+        If engine is ``"choclo"``, then this argument will be ignored.
     engine : {"geoana", "choclo"}, optional
        Choose which engine should be used to run the forward model.
     numba_parallel : bool, optional
@@ -73,10 +91,9 @@ class BasePFSimulation(LinearSimulation):
     Notes
     -----
     If using multiprocessing by setting `n_processes` to a value other than 1, you must
-    be aware of the method your operating system uses to spawn the subprocesses. On
-    Windows the default method starts new processes that all import the main script.
-    Therefor you must protect the calls to this class by testing if you are in
-    the main process with:
+    be aware that the worker processes are started with the ``forkserver`` method
+    (``spawn`` on Windows), so they all import the main script. Therefore you must
+    protect the calls to this class by testing if you are in the main process with:
 
     >>> from simpeg.potential_fields import gravity
     >>> if __name__ == '__main__':
@@ -197,15 +214,17 @@ class BasePFSimulation(LinearSimulation):
     def store_sensitivities(self):
         """Options for storing sensitivities.
 
-        There are 3 options:
+        There are 4 options:
 
         - 'ram': sensitivity matrix stored in RAM
         - 'disk': sensitivities written and stored to disk
         - 'forward_only': sensitivities are not store (only use for forward simulation)
+        - 'fft': kernels of each layer of cells stored in RAM, for gridded surveys,
+          falling back to 'ram' with a warning for other surveys and meshes
 
         Returns
         -------
-        {'disk', 'ram', 'forward_only'}
+        {'disk', 'ram', 'forward_only', 'fft'}
             A string defining the model type for the simulation.
         """
         if self._store_sensitivities is None:
@@ -215,7 +234,7 @@ class BasePFSimulation(LinearSimulation):
     @store_sensitivities.setter
     def store_sensitivities(self, value):
         self._store_sensitivities = validate_string(
-            "store_sensitivities", value, ["disk", "ram", "forward_only"]
+            "store_sensitivities", value, ["disk", "ram", "forward_only", "fft"]
         )
 
     @property
@@ -322,6 +341,31 @@ class BasePFSimulation(LinearSimulation):
         error=False,
     )
 
+    def _fft_sensitivities(self):
+        """Layer kernels of the sensitivities stored with ``store_sensitivities="fft"``.
+
+        Returns ``None``, and warns once, if the mesh or the survey don't define
+        block Toeplitz sensitivities. The dense sensitivity matrix is then
+        stored in RAM instead.
+
+        Returns
+        -------
+        simpeg.potential_fields._toeplitz.ToeplitzSensitivities or None
+        """
+        if self.store_sensitivities != "fft":
+            return None
+        if getattr(self, "_toeplitz_sensitivities", None) is None:
+            try:
+                self._toeplitz_sensitivities = ToeplitzSensitivities(self)
+            except ValueError as error:
+                warnings.warn(
+                    f"{error} Storing the dense sensitivity matrix in RAM instead.",
+                    UserWarning,
+                    stacklevel=3,
+                )
+                self._toeplitz_sensitivities = False
+        return self._toeplitz_sensitivities or None
+
     def linear_operator(self):
         """Return linear operator.
 
@@ -349,24 +393,12 @@ class BasePFSimulation(LinearSimulation):
         dtype = self.sensitivity_dtype
         kernel = np.empty(kernel_shape, dtype=dtype)
         if self.n_processes == 1:
-            id0 = 0
-            for args in self.survey._location_component_iterator():
-                rows = self.evaluate_integral(*args)
-                n_c = rows.shape[0]
-                id1 = id0 + n_c
-                kernel[id0:id1] = rows.astype(dtype, copy=False)
-                id0 = id1
+            for start, locations, components in self._location_component_blocks():
+                rows = self.evaluate_integral(locations, components)
+                _write_rows(kernel, start, rows)
         else:
             # multiprocessed
-            with Pool(processes=self.n_processes) as pool:
-                id0 = 0
-                for rows in pool.starmap(
-                    self.evaluate_integral, self.survey._location_component_iterator()
-                ):
-                    n_c = rows.shape[0]
-                    id1 = id0 + n_c
-                    kernel[id0:id1] = rows.astype(dtype, copy=False)
-                    id0 = id1
+            self._evaluate_blocks_in_pool(kernel)
 
         # if self.store_sensitivities != "forward_only":
         #     kernel = np.vstack(kernel)
@@ -378,6 +410,86 @@ class BasePFSimulation(LinearSimulation):
             np.save(sens_name, kernel)
         return kernel
 
+    def _location_component_blocks(self, block_size=None):
+        """
+        Generator for blocks of receiver locations that share their components.
+
+        Yields the index of the first row of each block in the linear operator,
+        the receiver locations of the block and their components.
+        """
+        if block_size is None:
+            block_size = max(1, _BLOCK_SIZE // (8 * self.nC))
+        start = 0
+        for receiver in self.survey.source_field.receiver_list:
+            n_components = len(receiver.components)
+            for i in range(0, receiver.locations.shape[0], block_size):
+                locations = receiver.locations[i : i + block_size]
+                yield start, locations, receiver.components
+                start += locations.shape[0] * n_components
+
+    def _node_offsets(self, receiver_location):
+        """
+        Return the vectors from one or several receivers to the active nodes.
+
+        Receivers with shape ``(3,)`` or ``(n_receivers, 3)`` are broadcast
+        against the nodes, so the receivers are kept in the leading axes of the
+        returned array.
+        """
+        receiver_location = np.asarray(receiver_location)
+        shape = receiver_location.shape[:-1] + (1,) * (self._nodes.ndim - 1) + (3,)
+        return self._nodes - receiver_location.reshape(shape)
+
+    def _evaluate_blocks_in_pool(self, kernel):
+        """
+        Fill the linear operator with blocks of rows evaluated by the workers.
+        """
+        n_processes = self.n_processes or os.cpu_count()
+        pool = _get_worker_pool(n_processes)
+        n_locations = sum(
+            receiver.locations.shape[0]
+            for receiver in self.survey.source_field.receiver_list
+        )
+        # Split the receivers in a few blocks per process to balance the load
+        block_size = min(
+            max(1, _BLOCK_SIZE // (8 * self.nC)),
+            -(-n_locations // (4 * n_processes)),
+        )
+        node_specs = self._get_shared_nodes().specs
+        # The workers unpickle the rest of the simulation once per call
+        snapshot = copy.copy(self)
+        snapshot._nodes = None
+        snapshot._unique_inv = None
+        data = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        shared_snapshot = _SharedArrays(np.frombuffer(data, dtype=np.uint8))
+        try:
+            tasks = (
+                (node_specs, shared_snapshot.specs[0], start, locations, components)
+                for start, locations, components in self._location_component_blocks(
+                    block_size
+                )
+            )
+            for start, rows in pool.imap_unordered(_evaluate_block, tasks):
+                _write_rows(kernel, start, rows)
+        finally:
+            # Don't keep the simulation alive in the idle workers
+            _clear_worker_states(pool, n_processes)
+            shared_snapshot.close()
+
+    def _get_shared_nodes(self):
+        """
+        Return the copies of the active nodes in shared memory, creating them if needed.
+        """
+        shared_nodes = getattr(self, "_shared_nodes", None)
+        if shared_nodes is None:
+            shared_nodes = _SharedArrays(self._nodes, self._unique_inv)
+            self._shared_nodes = shared_nodes
+        return shared_nodes
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shared_nodes"] = None
+        return state
+
     def _check_engine_and_sensitivity_path(self):
         """
         Check if sensitivity_path is a file if engine is set to "choclo"
@@ -504,6 +616,185 @@ class BaseEquivalentSourceLayerSimulation(BasePFSimulation):
         self._mesh = value
 
 
+def _write_rows(kernel, start, rows):
+    """
+    Write the rows of a block of receivers in the linear operator.
+    """
+    rows = rows.reshape(-1, *kernel.shape[1:])
+    kernel[start : start + rows.shape[0]] = rows
+
+
+# Pool of processes shared by all the simulations, with its number of processes
+_worker_pools = {}
+
+# Arrays and simulation attached by each worker process
+_worker_state = {}
+
+# Barrier of the workers of the pool, set in each worker process
+_worker_barrier = None
+
+
+def _get_worker_pool(n_processes):
+    """
+    Return the persistent pool with a given number of processes.
+
+    A single pool is kept: it is started on the first call and reused
+    afterwards, until a pool with another number of processes is requested or
+    :func:`close_worker_pools` is called, which also happens when the
+    interpreter exits. The workers are started from a ``forkserver`` (or
+    ``spawn`` where it isn't available), so they are never forked from a
+    process that runs threads, e.g. the ones of numba parallel kernels.
+    """
+    pool = _worker_pools.get(n_processes)
+    if pool is None:
+        close_worker_pools()
+        # Start the resource tracker first, so the workers share it and don't
+        # free the shared memory of the main process when they exit
+        resource_tracker.ensure_running()
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+        else:
+            context = multiprocessing.get_context("spawn")
+        pool = context.Pool(
+            processes=n_processes,
+            initializer=_init_worker,
+            initargs=(context.Barrier(n_processes),),
+        )
+        _worker_pools[n_processes] = pool
+    return pool
+
+
+@atexit.register
+def close_worker_pools():
+    """
+    Stop the worker processes of the potential field simulations.
+
+    The workers are kept between calls to ``linear_operator``, so they
+    don't import SimPEG again every time. Stop them to free their memory
+    once no more sensitivities are computed with several processes.
+    """
+    while _worker_pools:
+        _, pool = _worker_pools.popitem()
+        pool.terminate()
+        pool.join()
+
+
+def _init_worker(barrier):
+    """Keep the barrier shared by the workers of a pool."""
+    global _worker_barrier
+    _worker_barrier = barrier
+
+
+def _clear_worker_states(pool, n_processes):
+    """
+    Drop the simulation and the nodes attached by every worker of a pool.
+    """
+    try:
+        pool.map(_clear_worker_state, range(n_processes), chunksize=1)
+    except threading.BrokenBarrierError:
+        # A worker was replaced, the pool can't be trusted to be idle
+        close_worker_pools()
+
+
+def _clear_worker_state(_):
+    """
+    Drop the simulation and the nodes attached by this worker.
+
+    The workers wait for each other, so each one of them runs this once.
+    """
+    shared_memory_blocks = _worker_state.pop("shared_memory", [])
+    _worker_state.clear()
+    gc.collect()
+    for shm in shared_memory_blocks:
+        shm.close()
+    _worker_barrier.wait(timeout=60)
+
+
+class _SharedArrays:
+    """
+    Copies of arrays in shared memory.
+
+    The shared memory is freed when the object is closed or garbage collected.
+    The ``specs`` attribute contains the names, shapes and dtypes needed to
+    attach to the arrays from other processes, or None for missing arrays.
+
+    Parameters
+    ----------
+    *arrays : numpy.ndarray or None
+        Arrays to copy to shared memory.
+    """
+
+    def __init__(self, *arrays):
+        self._shared_memory = []
+        self.specs = tuple(self._share(array) for array in arrays)
+        self._finalizer = weakref.finalize(
+            self, _unlink_shared_memory, self._shared_memory
+        )
+
+    def _share(self, array):
+        if array is None:
+            return None
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        self._shared_memory.append(shm)
+        return shm.name, array.shape, array.dtype.str
+
+    def close(self):
+        """Free the shared memory."""
+        self._finalizer()
+
+
+def _unlink_shared_memory(shared_memory_blocks):
+    """Close and free blocks of shared memory."""
+    for shm in shared_memory_blocks:
+        shm.close()
+        shm.unlink()
+
+
+def _attach_arrays(specs):
+    """Attach to arrays in shared memory from their specs."""
+    shared_memory_blocks, arrays = [], []
+    for spec in specs:
+        if spec is None:
+            arrays.append(None)
+            continue
+        name, shape, dtype = spec
+        shm = shared_memory.SharedMemory(name=name)
+        shared_memory_blocks.append(shm)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    return shared_memory_blocks, arrays
+
+
+def _evaluate_block(task):
+    """
+    Evaluate the rows of a block of receivers in a worker process.
+
+    The worker attaches to the nodes of a simulation and unpickles it the
+    first time it receives one of its blocks in a call to ``linear_operator``.
+    Both are dropped by :func:`_clear_worker_state` at the end of the call.
+    """
+    node_specs, snapshot_spec, start, locations, components = task
+    if _worker_state.get("node_specs") != node_specs:
+        # Detach from the nodes of the previous simulation
+        for key in ("snapshot_spec", "simulation", "node_specs", "nodes"):
+            _worker_state.pop(key, None)
+        for shm in _worker_state.pop("shared_memory", []):
+            shm.close()
+        shared_memory_blocks, nodes = _attach_arrays(node_specs)
+        _worker_state.update(
+            node_specs=node_specs, shared_memory=shared_memory_blocks, nodes=nodes
+        )
+    if _worker_state.get("snapshot_spec") != snapshot_spec:
+        (shm,), (data,) = _attach_arrays([snapshot_spec])
+        simulation = pickle.loads(data)
+        del data
+        shm.close()
+        simulation._nodes, simulation._unique_inv = _worker_state["nodes"]
+        _worker_state.update(snapshot_spec=snapshot_spec, simulation=simulation)
+    rows = _worker_state["simulation"].evaluate_integral(locations, components)
+    return start, rows
+
+
 def progress(iteration, prog, final):
     """Progress (% complete) for constructing sensitivity matrix.
 
@@ -0,0 +1,582 @@
+"""
+Equivalent source layers fitted independently in overlapping windows.
+"""
+
+import copy
+import os
+
+import numpy as np
+import scipy.linalg
+from discretize import TensorMesh
+
+from ..data import Data
+from ..maps import IdentityMap
+from ..utils import (
+    validate_float,
+    validate_integer,
+    validate_ndarray_with_shape,
+    validate_string,
+    validate_type,
+)
+from . import gravity, magnetics
+from .base import _get_worker_pool
+
+# Equivalent source layer simulation and the name of its model mapping, by the
+# type of the survey
+_LAYER_SIMULATIONS = {
+    gravity.Survey: (gravity.SimulationEquivalentSourceLayer, "rhoMap"),
+    magnetics.Survey: (magnetics.SimulationEquivalentSourceLayer, "chiMap"),
+}
+
+# Maximum number of elements of the sensitivity matrices built at once when
+# predicting the fields of a window
+_PREDICTION_BLOCK_SIZE = 2**22
+
+# Smallest blending weight of the locations inside a window, so locations on
+# the edges of the windows still get a prediction
+_MIN_WEIGHT = 1e-6
+
+
+class WindowedEquivalentSources:
+    r"""
+    Equivalent source layers fitted independently in overlapping windows.
+
+    The horizontal extent of the data is covered by square windows that
+    overlap each other. The data inside each window is fitted by its own
+    :class:`~simpeg.potential_fields.gravity.SimulationEquivalentSourceLayer`
+    or :class:`~simpeg.potential_fields.magnetics.SimulationEquivalentSourceLayer`,
+    through a damped least-squares problem that only involves the data and the
+    cells of that window. The layer of each window extends beyond it by the
+    depth of the bottom of the layer, so it also reproduces the fields of
+    sources right outside the window. The windows are independent from each
+    other, so they can be fitted in parallel processes, and the cost of the fit
+    grows linearly with the area of the survey instead of with the square of
+    the number of data.
+
+    The fitted layers predict the fields on any set of locations through
+    :meth:`predict`, which can be used to grid the data or to continue it
+    upwards. The predictions of overlapping windows are blended with weights
+    that decay linearly towards the edges of each window.
+
+    Parameters
+    ----------
+    window_size : float
+        Horizontal size of the square windows, in meters.
+    cell_size : float
+        Horizontal size of the square cells of the equivalent source layer of
+        each window, in meters.
+    depth : float
+        Depth of the top of the equivalent source layer of each window below
+        the lowest datum in the window, in meters.
+    thickness : float, optional
+        Thickness of the equivalent source layers, in meters. If None, the
+        layers are as thick as the size of their cells.
+    overlap : float, optional
+        Fraction of the size of the windows that neighbouring windows overlap.
+        Must be in the :math:`[0, 1)` interval.
+    damping : float, optional
+        Damping of the least-squares problem of each window, relative to the
+        mean of the diagonal of :math:`\mathbf{G}^T \mathbf{W}^T \mathbf{W}
+        \mathbf{G}`.
+    block_size : float or None, optional
+        If not None, the data are averaged in square blocks of this horizontal
+        size, in meters, before fitting. Averaging dense line data reduces the
+        size of the problem of each window without losing resolution across the
+        lines.
+    engine : {"geoana", "choclo"}, optional
+        Engine used to compute the sensitivities of the layers.
+    n_processes : int or None, optional
+        Number of processes that fit and evaluate the windows. If 1, the
+        windows are processed in the current process. If None, use all the
+        available CPUs. The worker processes are shared with the integral
+        simulations, see :class:`~simpeg.potential_fields.base.BasePFSimulation`
+        for how to protect the main script when using them.
+
+    Notes
+    -----
+    The equivalent source layer of each window minimizes
+
+    .. math::
+
+        \| \mathbf{W} (\mathbf{G} \mathbf{m} - \mathbf{d}) \|^2
+        + \lambda \bar{g} \| \mathbf{m} \|^2,
+
+    where :math:`\mathbf{W}` is the diagonal matrix with the inverse of the
+    standard deviations of the data, :math:`\lambda` is the ``damping`` and
+    :math:`\bar{g}` is the mean of the diagonal of :math:`\mathbf{G}^T
+    \mathbf{W}^T \mathbf{W} \mathbf{G}`. The data must be a single component,
+    like ``"gz"`` or ``"tmi"``. If the standard deviations of the data are all
+    zero, every datum gets the same weight.
+
+    Locations outside the horizontal extent of the data use the windows on the
+    edge of the survey, and locations that are only covered by windows without
+    any data use the window with the nearest center.
+    """
+
+    def __init__(
+        self,
+        window_size,
+        cell_size,
+        depth,
+        thickness=None,
+        overlap=0.5,
+        damping=1e-3,
+        block_size=None,
+        engine="geoana",
+        n_processes=1,
+    ):
+        self.window_size = window_size
+        self.cell_size = cell_size
+        self.depth = depth
+        self.thickness = thickness
+        self.overlap = overlap
+        self.damping = damping
+        self.block_size = block_size
+        self.engine = engine
+        self.n_processes = n_processes
+        self._layers = None
+
+    @property
+    def window_size(self):
+        """
+        Horizontal size of the square windows, in meters.
+
+        Returns
+        -------
+        float
+        """
+        return self._window_size
+
+    @window_size.setter
+    def window_size(self, value):
+        self._window_size = validate_float(
+            "window_size", value, min_val=0.0, inclusive_min=False
+        )
+
+    @property
+    def cell_size(self):
+        """
+        Horizontal size of the cells of the equivalent source layers, in meters.
+
+        Returns
+        -------
+        float
+        """
+        return self._cell_size
+
+    @cell_size.setter
+    def cell_size(self, value):
+        self._cell_size = validate_float(
+            "cell_size", value, min_val=0.0, inclusive_min=False
+        )
+
+    @property
+    def depth(self):
+        """
+        Depth of the top of the layers below the lowest datum of each window.
+
+        Returns
+        -------
+        float
+        """
+        return self._depth
+
+    @depth.setter
+    def depth(self, value):
+        self._depth = validate_float("depth", value, min_val=0.0)
+
+    @property
+    def thickness(self):
+        """
+        Thickness of the equivalent source layers, in meters.
+
+        Returns
+        -------
+        float
+        """
+        if self._thickness is None:
+            return self.cell_size
+        return self._thickness
+
+    @thickness.setter
+    def thickness(self, value):
+        if value is not None:
+            value = validate_float("thickness", value, min_val=0.0, inclusive_min=False)
+        self._thickness = value
+
+    @property
+    def overlap(self):
+        """
+        Fraction of the size of the windows that neighbouring windows overlap.
+
+        Returns
+        -------
+        float
+        """
+        return self._overlap
+
+    @overlap.setter
+    def overlap(self, value):
+        self._overlap = validate_float(
+            "overlap", value, min_val=0.0, max_val=1.0, inclusive_max=False
+        )
+
+    @property
+    def damping(self):
+        """
+        Relative damping of the least-squares problem of each window.
+
+        Returns
+        -------
+        float
+        """
+        return self._damping
+
+    @damping.setter
+    def damping(self, value):
+        self._damping = validate_float("damping", value, min_val=0.0)
+
+    @property
+    def block_size(self):
+        """
+        Size of the blocks in which the data are averaged before fitting.
+
+        Returns
+        -------
+        float or None
+        """
+        return self._block_size
+
+    @block_size.setter
+    def block_size(self, value):
+        if value is not None:
+            value = validate_float(
+                "block_size", value, min_val=0.0, inclusive_min=False
+            )
+        self._block_size = value
+
+    @property
+    def engine(self):
+        """
+        Engine used to compute the sensitivities of the layers.
+
+        Returns
+        -------
+        str
+        """
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        self._engine = validate_string("engine", value, ["geoana", "choclo"])
+
+    @property
+    def n_processes(self):
+        """
+        Number of processes that fit and evaluate the windows.
+
+        Returns
+        -------
+        int or None
+        """
+        return self._n_processes
+
+    @n_processes.setter
+    def n_processes(self, value):
+        if value is not None:
+            value = validate_integer("n_processes", value, min_val=1)
+        self._n_processes = value
+
+    @property
+    def n_windows(self):
+        """
+        Number of windows with a fitted equivalent source layer.
+
+        Returns
+        -------
+        int
+        """
+        self._check_fitted()
+        return len(self._layers)
+
+    def fit(self, data):
+        """
+        Fit the equivalent source layers of every window to the data.
+
+        Parameters
+        ----------
+        data : simpeg.data.Data
+            Data of a gravity or magnetic survey with a single component.
+
+        Returns
+        -------
+        WindowedEquivalentSources
+            The fitted equivalent sources.
+        """
+        data = validate_type("data", data, Data, cast=False)
+        survey = data.survey
+        if type(survey) not in _LAYER_SIMULATIONS:
+            raise TypeError(
+                f"{type(self).__name__} requires a gravity or magnetic survey, "
+                f"but got a {type(survey).__name__}."
+            )
+        receivers = survey.source_field.receiver_list
+        components = {tuple(receiver.components) for receiver in receivers}
+        if len(components) != 1 or len(next(iter(components))) != 1:
+            raise ValueError(
+                f"{type(self).__name__} requires data of a single component, "
+                f"but the survey has components {sorted(components)}."
+            )
+        locations = np.vstack([receiver.locations for receiver in receivers])
+        values = data.dobs
+        standard_deviation = data.standard_deviation
+        if not np.all(standard_deviation > 0):
+            if np.any(standard_deviation):
+                raise ValueError(
+                    f"{type(self).__name__} requires positive standard deviations "
+                    "for every datum, or none at all."
+                )
+            standard_deviation = np.ones(data.nD)
+        if self.block_size is not None:
+            locations, values, standard_deviation = _block_average(
+                locations, values, standard_deviation, self.block_size
+            )
+
+        self._component = components.pop()[0]
+        self._settings = _LayerSettings(
+            survey, type(receivers[0]), self.engine, self.n_processes == 1
+        )
+        self._bounds = np.c_[locations[:, :2].min(axis=0), locations[:, :2].max(axis=0)]
+
+        layers, tasks = [], []
+        for center in self._window_centers():
+            inside = self._inside_window(center, locations[:, :2])
+            if not inside.any():
+                continue
+            z_top = locations[inside, 2].min() - self.depth
+            # Extend the layer beyond the window, so it can also reproduce the
+            # fields of sources right outside of it
+            size = self.window_size + 2 * (self.depth + self.thickness)
+            layer = _SourceLayer(center, size, self.cell_size, z_top, self.thickness)
+            layers.append(layer)
+            tasks.append(
+                (
+                    self._settings,
+                    layer,
+                    self._component,
+                    self.damping,
+                    locations[inside],
+                    values[inside],
+                    standard_deviation[inside],
+                )
+            )
+        for layer, model in zip(layers, self._map(_fit_layer, tasks)):
+            layer.model = model
+        self._layers = layers
+        return self
+
+    def predict(self, grid, component=None):
+        """
+        Predict the fields of the fitted equivalent sources on a set of locations.
+
+        Parameters
+        ----------
+        grid : (n_locations, 3) numpy.ndarray
+            Locations where the fields are predicted. Use the locations of the
+            nodes of a grid to interpolate the data, or locations above the
+            survey to continue it upwards.
+        component : str, optional
+            Component of the predicted fields. If None, predict the same
+            component as the fitted data.
+
+        Returns
+        -------
+        (n_locations,) numpy.ndarray
+            Predicted fields.
+        """
+        self._check_fitted()
+        grid = validate_ndarray_with_shape("grid", grid, shape=("*", 3))
+        if component is None:
+            component = self._component
+        # Locations outside the survey use the windows on its edges
+        horizontal = np.clip(grid[:, :2], self._bounds[:, 0], self._bounds[:, 1])
+
+        weights = []
+        total_weight = np.zeros(grid.shape[0])
+        for layer in self._layers:
+            inside = np.flatnonzero(self._inside_window(layer.center, horizontal))
+            taper = 1.0 - np.abs(horizontal[inside] - layer.center) / (
+                0.5 * self.window_size
+            )
+            weight = np.maximum(np.prod(taper, axis=1), _MIN_WEIGHT)
+            weights.append((inside, weight))
+            total_weight[inside] += weight
+
+        # Locations only covered by windows without data use the nearest window
+        uncovered = np.flatnonzero(total_weight == 0)
+        if uncovered.size:
+            centers = np.array([layer.center for layer in self._layers])
+            nearest = np.argmin(
+                np.linalg.norm(
+                    horizontal[uncovered, None, :] - centers[None, :, :], axis=-1
+                ),
+                axis=1,
+            )
+            for i, (inside, weight) in enumerate(weights):
+                extra = uncovered[nearest == i]
+                weights[i] = (np.r_[inside, extra], np.r_[weight, np.ones(extra.size)])
+            total_weight[uncovered] = 1.0
+
+        tasks = (
+            (self._settings, layer, grid[inside], component)
+            for layer, (inside, _) in zip(self._layers, weights)
+        )
+        fields = np.zeros(grid.shape[0])
+        for (inside, weight), values in zip(weights, self._map(_predict_layer, tasks)):
+            fields[inside] += weight * values
+        return fields / total_weight
+
+    def _check_fitted(self):
+        if self._layers is None:
+            raise AttributeError(
+                f"The {type(self).__name__} must be fitted with 'fit' first."
+            )
+
+    def _window_centers(self):
+        """
+        Return the horizontal centers of the windows that cover the data.
+        """
+        step = self.window_size * (1.0 - self.overlap)
+        centers = []
+        for lower, upper in self._bounds:
+            extent = upper - lower
+            n_windows = 1
+            if extent > self.window_size:
+                n_windows += int(np.ceil((extent - self.window_size) / step))
+            offsets = step * (np.arange(n_windows) - (n_windows - 1) / 2)
+            centers.append(0.5 * (lower + upper) + offsets)
+        x, y = np.meshgrid(*centers, indexing="ij")
+        return np.c_[x.ravel(), y.ravel()]
+
+    def _inside_window(self, center, horizontal):
+        """
+        Return a mask of the horizontal locations inside a window.
+        """
+        return np.all(np.abs(horizontal - center) <= 0.5 * self.window_size, axis=1)
+
+    def _map(self, function, tasks):
+        """
+        Apply a function to the tasks of each window, in order.
+        """
+        if self.n_processes == 1:
+            return map(function, tasks)
+        pool = _get_worker_pool(self.n_processes or os.cpu_count())
+        return pool.imap(function, tasks)
+
+
+class _LayerSettings:
+    """
+    Settings shared by the simulations of the layers of every window.
+
+    Only the types of the survey and receivers, the source field without its
+    receivers and the engine are kept, so the tasks sent to the worker
+    processes stay small.
+    """
+
+    def __init__(self, survey, receiver_type, engine, numba_parallel):
+        self.survey_type = type(survey)
+        self.receiver_type = receiver_type
+        self.source_field = copy.copy(survey.source_field)
+        self.source_field.receiver_list = []
+        self.engine = engine
+        self.numba_parallel = numba_parallel
+
+    def simulation(self, layer, locations, component):
+        """
+        Build the equivalent source layer simulation of a window.
+        """
+        source_field = copy.copy(self.source_field)
+        source_field.receiver_list = [
+            self.receiver_type(locations, components=component)
+        ]
+        simulation_class, map_name = _LAYER_SIMULATIONS[self.survey_type]
+        return simulation_class(
+            layer.mesh,
+            layer.z_top,
+            layer.z_bottom,
+            survey=self.survey_type(source_field),
+            store_sensitivities="ram",
+            sensitivity_dtype=np.float64,
+            engine=self.engine,
+            # don't oversubscribe the CPUs from the worker processes
+            numba_parallel=self.numba_parallel,
+            **{map_name: IdentityMap(nP=layer.mesh.n_cells)},
+        )
+
+
+class _SourceLayer:
+    """
+    Equivalent source layer of a window.
+    """
+
+    def __init__(self, center, size, cell_size, z_top, thickness):
+        n_cells = max(1, int(np.ceil(size / cell_size)))
+        h = [(cell_size, n_cells)]
+        self.center = center
+        self.mesh = TensorMesh([h, h], origin=center - 0.5 * cell_size * n_cells)
+        self.z_top = float(z_top)
+        self.z_bottom = float(z_top - thickness)
+        self.model = None
+
+
+def _fit_layer(task):
+    """
+    Fit the equivalent source layer of a window to its data.
+    """
+    settings, layer, component, damping, locations, values, standard_deviation = task
+    simulation = settings.simulation(layer, locations, component)
+    sensitivity = simulation.G / standard_deviation[:, None]
+    hessian = sensitivity.T @ sensitivity
+    damping *= np.trace(hessian) / hessian.shape[0]
+    hessian[np.diag_indices_from(hessian)] += damping
+    gradient = sensitivity.T @ (values / standard_deviation)
+    return scipy.linalg.solve(hessian, gradient, assume_a="pos")
+
+
+def _predict_layer(task):
+    """
+    Predict the fields of the equivalent source layer of a window.
+    """
+    settings, layer, locations, component = task
+    block_size = max(1, _PREDICTION_BLOCK_SIZE // layer.mesh.n_cells)
+    fields = np.empty(locations.shape[0])
+    for start in range(0, locations.shape[0], block_size):
+        block = slice(start, start + block_size)
+        simulation = settings.simulation(layer, locations[block], component)
+        fields[block] = simulation.dpred(layer.model)
+    return fields
+
+
+def _block_average(locations, values, standard_deviation, block_size):
+    """
+    Average data in square horizontal blocks.
+
+    The locations and the values are replaced by their means in each block,
+    and the standard deviations by the standard deviation of the mean.
+    """
+    blocks = np.floor(
+        (locations[:, :2] - locations[:, :2].min(axis=0)) / block_size
+    ).astype(np.int64)
+    _, block_indices, counts = np.unique(
+        blocks, axis=0, return_inverse=True, return_counts=True
+    )
+    block_indices = block_indices.ravel()
+
+    def mean(array):
+        return np.bincount(block_indices, weights=array) / counts
+
+    locations = np.stack([mean(coordinate) for coordinate in locations.T], axis=1)
+    standard_deviation = (
+        np.sqrt(np.bincount(block_indices, weights=standard_deviation**2)) / counts
+    )
+    return locations, mean(values), standard_deviation
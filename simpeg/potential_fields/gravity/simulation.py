@@ -164,8 +164,8 @@ class Simulation3DIntegral(BasePFSimulation):
         Model mapping.
     sensitivity_dtype : numpy.dtype, optional
         Data type that will be used to build the sensitivity matrix.
-    store_sensitivities : {"ram", "disk", "forward_only"}
-        Options for storing sensitivity matrix. There are 3 options
+    store_sensitivities : {"ram", "disk", "forward_only", "fft"}
+        Options for storing sensitivity matrix. There are 4 options
 
         - 'ram': sensitivities are stored in the computer's RAM
         - 'disk': sensitivities are written to a directory
@@ -173,6 +173,14 @@ class Simulation3DIntegral(BasePFSimulation):
           sensitivities do not need to be stored. The sensitivity matrix ``G``
           is never created, but it'll be defined as
           a :class:`~scipy.sparse.linalg.LinearOperator`.
+        - 'fft': only the kernel of each horizontal layer of cells is stored,
+          and ``G`` is defined as a :class:`~scipy.sparse.linalg.LinearOperator`
+          that computes its products with 2D FFTs. Requires a
+          :class:`discretize.TensorMesh` with uniform horizontal cell sizes,
+          and receivers at the same height on a grid with the same spacing as
+          the cells. Inactive cells and partial grids of receivers are
+          supported. For other meshes and surveys, a warning is issued and
+          the sensitivity matrix is stored in RAM, like with ``"ram"``.
 
     sensitivity_path : str, optional
         Path to store the sensitivity matrix if ``store_sensitivities`` is set
@@ -332,14 +340,19 @@ class Simulation3DIntegral(BasePFSimulation):
         -------
         np.ndarray
         """
-        gtg_diagonal = (
-            self._gtg_diagonal_without_building_g(weights)
-            if self.store_sensitivities == "forward_only"
-            else
-            # In Einstein notation, the j-th element of the diagonal is:
-            #   d_j = w_i * G_{ij} * G_{ij}
-            np.asarray(np.einsum("i,ij,ij->j", weights, self.G, self.G))
-        )
+        match self.store_sensitivities:
+            case "forward_only":
+                gtg_diagonal = self._gtg_diagonal_without_building_g(weights)
+            case "fft" if (sensitivities := self._fft_sensitivities()) is not None:
+                gtg_diagonal = sensitivities.gtg_diagonal(
+                    sensitivities.data_weights_to_grid(weights)
+                )
+            case _:
+                # In Einstein notation, the j-th element of the diagonal is:
+                #   d_j = w_i * G_{ij} * G_{ij}
+                gtg_diagonal = np.asarray(
+                    np.einsum("i,ij,ij->j", weights, self.G, self.G)
+                )
         return gtg_diagonal
 
     def getJ(self, m, f=None) -> NDArray[np.float64 | np.float32] | LinearOperator:
@@ -452,6 +465,8 @@ class Simulation3DIntegral(BasePFSimulation):
         """
         if not hasattr(self, "_G"):
             match self.engine, self.store_sensitivities:
+                case (_, "fft") if self._fft_sensitivities() is not None:
+                    self._G = self._fft_sensitivities().as_operator()
                 case ("choclo", "forward_only"):
                     self._G = self._sensitivity_matrix_as_operator()
                 case ("choclo", _):
@@ -486,14 +501,15 @@ class Simulation3DIntegral(BasePFSimulation):
         Compute the forward linear relationship between the model and the physics at a point
         and for all components of the survey.
 
-        :param numpy.ndarray receiver_location:  array with shape (n_receivers, 3)
-            Array of receiver locations as x, y, z columns.
+        :param numpy.ndarray receiver_location:  array with shape (3,) or (n_receivers, 3)
+            Receiver location, or array of receiver locations as x, y, z columns.
         :param list[str] components: List of gravity components chosen from:
             'gx', 'gy', 'gz', 'gxx', 'gxy', 'gxz', 'gyy', 'gyz', 'gzz', 'guv'
         :param float tolerance: Small constant to avoid singularity near nodes and edges.
         :rtype numpy.ndarray: rows
-        :returns: ndarray with shape (n_components, n_cells)
-            Dense array mapping of the contribution of all active cells to data components::
+        :returns: ndarray with shape (n_components, n_cells), or (n_receivers, n_components, n_cells)
+            for several receivers. Dense array mapping of the contribution of all active cells
+            to data components::
 
                 rows =
                     g_1 = [g_1x g_1y g_1z]
@@ -502,7 +518,7 @@ class Simulation3DIntegral(BasePFSimulation):
                     g_c = [g_cx g_cy g_cz]
 
         """
-        dr = self._nodes - receiver_location
+        dr = self._node_offsets(receiver_location)
         dx = dr[..., 0]
         dy = dr[..., 1]
         dz = dr[..., 2]
@@ -545,16 +561,16 @@ class Simulation3DIntegral(BasePFSimulation):
         for component in set(components):
             vals = node_evals[component]
             if self._unique_inv is not None:
-                vals = vals[self._unique_inv]
+                vals = vals[..., self._unique_inv]
             cell_vals = (
-                vals[0]
-                - vals[1]
-                - vals[2]
-                + vals[3]
-                - vals[4]
-                + vals[5]
-                + vals[6]
-                - vals[7]
+                vals[..., 0, :]
+                - vals[..., 1, :]
+                - vals[..., 2, :]
+                + vals[..., 3, :]
+                - vals[..., 4, :]
+                + vals[..., 5, :]
+                + vals[..., 6, :]
+                - vals[..., 7, :]
             )
             if inside_adjust and component == "gzz":
                 # should subtract 4 * pi to the cell containing the observation point
@@ -574,7 +590,8 @@ class Simulation3DIntegral(BasePFSimulation):
             [
                 rows[component].astype(self.sensitivity_dtype, copy=False)
                 for component in components
-            ]
+            ],
+            axis=np.ndim(receiver_location) - 1,
         )
 
     def _forward(self, densities):
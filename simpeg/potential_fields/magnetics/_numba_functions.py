@@ -1003,6 +1003,566 @@ def _forward_tmi_derivative(
                 )
 
 
+def _forward_mag_components(
+    receivers,
+    nodes,
+    model,
+    fields,
+    cell_nodes,
+    regional_field,
+    constant_factor,
+    scalar_model,
+):
+    """
+    Forward model the three components of the magnetic field
+
+    Compute the ``bx``, ``by`` and ``bz`` components on every receiver in
+    a single pass, evaluating the six kernels of the magnetic gradient
+    tensor only once for each node.
+
+    This function should be used with a `numba.jit` decorator, for example:
+
+    .. code::
+
+        from numba import jit
+
+        jit_forward = jit(nopython=True, parallel=True)(_forward_mag_components)
+
+    Parameters
+    ----------
+    receivers : (n_receivers, 3) array
+        Array with the locations of the receivers
+    nodes : (n_active_nodes, 3) array
+        Array with the location of the mesh nodes.
+    model : (n_active_cells) or (3 * n_active_cells)
+        Array with the susceptibility (scalar model) or the effective
+        susceptibility (vector model) of each active cell in the mesh.
+        If the model is scalar, the ``model`` array should have
+        ``n_active_cells`` elements and ``scalar_model`` should be True.
+        If the model is vector, the ``model`` array should have
+        ``3 * n_active_cells`` elements and ``scalar_model`` should be False.
+    fields : (n_receivers, 3) array
+        Array full of zeros where the ``bx``, ``by`` and ``bz`` components on
+        each receiver will be stored, one column per component.
+    cell_nodes : (n_active_cells, 8) array
+        Array of integers, where each row contains the indices of the nodes for
+        each active cell in the mesh.
+    regional_field : (3,) array
+        Array containing the x, y and z components of the regional magnetic
+        field (uniform background field).
+    constant_factor : float
+        Constant factor that will be used to multiply each element of the
+        sensitivity matrix.
+    scalar_model : bool
+        If True, the sensitivity matrix is build to work with scalar models
+        (susceptibilities).
+        If False, the sensitivity matrix is build to work with vector models
+        (effective susceptibilities).
+    """
+    n_receivers = receivers.shape[0]
+    n_nodes = nodes.shape[0]
+    n_cells = cell_nodes.shape[0]
+    fx, fy, fz = regional_field
+    regional_field_amplitude = np.sqrt(fx**2 + fy**2 + fz**2)
+    fx /= regional_field_amplitude
+    fy /= regional_field_amplitude
+    fz /= regional_field_amplitude
+    # Evaluate kernel function on each node, for each receiver location
+    for i in prange(n_receivers):
+        # Allocate vectors for kernels evaluated on mesh nodes
+        kxx, kyy, kzz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        kxy, kxz, kyz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        _evaluate_gradient_kernels(receivers[i], nodes, kxx, kyy, kzz, kxy, kxz, kyz)
+        # Accumulate the three components of the field on the receiver
+        bx, by, bz = 0.0, 0.0, 0.0
+        for k in range(n_cells):
+            nodes_indices = cell_nodes[k, :]
+            uxx = kernels_in_nodes_to_cell(kxx, nodes_indices)
+            uyy = kernels_in_nodes_to_cell(kyy, nodes_indices)
+            uzz = kernels_in_nodes_to_cell(kzz, nodes_indices)
+            uxy = kernels_in_nodes_to_cell(kxy, nodes_indices)
+            uxz = kernels_in_nodes_to_cell(kxz, nodes_indices)
+            uyz = kernels_in_nodes_to_cell(kyz, nodes_indices)
+            if scalar_model:
+                mx = model[k] * fx
+                my = model[k] * fy
+                mz = model[k] * fz
+            else:
+                mx = model[k]
+                my = model[k + n_cells]
+                mz = model[k + 2 * n_cells]
+            bx += uxx * mx + uxy * my + uxz * mz
+            by += uxy * mx + uyy * my + uyz * mz
+            bz += uxz * mx + uyz * my + uzz * mz
+        fields[i, 0] += constant_factor * regional_field_amplitude * bx
+        fields[i, 1] += constant_factor * regional_field_amplitude * by
+        fields[i, 2] += constant_factor * regional_field_amplitude * bz
+
+
+def _gradient_tensor(receivers, nodes, cell_nodes, tensor):
+    """
+    Compute the six kernels of the magnetic gradient tensor for every cell
+
+    Integrate the ``ee``, ``nn``, ``uu``, ``en``, ``eu`` and ``nu`` kernels
+    over every active cell, for every receiver. Every first order component of
+    the magnetic field (``bx``, ``by``, ``bz`` and ``tmi``), for any regional
+    field and for scalar or vector models, is a linear combination of them.
+
+    This function should be used with a `numba.jit` decorator, for example:
+
+    .. code::
+
+        from numba import jit
+
+        jit_gradient_tensor = jit(nopython=True, parallel=True)(_gradient_tensor)
+
+    Parameters
+    ----------
+    receivers : (n_receivers, 3) array
+        Array with the locations of the receivers
+    nodes : (n_active_nodes, 3) array
+        Array with the location of the mesh nodes.
+    cell_nodes : (n_active_cells, 8) array
+        Array of integers, where each row contains the indices of the nodes for
+        each active cell in the mesh.
+    tensor : (n_receivers, 6, n_active_cells) array
+        Empty array where the ``xx``, ``yy``, ``zz``, ``xy``, ``xz`` and ``yz``
+        elements of the tensor of each cell will be stored, in that order.
+    """
+    n_receivers = receivers.shape[0]
+    n_nodes = nodes.shape[0]
+    n_cells = cell_nodes.shape[0]
+    for i in prange(n_receivers):
+        # Allocate vectors for kernels evaluated on mesh nodes
+        kxx, kyy, kzz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        kxy, kxz, kyz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        _evaluate_gradient_kernels(receivers[i], nodes, kxx, kyy, kzz, kxy, kxz, kyz)
+        for k in range(n_cells):
+            nodes_indices = cell_nodes[k, :]
+            tensor[i, 0, k] = kernels_in_nodes_to_cell(kxx, nodes_indices)
+            tensor[i, 1, k] = kernels_in_nodes_to_cell(kyy, nodes_indices)
+            tensor[i, 2, k] = kernels_in_nodes_to_cell(kzz, nodes_indices)
+            tensor[i, 3, k] = kernels_in_nodes_to_cell(kxy, nodes_indices)
+            tensor[i, 4, k] = kernels_in_nodes_to_cell(kxz, nodes_indices)
+            tensor[i, 5, k] = kernels_in_nodes_to_cell(kyz, nodes_indices)
+
+
+@jit(nopython=True, parallel=False)
+def _sensitivity_amplitude_t_dot_v_serial(
+    receivers,
+    nodes,
+    cell_nodes,
+    regional_field,
+    amplitude_derivative,
+    constant_factor,
+    scalar_model,
+    vector,
+    result,
+):
+    r"""
+    Compute ``J.T @ v`` for amplitude data in serial, without building ``J``.
+
+    Parameters
+    ----------
+    receivers : (n_receivers, 3) array
+        Array with the locations of the receivers
+    nodes : (n_active_nodes, 3) array
+        Array with the location of the mesh nodes.
+    cell_nodes : (n_active_cells, 8) array
+        Array of integers, where each row contains the indices of the nodes for
+        each active cell in the mesh.
+    regional_field : (3,) array
+        Array containing the x, y and z components of the regional magnetic
+        field (uniform background field).
+    amplitude_derivative : (n_receivers, 3) array
+        Derivative of the amplitude with respect to the ``bx``, ``by`` and
+        ``bz`` components on each receiver: the components of the field
+        normalized by its amplitude.
+    constant_factor : float
+        Constant factor that will be used to multiply each element of the
+        sensitivity matrix.
+    scalar_model : bool
+        If True, the sensitivity matrix is build to work with scalar models
+        (susceptibilities).
+        If False, the sensitivity matrix is build to work with vector models
+        (effective susceptibilities).
+    vector : (n_receivers) array
+        Array that represents the vector used in the dot product.
+    result : (n_active_cells) or (3 * n_active_cells) array
+        Running result array where the output of the dot product will be added
+        to.
+
+    Notes
+    -----
+    The row of ``J`` for the receiver :math:`i` is the derivative of the
+    amplitude :math:`|\mathbf{b}_i|` with respect to the model. Its element for
+    the cell :math:`k` is :math:`\hat{\mathbf{b}}_i^T \mathbf{T}_{ik}
+    \mathbf{f}`, where :math:`\hat{\mathbf{b}}_i` is the normalized field,
+    :math:`\mathbf{T}_{ik}` the (symmetric) magnetic gradient tensor of the
+    cell and :math:`\mathbf{f}` the regional field, for scalar models. For
+    vector models the row contains the three components of
+    :math:`\mathbf{T}_{ik} \hat{\mathbf{b}}_i`.
+
+    This function is meant to be run in serial. Writing to the ``result`` array
+    inside a parallel loop over the receivers generates a race condition that
+    leads to corrupted outputs.
+
+    A parallel implementation of this function is available in
+    ``_sensitivity_amplitude_t_dot_v_parallel``.
+    """
+    n_receivers = receivers.shape[0]
+    n_nodes = nodes.shape[0]
+    n_cells = cell_nodes.shape[0]
+    fx, fy, fz = regional_field
+    regional_field_amplitude = np.sqrt(fx**2 + fy**2 + fz**2)
+    fx /= regional_field_amplitude
+    fy /= regional_field_amplitude
+    fz /= regional_field_amplitude
+    # Allocate vectors for kernels evaluated on mesh nodes
+    kxx, kyy, kzz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+    kxy, kxz, kyz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+    for i in range(n_receivers):
+        _evaluate_gradient_kernels(receivers[i], nodes, kxx, kyy, kzz, kxy, kxz, kyz)
+        # Scale the normalized field by the element of the vector
+        factor = constant_factor * regional_field_amplitude * vector[i]
+        ax = factor * amplitude_derivative[i, 0]
+        ay = factor * amplitude_derivative[i, 1]
+        az = factor * amplitude_derivative[i, 2]
+        # Compute the i-th row of J multiplied by the i-th element of the vector
+        for k in range(n_cells):
+            nodes_indices = cell_nodes[k, :]
+            uxx = kernels_in_nodes_to_cell(kxx, nodes_indices)
+            uyy = kernels_in_nodes_to_cell(kyy, nodes_indices)
+            uzz = kernels_in_nodes_to_cell(kzz, nodes_indices)
+            uxy = kernels_in_nodes_to_cell(kxy, nodes_indices)
+            uxz = kernels_in_nodes_to_cell(kxz, nodes_indices)
+            uyz = kernels_in_nodes_to_cell(kyz, nodes_indices)
+            tx = uxx * ax + uxy * ay + uxz * az
+            ty = uxy * ax + uyy * ay + uyz * az
+            tz = uxz * ax + uyz * ay + uzz * az
+            if scalar_model:
+                result[k] += tx * fx + ty * fy + tz * fz
+            else:
+                result[k] += tx
+                result[k + n_cells] += ty
+                result[k + 2 * n_cells] += tz
+
+
+@jit(nopython=True, parallel=True)
+def _sensitivity_amplitude_t_dot_v_parallel(
+    receivers,
+    nodes,
+    cell_nodes,
+    regional_field,
+    amplitude_derivative,
+    constant_factor,
+    scalar_model,
+    vector,
+    result,
+):
+    """
+    Compute ``J.T @ v`` for amplitude data in parallel, without building ``J``.
+
+    Parameters
+    ----------
+    receivers : (n_receivers, 3) array
+        Array with the locations of the receivers
+    nodes : (n_active_nodes, 3) array
+        Array with the location of the mesh nodes.
+    cell_nodes : (n_active_cells, 8) array
+        Array of integers, where each row contains the indices of the nodes for
+        each active cell in the mesh.
+    regional_field : (3,) array
+        Array containing the x, y and z components of the regional magnetic
+        field (uniform background field).
+    amplitude_derivative : (n_receivers, 3) array
+        Derivative of the amplitude with respect to the ``bx``, ``by`` and
+        ``bz`` components on each receiver: the components of the field
+        normalized by its amplitude.
+    constant_factor : float
+        Constant factor that will be used to multiply each element of the
+        sensitivity matrix.
+    scalar_model : bool
+        If True, the sensitivity matrix is build to work with scalar models
+        (susceptibilities).
+        If False, the sensitivity matrix is build to work with vector models
+        (effective susceptibilities).
+    vector : (n_receivers) array
+        Array that represents the vector used in the dot product.
+    result : (n_active_cells) or (3 * n_active_cells) array
+        Running result array where the output of the dot product will be added
+        to.
+
+    Notes
+    -----
+    This function is meant to be run in parallel.
+    This implementation instructs each thread to allocate their own array for
+    the current row of ``J``. After computing the elements of that row, it gets
+    added to the running ``result`` array through a reduction operation handled
+    by Numba.
+
+    A serialized implementation of this function is available in
+    ``_sensitivity_amplitude_t_dot_v_serial``.
+    """
+    n_receivers = receivers.shape[0]
+    n_nodes = nodes.shape[0]
+    n_cells = cell_nodes.shape[0]
+    n_columns = n_cells if scalar_model else 3 * n_cells
+    fx, fy, fz = regional_field
+    regional_field_amplitude = np.sqrt(fx**2 + fy**2 + fz**2)
+    fx /= regional_field_amplitude
+    fy /= regional_field_amplitude
+    fz /= regional_field_amplitude
+    for i in prange(n_receivers):
+        # Allocate vectors for kernels evaluated on mesh nodes
+        kxx, kyy, kzz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        kxy, kxz, kyz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        # Allocate array for the current row of J
+        local_row = np.empty(n_columns)
+        _evaluate_gradient_kernels(receivers[i], nodes, kxx, kyy, kzz, kxy, kxz, kyz)
+        # Scale the normalized field by the element of the vector
+        factor = constant_factor * regional_field_amplitude * vector[i]
+        ax = factor * amplitude_derivative[i, 0]
+        ay = factor * amplitude_derivative[i, 1]
+        az = factor * amplitude_derivative[i, 2]
+        for k in range(n_cells):
+            nodes_indices = cell_nodes[k, :]
+            uxx = kernels_in_nodes_to_cell(kxx, nodes_indices)
+            uyy = kernels_in_nodes_to_cell(kyy, nodes_indices)
+            uzz = kernels_in_nodes_to_cell(kzz, nodes_indices)
+            uxy = kernels_in_nodes_to_cell(kxy, nodes_indices)
+            uxz = kernels_in_nodes_to_cell(kxz, nodes_indices)
+            uyz = kernels_in_nodes_to_cell(kyz, nodes_indices)
+            tx = uxx * ax + uxy * ay + uxz * az
+            ty = uxy * ax + uyy * ay + uyz * az
+            tz = uxz * ax + uyz * ay + uzz * az
+            if scalar_model:
+                local_row[k] = tx * fx + ty * fy + tz * fz
+            else:
+                local_row[k] = tx
+                local_row[k + n_cells] = ty
+                local_row[k + 2 * n_cells] = tz
+        # Apply reduction operation to add the values of the row to the running
+        # result. Avoid slicing the `result` array when updating it to avoid
+        # racing conditions, just add the `local_row` to the `results`
+        # variable.
+        result += local_row
+
+
+@jit(nopython=True, parallel=False)
+def _diagonal_amplitude_J_T_dot_J_serial(
+    receivers,
+    nodes,
+    cell_nodes,
+    regional_field,
+    amplitude_derivative,
+    constant_factor,
+    scalar_model,
+    weights,
+    diagonal,
+):
+    """
+    Diagonal of ``J.T @ W.T @ W @ J`` for amplitude data, in serial.
+
+    Parameters
+    ----------
+    receivers : (n_receivers, 3) array
+        Array with the locations of the receivers
+    nodes : (n_active_nodes, 3) array
+        Array with the location of the mesh nodes.
+    cell_nodes : (n_active_cells, 8) array
+        Array of integers, where each row contains the indices of the nodes for
+        each active cell in the mesh.
+    regional_field : (3,) array
+        Array containing the x, y and z components of the regional magnetic
+        field (uniform background field).
+    amplitude_derivative : (n_receivers, 3) array
+        Derivative of the amplitude with respect to the ``bx``, ``by`` and
+        ``bz`` components on each receiver: the components of the field
+        normalized by its amplitude.
+    constant_factor : float
+        Constant factor that will be used to multiply each element of the
+        sensitivity matrix.
+    scalar_model : bool
+        If True, the sensitivity matrix is build to work with scalar models
+        (susceptibilities).
+        If False, the sensitivity matrix is build to work with vector models
+        (effective susceptibilities).
+    weights : (n_receivers,) array
+        Array with data weights. It should be the diagonal of the ``W`` matrix,
+        squared.
+    diagonal : (n_active_cells) or (3 * n_active_cells) array
+        Array where the diagonal of ``J.T @ J`` will be added to.
+
+    Notes
+    -----
+    This function is meant to be run in serial. Use the
+    ``_diagonal_amplitude_J_T_dot_J_parallel`` one for parallelized
+    computations.
+    """
+    n_receivers = receivers.shape[0]
+    n_nodes = nodes.shape[0]
+    n_cells = cell_nodes.shape[0]
+    fx, fy, fz = regional_field
+    regional_field_amplitude = np.sqrt(fx**2 + fy**2 + fz**2)
+    fx /= regional_field_amplitude
+    fy /= regional_field_amplitude
+    fz /= regional_field_amplitude
+    # Allocate vectors for kernels evaluated on mesh nodes
+    kxx, kyy, kzz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+    kxy, kxz, kyz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+    for i in range(n_receivers):
+        _evaluate_gradient_kernels(receivers[i], nodes, kxx, kyy, kzz, kxy, kxz, kyz)
+        factor = constant_factor * regional_field_amplitude
+        ax = factor * amplitude_derivative[i, 0]
+        ay = factor * amplitude_derivative[i, 1]
+        az = factor * amplitude_derivative[i, 2]
+        for k in range(n_cells):
+            nodes_indices = cell_nodes[k, :]
+            uxx = kernels_in_nodes_to_cell(kxx, nodes_indices)
+            uyy = kernels_in_nodes_to_cell(kyy, nodes_indices)
+            uzz = kernels_in_nodes_to_cell(kzz, nodes_indices)
+            uxy = kernels_in_nodes_to_cell(kxy, nodes_indices)
+            uxz = kernels_in_nodes_to_cell(kxz, nodes_indices)
+            uyz = kernels_in_nodes_to_cell(kyz, nodes_indices)
+            tx = uxx * ax + uxy * ay + uxz * az
+            ty = uxy * ax + uyy * ay + uyz * az
+            tz = uxz * ax + uyz * ay + uzz * az
+            if scalar_model:
+                diagonal[k] += weights[i] * (tx * fx + ty * fy + tz * fz) ** 2
+            else:
+                diagonal[k] += weights[i] * tx**2
+                diagonal[k + n_cells] += weights[i] * ty**2
+                diagonal[k + 2 * n_cells] += weights[i] * tz**2
+
+
+@jit(nopython=True, parallel=True)
+def _diagonal_amplitude_J_T_dot_J_parallel(
+    receivers,
+    nodes,
+    cell_nodes,
+    regional_field,
+    amplitude_derivative,
+    constant_factor,
+    scalar_model,
+    weights,
+    diagonal,
+):
+    """
+    Diagonal of ``J.T @ W.T @ W @ J`` for amplitude data, in parallel.
+
+    Parameters
+    ----------
+    receivers : (n_receivers, 3) array
+        Array with the locations of the receivers
+    nodes : (n_active_nodes, 3) array
+        Array with the location of the mesh nodes.
+    cell_nodes : (n_active_cells, 8) array
+        Array of integers, where each row contains the indices of the nodes for
+        each active cell in the mesh.
+    regional_field : (3,) array
+        Array containing the x, y and z components of the regional magnetic
+        field (uniform background field).
+    amplitude_derivative : (n_receivers, 3) array
+        Derivative of the amplitude with respect to the ``bx``, ``by`` and
+        ``bz`` components on each receiver: the components of the field
+        normalized by its amplitude.
+    constant_factor : float
+        Constant factor that will be used to multiply each element of the
+        sensitivity matrix.
+    scalar_model : bool
+        If True, the sensitivity matrix is build to work with scalar models
+        (susceptibilities).
+        If False, the sensitivity matrix is build to work with vector models
+        (effective susceptibilities).
+    weights : (n_receivers,) array
+        Array with data weights. It should be the diagonal of the ``W`` matrix,
+        squared.
+    diagonal : (n_active_cells) or (3 * n_active_cells) array
+        Array where the diagonal of ``J.T @ J`` will be added to.
+
+    Notes
+    -----
+    This function is meant to be run in parallel. Use the
+    ``_diagonal_amplitude_J_T_dot_J_serial`` one for serialized computations.
+
+    This implementation instructs each thread to allocate their own array for
+    the diagonal elements of the current receiver. After computing them, they
+    get added to the running ``diagonal`` array through a reduction operation
+    handled by Numba.
+    """
+    n_receivers = receivers.shape[0]
+    n_nodes = nodes.shape[0]
+    n_cells = cell_nodes.shape[0]
+    n_columns = n_cells if scalar_model else 3 * n_cells
+    fx, fy, fz = regional_field
+    regional_field_amplitude = np.sqrt(fx**2 + fy**2 + fz**2)
+    fx /= regional_field_amplitude
+    fy /= regional_field_amplitude
+    fz /= regional_field_amplitude
+    for i in prange(n_receivers):
+        # Allocate vectors for kernels evaluated on mesh nodes
+        kxx, kyy, kzz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        kxy, kxz, kyz = np.empty(n_nodes), np.empty(n_nodes), np.empty(n_nodes)
+        # Allocate array for the diagonal elements for the current receiver
+        local_diagonal = np.empty(n_columns)
+        _evaluate_gradient_kernels(receivers[i], nodes, kxx, kyy, kzz, kxy, kxz, kyz)
+        factor = constant_factor * regional_field_amplitude
+        ax = factor * amplitude_derivative[i, 0]
+        ay = factor * amplitude_derivative[i, 1]
+        az = factor * amplitude_derivative[i, 2]
+        for k in range(n_cells):
+            nodes_indices = cell_nodes[k, :]
+            uxx = kernels_in_nodes_to_cell(kxx, nodes_indices)
+            uyy = kernels_in_nodes_to_cell(kyy, nodes_indices)
+            uzz = kernels_in_nodes_to_cell(kzz, nodes_indices)
+            uxy = kernels_in_nodes_to_cell(kxy, nodes_indices)
+            uxz = kernels_in_nodes_to_cell(kxz, nodes_indices)
+            uyz = kernels_in_nodes_to_cell(kyz, nodes_indices)
+            tx = uxx * ax + uxy * ay + uxz * az
+            ty = uxy * ax + uyy * ay + uyz * az
+            tz = uxz * ax + uyz * ay + uzz * az
+            if scalar_model:
+                local_diagonal[k] = weights[i] * (tx * fx + ty * fy + tz * fz) ** 2
+            else:
+                local_diagonal[k] = weights[i] * tx**2
+                local_diagonal[k + n_cells] = weights[i] * ty**2
+                local_diagonal[k + 2 * n_cells] = weights[i] * tz**2
+        # Apply reduction operation to add the values of the local diagonal to
+        # the running diagonal array. Avoid slicing the `diagonal` array when
+        # updating it to avoid racing conditions, just add the `local_diagonal`
+        # to the `diagonal` variable.
+        diagonal += local_diagonal
+
+
+@jit(nopython=True)
+def _evaluate_gradient_kernels(receiver, nodes, kxx, kyy, kzz, kxy, kxz, kyz):
+    """
+    Evaluate the six kernels of the magnetic gradient tensor on mesh nodes.
+
+    Parameters
+    ----------
+    receiver : (3,) array
+        Location of the receiver.
+    nodes : (n_active_nodes, 3) array
+        Array with the location of the mesh nodes.
+    kxx, kyy, kzz, kxy, kxz, kyz : (n_active_nodes) array
+        Arrays where the ``ee``, ``nn``, ``uu``, ``en``, ``eu`` and ``nu``
+        kernels evaluated on each node will be stored.
+    """
+    for j in range(nodes.shape[0]):
+        dx = nodes[j, 0] - receiver[0]
+        dy = nodes[j, 1] - receiver[1]
+        dz = nodes[j, 2] - receiver[2]
+        distance = np.sqrt(dx**2 + dy**2 + dz**2)
+        kxx[j] = choclo.prism.kernel_ee(dx, dy, dz, distance)
+        kyy[j] = choclo.prism.kernel_nn(dx, dy, dz, distance)
+        kzz[j] = choclo.prism.kernel_uu(dx, dy, dz, distance)
+        kxy[j] = choclo.prism.kernel_en(dx, dy, dz, distance)
+        kxz[j] = choclo.prism.kernel_eu(dx, dy, dz, distance)
+        kyz[j] = choclo.prism.kernel_nu(dx, dy, dz, distance)
+
+
 def _forward_mag_2d_mesh(
     receivers,
     cells_bounds,
@@ -1979,3 +2539,11 @@ _sensitivity_tmi_derivative_2d_mesh_serial = jit(nopython=True, parallel=False)(
 _sensitivity_tmi_derivative_2d_mesh_parallel = jit(nopython=True, parallel=True)(
     _sensitivity_tmi_derivative_2d_mesh
 )
+_forward_mag_components_serial = jit(nopython=True, parallel=False)(
+    _forward_mag_components
+)
+_forward_mag_components_parallel = jit(nopython=True, parallel=True)(
+    _forward_mag_components
+)
+_gradient_tensor_serial = jit(nopython=True, parallel=False)(_gradient_tensor)
+_gradient_tensor_parallel = jit(nopython=True, parallel=True)(_gradient_tensor)
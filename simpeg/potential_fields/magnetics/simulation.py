@@ -1,3 +1,4 @@
+import hashlib
 import warnings
 import numpy as np
 import scipy.sparse as sp
@@ -48,7 +49,16 @@ from ._numba_functions import (
     _sensitivity_tmi_derivative_serial,
     _sensitivity_tmi_derivative_2d_mesh_serial,
     _sensitivity_tmi_derivative_2d_mesh_parallel,
+    _forward_mag_components_serial,
+    _forward_mag_components_parallel,
+    _sensitivity_amplitude_t_dot_v_serial,
+    _sensitivity_amplitude_t_dot_v_parallel,
+    _diagonal_amplitude_J_T_dot_J_serial,
+    _diagonal_amplitude_J_T_dot_J_parallel,
+    _gradient_tensor_serial,
+    _gradient_tensor_parallel,
 )
+from simpeg.utils.cache_utils import discard_cached_items
 
 if choclo is not None:
     CHOCLO_SUPPORTED_COMPONENTS = {
@@ -162,13 +172,21 @@ class Simulation3DIntegral(BasePFSimulation):
         field. If False, the fields will be returned unmodified.
     sensitivity_dtype : numpy.dtype, optional
         Data type that will be used to build the sensitivity matrix.
-    store_sensitivities : {"ram", "disk", "forward_only"}
-        Options for storing sensitivity matrix. There are 3 options
+    store_sensitivities : {"ram", "disk", "forward_only", "fft"}
+        Options for storing sensitivity matrix. There are 4 options
 
         - 'ram': sensitivities are stored in the computer's RAM
         - 'disk': sensitivities are written to a directory
         - 'forward_only': you intend only do perform a forward simulation and
           sensitivities do not need to be stored
+        - 'fft': only the kernel of each horizontal layer of cells is stored,
+          and ``G`` is defined as a :class:`~scipy.sparse.linalg.LinearOperator`
+          that computes its products with 2D FFTs. Requires a
+          :class:`discretize.TensorMesh` with uniform horizontal cell sizes,
+          and receivers at the same height on a grid with the same spacing as
+          the cells. Inactive cells and partial grids of receivers are
+          supported. For other meshes and surveys, a warning is issued and
+          the sensitivity matrix is stored in RAM, like with ``"ram"``.
 
     sensitivity_path : str, optional
         Path to store the sensitivity matrix if ``store_sensitivities`` is set
@@ -179,6 +197,15 @@ class Simulation3DIntegral(BasePFSimulation):
         If True, the simulation will run in parallel. If False, it will
         run in serial. If ``engine`` is not ``"choclo"`` this argument will be
         ignored.
+    store_gradient_tensor : bool, optional
+        If True, the six independent elements of the magnetic gradient tensor
+        of every active cell are computed once for every receiver location and
+        stored in memory. The ``bx``, ``by``, ``bz`` and ``tmi`` rows of the
+        sensitivity matrix are assembled from them, and are reassembled
+        without evaluating the kernels again when the regional field or the
+        components in the survey change. Only available with
+        ``engine="choclo"``, and not with ``store_sensitivities="forward_only"``
+        or ``"fft"``.
     ind_active : np.ndarray of int or bool
 
         .. deprecated:: 0.23.0
@@ -198,6 +225,7 @@ class Simulation3DIntegral(BasePFSimulation):
         is_amplitude_data=False,
         engine="geoana",
         numba_parallel=True,
+        store_gradient_tensor=False,
         **kwargs,
     ):
         self.model_type = model_type
@@ -209,6 +237,7 @@ class Simulation3DIntegral(BasePFSimulation):
         self._M = None
         self._gtg_diagonal = None
         self.is_amplitude_data = is_amplitude_data
+        self.store_gradient_tensor = store_gradient_tensor
         self.modelMap = self.chiMap
 
         # Warn if n_processes has been passed
@@ -229,6 +258,14 @@ class Simulation3DIntegral(BasePFSimulation):
                 self._forward_mag = _forward_mag_parallel
                 self._forward_tmi_derivative = _forward_tmi_derivative_parallel
                 self._sensitivity_tmi_derivative = _sensitivity_tmi_derivative_parallel
+                self._forward_mag_components = _forward_mag_components_parallel
+                self._sensitivity_amplitude_t_dot_v = (
+                    _sensitivity_amplitude_t_dot_v_parallel
+                )
+                self._diagonal_amplitude_J_T_dot_J = (
+                    _diagonal_amplitude_J_T_dot_J_parallel
+                )
+                self._gradient_tensor = _gradient_tensor_parallel
             else:
                 self._sensitivity_tmi = _sensitivity_tmi_serial
                 self._sensitivity_mag = _sensitivity_mag_serial
@@ -236,6 +273,14 @@ class Simulation3DIntegral(BasePFSimulation):
                 self._forward_mag = _forward_mag_serial
                 self._forward_tmi_derivative = _forward_tmi_derivative_serial
                 self._sensitivity_tmi_derivative = _sensitivity_tmi_derivative_serial
+                self._forward_mag_components = _forward_mag_components_serial
+                self._sensitivity_amplitude_t_dot_v = (
+                    _sensitivity_amplitude_t_dot_v_serial
+                )
+                self._diagonal_amplitude_J_T_dot_J = (
+                    _diagonal_amplitude_J_T_dot_J_serial
+                )
+                self._gradient_tensor = _gradient_tensor_serial
 
     @property
     def model_type(self):
@@ -261,6 +306,30 @@ class Simulation3DIntegral(BasePFSimulation):
     def is_amplitude_data(self, value):
         self._is_amplitude_data = validate_type("is_amplitude_data", value, bool)
 
+    @property
+    def store_gradient_tensor(self):
+        """Whether to store the magnetic gradient tensor of the cells.
+
+        Returns
+        -------
+        bool
+        """
+        return self._store_gradient_tensor
+
+    @store_gradient_tensor.setter
+    def store_gradient_tensor(self, value):
+        value = validate_type("store_gradient_tensor", value, bool)
+        if value and self.engine != "choclo":
+            raise ValueError(
+                'Storing the gradient tensor is only available with engine="choclo".'
+            )
+        if value and self.store_sensitivities in ("forward_only", "fft"):
+            raise ValueError(
+                "Storing the gradient tensor is not available with "
+                f'store_sensitivities="{self.store_sensitivities}".'
+            )
+        self._store_gradient_tensor = value
+
     @property
     def M(self):
         """
@@ -290,6 +359,14 @@ class Simulation3DIntegral(BasePFSimulation):
     def fields(self, model):
         self.model = model
         # model = self.chiMap * model
+        if self._amplitude_without_building_g:
+            # Compute the three components at once and keep their normalized
+            # values, needed by the derivatives at this model
+            fields = self._forward_amplitude_components(self.chi)
+            amplitude = np.linalg.norm(fields, axis=1)
+            self._ampDeriv = self._survey_ordered_components(fields).T / amplitude
+            return amplitude
+
         if self.store_sensitivities == "forward_only":
             if self.engine == "choclo":
                 fields = self._forward(self.chi)
@@ -307,8 +384,19 @@ class Simulation3DIntegral(BasePFSimulation):
 
     @property
     def G(self):
+        if self.store_gradient_tensor:
+            # Reassemble G from the stored tensor if the regional field or
+            # the components changed since it was built
+            key = self._sensitivity_matrix_key()
+            if getattr(self, "_G_key", None) != key:
+                self._G = None
+                self._gtg_diagonal = None
+                self._ampDeriv = None
+                self._G_key = key
         if getattr(self, "_G", None) is None:
-            if self.engine == "choclo":
+            if self._fft_sensitivities() is not None:
+                self._G = self._fft_sensitivities().as_operator()
+            elif self.engine == "choclo":
                 self._G = self._sensitivity_matrix()
             else:
                 self._G = self.linear_operator()
@@ -342,30 +430,32 @@ class Simulation3DIntegral(BasePFSimulation):
     def getJtJdiag(self, m, W=None, f=None):
         """
         Return the diagonal of JtJ
+
+        Notes
+        -----
+        For amplitude data with ``engine="choclo"`` and
+        ``store_sensitivities="forward_only"``, the diagonal is obtained by
+        accumulation, computing the elements of ``J`` on the fly without
+        building the ``G`` matrix.
         """
         self.model = m
 
         if W is None:
-            W = np.ones(self.survey.nD)
+            n_data = self.survey.nD // 3 if self.is_amplitude_data else self.survey.nD
+            W = np.ones(n_data)
         else:
             W = W.diagonal() ** 2
         if getattr(self, "_gtg_diagonal", None) is None:
-            diag = np.zeros(self.G.shape[1])
-            if not self.is_amplitude_data:
-                for i in range(len(W)):
-                    diag += W[i] * (self.G[i] * self.G[i])
+            if self._fft_sensitivities() is not None:
+                diag = self._toeplitz_gtg_diagonal(W)
+            elif not self.is_amplitude_data:
+                # In Einstein notation, the j-th element of the diagonal is:
+                #   d_j = w_i * G_{ij} * G_{ij}
+                diag = np.einsum("i,ij,ij->j", W, self.G, self.G)
+            elif self._amplitude_without_building_g:
+                diag = self._amplitude_gtg_diagonal_without_building_g(W)
             else:
-                ampDeriv = self.ampDeriv
-                Gx = self.G[::3]
-                Gy = self.G[1::3]
-                Gz = self.G[2::3]
-                for i in range(len(W)):
-                    row = (
-                        ampDeriv[0, i] * Gx[i]
-                        + ampDeriv[1, i] * Gy[i]
-                        + ampDeriv[2, i] * Gz[i]
-                    )
-                    diag += W[i] * (row * row)
+                diag = self._amplitude_gtg_diagonal(W)
             self._gtg_diagonal = diag
         else:
             diag = self._gtg_diagonal
@@ -375,6 +465,10 @@ class Simulation3DIntegral(BasePFSimulation):
         self.model = m
         dmu_dm_v = self.chiDeriv @ v
 
+        if self._amplitude_without_building_g:
+            fields = self._forward_amplitude_components(dmu_dm_v)
+            return np.sum(self._amplitude_derivative_components() * fields, axis=1)
+
         Jvec = self.G @ dmu_dm_v.astype(self.sensitivity_dtype, copy=False)
 
         if self.is_amplitude_data:
@@ -388,6 +482,10 @@ class Simulation3DIntegral(BasePFSimulation):
     def Jtvec(self, m, v, f=None):
         self.model = m
 
+        if self._amplitude_without_building_g:
+            Jtvec = self._amplitude_sensitivity_t_dot_v(v)
+            return np.asarray(self.chiDeriv.T @ Jtvec)
+
         if self.is_amplitude_data:
             v = self.ampDeriv * v
             # dask doesn't support and "order" argument to reshape...
@@ -398,9 +496,13 @@ class Simulation3DIntegral(BasePFSimulation):
     @property
     def ampDeriv(self):
         if getattr(self, "_ampDeriv", None) is None:
-            fields = np.asarray(
-                self.G.dot(self.chi).astype(self.sensitivity_dtype, copy=False)
-            )
+            if self._amplitude_without_building_g:
+                fields = self._forward_amplitude_components(self.chi)
+                fields = self._survey_ordered_components(fields).ravel()
+            else:
+                fields = np.asarray(
+                    self.G.dot(self.chi).astype(self.sensitivity_dtype, copy=False)
+                )
             self._ampDeriv = self.normalized_fields(fields)
 
         return self._ampDeriv
@@ -433,7 +535,9 @@ class Simulation3DIntegral(BasePFSimulation):
         location outside the Earth [obsx, obsy, obsz]
 
         INPUT:
-        receiver_location:  [obsx, obsy, obsz] nC x 3 Array
+        receiver_location:  [obsx, obsy, obsz] Array, or n_receivers x 3 Array
+            for a block of receivers (the receivers are then the first axis of
+            the output)
 
         components: list[str]
             List of magnetic components chosen from:
@@ -444,7 +548,7 @@ class Simulation3DIntegral(BasePFSimulation):
         Ty = [Tyx Tyy Tyz]
         Tz = [Tzx Tzy Tzz]
         """
-        dr = self._nodes - receiver_location
+        dr = self._node_offsets(receiver_location)
         dx = dr[..., 0]
         dy = dr[..., 1]
         dz = dr[..., 2]
@@ -622,43 +726,43 @@ class Simulation3DIntegral(BasePFSimulation):
                 vals_y = node_evals["gzzy"]
                 vals_z = node_evals["gzzz"]
             if self._unique_inv is not None:
-                vals_x = vals_x[self._unique_inv]
-                vals_y = vals_y[self._unique_inv]
-                vals_z = vals_z[self._unique_inv]
+                vals_x = vals_x[..., self._unique_inv]
+                vals_y = vals_y[..., self._unique_inv]
+                vals_z = vals_z[..., self._unique_inv]
 
             cell_eval_x = (
-                vals_x[0]
-                - vals_x[1]
-                - vals_x[2]
-                + vals_x[3]
-                - vals_x[4]
-                + vals_x[5]
-                + vals_x[6]
-                - vals_x[7]
+                vals_x[..., 0, :]
+                - vals_x[..., 1, :]
+                - vals_x[..., 2, :]
+                + vals_x[..., 3, :]
+                - vals_x[..., 4, :]
+                + vals_x[..., 5, :]
+                + vals_x[..., 6, :]
+                - vals_x[..., 7, :]
             )
             cell_eval_y = (
-                vals_y[0]
-                - vals_y[1]
-                - vals_y[2]
-                + vals_y[3]
-                - vals_y[4]
-                + vals_y[5]
-                + vals_y[6]
-                - vals_y[7]
+                vals_y[..., 0, :]
+                - vals_y[..., 1, :]
+                - vals_y[..., 2, :]
+                + vals_y[..., 3, :]
+                - vals_y[..., 4, :]
+                + vals_y[..., 5, :]
+                + vals_y[..., 6, :]
+                - vals_y[..., 7, :]
             )
             cell_eval_z = (
-                vals_z[0]
-                - vals_z[1]
-                - vals_z[2]
-                + vals_z[3]
-                - vals_z[4]
-                + vals_z[5]
-                + vals_z[6]
-                - vals_z[7]
+                vals_z[..., 0, :]
+                - vals_z[..., 1, :]
+                - vals_z[..., 2, :]
+                + vals_z[..., 3, :]
+                - vals_z[..., 4, :]
+                + vals_z[..., 5, :]
+                + vals_z[..., 6, :]
+                - vals_z[..., 7, :]
             )
             if self.model_type == "vector":
                 cell_vals = (
-                    np.r_[cell_eval_x, cell_eval_y, cell_eval_z]
+                    np.concatenate([cell_eval_x, cell_eval_y, cell_eval_z], axis=-1)
                 ) * self.survey.source_field.amplitude
             else:
                 cell_vals = (
@@ -678,7 +782,8 @@ class Simulation3DIntegral(BasePFSimulation):
             [
                 rows[component].astype(self.sensitivity_dtype, copy=False)
                 for component in components
-            ]
+            ],
+            axis=np.ndim(receiver_location) - 1,
         )
 
     @property
@@ -811,8 +916,11 @@ class Simulation3DIntegral(BasePFSimulation):
             sensitivity_matrix = np.empty(shape, dtype=self.sensitivity_dtype)
         # Define the constant factor
         constant_factor = 1 / 4 / np.pi
+        # Get the stored gradient tensor of the cells
+        tensor = self._get_gradient_tensor() if self.store_gradient_tensor else None
         # Start filling the sensitivity matrix
         index_offset = 0
+        location_offset = 0
         scalar_model = self.model_type == "scalar"
         for components, receivers in self._get_components_and_receivers():
             if not CHOCLO_SUPPORTED_COMPONENTS.issuperset(components):
@@ -826,7 +934,16 @@ class Simulation3DIntegral(BasePFSimulation):
                 matrix_slice = slice(
                     index_offset + i, index_offset + n_rows, n_components
                 )
-                if component == "tmi":
+                if tensor is not None and component in ("bx", "by", "bz", "tmi"):
+                    self._sensitivity_from_gradient_tensor(
+                        tensor[location_offset : location_offset + receivers.shape[0]],
+                        component,
+                        sensitivity_matrix[matrix_slice, :],
+                        regional_field,
+                        constant_factor,
+                        scalar_model,
+                    )
+                elif component == "tmi":
                     self._sensitivity_tmi(
                         receivers,
                         active_nodes,
@@ -870,8 +987,313 @@ class Simulation3DIntegral(BasePFSimulation):
                         scalar_model,
                     )
             index_offset += n_rows
+            location_offset += receivers.shape[0]
         return sensitivity_matrix
 
+    def _receiver_locations_sha256(self):
+        """
+        Return the sha256 hash of the locations of every receiver.
+        """
+        sha256 = hashlib.sha256()
+        for _, locations in self._get_components_and_receivers():
+            sha256.update(np.ascontiguousarray(locations, dtype=np.float64))
+        return sha256.digest()
+
+    def _sensitivity_matrix_key(self):
+        """
+        Return the parameters of the survey the sensitivity matrix depends on.
+        """
+        components = tuple(
+            tuple(components) for components, _ in self._get_components_and_receivers()
+        )
+        return (
+            tuple(self.survey.source_field.b0),
+            components,
+            self.model_type,
+            self._receiver_locations_sha256(),
+        )
+
+    def _get_gradient_tensor(self):
+        """
+        Return the gradient tensor of the active cells on every receiver.
+
+        The tensor is computed the first time and stored, and it's only
+        computed again if the receiver locations change.
+
+        Returns
+        -------
+        (n_locations, 6, n_active_cells) numpy.ndarray
+            The ``xx``, ``yy``, ``zz``, ``xy``, ``xz`` and ``yz`` elements of
+            the tensor of each active cell on each receiver location.
+        """
+        key = self._receiver_locations_sha256()
+        if getattr(self, "_stored_gradient_tensor_key", None) != key:
+            receivers = np.vstack(
+                [locations for _, locations in self._get_components_and_receivers()]
+            )
+            active_nodes, active_cell_nodes = self._get_active_nodes()
+            tensor = np.empty(
+                (receivers.shape[0], 6, self.nC), dtype=self.sensitivity_dtype
+            )
+            self._gradient_tensor(receivers, active_nodes, active_cell_nodes, tensor)
+            self._stored_gradient_tensor = tensor
+            self._stored_gradient_tensor_key = key
+        return self._stored_gradient_tensor
+
+    @staticmethod
+    def _sensitivity_from_gradient_tensor(
+        tensor,
+        component,
+        sensitivity_matrix,
+        regional_field,
+        constant_factor,
+        scalar_model,
+    ):
+        """
+        Fill the rows of the sensitivity matrix for a first order component.
+
+        Parameters
+        ----------
+        tensor : (n_receivers, 6, n_active_cells) numpy.ndarray
+            Gradient tensor of the active cells on the receivers.
+        component : {"bx", "by", "bz", "tmi"}
+            Component of the magnetic field.
+        sensitivity_matrix : (n_receivers, n_columns) numpy.ndarray
+            Slice of the sensitivity matrix where the rows will be filled.
+        regional_field : (3,) numpy.ndarray
+            Array containing the x, y and z components of the regional
+            magnetic field (uniform background field).
+        constant_factor : float
+            Constant factor that will be used to multiply each element of the
+            sensitivity matrix.
+        scalar_model : bool
+            Whether the sensitivity matrix works with scalar or vector models.
+        """
+        regional_field_amplitude = np.linalg.norm(regional_field)
+        fx, fy, fz = regional_field / regional_field_amplitude
+        # Project the tensor on the direction of the component: the tmi is
+        # along the regional field.
+        if component == "tmi":
+            dx, dy, dz = fx, fy, fz
+        else:
+            dx, dy, dz = np.eye(3)[("bx", "by", "bz").index(component)]
+        xx, yy, zz, xy, xz, yz = (tensor[:, i, :] for i in range(6))
+        factor = constant_factor * regional_field_amplitude
+        tx = factor * (xx * dx + xy * dy + xz * dz)
+        ty = factor * (xy * dx + yy * dy + yz * dz)
+        tz = factor * (xz * dx + yz * dy + zz * dz)
+        if scalar_model:
+            sensitivity_matrix[:] = tx * fx + ty * fy + tz * fz
+        else:
+            n_cells = tensor.shape[2]
+            sensitivity_matrix[:, :n_cells] = tx
+            sensitivity_matrix[:, n_cells : 2 * n_cells] = ty
+            sensitivity_matrix[:, 2 * n_cells :] = tz
+
+    @property
+    def _amplitude_without_building_g(self):
+        """
+        Whether amplitude data and its derivatives are computed on the fly.
+        """
+        return (
+            self.is_amplitude_data
+            and self.engine == "choclo"
+            and self.store_sensitivities == "forward_only"
+        )
+
+    def _get_amplitude_receivers(self):
+        """
+        Return receiver locations and component order for amplitude data.
+
+        Returns
+        -------
+        receivers : (n_locations, 3) numpy.ndarray
+            Locations of every receiver in the survey.
+        component_order : (n_locations, 3) numpy.ndarray
+            Array of integers with the index (0 for ``bx``, 1 for ``by`` and
+            2 for ``bz``) of each component of the receiver on each location,
+            in the order they appear in the survey.
+        """
+        receivers, component_order = [], []
+        for components, locations in self._get_components_and_receivers():
+            if len(components) != 3 or set(components) != {"bx", "by", "bz"}:
+                raise ValueError(
+                    "Amplitude data require receivers with the 'bx', 'by' and "
+                    f"'bz' components, but found {components}."
+                )
+            order = [("bx", "by", "bz").index(c) for c in components]
+            receivers.append(locations)
+            component_order.append(np.tile(order, (locations.shape[0], 1)))
+        return np.vstack(receivers), np.vstack(component_order)
+
+    def _survey_ordered_components(self, fields):
+        """
+        Sort the ``bx``, ``by`` and ``bz`` columns in the order of the survey.
+        """
+        _, component_order = self._get_amplitude_receivers()
+        return np.take_along_axis(fields, component_order, axis=1)
+
+    def _amplitude_derivative_components(self):
+        """
+        Return the ``ampDeriv`` as a (n_locations, 3) array of ``bx``, ``by``
+        and ``bz`` columns.
+        """
+        _, component_order = self._get_amplitude_receivers()
+        amplitude_derivative = np.empty((component_order.shape[0], 3))
+        np.put_along_axis(
+            amplitude_derivative, component_order, self.ampDeriv.T, axis=1
+        )
+        return amplitude_derivative
+
+    def _forward_amplitude_components(self, model):
+        """
+        Forward model the ``bx``, ``by`` and ``bz`` components on receivers.
+
+        Parameters
+        ----------
+        model : (n_active_cells) or (3 * n_active_cells) array
+            Array containing the susceptibilities (scalar) or effective
+            susceptibilities (vector) of the active cells in the mesh, in SI
+            units.
+
+        Returns
+        -------
+        (n_locations, 3) array
+            Components of the magnetic field on every receiver location.
+        """
+        active_nodes, active_cell_nodes = self._get_active_nodes()
+        receivers, _ = self._get_amplitude_receivers()
+        fields = np.zeros((receivers.shape[0], 3), dtype=np.float64)
+        self._forward_mag_components(
+            receivers,
+            active_nodes,
+            np.asarray(model, dtype=np.float64),
+            fields,
+            active_cell_nodes,
+            self.survey.source_field.b0,
+            1 / 4 / np.pi,
+            self.model_type == "scalar",
+        )
+        return fields
+
+    def _amplitude_sensitivity_t_dot_v(self, vector):
+        """
+        Compute ``J.T @ v`` for amplitude data without building ``G``.
+
+        Parameters
+        ----------
+        vector : (n_locations) numpy.ndarray
+            Vector used in the dot product.
+
+        Returns
+        -------
+        (n_active_cells) or (3 * n_active_cells) numpy.ndarray
+        """
+        active_nodes, active_cell_nodes = self._get_active_nodes()
+        receivers, _ = self._get_amplitude_receivers()
+        n_columns = self.nC if self.model_type == "scalar" else 3 * self.nC
+        result = np.zeros(n_columns)
+        self._sensitivity_amplitude_t_dot_v(
+            receivers,
+            active_nodes,
+            active_cell_nodes,
+            self.survey.source_field.b0,
+            self._amplitude_derivative_components(),
+            1 / 4 / np.pi,
+            self.model_type == "scalar",
+            np.asarray(vector, dtype=np.float64),
+            result,
+        )
+        return result
+
+    def _amplitude_gtg_diagonal_without_building_g(self, weights):
+        """
+        Compute the diagonal of ``J.T @ W.T @ W @ J`` for amplitude data
+        without building the ``G`` matrix.
+
+        Parameters
+        -----------
+        weights : (n_locations,) array
+            Array with data weights. It should be the diagonal of the ``W``
+            matrix, squared.
+
+        Returns
+        -------
+        (n_active_cells) or (3 * n_active_cells) numpy.ndarray
+        """
+        active_nodes, active_cell_nodes = self._get_active_nodes()
+        receivers, _ = self._get_amplitude_receivers()
+        n_columns = self.nC if self.model_type == "scalar" else 3 * self.nC
+        diagonal = np.zeros(n_columns)
+        self._diagonal_amplitude_J_T_dot_J(
+            receivers,
+            active_nodes,
+            active_cell_nodes,
+            self.survey.source_field.b0,
+            self._amplitude_derivative_components(),
+            1 / 4 / np.pi,
+            self.model_type == "scalar",
+            np.asarray(weights, dtype=np.float64),
+            diagonal,
+        )
+        return diagonal
+
+    def _amplitude_gtg_diagonal(self, weights, block_size=1024):
+        """
+        Compute the diagonal of ``J.T @ W.T @ W @ J`` for amplitude data from
+        the stored ``G`` matrix.
+
+        The rows of ``J`` are built in blocks of ``block_size`` locations, so
+        only a block of ``J`` is held in memory at a time.
+        """
+        G = self.G
+        ampDeriv = self.ampDeriv
+        diagonal = np.zeros(G.shape[1])
+        for start in range(0, ampDeriv.shape[1], block_size):
+            stop = min(start + block_size, ampDeriv.shape[1])
+            rows = (
+                ampDeriv[0, start:stop, None] * G[3 * start : 3 * stop : 3]
+                + ampDeriv[1, start:stop, None] * G[3 * start + 1 : 3 * stop : 3]
+                + ampDeriv[2, start:stop, None] * G[3 * start + 2 : 3 * stop : 3]
+            )
+            diagonal += np.einsum("i,ij,ij->j", weights[start:stop], rows, rows)
+        return diagonal
+
+    def _toeplitz_gtg_diagonal(self, weights):
+        """
+        Compute the diagonal of ``J.T @ W.T @ W @ J`` from the layer kernels
+        stored with ``store_sensitivities="fft"``.
+
+        For amplitude data, the rows of ``J`` combine the rows of the three
+        components of each location, so the diagonal needs the products of
+        the kernels of every pair of components, weighted by the normalized
+        fields.
+        """
+        sensitivities = self._fft_sensitivities()
+        if not self.is_amplitude_data:
+            return sensitivities.gtg_diagonal(
+                sensitivities.data_weights_to_grid(weights)
+            )
+        rows = np.arange(self.survey.nD).reshape(-1, 3)
+        components = sensitivities.data_components[rows]
+        grid_indices = sensitivities.data_grid_indices[rows[:, 0]]
+        n_components = len(sensitivities.components)
+        grid_weights = np.zeros(
+            (n_components, n_components, np.prod(sensitivities.shape_receivers))
+        )
+        amplitude_derivative = self.ampDeriv
+        for i in range(3):
+            for j in range(3):
+                np.add.at(
+                    grid_weights,
+                    (components[:, i], components[:, j], grid_indices),
+                    weights * amplitude_derivative[i] * amplitude_derivative[j],
+                )
+        grid_weights = grid_weights.reshape(
+            n_components, n_components, *sensitivities.shape_receivers
+        )
+        return sensitivities.gtg_diagonal(grid_weights)
+
 
 class SimulationEquivalentSourceLayer(
     BaseEquivalentSourceLayerSimulation, Simulation3DIntegral
@@ -915,6 +1337,11 @@ class SimulationEquivalentSourceLayer(
             numba_parallel=numba_parallel,
             **kwargs,
         )
+        if self.store_gradient_tensor:
+            raise NotImplementedError(
+                "Storing the gradient tensor is not implemented for equivalent "
+                "source layers."
+            )
 
         if self.engine == "choclo":
             if self.numba_parallel:
@@ -936,6 +1363,11 @@ class SimulationEquivalentSourceLayer(
                     _sensitivity_tmi_derivative_2d_mesh_serial
                 )
 
+    @property
+    def _amplitude_without_building_g(self):
+        # The fused amplitude functions only work on 3D meshes
+        return False
+
     def _forward(self, model):
         """
         Forward model the fields of active cells in the mesh on receivers.
@@ -1148,6 +1580,7 @@ class Simulation3DDifferential(BaseMagneticPDESimulation):
         if obj is not None:
             obj = validate_type("survey", obj, Survey, cast=False)
         self._survey = obj
+        discard_cached_items(self)
 
     @property
     def MfMuI(self):
@@ -0,0 +1,503 @@
+"""
+=====================================
+Profiling (:mod:`simpeg.profiling`)
+=====================================
+.. currentmodule:: simpeg.profiling
+
+Record nested spans of the hot paths of simulations and inversions.
+
+While a :class:`Profiler` is active, SimPEG records a span for every call to
+the ``fields``, ``dpred``, ``Jvec``, ``Jtvec``, ``getJ`` and ``getJtJdiag``
+methods of simulations, the evaluations and derivatives of objective
+functions (data misfits and regularizations), the factorizations and solves
+of the solvers used by PDE simulations, and the hooks of the inversion
+directives. Each span stores its wall time, CPU time and memory usage, and
+spans are nested following the call stack of each thread.
+
+When no profiler is active, the instrumented methods only check a global
+variable before running, so the overhead is negligible.
+
+.. code::
+
+    from simpeg.profiling import Profiler
+
+    with Profiler() as profiler:
+        inv.run(m0)
+
+    profiler.summary()
+    profiler.to_chrome_trace("trace.json")  # open with chrome://tracing
+    table = profiler.to_dataframe()
+
+API
+---
+
+.. autosummary::
+  :toctree: generated/
+
+  Profiler
+  Span
+  span
+  annotate
+  traced
+  is_enabled
+
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+
+from .utils.cache_utils import current_memory_usage
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+__all__ = ["Profiler", "Span", "span", "annotate", "traced", "is_enabled"]
+
+# The profiler that is currently recording spans, if any.
+_active_profiler = None
+
+
+def _max_rss():
+    """High-water mark of the resident memory of the process, in bytes."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return max_rss if os.uname().sysname == "Darwin" else max_rss * 1024
+
+
+@dataclass
+class Span:
+    """A single timed call recorded by a :class:`Profiler`.
+
+    Attributes
+    ----------
+    name : str
+        Name of the span, e.g. ``"Simulation3DNodal.Jvec"``.
+    category : str
+        Category of the span, e.g. ``"simulation"`` or ``"solver"``.
+    index : int
+        Index of the span in :attr:`Profiler.spans`.
+    parent : int or None
+        Index of the enclosing span in the same thread.
+    depth : int
+        Nesting level of the span in its thread.
+    thread : int
+        Identifier of the thread that ran the span.
+    start : float
+        Start time in seconds, relative to the start of the profiler.
+    wall_time : float
+        Wall time of the span in seconds.
+    cpu_time : float
+        CPU time used by the process during the span, in seconds.
+    rss_start, rss_end : int or None
+        Resident memory of the process at the start and end of the span.
+    peak_rss : int or None
+        Peak resident memory during the span. It is exact when the span
+        raised the high-water mark of the process, otherwise it is the largest
+        of ``rss_start`` and ``rss_end``.
+    args : dict
+        Extra information attached to the span.
+    """
+
+    name: str
+    category: str
+    index: int
+    parent: int | None
+    depth: int
+    thread: int
+    start: float
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    rss_start: int | None = None
+    rss_end: int | None = None
+    peak_rss: int | None = None
+    args: dict = field(default_factory=dict)
+
+
+class _SpanContext:
+    """Context manager recording a span on the active profiler."""
+
+    __slots__ = ("_profiler", "_name", "_category", "_args", "_span", "_state")
+
+    def __init__(self, profiler, name, category, args):
+        self._profiler = profiler
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._span, self._state = self._profiler._open(
+            self._name, self._category, self._args
+        )
+        return self._span
+
+    def __exit__(self, *exc_info):
+        self._profiler._close(self._span, self._state)
+        return False
+
+
+class _NullContext:
+    """Context manager that does nothing, used when profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class Profiler:
+    """Recorder of nested spans in simulations and inversions.
+
+    Use the profiler as a context manager, or call :meth:`start` and
+    :meth:`stop`. Only one profiler can be active at a time.
+
+    Parameters
+    ----------
+    track_memory : bool, optional
+        Whether to record the resident memory of the process at the start and
+        end of each span. Reading it adds a small overhead to each span.
+    """
+
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._t0 = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def start(self):
+        """Start recording spans."""
+        global _active_profiler
+        if _active_profiler is not None and _active_profiler is not self:
+            raise RuntimeError("Another profiler is already active.")
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+        _active_profiler = self
+
+    def stop(self):
+        """Stop recording spans."""
+        global _active_profiler
+        if _active_profiler is self:
+            _active_profiler = None
+
+    def clear(self):
+        """Remove all the recorded spans."""
+        with self._lock:
+            self.spans = []
+        self._t0 = time.perf_counter()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _open(self, name, category, args):
+        stack = self._stack()
+        with self._lock:
+            index = len(self.spans)
+            span = Span(
+                name=name,
+                category=category,
+                index=index,
+                parent=stack[-1].index if stack else None,
+                depth=len(stack),
+                thread=threading.get_ident(),
+                start=0.0,
+                args=dict(args) if args else {},
+            )
+            self.spans.append(span)
+        stack.append(span)
+        max_rss = None
+        if self.track_memory:
+            span.rss_start = current_memory_usage()
+            max_rss = _max_rss()
+        span.start = time.perf_counter() - self._t0
+        return span, (time.perf_counter(), time.process_time(), max_rss)
+
+    def _close(self, span, state):
+        wall_start, cpu_start, max_rss_start = state
+        span.wall_time = time.perf_counter() - wall_start
+        span.cpu_time = time.process_time() - cpu_start
+        if self.track_memory:
+            span.rss_end = current_memory_usage()
+            candidates = [r for r in (span.rss_start, span.rss_end) if r is not None]
+            max_rss_end = _max_rss()
+            if max_rss_end is not None and max_rss_end > max_rss_start:
+                candidates.append(max_rss_end)
+            span.peak_rss = max(candidates) if candidates else None
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def span(self, name, category="user", **args):
+        """Context manager recording a span on this profiler.
+
+        Parameters
+        ----------
+        name : str
+            Name of the span.
+        category : str, optional
+            Category of the span.
+        **args
+            Extra information stored with the span.
+        """
+        return _SpanContext(self, name, category, args)
+
+    def to_records(self):
+        """Recorded spans as a list of dictionaries.
+
+        Returns
+        -------
+        list of dict
+        """
+        return [asdict(s) for s in self.spans]
+
+    def to_dataframe(self):
+        """Recorded spans as a table.
+
+        Requires ``pandas``.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Table with one row per span, indexed by the span index.
+        """
+        try:
+            import pandas as pd
+        except ImportError as err:
+            raise ImportError(
+                "pandas is required to export the profiling spans as a table. "
+                "Use 'to_records' instead."
+            ) from err
+        columns = [f.name for f in Span.__dataclass_fields__.values()]
+        return pd.DataFrame(self.to_records(), columns=columns).set_index("index")
+
+    def to_chrome_trace(self, filename=None):
+        """Recorded spans in the Chrome trace-event format.
+
+        The trace can be opened with ``chrome://tracing`` or
+        `Perfetto <https://ui.perfetto.dev>`__.
+
+        Parameters
+        ----------
+        filename : str or path-like, optional
+            If provided, the trace is written to this file as JSON.
+
+        Returns
+        -------
+        dict
+            The trace, with the spans as complete (``"X"``) events.
+        """
+        pid = os.getpid()
+        events = []
+        for s in self.spans:
+            args = {"cpu_time": s.cpu_time, **s.args}
+            if s.peak_rss is not None:
+                args["peak_rss"] = s.peak_rss
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": s.category,
+                    "ph": "X",
+                    "ts": s.start * 1e6,
+                    "dur": s.wall_time * 1e6,
+                    "pid": pid,
+                    "tid": s.thread,
+                    "args": args,
+                }
+            )
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if filename is not None:
+            with open(filename, "w") as f:
+                json.dump(trace, f)
+        return trace
+
+    def summary(self):
+        """Print the number of calls and times spent in each span name."""
+        totals = {}
+        for s in self.spans:
+            count, wall, cpu = totals.get(s.name, (0, 0.0, 0.0))
+            totals[s.name] = (count + 1, wall + s.wall_time, cpu + s.cpu_time)
+        print("Spans:" + " " * 44 + "calls     wall      cpu")
+        for name in sorted(totals, key=lambda n: -totals[n][1]):
+            count, wall, cpu = totals[name]
+            print(
+                "  {0:<46}: {1:6d}, {2:4.2e}, {3:4.2e}".format(name, count, wall, cpu)
+            )
+
+
+def is_enabled():
+    """Whether a profiler is currently recording spans.
+
+    Returns
+    -------
+    bool
+    """
+    return _active_profiler is not None
+
+
+def span(name, category="user", **args):
+    """Context manager recording a span on the active profiler.
+
+    Does nothing if no profiler is active.
+
+    Parameters
+    ----------
+    name : str
+        Name of the span.
+    category : str, optional
+        Category of the span.
+    **args
+        Extra information stored with the span.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return _NULL_CONTEXT
+    return _SpanContext(profiler, name, category, args)
+
+
+def annotate(**args):
+    """Store extra information with the innermost open span of this thread.
+
+    Does nothing if no profiler is active or no span is open, e.g. to attach
+    the iteration counts of an iterative solve to the span of the solve.
+
+    Parameters
+    ----------
+    **args
+        Extra information stored with the span.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return
+    stack = profiler._stack()
+    if stack:
+        stack[-1].args.update(args)
+
+
+def traced(category="user", name=None):
+    """Decorator recording a span for every call of a method.
+
+    The span is named after the class of the instance and the name of the
+    method, e.g. ``"Simulation3DNodal.Jvec"``. While no profiler is active,
+    the method is looked up as the undecorated function, so its calls don't
+    go through an extra frame (e.g. warnings raised with ``stacklevel=2``
+    are still attributed to the caller).
+
+    Parameters
+    ----------
+    category : str, optional
+        Category of the spans.
+    name : str, optional
+        Name of the method used in the span names. Defaults to the name of
+        the decorated function.
+    """
+
+    def decorator(f):
+        return _TracedMethod(f, category, name)
+
+    return decorator
+
+
+class _TracedMethod:
+    """Descriptor of a method recording its calls while a profiler is active."""
+
+    _simpeg_traced = True
+
+    def __init__(self, func, category, name=None):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.category = category
+        self.method_name = func.__name__ if name is None else name
+
+    def __get__(self, instance, owner=None):
+        method = self.func.__get__(instance, owner)
+        if instance is None or _active_profiler is None:
+            return method
+        span_name = f"{type(instance).__name__}.{self.method_name}"
+        category = self.category
+
+        @functools.wraps(self.func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler
+            if profiler is None:
+                return method(*args, **kwargs)
+            span, state = profiler._open(span_name, category, None)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler._close(span, state)
+
+        return wrapper
+
+    def __call__(self, instance, *args, **kwargs):
+        return self.__get__(instance, type(instance))(*args, **kwargs)
+
+
+def _trace_methods(cls, method_names, category):
+    """Wrap the methods defined by a class so they are recorded as spans."""
+    for method_name in method_names:
+        method = cls.__dict__.get(method_name, None)
+        if not callable(method) or getattr(method, "_simpeg_traced", False):
+            continue
+        setattr(cls, method_name, traced(category, name=method_name)(method))
+
+
+_traced_solver_classes = {}
+
+
+def _traced_solver(solver_class, name=None):
+    """Subclass of a pymatsolver solver recording its factorizations and solves.
+
+    The spans are named after the solver class, or after ``name`` if given.
+    """
+    if name is None:
+        name = solver_class.__name__
+    traced_class = _traced_solver_classes.get((solver_class, name), None)
+    if traced_class is not None:
+        return traced_class
+
+    def __init__(self, A, *args, **kwargs):
+        with span(f"{name}.factor", "solver", shape=list(A.shape)):
+            solver_class.__init__(self, A, *args, **kwargs)
+
+    def solve(self, rhs):
+        n_rhs = 1 if rhs.ndim == 1 else rhs.shape[-1]
+        with span(f"{name}.solve", "solver", n_rhs=n_rhs):
+            return solver_class.solve(self, rhs)
+
+    traced_class = type(
+        name,
+        (solver_class,),
+        {
+            "__init__": __init__,
+            "solve": solve,
+            "__module__": solver_class.__module__,
+            "__qualname__": solver_class.__qualname__,
+            "_simpeg_traced": True,
+        },
+    )
+    _traced_solver_classes[(solver_class, name)] = traced_class
+    return traced_class
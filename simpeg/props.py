@@ -5,6 +5,7 @@ import numpy as np
 from simpeg.utils import deprecate_property
 from .maps import IdentityMap, ReciprocalMap
 from .utils import Zero, validate_type, validate_ndarray_with_shape
+from .utils.cache_utils import discard_cached_items
 
 
 class Mapping:
@@ -60,6 +61,7 @@ class Mapping:
                 value = validate_type(scope.name, value, IdentityMap, cast=False)
                 scope.clear_props(self)
             setattr(self, f"_{scope.name}", value)
+            discard_cached_items(self)
 
         def fdel(self):
             setattr(self, f"_{scope.name}", None)
@@ -182,6 +184,7 @@ class PhysicalProperty:
                     delattr(self, scope.reciprocal.name)
                 scope.clear_mappings(self)
             setattr(self, f"_{scope.name}", value)
+            discard_cached_items(self)
 
         def fdel(self):
             setattr(self, f"_{scope.name}", None)
@@ -10,6 +10,7 @@ from ..utils import (
     Identity,
     deprecate_property,
     mkvc,
+    model_fingerprint,
     sdiag,
     timeIt,
     validate_float,
@@ -185,6 +186,8 @@ class PGIsmallness(Smallness):
     _multiplier_pair = "alpha_pgi"
     _maplist = None
     _wiresmap = None
+    _membership_cache = None
+    _residual_cache = None
 
     def __init__(
         self,
@@ -389,6 +392,7 @@ class PGIsmallness(Smallness):
             raise ValueError(f"Attribure 'wiresmap' should be of type {Wires} or None.")
 
         self._wiresmap = wires
+        self._residual_cache = None
 
     @property
     def maplist(self):
@@ -427,6 +431,101 @@ class PGIsmallness(Smallness):
             )
 
         self._maplist = maplist
+        self._residual_cache = None
+
+    def _cluster_membership(self):
+        """Membership and precisions of the quasi geology model.
+
+        The membership array from :meth:`compute_quasi_geology_model` and the
+        precisions of the matching cluster for each cell are kept until the
+        reference model or the Gaussian mixture model change.
+
+        Returns
+        -------
+        membership : (n_active, ) numpy.ndarray of int
+            The membership array.
+        precisions : numpy.ndarray
+            The precisions of the cluster of each cell; ``(n_active, n_features)``
+            for diagonal, ``(n_active, 1)`` for spherical and
+            ``(n_active, n_features, n_features)`` for full covariances. For tied
+            covariances, the shared ``(n_features, n_features)`` precision matrix.
+        """
+        key = model_fingerprint(self.reference_model)
+        cache = self._membership_cache
+        if cache is None or cache[0] != key or cache[1] is not self.gmm:
+            membership = self.compute_quasi_geology_model()
+            precisions = np.asarray(self.gmm.precisions_)
+            if self.gmm.covariance_type != "tied":
+                precisions = precisions[membership]
+                if self.gmm.covariance_type == "spherical":
+                    precisions = precisions[:, np.newaxis]
+            self._membership_cache = cache = (key, self.gmm, membership, precisions)
+        return cache[2], cache[3]
+
+    def _apply_cluster_precisions(self, r0, precisions):
+        """Multiply the residual of each cell by the precisions of its cluster."""
+        if self.gmm.covariance_type == "tied":
+            return r0 @ precisions.T
+        if self.gmm.covariance_type in ["diag", "spherical"]:
+            return r0 * precisions
+        return np.einsum("ijk,ik->ij", precisions, r0)
+
+    def _weighted_residuals(self, m, W):
+        r"""Weighted residual and precision-weighted residual for a model.
+
+        The residual :math:`\mathbf{r_0} = \mathbf{W} (\mathbf{m} - \mathbf{m_{ref}})`
+        and :math:`\mathbf{r_1} = \boldsymbol{\Sigma}_{\mathbf{z}^\ast}^{-1} \mathbf{r_0}`
+        are shared by the evaluation and the gradient of the least-squares
+        approximation, so the last ones computed are kept for reuse at the same
+        model, weights, reference model and Gaussian mixture model.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model.
+        W : scipy.sparse.csr_matrix
+            The weighting matrix.
+
+        Returns
+        -------
+        r0, r1 : (n_active, n_features) numpy.ndarray
+            The weighted residual and the precision-weighted residual.
+        """
+        key = (model_fingerprint(m), model_fingerprint(self.reference_model))
+        cache = self._residual_cache
+        if (
+            cache is not None
+            and cache[0] == key
+            and cache[1] is W
+            and cache[2] is self.gmm
+        ):
+            return cache[3], cache[4]
+
+        membership, precisions = self._cluster_membership()
+        modellist = self.wiresmap * m
+        dmm = np.c_[[a * b for a, b in zip(self.maplist, modellist)]].T
+        if self.non_linear_relationships:
+            dmm = np.r_[
+                [
+                    self.gmm.cluster_mapping[membership[i]] * dmm[i].reshape(-1, 2)
+                    for i in range(dmm.shape[0])
+                ]
+            ].reshape(-1, 2)
+
+        dmmref = np.c_[[a for a in self.wiresmap * self.reference_model]].T
+        dmr = dmm - dmmref
+        r0 = (W * mkvc(dmr)).reshape(dmr.shape, order="F")
+        r1 = self._apply_cluster_precisions(r0, precisions)
+        self._residual_cache = (key, W, self.gmm, r0, r1)
+        return r0, r1
+
+    def _precision_matrix(self, k):
+        """Full precision matrix of cluster ``k`` of the Gaussian mixture model."""
+        if self.gmm.covariance_type == "tied":
+            return self.gmm.precisions_
+        if self.gmm.covariance_type in ["diag", "spherical"]:
+            return self.gmm.precisions_[k] * np.eye(len(self.wiresmap.maps))
+        return self.gmm.precisions_[k]
 
     @timeIt
     def __call__(self, m, external_weights=True):
@@ -453,40 +552,7 @@ class PGIsmallness(Smallness):
             self.reference_model = mkvc(self.gmm.means_[self.membership(m)])
 
         if self.approx_eval:
-            membership = self.compute_quasi_geology_model()
-            dm = self.wiresmap * (m)
-            dmref = self.wiresmap * (self.reference_model)
-            dmm = np.c_[[a * b for a, b in zip(self.maplist, dm)]].T
-            if self.non_linear_relationships:
-                dmm = np.r_[
-                    [
-                        self.gmm.cluster_mapping[membership[i]] * dmm[i].reshape(-1, 2)
-                        for i in range(dmm.shape[0])
-                    ]
-                ].reshape(-1, 2)
-
-            dmmref = np.c_[[a for a in dmref]].T
-            dmr = dmm - dmmref
-            r0 = (W * mkvc(dmr)).reshape(dmr.shape, order="F")
-
-            if self.gmm.covariance_type == "tied":
-                r1 = mkvc(np.dot(self.gmm.precisions_, r0.T).T)
-            elif (
-                self.gmm.covariance_type == "diag"
-                or self.gmm.covariance_type == "spherical"
-            ):
-                r1 = np.zeros_like(r0)
-                for i in range(self.gmm.n_components):
-                    selection = membership == i
-                    r1[selection] = r0[selection] * self.gmm.precisions_[i].T
-                r1 = mkvc(r1)
-            else:
-                r1 = np.zeros_like(r0)
-                for i in range(self.gmm.n_components):
-                    selection = membership == i
-                    r1[selection] = (self.gmm.precisions_[i] @ r0[selection].T).T
-                r1 = mkvc(r1)
-
+            r0, r1 = self._weighted_residuals(m, W)
             return mkvc(r0).dot(mkvc(r1))
 
         else:
@@ -535,66 +601,40 @@ class PGIsmallness(Smallness):
         if getattr(self, "reference_model", None) is None:
             self.reference_model = mkvc(self.gmm.means_[self.membership(m)])
 
-        membership = self.compute_quasi_geology_model()
         modellist = self.wiresmap * m
-        dmmodel = np.c_[[a * b for a, b in zip(self.maplist, modellist)]].T
-        mreflist = self.wiresmap * self.reference_model
         mD = [a.deriv(b) for a, b in zip(self.maplist, modellist)]
         mD = sp.block_diag(mD)
 
-        if self.non_linear_relationships:
+        if self.approx_gradient:
+            if not self.non_linear_relationships:
+                _, r = self._weighted_residuals(m, self.W)
+                return 2 * mkvc(mD.T * (self.W.T * mkvc(r)))
+
+            if self.gmm.covariance_type == "tied":
+                raise Exception("Not implemented")
+
+            membership, _ = self._cluster_membership()
+            dmmodel = np.c_[[a * b for a, b in zip(self.maplist, modellist)]].T
             dmmodel = np.r_[
                 [
                     self.gmm.cluster_mapping[membership[i]] * dmmodel[i].reshape(-1, 2)
                     for i in range(dmmodel.shape[0])
                 ]
             ].reshape(-1, 2)
-
-        if self.approx_gradient:
-            dmmref = np.c_[[a for a in mreflist]].T
-            dm = dmmodel - dmmref
-            r0 = (self.W * (mkvc(dm))).reshape(dm.shape, order="F")
-
-            if self.gmm.covariance_type == "tied":
-                if self.non_linear_relationships:
-                    raise Exception("Not implemented")
-
-                r = mkvc(np.dot(self.gmm.precisions_, r0.T).T)
-            elif (
-                self.gmm.covariance_type == "diag"
-                or self.gmm.covariance_type == "spherical"
-            ) and not self.non_linear_relationships:
-                r = np.zeros_like(r0)
-                for i in range(self.gmm.n_components):
-                    selection = membership == i
-                    r[selection] = r0[selection] * self.gmm.precisions_[i].T
-                r = mkvc(r)
-
-            else:
-                if self.non_linear_relationships:
-                    r = mkvc(
-                        np.r_[
-                            [
-                                mkvc(
-                                    self.gmm.cluster_mapping[membership[i]].deriv(
-                                        dmmodel[i],
-                                        v=np.dot(
-                                            self.gmm.precisions_[membership[i]], r0[i]
-                                        ),
-                                    )
-                                )
-                                for i in range(dmmodel.shape[0])
-                            ]
-                        ]
-                    )
-
-                else:
-                    r0 = (self.W * (mkvc(dm))).reshape(dm.shape, order="F")
-                    r = np.zeros_like(r0)
-                    for i in range(self.gmm.n_components):
-                        selection = membership == i
-                        r[selection] = (self.gmm.precisions_[i] @ r0[selection].T).T
-                    r = mkvc(r)
+            r0, _ = self._weighted_residuals(m, self.W)
+            r = mkvc(
+                np.r_[
+                    [
+                        mkvc(
+                            self.gmm.cluster_mapping[membership[i]].deriv(
+                                dmmodel[i],
+                                v=np.dot(self.gmm.precisions_[membership[i]], r0[i]),
+                            )
+                        )
+                        for i in range(dmmodel.shape[0])
+                    ]
+                ]
+            )
             return 2 * mkvc(mD.T * (self.W.T * r))
 
         else:
@@ -615,8 +655,6 @@ class PGIsmallness(Smallness):
             # score = self.gmm.score_samples(model)
             score_vec = np.hstack([score for maps in self.wiresmap.maps])
 
-            logP = np.zeros((len(model), self.gmm.n_components))
-            W = []
             logP = self.gmm._estimate_log_gaussian_prob_with_sensW(
                 model,
                 sensW,
@@ -624,83 +662,18 @@ class PGIsmallness(Smallness):
                 self.gmm.precisions_cholesky_,
                 self.gmm.covariance_type,
             )
-            for k in range(self.gmm.n_components):
-                if self.gmm.covariance_type == "tied":
-                    # logP[:, k] = mkvc(
-                    #    multivariate_normal(
-                    #        self.gmm.means_[k], self.gmm.covariances_
-                    #    ).logpdf(model)
-                    # )
-
-                    W.append(
-                        self.gmm.weights_[k]
-                        * mkvc(
-                            np.r_[
-                                [
-                                    np.dot(
-                                        np.diag(sensW[i]).dot(
-                                            self.gmm.precisions_.dot(np.diag(sensW[i]))
-                                        ),
-                                        (model[i] - self.gmm.means_[k]).T,
-                                    )
-                                    for i in range(len(model))
-                                ]
-                            ]
-                        )
-                    )
-                elif (
-                    self.gmm.covariance_type == "diag"
-                    or self.gmm.covariance_type == "spherical"
-                ):
-                    # logP[:, k] = mkvc(
-                    #    multivariate_normal(
-                    #        self.gmm.means_[k],
-                    #        self.gmm.covariances_[k] * np.eye(len(self.wiresmap.maps)),
-                    #    ).logpdf(model)
-                    # )
-                    W.append(
-                        self.gmm.weights_[k]
-                        * mkvc(
-                            np.r_[
-                                [
-                                    np.dot(
-                                        np.diag(sensW[i]).dot(
-                                            (
-                                                self.gmm.precisions_[k]
-                                                * np.eye(len(self.wiresmap.maps))
-                                            ).dot(np.diag(sensW[i]))
-                                        ),
-                                        (model[i] - self.gmm.means_[k]).T,
-                                    )
-                                    for i in range(len(model))
-                                ]
-                            ]
-                        )
-                    )
-                else:
-                    # logP[:, k] = mkvc(
-                    #    multivariate_normal(
-                    #        self.gmm.means_[k], self.gmm.covariances_[k]
-                    #    ).logpdf(model)
-                    # )
-                    W.append(
-                        self.gmm.weights_[k]
-                        * mkvc(
-                            np.r_[
-                                [
-                                    np.dot(
-                                        np.diag(sensW[i]).dot(
-                                            self.gmm.precisions_[k].dot(
-                                                np.diag(sensW[i])
-                                            )
-                                        ),
-                                        (model[i] - self.gmm.means_[k]).T,
-                                    )
-                                    for i in range(len(model))
-                                ]
-                            ]
-                        )
+            # diag(sensW_i) P_k diag(sensW_i) (m_i - mu_k) for all cells at once
+            W = [
+                self.gmm.weights_[k]
+                * mkvc(
+                    sensW
+                    * (
+                        (sensW * (model - self.gmm.means_[k]))
+                        @ self._precision_matrix(k).T
                     )
+                )
+                for k in range(self.gmm.n_components)
+            ]
             W = np.c_[W].T
             logP = np.vstack([logP for maps in self.wiresmap.maps])
             numer = (W * np.exp(logP)).sum(axis=1)
@@ -742,7 +715,7 @@ class PGIsmallness(Smallness):
         if self.approx_hessian:
             # we approximate it with the covariance of the cluster
             # whose each point belong
-            membership = self.compute_quasi_geology_model()
+            membership, precisions = self._cluster_membership()
             modellist = self.wiresmap * m
             dmmodel = np.c_[[a * b for a, b in zip(self.maplist, modellist)]].T
             mD = [a.deriv(b) for a, b in zip(self.maplist, modellist)]
@@ -764,9 +737,7 @@ class PGIsmallness(Smallness):
                             ]
                         ]
                     else:
-                        r = self.gmm.precisions_[np.newaxis, :, :][
-                            np.zeros_like(membership)
-                        ]
+                        r = np.repeat(precisions[np.newaxis], len(membership), axis=0)
                 elif (
                     self.gmm.covariance_type == "spherical"
                     or self.gmm.covariance_type == "diag"
@@ -788,13 +759,9 @@ class PGIsmallness(Smallness):
                             ]
                         ]
                     else:
-                        r = np.r_[
-                            [
-                                self.gmm.precisions_[memb]
-                                * np.eye(len(self.wiresmap.maps))
-                                for memb in membership
-                            ]
-                        ]
+                        r = precisions[:, :, np.newaxis] * np.eye(
+                            len(self.wiresmap.maps)
+                        )
                 else:
                     if self.non_linear_relationships:
                         r = np.r_[
@@ -812,7 +779,7 @@ class PGIsmallness(Smallness):
                             ]
                         ]
                     else:
-                        r = self.gmm.precisions_[membership]
+                        r = precisions
 
                 self._r_second_deriv = r
 
@@ -863,47 +830,19 @@ class PGIsmallness(Smallness):
             mD = sp.block_diag(mD)
 
             score = self.gmm.score_samples_with_sensW(model, sensW)
-            logP = np.zeros((len(model), self.gmm.n_components))
-            W = []
             logP = self.gmm._estimate_weighted_log_prob_with_sensW(
                 model,
                 sensW,
             )
-            for k in range(self.gmm.n_components):
-                if self.gmm.covariance_type == "tied":
-                    W.append(
-                        [
-                            np.diag(sensW[i]).dot(
-                                self.gmm.precisions_.dot(np.diag(sensW[i]))
-                            )
-                            for i in range(len(model))
-                        ]
-                    )
-                elif (
-                    self.gmm.covariance_type == "diag"
-                    or self.gmm.covariance_type == "spherical"
-                ):
-                    W.append(
-                        [
-                            np.diag(sensW[i]).dot(
-                                (
-                                    self.gmm.precisions_[k]
-                                    * np.eye(len(self.wiresmap.maps))
-                                ).dot(np.diag(sensW[i]))
-                            )
-                            for i in range(len(model))
-                        ]
-                    )
-                else:
-                    W.append(
-                        [
-                            np.diag(sensW[i]).dot(
-                                self.gmm.precisions_[k].dot(np.diag(sensW[i]))
-                            )
-                            for i in range(len(model))
-                        ]
-                    )
-            W = np.c_[W]
+            # diag(sensW_i) P_k diag(sensW_i) for all cells and clusters
+            W = np.stack(
+                [
+                    sensW[:, :, np.newaxis]
+                    * self._precision_matrix(k)
+                    * sensW[:, np.newaxis, :]
+                    for k in range(self.gmm.n_components)
+                ]
+            )
 
             hlist = [
                 [
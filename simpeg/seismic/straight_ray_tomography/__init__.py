@@ -12,6 +12,9 @@ Simulations
   :toctree: generated/
 
   Simulation
+  Simulation2DIntegral
+  Simulation3DIntegral
+  simulation.BaseStraightRaySimulation
 
 
 Survey, Sources and Receivers
@@ -26,6 +29,7 @@ Survey, Sources and Receivers
 """
 
 from .simulation import Simulation2DIntegral as Simulation
+from .simulation import Simulation2DIntegral, Simulation3DIntegral
 from .survey import StraightRaySurvey as Survey
 from ...survey import BaseSrc as Src
 from ...survey import BaseRx as Rx
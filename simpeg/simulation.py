@@ -10,9 +10,11 @@ from discretize import TensorMesh
 from discretize.utils import unpack_widths, sdiag, mkvc
 
 from . import props
+from .profiling import _trace_methods
 from .typing import RandomSeed
 from .data import SyntheticData
 from .survey import BaseSurvey
+from .utils.cache_utils import discard_cached_items
 from .utils import (
     Counter,
     timeIt,
@@ -59,6 +61,22 @@ class BaseSimulation(props.HasModel):
 
     _REGISTRY = {}
 
+    # Methods recorded as spans while a simpeg.profiling.Profiler is active
+    _traced_methods = (
+        "fields",
+        "dpred",
+        "Jvec",
+        "Jtvec",
+        "Jvec_approx",
+        "Jtvec_approx",
+        "getJ",
+        "getJtJdiag",
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _trace_methods(cls, cls._traced_methods, "simulation")
+
     def __init__(
         self,
         survey=None,
@@ -94,6 +112,7 @@ class BaseSimulation(props.HasModel):
         if value is not None:
             value = validate_type("survey", value, BaseSurvey, cast=False)
         self._survey = value
+        discard_cached_items(self)
 
     @property
     def counter(self):
@@ -433,6 +452,9 @@ class BaseSimulation(props.HasModel):
         )
 
 
+_trace_methods(BaseSimulation, BaseSimulation._traced_methods, "simulation")
+
+
 class BaseTimeSimulation(BaseSimulation):
     r"""Base class for time domain simulations.
 
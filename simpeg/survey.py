@@ -1,6 +1,7 @@
 import numpy as np
 import scipy.sparse as sp
 
+import copy
 import warnings
 import uuid
 
@@ -641,6 +642,314 @@ class BaseSurvey:
         return slices
 
 
+class BaseArraySurvey(BaseSurvey):
+    """Base SimPEG survey repeating template sources at many locations.
+
+    The survey is stored as a few contiguous arrays: the location of every
+    sounding, the offsets of the template receivers and the number of data of
+    each source. The sources and receivers in :py:attr:`source_list` are
+    only built when first requested, and are not pickled, so copying the
+    survey to other processes is cheap. The 1D EM simulations never request
+    them: they work from the sources of a single sounding, given by
+    :py:meth:`get_sounding_sources`, and the sounding locations.
+
+    Each sounding is made of a copy of every template source, translated to
+    the sounding location, with a copy of its receivers translated
+    accordingly. The data are ordered by sounding, then by template source.
+
+    Parameters
+    ----------
+    source_templates : simpeg.survey.BaseSrc or list of simpeg.survey.BaseSrc
+        Sources, with their receivers, defining a single sounding. Receiver
+        locations are relative to the location of their source if they use
+        source-receiver offsets, and absolute otherwise. The templates should
+        not have been used in a simulation.
+    source_locations : (n_soundings, dim) numpy.ndarray
+        Locations of the template sources at each sounding. For sources
+        defined by several points, the first point is moved to these locations.
+    counter : simpeg.utils.Counter, optional
+        A SimPEG counter object
+    """
+
+    _source_type = BaseSrc
+
+    def __init__(self, source_templates, source_locations, counter=None, **kwargs):
+        if isinstance(source_templates, BaseSrc):
+            source_templates = [source_templates]
+        self._source_templates = validate_list_of_types(
+            "source_templates",
+            source_templates,
+            self._source_type,
+            ensure_unique=True,
+        )
+        self._source_locations = np.ascontiguousarray(
+            validate_ndarray_with_shape(
+                "source_locations", source_locations, shape=("*", "*"), dtype=float
+            )
+        )
+
+        # Receiver offsets from the reference point of each template source
+        self._references = []
+        self._receiver_offsets = []
+        for src in self._source_templates:
+            reference = np.atleast_2d(src.location)[0]
+            self._references.append(reference)
+            self._receiver_offsets.append(
+                [
+                    (
+                        rx.locations
+                        if getattr(rx, "use_source_receiver_offset", False)
+                        else rx.locations - reference
+                    )
+                    for rx in src.receiver_list
+                ]
+            )
+
+        if counter is not None:
+            self.counter = counter
+
+        self._uid = uuid.uuid4()
+        # The sources are defined by the templates, skip setting a source list
+        super(BaseSurvey, self).__init__(**kwargs)
+
+    def __getstate__(self):
+        # The sources and receivers are rebuilt from the arrays when needed
+        state = self.__dict__.copy()
+        for name in (
+            "_source_list",
+            "_source_order",
+            "_source_indices",
+            "_all_slices",
+            "_frequency_sources",
+        ):
+            state.pop(name, None)
+        return state
+
+    @property
+    def source_templates(self):
+        """Sources, with their receivers, defining a single sounding.
+
+        Returns
+        -------
+        list of simpeg.survey.BaseSrc
+        """
+        return self._source_templates
+
+    @property
+    def source_locations(self):
+        """Locations of the template sources at each sounding.
+
+        Returns
+        -------
+        (n_soundings, dim) numpy.ndarray
+        """
+        return self._source_locations
+
+    @property
+    def n_soundings(self):
+        """Number of soundings.
+
+        Returns
+        -------
+        int
+        """
+        return self._source_locations.shape[0]
+
+    @property
+    def source_list(self):
+        """Sources of the survey, built from the templates on first access.
+
+        Returns
+        -------
+        list of simpeg.survey.BaseSrc
+        """
+        if getattr(self, "_source_list", None) is None:
+            self._source_list = [
+                _translated_copy(src, location - reference, offsets, location)
+                for location in self._source_locations
+                for src, reference, offsets in zip(
+                    self._source_templates, self._references, self._receiver_offsets
+                )
+            ]
+        return self._source_list
+
+    @source_list.setter
+    def source_list(self, new_list):
+        raise AttributeError(
+            f"The sources of a {type(self).__name__} are defined by its "
+            "'source_templates' and 'source_locations'."
+        )
+
+    def get_sounding_sources(self, index):
+        """Sources of a single sounding.
+
+        The sources of :py:attr:`source_list` are returned if it was already
+        built, otherwise only the sources of this sounding are built.
+
+        Parameters
+        ----------
+        index : int
+            Index of the sounding.
+
+        Returns
+        -------
+        list of simpeg.survey.BaseSrc
+        """
+        n_templates = len(self._source_templates)
+        if getattr(self, "_source_list", None) is not None:
+            start = index * n_templates
+            return self._source_list[start : start + n_templates]
+        location = self._source_locations[index]
+        return [
+            _translated_copy(src, location - reference, offsets, location)
+            for src, reference, offsets in zip(
+                self._source_templates, self._references, self._receiver_offsets
+            )
+        ]
+
+    @property
+    def _sourceOrder(self):
+        if getattr(self, "_source_order", None) is None:
+            n_fields = np.tile(
+                [src._fields_per_source for src in self._source_templates],
+                self.n_soundings,
+            )
+            offsets = np.r_[0, np.cumsum(n_fields)]
+            self._source_order = {
+                src._uid: list(range(start, end))
+                for src, start, end in zip(self.source_list, offsets[:-1], offsets[1:])
+            }
+        return self._source_order
+
+    @property
+    def nD(self):
+        """Total number of data for the survey
+
+        Returns
+        -------
+        int
+            Total number of data for the survey
+        """
+        return int(self.vnD.sum())
+
+    @property
+    def vnD(self):
+        """Number of associated data for each source
+
+        Returns
+        -------
+        (n_src) numpy.ndarray of int
+            Number of associate data for each source
+        """
+        if getattr(self, "_vnD", None) is None:
+            self._vnD = np.tile(
+                [src.nD for src in self._source_templates], self.n_soundings
+            )
+        return self._vnD
+
+    @property
+    def nSrc(self):
+        """Number of Sources
+
+        Returns
+        -------
+        int
+            Number of sources
+        """
+        return self.n_soundings * len(self._source_templates)
+
+    @property
+    def _n_fields(self):
+        """number of fields required for solution"""
+        return self.n_soundings * sum(
+            src._fields_per_source for src in self._source_templates
+        )
+
+    @property
+    def data_offsets(self):
+        """Index of the first datum of each source.
+
+        Returns
+        -------
+        (n_src + 1) numpy.ndarray of int
+            Offsets of the data of each source, followed by the number of data.
+        """
+        return np.r_[0, np.cumsum(self.vnD)]
+
+    def get_slice(self, source, receiver):
+        """
+        Get slice to index a flat array for a given source-receiver pair.
+
+        Parameters
+        ----------
+        source : .BaseSrc
+            Source object.
+        receiver : .BaseRx
+            Receiver object.
+
+        Returns
+        -------
+        slice
+
+        Raises
+        ------
+        KeyError
+            If the given ``source`` or ``receiver`` do not belong to this survey.
+        """
+        if getattr(self, "_source_indices", None) is None:
+            self._source_indices = {
+                src._uid: i for i, src in enumerate(self.source_list)
+            }
+        i_src = self._source_indices.get(getattr(source, "_uid", None))
+        if i_src is not None and self.source_list[i_src] is source:
+            start = self.data_offsets[i_src]
+            for rx in source.receiver_list:
+                if rx is receiver:
+                    return slice(start, start + rx.nD)
+                start += rx.nD
+        msg = (
+            f"Source '{source}' and receiver '{receiver}' pair "
+            "is not part of the survey."
+        )
+        raise KeyError(msg)
+
+    def get_all_slices(self):
+        """
+        Get slices to index a flat array for all source-receiver pairs.
+
+        The slices are computed once, since the sources of the survey cannot
+        be replaced.
+
+        Returns
+        -------
+        dict[tuple[.BaseSrc, .BaseRx], slice]
+            Dictionary with flat array slices for every pair of source and
+            receiver in the survey.
+        """
+        if getattr(self, "_all_slices", None) is None:
+            self._all_slices = super().get_all_slices()
+        return self._all_slices
+
+
+def _translated_copy(source, shift, receiver_offsets, location):
+    """Copy of a template source and its receivers moved to a new location."""
+    receiver_list = []
+    for rx, offsets in zip(source.receiver_list, receiver_offsets):
+        rx = copy.copy(rx)
+        rx._Ps = {}
+        rx._uid = uuid.uuid4()
+        rx.locations = location + offsets
+        if hasattr(rx, "use_source_receiver_offset"):
+            rx.use_source_receiver_offset = False
+        receiver_list.append(rx)
+
+    source = copy.copy(source)
+    source._uid = uuid.uuid4()
+    source.location = source.location + shift
+    source.receiver_list = receiver_list
+    return source
+
+
 class BaseTimeSurvey(BaseSurvey):
     """Base SimPEG survey class for time-dependent simulations."""
 
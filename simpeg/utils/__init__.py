@@ -22,6 +22,19 @@ Counter Utility Functions
   timeIt
 
 
+Cache Utility Functions
+=======================
+
+.. autosummary::
+  :toctree: generated/
+
+  ModelCache
+  GarbageCollectionPolicy
+  model_fingerprint
+  current_memory_usage
+  discard_cached_items
+
+
 IO Utility Functions
 ====================
 
@@ -29,6 +42,7 @@ IO Utility Functions
   :toctree: generated/
 
   download
+  io_utils.read_archive
   io_utils.read_dcip2d_ubc
   io_utils.read_dcip3d_ubc
   io_utils.read_dcipoctree_ubc
@@ -36,6 +50,7 @@ IO Utility Functions
   io_utils.read_gg3d_ubc
   io_utils.read_grav3d_ubc
   io_utils.read_mag3d_ubc
+  io_utils.write_archive
   io_utils.write_dcip2d_ubc
   io_utils.write_dcip3d_ubc
   io_utils.write_dcipoctree_ubc
@@ -145,13 +160,29 @@ Many of the functions here are used internally to SimPEG and have minimal docume
 Solver utilities
 ----------------
 This module contains utilities to get and set the default solver
-used by SimPEG simulations.
+used by SimPEG simulations, to reuse the symbolic analysis of their
+factorizations, and an iterative solver for systems too large to factorize.
 
 .. autosummary::
   :toctree: generated/
 
   solver_utils.get_default_solver
   solver_utils.set_default_solver
+  solver_utils.FactorizationCache
+  solver_utils.FactorizationRecord
+  solver_utils.SolverKrylov
+
+Storage utilities
+-----------------
+Backends storing the fields of simulations in memory, in memory-mapped
+files or in compressed zarr arrays.
+
+.. autosummary::
+  :toctree: generated/
+
+  storage_utils.FieldsStorage
+  storage_utils.MemmapFieldsStorage
+  storage_utils.ZarrFieldsStorage
 """
 
 from discretize.utils.interpolation_utils import interpolation_matrix
@@ -229,8 +260,16 @@ from .curv_utils import (
     example_curvilinear_grid,
 )
 from .counter_utils import Counter, count, timeIt
+from .cache_utils import (
+    ModelCache,
+    GarbageCollectionPolicy,
+    model_fingerprint,
+    current_memory_usage,
+    discard_cached_items,
+)
 from . import model_builder
 from . import solver_utils
+from . import storage_utils
 from . import io_utils
 from .coord_utils import (
     rotation_matrix_from_normals,
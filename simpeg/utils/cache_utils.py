@@ -0,0 +1,383 @@
+"""
+Caches of quantities computed for a given model.
+"""
+
+import gc
+import hashlib
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from .code_utils import validate_integer, validate_float, validate_string
+
+# Every live cache, so the items of an object can be dropped when it changes
+_live_caches = weakref.WeakSet()
+
+
+def model_fingerprint(m):
+    """Fast fingerprint of a model vector.
+
+    Two models get the same fingerprint if they have the same shape, dtype and
+    values, regardless of whether they are the same object.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+        The model.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the model.
+    """
+    m = np.ascontiguousarray(m)
+    digest = hashlib.blake2b(m.view(np.uint8).reshape(-1), digest_size=16)
+    digest.update(f"{m.dtype.str}{m.shape}".encode())
+    return digest.hexdigest()
+
+
+def _estimate_nbytes(item):
+    """Estimate the memory held by a cached item, in bytes."""
+    if isinstance(item, np.ndarray):
+        return item.nbytes
+    if isinstance(item, (list, tuple)):
+        return sum(_estimate_nbytes(x) for x in item)
+    if isinstance(item, dict):
+        return sum(_estimate_nbytes(x) for x in item.values())
+    nbytes = getattr(item, "nbytes", None)
+    if isinstance(nbytes, (int, np.integer)):
+        return int(nbytes)
+    # Fields objects store their arrays in a dictionary
+    fields = getattr(item, "_fields", None)
+    if isinstance(fields, dict):
+        return _estimate_nbytes(fields)
+    return 0
+
+
+class ModelCache:
+    """Least recently used cache of quantities computed for given models.
+
+    Items are grouped by the :func:`model_fingerprint` of the model they were
+    computed for, so models with equal values share the same entries even
+    when they are different arrays. Within a model, items are keyed by the
+    object that computed them (e.g. a simulation) and by their kind (e.g.
+    ``"fields"`` or ``"dpred"``). When the cache is full, all the items of
+    the least recently used model are evicted.
+
+    Parameters
+    ----------
+    max_models : int, optional
+        Maximum number of models for which items are held.
+    max_bytes : float, optional
+        Memory budget of the cache in bytes. Least recently used models are
+        evicted while the estimated size of the stored items exceeds it.
+        Items whose size can't be estimated count as zero bytes.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from simpeg.utils import ModelCache
+    >>> cache = ModelCache(max_models=2)
+    >>> m = np.ones(3)
+    >>> cache.get_or_compute("sim", m, "dpred", lambda: 2 * m)
+    array([2., 2., 2.])
+    >>> cache.get("sim", np.ones(3), "dpred")
+    array([2., 2., 2.])
+    """
+
+    def __init__(self, max_models=1, max_bytes=np.inf):
+        self._models = OrderedDict()
+        self._lock = threading.RLock()
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        _live_caches.add(self)
+
+    def __getstate__(self):
+        # Cached items are not sent to other processes
+        state = self.__dict__.copy()
+        state["_models"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        _live_caches.add(self)
+
+    @property
+    def max_models(self):
+        """Maximum number of models for which items are held.
+
+        Returns
+        -------
+        int
+        """
+        return self._max_models
+
+    @max_models.setter
+    def max_models(self, value):
+        self._max_models = validate_integer("max_models", value, min_val=0)
+        self._evict()
+
+    @property
+    def max_bytes(self):
+        """Memory budget of the cache in bytes.
+
+        Returns
+        -------
+        float
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        self._max_bytes = validate_float("max_bytes", value, min_val=0.0)
+        self._evict()
+
+    @property
+    def nbytes(self):
+        """Estimated memory held by the cached items, in bytes.
+
+        Returns
+        -------
+        int
+        """
+        return sum(
+            nbytes for items in self._models.values() for _, _, nbytes in items.values()
+        )
+
+    def __len__(self):
+        return len(self._models)
+
+    def get(self, owner, m, kind="fields", default=None):
+        """Return a cached item, or ``default`` if it isn't cached.
+
+        Parameters
+        ----------
+        owner : object
+            Object that computed the item, usually a simulation.
+        m : numpy.ndarray
+            Model for which the item was computed.
+        kind : str, optional
+            Kind of item.
+        default : object, optional
+            Value returned if the item is not in the cache.
+
+        Returns
+        -------
+        object
+        """
+        if m is None:
+            return default
+        fingerprint = model_fingerprint(m)
+        with self._lock:
+            entry = self._models.get(fingerprint, {}).get((id(owner), kind))
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._models.move_to_end(fingerprint)
+            return entry[1]
+
+    def put(self, owner, m, kind, item):
+        """Store an item in the cache.
+
+        Parameters
+        ----------
+        owner : object
+            Object that computed the item, usually a simulation.
+        m : numpy.ndarray
+            Model for which the item was computed.
+        kind : str
+            Kind of item.
+        item : object
+            Item to store.
+        """
+        if m is None or item is None or self.max_models == 0:
+            return
+        fingerprint = model_fingerprint(m)
+        nbytes = _estimate_nbytes(item)
+        with self._lock:
+            items = self._models.setdefault(fingerprint, {})
+            # Hold a reference to the owner so that its id can't be reused
+            items[(id(owner), kind)] = (owner, item, nbytes)
+            self._models.move_to_end(fingerprint)
+            self._evict()
+
+    def get_or_compute(self, owner, m, kind, compute):
+        """Return a cached item, computing and storing it if needed.
+
+        Parameters
+        ----------
+        owner : object
+            Object that computes the item, usually a simulation.
+        m : numpy.ndarray
+            Model for which the item is computed.
+        kind : str
+            Kind of item.
+        compute : callable
+            Function without arguments returning the item.
+
+        Returns
+        -------
+        object
+        """
+        item = self.get(owner, m, kind)
+        if item is None:
+            item = compute()
+            self.put(owner, m, kind, item)
+        return item
+
+    def clear(self):
+        """Remove all items from the cache."""
+        with self._lock:
+            self._models.clear()
+
+    def discard(self, owner):
+        """Remove all the items computed by an object.
+
+        Parameters
+        ----------
+        owner : object
+            Object that computed the items, usually a simulation.
+        """
+        owner_id = id(owner)
+        with self._lock:
+            for fingerprint in list(self._models):
+                items = self._models[fingerprint]
+                for key in [key for key in items if key[0] == owner_id]:
+                    del items[key]
+                if not items:
+                    del self._models[fingerprint]
+
+    def _evict(self):
+        with self._lock:
+            while len(self._models) > getattr(self, "_max_models", np.inf) or (
+                self._models and self.nbytes > getattr(self, "_max_bytes", np.inf)
+            ):
+                self._models.popitem(last=False)
+
+
+def discard_cached_items(owner):
+    """Remove the items computed by an object from every cache.
+
+    Simulations call it when their survey, mappings or physical properties
+    change, since the items they computed for a model are no longer valid.
+
+    Parameters
+    ----------
+    owner : object
+        Object that computed the items, usually a simulation.
+    """
+    for cache in list(_live_caches):
+        cache.discard(owner)
+
+
+def current_memory_usage():
+    """Resident memory of the current process, in bytes.
+
+    Returns
+    -------
+    int or None
+        Resident set size of the process, or ``None`` if it can't be
+        determined on this platform.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    return None
+
+
+class GarbageCollectionPolicy:
+    """Decide when to trigger a full garbage collection.
+
+    Large objects such as factorizations of simulation matrices are often
+    held in reference cycles, and are only released by a full garbage
+    collection. Running :func:`gc.collect` can take seconds on large heaps,
+    so this policy only runs it when the memory of the process has grown by
+    more than a threshold since the last collection.
+
+    Parameters
+    ----------
+    policy : {"auto", "always", "never"}
+        ``"always"`` collects on every call, ``"never"`` leaves it to the
+        interpreter, and ``"auto"`` collects when the resident memory grew by
+        more than ``memory_threshold`` bytes since the last collection (or
+        on every call if the resident memory can't be measured).
+    memory_threshold : float, optional
+        Growth of the resident memory, in bytes, that triggers a collection
+        with the ``"auto"`` policy.
+    """
+
+    def __init__(self, policy="auto", memory_threshold=512 * 1024**2):
+        self.policy = policy
+        self.memory_threshold = memory_threshold
+        self._last_usage = None
+
+    @property
+    def policy(self):
+        """Garbage collection policy.
+
+        Returns
+        -------
+        {"auto", "always", "never"}
+        """
+        return self._policy
+
+    @policy.setter
+    def policy(self, value):
+        self._policy = validate_string(
+            "policy", value, string_list=("auto", "always", "never")
+        )
+
+    @property
+    def memory_threshold(self):
+        """Memory growth, in bytes, that triggers a collection.
+
+        Returns
+        -------
+        float
+        """
+        return self._memory_threshold
+
+    @memory_threshold.setter
+    def memory_threshold(self, value):
+        self._memory_threshold = validate_float("memory_threshold", value, min_val=0.0)
+
+    def __call__(self):
+        """Run a garbage collection if required by the policy.
+
+        Returns
+        -------
+        bool
+            Whether a collection was run.
+        """
+        if self.policy == "never":
+            return False
+        if self.policy == "auto":
+            usage = current_memory_usage()
+            if (
+                usage is not None
+                and self._last_usage is not None
+                and usage - self._last_usage < self.memory_threshold
+            ):
+                return False
+        gc.collect()
+        self._last_usage = current_memory_usage()
+        return True
@@ -81,6 +81,21 @@ class Counter(object):
         assert prop in self._timeList, "The property must already be in the dictionary."
         self._timeList[prop][-1] += time.time()
 
+    def countTime(self, prop, elapsed):
+        """Records the duration of a property call timed elsewhere.
+
+        Parameters
+        ----------
+        prop : str
+            The property being timed
+        elapsed : float
+            Duration of the call in seconds
+        """
+        assert isinstance(prop, str), "The property must be a string."
+        if prop not in self._timeList:
+            self._timeList[prop] = []
+        self._timeList[prop].append(elapsed)
+
     def summary(self):
         """
         Provides a text summary of the current counters and timers.
@@ -18,3 +18,5 @@ from .io_utils_electromagnetics import (
     write_dcipoctree_ubc,
     write_dcip_xyz,
 )
+
+from .io_utils_archive import write_archive, read_archive
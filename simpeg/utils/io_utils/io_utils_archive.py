@@ -0,0 +1,505 @@
+"""Binary archives of SimPEG data, surveys, models and inversion state.
+
+An archive is a directory, or a zip file, holding one ``.npy`` file per
+array and a ``manifest.json`` file describing how to put them back together.
+Arrays of directory archives are memory-mapped when read, so that large data
+sets and models are only loaded from disk when they are used.
+"""
+
+import inspect
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from ..code_utils import validate_string, validate_type
+from ...version import __version__ as simpeg_version
+
+ARCHIVE_FORMAT = "simpeg-archive"
+ARCHIVE_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+def write_archive(
+    path, data=None, models=None, weights=None, inv_prob=None, overwrite=False
+):
+    """Write SimPEG objects to a binary archive.
+
+    Each array is stored as a ``.npy`` file next to a JSON manifest. The
+    archive is a directory, or a zip file if `path` ends with ``.zip``.
+
+    Parameters
+    ----------
+    path : str
+        Path of the archive.
+    data : simpeg.data.Data, optional
+        Data to store, with its observed data, standard deviations and survey.
+        The survey must be a DC/IP, gravity or magnetics survey, or a time or
+        frequency domain array survey. The templates of array surveys are
+        stored by class name and constructor parameters, so reading an archive
+        never unpickles objects.
+    models : dict of {str: numpy.ndarray}, optional
+        Models to store, by name.
+    weights : dict of {str: numpy.ndarray}, optional
+        Weights to store by name, e.g. sensitivity weights.
+    inv_prob : simpeg.inverse_problem.BaseInvProblem, optional
+        Inverse problem whose current model, trade-off parameter, misfits and
+        iteration are stored.
+    overwrite : bool, optional
+        Whether to replace an existing archive at `path`.
+
+    See Also
+    --------
+    read_archive
+    """
+    path = validate_string("path", path)
+    overwrite = validate_type("overwrite", overwrite, bool)
+    if os.path.exists(path) and not overwrite:
+        raise FileExistsError(f"An archive already exists at '{path}'.")
+
+    manifest = {
+        "format": ARCHIVE_FORMAT,
+        "version": ARCHIVE_VERSION,
+        "simpeg_version": simpeg_version,
+    }
+    arrays = {}
+
+    if data is not None:
+        manifest["data"] = _data_to_arrays(data, arrays)
+
+    for group, values in (("models", models), ("weights", weights)):
+        if values is not None:
+            manifest[group] = list(values)
+            for name, value in values.items():
+                arrays[f"{group}/{name}"] = value
+
+    if inv_prob is not None:
+        state = {
+            "beta": float(inv_prob.beta),
+            "phi_d": float(getattr(inv_prob, "phi_d", np.nan)),
+            "phi_m": float(getattr(inv_prob, "phi_m", np.nan)),
+            "iteration": int(getattr(inv_prob.opt, "iter", 0)),
+            "model": inv_prob.model is not None,
+        }
+        if state["model"]:
+            arrays["inversion/model"] = inv_prob.model
+        manifest["inversion"] = state
+
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, value in arrays.items():
+                with archive.open(f"{name}.npy", "w", force_zip64=True) as fid:
+                    np.lib.format.write_array(fid, np.asanyarray(value))
+            archive.writestr(MANIFEST, json.dumps(manifest, indent=2))
+    else:
+        os.makedirs(path, exist_ok=True)
+        for name, value in arrays.items():
+            file_name = os.path.join(path, f"{name}.npy")
+            os.makedirs(os.path.dirname(file_name), exist_ok=True)
+            np.save(file_name, np.asanyarray(value))
+        # The manifest is written last, so that it marks a complete archive
+        with open(os.path.join(path, MANIFEST), "w") as fid:
+            json.dump(manifest, fid, indent=2)
+
+
+def read_archive(path, mmap_mode="r"):
+    """Read SimPEG objects from a binary archive.
+
+    Parameters
+    ----------
+    path : str
+        Path of an archive written by :func:`write_archive`.
+    mmap_mode : {'r', 'r+', 'c', None}, optional
+        Memory-map mode of the arrays of directory archives, see
+        :func:`numpy.load`. Use None to load the arrays in memory. Arrays of
+        zip archives are always loaded in memory.
+
+    Returns
+    -------
+    dict
+        The objects in the archive, under the keys ``"data"``
+        (:class:`simpeg.data.Data`), ``"models"`` and ``"weights"`` (dict of
+        arrays) and ``"inversion"`` (dict with the ``"model"``, ``"beta"``,
+        ``"phi_d"``, ``"phi_m"`` and ``"iteration"`` of the inverse problem).
+        Objects missing from the archive are None.
+
+    See Also
+    --------
+    write_archive
+    """
+    path = validate_string("path", path)
+    if mmap_mode is not None:
+        mmap_mode = validate_string("mmap_mode", mmap_mode, ["r", "r+", "c"])
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(MANIFEST))
+            arrays = {}
+            for name in archive.namelist():
+                if name.endswith(".npy"):
+                    with archive.open(name) as fid:
+                        arrays[name[:-4]] = np.lib.format.read_array(fid)
+            load = arrays.__getitem__
+    else:
+        with open(os.path.join(path, MANIFEST)) as fid:
+            manifest = json.load(fid)
+
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+
+    if manifest.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"'{path}' is not a SimPEG archive.")
+    if manifest["version"] > ARCHIVE_VERSION:
+        raise ValueError(
+            f"'{path}' was written with archive version {manifest['version']}, "
+            f"which is newer than the supported version {ARCHIVE_VERSION}. "
+            "Please update SimPEG."
+        )
+
+    out = {"data": None, "models": None, "weights": None, "inversion": None}
+    if "data" in manifest:
+        out["data"] = _data_from_arrays(manifest["data"], load)
+    for group in ("models", "weights"):
+        if group in manifest:
+            out[group] = {name: load(f"{group}/{name}") for name in manifest[group]}
+    if "inversion" in manifest:
+        state = dict(manifest["inversion"])
+        state["model"] = load("inversion/model") if state["model"] else None
+        out["inversion"] = state
+    return out
+
+
+def _data_to_arrays(data, arrays):
+    """Add the arrays of a data object and return its manifest entry."""
+    from ...data import Data
+
+    data = validate_type("data", data, Data, cast=False)
+    entry = {"survey": _survey_to_arrays(data.survey, arrays)}
+    arrays["data/dobs"] = data.dobs
+    try:
+        arrays["data/standard_deviation"] = data.standard_deviation
+        entry["standard_deviation"] = True
+    except TypeError:
+        # Uncertainties were never set
+        entry["standard_deviation"] = False
+    return entry
+
+
+def _data_from_arrays(entry, load):
+    """Build a data object from its manifest entry."""
+    from ...data import Data
+
+    survey = _survey_from_arrays(entry["survey"], load)
+    standard_deviation = None
+    if entry["standard_deviation"]:
+        standard_deviation = load("data/standard_deviation")
+    return Data(survey, dobs=load("data/dobs"), standard_deviation=standard_deviation)
+
+
+def _survey_to_arrays(survey, arrays):
+    """Add the arrays of a survey and return its manifest entry."""
+    # Prevent circular import
+    from ...survey import BaseArraySurvey
+    from ...electromagnetics.static import resistivity as dc
+    from ...potential_fields import gravity, magnetics
+
+    if isinstance(survey, BaseArraySurvey):
+        domains = {cls: domain for domain, (cls, *_) in _array_survey_types().items()}
+        domain = domains.get(type(survey))
+        if domain is None:
+            raise TypeError(
+                f"Cannot store a {type(survey).__name__} in an archive. Only the "
+                "time and frequency domain array surveys are supported."
+            )
+        arrays["survey/source_locations"] = survey.source_locations
+        templates = [
+            _object_to_entry(src, f"survey/templates/{i}", arrays)
+            for i, src in enumerate(survey.source_templates)
+        ]
+        return {"type": "array", "domain": domain, "templates": templates}
+
+    if isinstance(survey, dc.survey.Survey):
+        data_types = []
+        rx_data_type = []
+        rx_is_dipole = []
+        rx_counts = []
+        src_n_receivers = []
+        src_is_dipole = []
+        src_a = []
+        src_b = []
+        for src in survey.source_list:
+            if isinstance(src, dc.sources.Dipole):
+                src_a.append(src.location[0])
+                src_b.append(src.location[1])
+            elif isinstance(src, dc.sources.Pole):
+                src_a.append(np.reshape(src.location, -1))
+                src_b.append(src_a[-1])
+            else:
+                raise TypeError(
+                    f"Cannot store {type(src).__name__} sources, only Pole and "
+                    "Dipole sources."
+                )
+            src_is_dipole.append(isinstance(src, dc.sources.Dipole))
+            src_n_receivers.append(len(src.receiver_list))
+            for rx in src.receiver_list:
+                if rx.data_type not in data_types:
+                    data_types.append(rx.data_type)
+                rx_data_type.append(data_types.index(rx.data_type))
+                rx_is_dipole.append(isinstance(rx, dc.receivers.Dipole))
+                rx_counts.append(rx.nD)
+        arrays.update(
+            {
+                "survey/source_locations_a": np.array(src_a),
+                "survey/source_locations_b": np.array(src_b),
+                "survey/locations_m": survey.locations_m,
+                "survey/locations_n": survey.locations_n,
+                # dipoles hold [I, -I], only the current through A is stored
+                "survey/source_current": np.array(
+                    [src.current[0] for src in survey.source_list]
+                ),
+                "survey/source_is_dipole": np.array(src_is_dipole),
+                "survey/source_n_receivers": np.array(src_n_receivers, dtype=int),
+                "survey/receiver_is_dipole": np.array(rx_is_dipole),
+                "survey/receiver_data_type": np.array(rx_data_type, dtype=int),
+                "survey/receiver_counts": np.array(rx_counts, dtype=int),
+            }
+        )
+        return {"type": "dc", "data_types": data_types}
+
+    if isinstance(survey, (gravity.survey.Survey, magnetics.survey.Survey)):
+        receiver_list = survey.source_field.receiver_list
+        arrays["survey/receiver_locations"] = np.vstack(
+            [rx.locations for rx in receiver_list]
+        )
+        arrays["survey/receiver_counts"] = np.array(
+            [rx.locations.shape[0] for rx in receiver_list], dtype=int
+        )
+        entry = {"components": [list(rx.components) for rx in receiver_list]}
+        if isinstance(survey, gravity.survey.Survey):
+            entry["type"] = "gravity"
+        else:
+            source_field = survey.source_field
+            entry["type"] = "magnetics"
+            entry["source_field"] = [
+                float(source_field.amplitude),
+                float(source_field.inclination),
+                float(source_field.declination),
+            ]
+        return entry
+
+    raise TypeError(
+        f"Cannot store a {type(survey).__name__} in an archive. Only DC/IP, "
+        "gravity, magnetics and array surveys are supported."
+    )
+
+
+def _survey_from_arrays(entry, load):
+    """Build a survey from its manifest entry."""
+    # Prevent circular import
+    from ...electromagnetics.static import resistivity as dc
+    from ...potential_fields import gravity, magnetics
+
+    survey_type = entry["type"]
+    if survey_type == "array":
+        if entry.get("domain") not in _array_survey_types():
+            raise ValueError("Unknown array survey in the archive.")
+        cls, sources, receivers = _array_survey_types()[entry["domain"]]
+        source_templates = [
+            _object_from_entry(template, cls._source_type, sources, receivers, load)
+            for template in entry["templates"]
+        ]
+        return cls(source_templates, load("survey/source_locations"))
+
+    if survey_type == "dc":
+        locations_a = load("survey/source_locations_a")
+        locations_b = load("survey/source_locations_b")
+        locations_m = load("survey/locations_m")
+        locations_n = load("survey/locations_n")
+        rx_is_dipole = load("survey/receiver_is_dipole")
+        rx_data_type = load("survey/receiver_data_type")
+        rx_offsets = np.r_[0, np.cumsum(load("survey/receiver_counts"))]
+        src_rx_offsets = np.r_[0, np.cumsum(load("survey/source_n_receivers"))]
+        src_current = load("survey/source_current")
+        src_is_dipole = load("survey/source_is_dipole")
+
+        source_list = []
+        for i_src in range(len(src_is_dipole)):
+            receiver_list = []
+            for i_rx in range(src_rx_offsets[i_src], src_rx_offsets[i_src + 1]):
+                rows = slice(rx_offsets[i_rx], rx_offsets[i_rx + 1])
+                data_type = entry["data_types"][rx_data_type[i_rx]]
+                if rx_is_dipole[i_rx]:
+                    rx = dc.receivers.Dipole(
+                        locations_m[rows], locations_n[rows], data_type=data_type
+                    )
+                else:
+                    rx = dc.receivers.Pole(locations_m[rows], data_type=data_type)
+                receiver_list.append(rx)
+
+            if src_is_dipole[i_src]:
+                src = dc.sources.Dipole(
+                    receiver_list,
+                    locations_a[i_src],
+                    locations_b[i_src],
+                    current=src_current[i_src],
+                )
+            else:
+                src = dc.sources.Pole(
+                    receiver_list, locations_a[i_src], current=src_current[i_src]
+                )
+            source_list.append(src)
+        return dc.survey.Survey(source_list)
+
+    if survey_type in ("gravity", "magnetics"):
+        module = gravity if survey_type == "gravity" else magnetics
+        locations = load("survey/receiver_locations")
+        offsets = np.r_[0, np.cumsum(load("survey/receiver_counts"))]
+        receiver_list = [
+            module.receivers.Point(locations[start:end], components=components)
+            for start, end, components in zip(
+                offsets[:-1], offsets[1:], entry["components"]
+            )
+        ]
+        if survey_type == "gravity":
+            source_field = gravity.sources.SourceField(receiver_list=receiver_list)
+        else:
+            amplitude, inclination, declination = entry["source_field"]
+            source_field = magnetics.sources.UniformBackgroundField(
+                receiver_list,
+                amplitude=amplitude,
+                inclination=inclination,
+                declination=declination,
+            )
+        return module.survey.Survey(source_field)
+
+    raise ValueError(f"Unknown survey type '{survey_type}' in the archive.")
+
+
+def _array_survey_types():
+    """Array surveys that can be archived, with the modules of their templates.
+
+    The classes of the templates are only looked up in these modules, so that
+    reading an archive never imports or runs other code.
+    """
+    from ...electromagnetics import frequency_domain as fdem
+    from ...electromagnetics import time_domain as tdem
+
+    return {
+        "time_domain": (tdem.survey.ArraySurvey, tdem.sources, tdem.receivers),
+        "frequency_domain": (fdem.survey.ArraySurvey, fdem.sources, fdem.receivers),
+    }
+
+
+def _init_parameters(cls):
+    """Names of the parameters of the constructors of a class and its bases."""
+    names = []
+    for klass in cls.__mro__:
+        if "__init__" not in vars(klass):
+            continue
+        for parameter in inspect.signature(klass.__init__).parameters.values():
+            if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+                continue
+            if parameter.name not in names + ["self", "receiver_list"]:
+                names.append(parameter.name)
+    return names
+
+
+def _object_to_entry(obj, name, arrays):
+    """Add the arrays of a source, receiver or waveform and return its entry.
+
+    The object is described by its class name and the values of its
+    constructor parameters. Arrays are stored in the archive, and other
+    values in the manifest.
+    """
+    from ...survey import BaseSrc
+    from ...electromagnetics.time_domain.sources import BaseWaveform
+
+    parameters = {}
+    for parameter in _init_parameters(type(obj)):
+        try:
+            value = getattr(obj, parameter)
+        except AttributeError:
+            continue
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, BaseWaveform):
+            value = {"object": _object_to_entry(value, f"{name}/{parameter}", arrays)}
+        elif isinstance(value, (np.ndarray, list, tuple)):
+            value = np.asarray(value)
+            if value.dtype.kind not in "biufcU":
+                raise TypeError(
+                    f"Cannot store the '{parameter}' of a {type(obj).__name__} in "
+                    "an archive."
+                )
+            arrays[f"{name}/{parameter}"] = value
+            value = {"array": f"{name}/{parameter}"}
+        elif value is not None and not isinstance(value, (bool, int, float, str)):
+            raise TypeError(
+                f"Cannot store the '{parameter}' of a {type(obj).__name__} in an "
+                "archive."
+            )
+        parameters[parameter] = value
+
+    entry = {"class": type(obj).__name__, "parameters": parameters}
+    if isinstance(obj, BaseSrc):
+        entry["receivers"] = [
+            _object_to_entry(rx, f"{name}/receivers/{i}", arrays)
+            for i, rx in enumerate(obj.receiver_list)
+        ]
+    return entry
+
+
+def _object_from_entry(entry, base, sources, receivers, load):
+    """Build a source, receiver or waveform from its manifest entry.
+
+    The class must be a subclass of `base` found in the `sources` or
+    `receivers` module.
+    """
+    cls = getattr(sources, entry["class"], None) or getattr(
+        receivers, entry["class"], None
+    )
+    if base is None or not (inspect.isclass(cls) and issubclass(cls, base)):
+        raise ValueError(f"Unknown class '{entry['class']}' in the archive.")
+
+    parameters = {}
+    for parameter, value in entry["parameters"].items():
+        if isinstance(value, dict) and "array" in value:
+            value = np.array(load(value["array"]))
+        elif isinstance(value, dict) and "object" in value:
+            value = _object_from_entry(
+                value["object"],
+                getattr(sources, "BaseWaveform", None),
+                sources,
+                receivers,
+                load,
+            )
+        parameters[parameter] = value
+
+    # Parameters of the base classes are set once the object is built, when
+    # the subclass doesn't give them the stored value
+    own = inspect.signature(cls.__init__).parameters
+    args = []
+    if "receivers" in entry:
+        args.append(
+            [
+                _object_from_entry(rx, receivers.BaseRx, sources, receivers, load)
+                for rx in entry["receivers"]
+            ]
+        )
+    obj = cls(*args, **{key: parameters[key] for key in parameters if key in own})
+    for key, value in parameters.items():
+        if key not in own and not _same_value(getattr(obj, key), value):
+            setattr(obj, key, value)
+    return obj
+
+
+def _same_value(a, b):
+    """Whether two parameter values are equal."""
+    if a is b:
+        return True
+    if isinstance(a, (np.ndarray, list, tuple)) or isinstance(
+        b, (np.ndarray, list, tuple)
+    ):
+        return np.array_equal(a, b)
+    return type(a) is type(b) and a == b
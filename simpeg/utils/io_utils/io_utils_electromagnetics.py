@@ -1,3 +1,5 @@
+import io
+
 import numpy as np
 from discretize.utils import mkvc
 import warnings
@@ -20,6 +22,7 @@ def read_dcip_xyz(
     uncertainties_header=None,
     dict_headers=None,
     is_surface_data=False,
+    output_sorting=False,
 ):
     """Read 2D or 3D DC/IP data from XYZ-formatted file.
 
@@ -59,6 +62,9 @@ def read_dcip_xyz(
         If ``True``, we assume electrode elevations are not supplied. That is, the header lists
         for ``a``, ``b``, ``m`` and ``n`` electrode locations do not have headers for
         elevation columns.
+    output_sorting : bool, optional
+        If True, also return the (n_data,) array of the rows of the file in the
+        order of the data, e.g. to sort other columns loaded from the file.
 
     Returns
     -------
@@ -69,6 +75,9 @@ def read_dcip_xyz(
     dict
         If additional columns are loaded and output to a dictionary using the keyward argument
         `dict_headers`, the output of this function has the form `(out_data, out_dict)`.
+    numpy.ndarray
+        Rows of the file in the order of the data. If `output_sorting` is True,
+        it is appended to the output of this function.
     """
     data_type = validate_string(
         "data_type",
@@ -115,7 +124,9 @@ def read_dcip_xyz(
         col_indices.append(file_headers.index(h))
 
     # Load specified columns of data
-    data_array = np.loadtxt(file_name, comments="!", skiprows=1, usecols=col_indices)
+    data_array = np.loadtxt(
+        file_name, comments="!", skiprows=1, usecols=col_indices, ndmin=2
+    )
     n_rows = np.shape(data_array)[0]
     num_location_columns = np.shape(data_array)[1] - non_location_columns
 
@@ -133,10 +144,10 @@ def read_dcip_xyz(
         n_cols = [6, 7]
     # 2D surface data
     else:
-        a_cols = [1]
-        b_cols = [2]
-        m_cols = [3]
-        n_cols = [4]
+        a_cols = [0]
+        b_cols = [1]
+        m_cols = [2]
+        n_cols = [3]
 
     # Extract electrode locations
     if is_surface_data:
@@ -167,26 +178,28 @@ def read_dcip_xyz(
     )
 
     data_object = Data(survey)
+    out = (data_object,)
 
-    # Sort and organize all data columns
+    # Sort and organize all data columns, in the order they were loaded
     if has_data:
-        data_object.dobs = data_array[out_indices, file_headers.index(data_header)]
+        data_object.dobs = data_array[out_indices, out_headers.index(data_header)]
 
     # Sort and organize all data columns
     if has_uncert:
         data_object.standard_deviation = data_array[
-            out_indices, file_headers.index(uncertainties_header)
+            out_indices, out_headers.index(uncertainties_header)
         ]
 
     # Sort and organize all data columns
     if has_dict:
         out_dict = {}
         for h in dict_headers:
-            out_dict[h] = data_array[out_indices, file_headers.index(h)]
-        return data_object, out_dict
+            out_dict[h] = data_array[out_indices, out_headers.index(h)]
+        out += (out_dict,)
 
-    else:
-        return data_object
+    if output_sorting:
+        out += (out_indices,)
+    return out[0] if len(out) == 1 else out
 
 
 def read_dcip2d_ubc(file_name, data_type, format_type):
@@ -419,19 +432,26 @@ def read_dcip2d_ubc(file_name, data_type, format_type):
     return data_out
 
 
-def read_dcip3d_ubc(file_name, data_type):
+def read_dcip3d_ubc(file_name, data_type, output_sorting=False):
     """Read UBC-GIF DCIP3D formatted survey or data files.
 
     This method can load survey locations, predicted data or observations
     files formatted for the UBC-GIF DCIP3D coding package. For more, see
     the `UBC-GIF DCIP3D online manual <https://dcip3d.readthedocs.io/en/latest/>`__.
 
+    The receiver rows of the whole file are parsed in a single pass. Each
+    transmitter block defines one source; within a block, pole receivers are
+    placed before dipole receivers.
+
     Parameters
     ----------
     file_name : str
         The file path to the data file
     data_type : {'volt', 'apparent_chargeability', secondary_potential'}
         Data type.
+    output_sorting : bool, optional
+        If True, also return the (n_data,) array of the receiver rows of the
+        file in the order of the data.
 
     Returns
     -------
@@ -442,6 +462,9 @@ def read_dcip3d_ubc(file_name, data_type):
         - `survey`: the survey geometry as defined by an instance of :class`simpeg.electromagnetics.static.resitivity.survey.Survey` or :class`simpeg.electromagnetics.static.induced_polarization.survey.Survey`
         - `dobs`: observed/predicted data if present in the data file
         - `standard_deviations`: uncertainties (if observed data file) or apparent resistivities (if predicted data file)
+    numpy.ndarray
+        Receiver rows of the file in the order of the data. Only returned if
+        `output_sorting` is True.
 
     """
 
@@ -456,117 +479,81 @@ def read_dcip3d_ubc(file_name, data_type):
     )
 
     # Prevent circular import
-    from ...electromagnetics.static import resistivity as dc
+    from ...electromagnetics.static.utils.static_utils import (
+        _survey_from_source_index,
+    )
     from ...data import Data
 
-    # Load file
-    obsfile = np.genfromtxt(file_name, delimiter="\n", dtype=str, comments="!")
-
-    # Pre-allocate
-    source_list = []
-    d = []
-    wd = []
-
-    # Flag for z value provided
-    is_surface = False
-    is_pole_tx = False
-    is_pole_rx = False
-
-    # IP data for dcip3d has a line with a flag we can remove.
-    if obsfile[0][0:6] == "IPTYPE":
-        obsfile = obsfile[1:]
-
     # Since SimPEG defines secondary potential from IP as voltage,
     # we must use this type when defining the receivers.
     if data_type == "secondary_potential":
         data_type = "volt"
 
-    # Countdown for number of obs/tx
-    count = 0
-    for ii in range(obsfile.shape[0]):
-        if not obsfile[ii]:
-            continue
-
-        # Extract transmitter ii and the number of receivers
-        if count == 0:
-            rx = []
-            temp = np.fromstring(obsfile[ii], dtype=float, sep=" ").T
-            count = int(temp[-1])
-
-            # Check if z value is provided, if False -> 9999
-            if len(temp) == 5:
-                # check if pole|dipole
-                if np.allclose(temp[0:2], temp[2:4]):
-                    tx = np.r_[temp[0:2], 9999]
-                    is_pole_tx = True
-                else:
-                    tx = np.r_[temp[0:2], 9999, temp[2:4], 9999]
-                is_surface = True
-
-            else:
-                # check if pole|dipole
-                if np.allclose(temp[0:3], temp[3:6]):
-                    tx = np.r_[temp[0:3]]
-                    is_pole_tx = True
-                else:
-                    tx = temp[:-1]
-
-            continue
+    # Load file, without comments and empty lines
+    with open(file_name, "r") as fid:
+        lines = [line.split("!", 1)[0].strip() for line in fid]
+    lines = np.array([line for line in lines if line], dtype=str)
 
-        # Extract receivers
-        temp = np.fromstring(obsfile[ii], dtype=float, sep=" ")
-
-        if is_surface:
-            data_column_index = 4  # Since dpred for dc has app_res
-
-            # Check if Pole Receiver
-            if np.allclose(temp[0:2], temp[2:4]):
-                is_pole_rx = True
-                rx.append(temp[:2])
-            else:
-                rx.append(np.r_[temp[0:2], 9999, temp[2:4], 9999])
-
-        else:
-            data_column_index = 6  # Since dpred for dc has app_res
-
-            # Check if Pole Receiver
-            if np.allclose(temp[0:3], temp[3:6]):
-                is_pole_rx = True
-                rx.append(temp[:3])
-            else:
-                rx.append(temp[:6])
-
-        # Predicted/observed data
-        if len(temp) == data_column_index + 1:
-            d.append(temp[data_column_index])
-
-        # Observed data or predicted DC data (since app res column)
-        elif len(temp) == data_column_index + 2:
-            d.append(temp[data_column_index])
-            wd.append(temp[data_column_index + 1])
+    # IP data for dcip3d has a line with a flag we can remove.
+    if lines[0][0:6] == "IPTYPE":
+        lines = lines[1:]
+
+    # Walk over the transmitter lines, which give the number of receivers
+    tx_rows = []
+    n_rx = []
+    ii = 0
+    while ii < len(lines):
+        tx_rows.append(ii)
+        n_rx.append(int(float(lines[ii].split()[-1])))
+        ii += n_rx[-1] + 1
+    tx_rows = np.array(tx_rows)
+    n_rx = np.array(n_rx)
+
+    is_rx = np.ones(len(lines), dtype=bool)
+    is_rx[tx_rows] = False
+
+    # Parse all transmitters, then all receivers, in single passes
+    tx = np.fromstring(" ".join(lines[tx_rows]), dtype=float, sep=" ")
+    tx = tx.reshape(len(tx_rows), -1)
+    rx = np.fromstring(" ".join(lines[is_rx]), dtype=float, sep=" ")
+    n_columns = len(lines[is_rx][0].split())
+    if rx.size != n_columns * n_rx.sum():
+        raise ValueError(
+            f"All receiver lines of '{file_name}' must have the same number of columns."
+        )
+    rx = rx.reshape(-1, n_columns)
 
-        count = count - 1
+    # Check if z value is provided, if False -> 9999
+    is_surface = tx.shape[1] == 5
+    dim = 2 if is_surface else 3
 
-        # Reach the end of transmitter block
-        if count == 0:
-            rx = np.asarray(rx)
-            if is_pole_rx:
-                Rx = dc.receivers.Pole(rx[:, :3], data_type=data_type)
-            else:
-                Rx = dc.receivers.Dipole(rx[:, :3], rx[:, 3:], data_type=data_type)
-            if is_pole_tx:
-                source_list.append(dc.sources.Pole([Rx], tx[:3]))
-            else:
-                source_list.append(dc.sources.Dipole([Rx], tx[:3], tx[3:]))
+    locations_a = np.repeat(tx[:, :dim], n_rx, axis=0)
+    locations_b = np.repeat(tx[:, dim : 2 * dim], n_rx, axis=0)
+    locations_m = rx[:, :dim]
+    locations_n = rx[:, dim : 2 * dim]
+    if is_surface:
+        locations_a, locations_b, locations_m, locations_n = (
+            np.c_[loc, np.full(len(loc), 9999.0)]
+            for loc in (locations_a, locations_b, locations_m, locations_n)
+        )
 
-    survey = dc.survey.Survey(source_list)
+    survey, sort_index = _survey_from_source_index(
+        np.repeat(np.arange(len(tx_rows)), n_rx),
+        locations_a,
+        locations_b,
+        locations_m,
+        locations_n,
+        data_type=data_type,
+    )
     data_out = Data(survey=survey)
 
-    if len(d) > 0:
-        data_out.dobs = d
+    # Predicted/observed data
+    if n_columns > 2 * dim:
+        data_out.dobs = rx[sort_index, 2 * dim]
 
-    if len(wd) > 0:
-        data_out.standard_deviation = wd
+    # Observed data or predicted DC data (since app res column)
+    if n_columns > 2 * dim + 1:
+        data_out.standard_deviation = rx[sort_index, 2 * dim + 1]
 
     if is_surface:
         warnings.warn(
@@ -576,10 +563,12 @@ def read_dcip3d_ubc(file_name, data_type):
             stacklevel=2,
         )
 
+    if output_sorting:
+        return data_out, sort_index
     return data_out
 
 
-def read_dcipoctree_ubc(file_name, data_type):
+def read_dcipoctree_ubc(file_name, data_type, output_sorting=False):
     """Read UBC-GIF DCIP OcTree formatted survey or data files.
 
     This method can load survey locations, predicted data or observations
@@ -592,6 +581,9 @@ def read_dcipoctree_ubc(file_name, data_type):
         The file path to the data file
     data_type : {'volt', 'apparent_chargeability', secondary_potential'}
         Data type.
+    output_sorting : bool, optional
+        If True, also return the (n_data,) array of the receiver rows of the
+        file in the order of the data.
 
     Returns
     -------
@@ -602,10 +594,13 @@ def read_dcipoctree_ubc(file_name, data_type):
         - `survey`: the survey geometry as defined by an instance of :class`simpeg.electromagnetics.static.resistivity.survey.Survey` or :class`simpeg.electromagnetics.static.induced_polarization.survey.Survey`
         - `dobs`: observed/predicted data if present in the data file
         - `standard_deviations`: uncertainties (if observed data file) or apparent resistivities (if predicted data file)
+    numpy.ndarray
+        Receiver rows of the file in the order of the data. Only returned if
+        `output_sorting` is True.
 
     """
 
-    return read_dcip3d_ubc(file_name, data_type)
+    return read_dcip3d_ubc(file_name, data_type, output_sorting=output_sorting)
 
 
 def write_dcip2d_ubc(
@@ -821,10 +816,6 @@ def write_dcip3d_ubc(
         Pole as PoleSrc,
         Dipole as DipoleSrc,
     )
-    from ...electromagnetics.static.resistivity.receivers import (
-        Pole as PoleRx,
-        Dipole as DipoleRx,
-    )
     from ...data import Data
 
     # Validate inputs
@@ -890,53 +881,35 @@ def write_dcip3d_ubc(
         elif format_type == "general":
             end_index = 3
 
-        # Loop over all sources
-        count = 0
-        for src in data_object.survey.source_list:
-            # Write Source
-            nD = src.nD
-
-            if isinstance(src, PoleSrc):
-                tx = src.location[0]
-                tx = np.repeat(np.r_[[tx]], 2, axis=0)
-            elif isinstance(src, DipoleSrc):
-                tx = np.c_[src.location]
-
-            fid.writelines("%e " % ii for ii in mkvc(tx[:, 0:end_index].T))
-            fid.write(f"{nD}\n")
-
-            # Write receivers
-            for rx in src.receiver_list:
-                if isinstance(rx, DipoleRx):
-                    M = rx.locations[0][:, 0:end_index]
-                    N = rx.locations[1][:, 0:end_index]
-                elif isinstance(rx, PoleRx):
-                    M = rx.locations[:, 0:end_index]
-                    N = rx.locations[:, 0:end_index]
-
-                if file_type != "survey":
-                    N = np.c_[N, data_object.dobs[count : count + rx.nD]]
-
-                if file_type == "dobs":
-                    N = np.c_[N, data_object.standard_deviation[count : count + rx.nD]]
-
-                # Write receivers and locations
-                if isinstance(N, np.ndarray):
-                    np.savetxt(
-                        fid,
-                        np.c_[M, N],
-                        fmt="%e",
-                    )
-                else:
-                    raise Exception(
-                        """Uncertainities SurveyObject.std should be set.
-                        Either float or nunmpy.ndarray is expected, """
-                        "not {}".format(type(data_object.relative_error))
-                    )
+        survey = data_object.survey
+        tx = np.c_[survey.locations_a[:, :end_index], survey.locations_b[:, :end_index]]
+        rx = np.c_[survey.locations_m[:, :end_index], survey.locations_n[:, :end_index]]
 
-                fid.write("\n")
+        if file_type != "survey":
+            rx = np.c_[rx, data_object.dobs]
+
+        if file_type == "dobs":
+            rx = np.c_[rx, data_object.standard_deviation]
 
-                count += rx.nD
+        # Format all receiver lines at once
+        rx_lines = io.StringIO()
+        np.savetxt(rx_lines, rx, fmt="%e")
+        rx_lines = rx_lines.getvalue().splitlines(keepends=True)
+
+        # Write each source followed by its receivers
+        count = 0
+        for src in survey.source_list:
+            if not isinstance(src, (PoleSrc, DipoleSrc)):
+                raise TypeError(
+                    f"Sources must be Pole or Dipole, not {type(src).__name__}."
+                )
+            fid.writelines("%e " % ii for ii in tx[count])
+            fid.write(f"{src.nD}\n")
+
+            for receiver in src.receiver_list:
+                fid.writelines(rx_lines[count : count + receiver.nD])
+                fid.write("\n")
+                count += receiver.nD
 
 
 def write_dcipoctree_ubc(
@@ -12,9 +12,30 @@ from pymatsolver import (
 )
 from pymatsolver.solvers import Base
 from .code_utils import deprecate_function
+from .. import profiling
+from dataclasses import dataclass
+import inspect
+import numpy as np
+import scipy
+import scipy.sparse as sp
+from scipy.sparse.linalg import (
+    LinearOperator,
+    aslinearoperator,
+    bicgstab,
+    cg,
+    gmres,
+    minres,
+    splu,
+)
+import time
 import warnings
 from typing import Type
 
+try:
+    import pyamg
+except ImportError:
+    pyamg = None
+
 __all__ = [
     "Solver",
     "SolverLU",
@@ -27,6 +48,9 @@ __all__ = [
     "wrap_iterative",
     "get_default_solver",
     "set_default_solver",
+    "FactorizationCache",
+    "FactorizationRecord",
+    "SolverKrylov",
     "SolverWrapD",
     "SolverWrapI",
     "SolverDiag",
@@ -112,3 +136,648 @@ SolverDiag = deprecate_function(
     removal_version="0.24.0",
     new_location="pymatsolver",
 )
+
+
+@dataclass
+class FactorizationRecord:
+    """A single factorization done by a :class:`FactorizationCache`.
+
+    Attributes
+    ----------
+    key : hashable
+        Key of the system matrix, e.g. ``("A", 0)`` for the first frequency.
+    solver : str
+        Name of the solver class.
+    n : int
+        Size of the matrix.
+    nnz : int
+        Number of stored entries of the matrix.
+    reused_analysis : bool
+        Whether the ordering and symbolic analysis of a previous factorization
+        were reused, so that only the numeric factorization was done.
+    time : float
+        Wall time of the factorization in seconds.
+    """
+
+    key: object
+    solver: str
+    n: int
+    nnz: int
+    reused_analysis: bool
+    time: float
+
+
+class _SparsityLayout:
+    """Fixed CSR layout of the system matrices sharing a key.
+
+    The layout only grows: matrices whose entries are all in the layout are
+    scattered into it, and a matrix with an entry outside of it replaces the
+    layout with the union of both patterns.
+    """
+
+    def __init__(self, A):
+        self.shape = A.shape
+        self._set_pattern(A.indptr, A.indices)
+
+    def _set_pattern(self, indptr, indices):
+        M = sp.csr_matrix((np.zeros(len(indices)), indices, indptr), shape=self.shape)
+        self.indptr = M.indptr
+        self.indices = M.indices
+        self._keys = None
+        # analysis of the pattern reused by the factorizations
+        self.perm_c = None
+        self.n_factorizations = 0
+
+    @property
+    def keys(self):
+        """Sorted linear indices of the entries of the layout."""
+        if self._keys is None:
+            self._keys = _linear_indices(self.indptr, self.indices, self.shape[1])
+        return self._keys
+
+    def project(self, A):
+        """Matrix with the values of ``A`` in the layout.
+
+        The returned matrix shares its index arrays with the layout, only its
+        values are allocated.
+        """
+        if np.array_equal(A.indptr, self.indptr) and np.array_equal(
+            A.indices, self.indices
+        ):
+            data = A.data
+        else:
+            keys = _linear_indices(A.indptr, A.indices, self.shape[1])
+            positions = np.searchsorted(self.keys, keys)
+            in_layout = positions < len(self.keys)
+            in_layout[in_layout] = self.keys[positions[in_layout]] == keys[in_layout]
+            if not np.all(in_layout):
+                keys = np.union1d(self.keys, keys)
+                rows, columns = np.divmod(keys, self.shape[1])
+                indptr = np.r_[0, np.cumsum(np.bincount(rows, minlength=self.shape[0]))]
+                self._set_pattern(indptr, columns)
+                positions = np.searchsorted(
+                    self.keys, _linear_indices(A.indptr, A.indices, self.shape[1])
+                )
+            data = np.zeros(len(self.indices), dtype=A.dtype)
+            data[positions] = A.data
+        return sp.csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+
+def _linear_indices(indptr, indices, n_columns):
+    """Linear indices of the entries of a CSR matrix with sorted indices."""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+    return rows * n_columns + indices
+
+
+def _canonical_csr(A):
+    """CSR matrix without duplicate entries and with sorted indices."""
+    A = sp.csr_matrix(A)
+    if not A.has_canonical_format:
+        A = A.copy()
+        A.sum_duplicates()
+    return A
+
+
+def _can_refactor(solver):
+    """Whether a solver can factorize a new matrix in place with ``factor(A)``."""
+    factor = getattr(solver, "factor", None)
+    if factor is None:
+        return False
+    try:
+        return len(inspect.signature(factor).parameters) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+class _ReorderedLU(Base):
+    """SuperLU factorization of a matrix with a precomputed column ordering.
+
+    Parameters
+    ----------
+    A : scipy.sparse.spmatrix
+        Matrix to factorize.
+    perm_c : (n, ) numpy.ndarray of int, optional
+        Column ordering of a previous factorization of a matrix with the same
+        sparsity pattern. If ``None``, the ordering is computed by SuperLU.
+    **kwargs
+        Keyword arguments of :class:`pymatsolver.solvers.Base` and of
+        :func:`scipy.sparse.linalg.splu`.
+    """
+
+    _transposed = False
+
+    def __init__(
+        self,
+        A,
+        perm_c=None,
+        is_symmetric=None,
+        is_positive_definite=False,
+        is_hermitian=None,
+        check_accuracy=False,
+        check_rtol=1e-6,
+        check_atol=0,
+        **kwargs,
+    ):
+        Base.__init__(
+            self,
+            A,
+            is_symmetric=is_symmetric,
+            is_positive_definite=is_positive_definite,
+            is_hermitian=is_hermitian,
+            check_accuracy=check_accuracy,
+            check_rtol=check_rtol,
+            check_atol=check_atol,
+        )
+        A = sp.csc_matrix(A)
+        if perm_c is None:
+            self.solver = splu(A, **kwargs)
+            self._columns = None
+            self.perm_c = self.solver.perm_c
+        else:
+            # SuperLU factors A[:, argsort(perm_c)] with its columns in order
+            kwargs["permc_spec"] = "NATURAL"
+            self._columns = np.argsort(perm_c)
+            self.solver = splu(A[:, self._columns], **kwargs)
+            self.perm_c = perm_c
+
+    def _solve_multiple(self, rhs):
+        rhs = rhs.astype(self.dtype)
+        if self._columns is None:
+            return self.solver.solve(rhs, trans="T" if self._transposed else "N")
+        if self._transposed:
+            return self.solver.solve(rhs[self._columns], trans="T")
+        x = np.empty_like(rhs)
+        x[self._columns] = self.solver.solve(rhs)
+        return x
+
+    _solve_single = _solve_multiple
+
+    def transpose(self):
+        if self.is_symmetric:
+            return self
+        trans_obj = _ReorderedLU.__new__(_ReorderedLU)
+        trans_obj.__dict__.update(self.__dict__)
+        trans_obj._A = self.A.T
+        trans_obj._transposed = not self._transposed
+        return trans_obj
+
+
+class FactorizationCache:
+    """Factorizations of system matrices reusing their symbolic analysis.
+
+    The sparsity pattern of the system matrices of a simulation does not
+    change between models, frequencies or time step lengths. The cache keeps
+    the matrices sharing a key in a fixed CSR layout, so that the
+    fill-reducing ordering and symbolic analysis of their first factorization
+    can be reused by the next ones, which only do the numeric factorization.
+
+    Reuse is supported by the SuperLU solver of SciPy
+    (:class:`pymatsolver.SolverLU`), whose column ordering is stored in the
+    layout and reused by every matrix sharing it, and by the pymatsolver
+    solvers with a ``factor(A)`` method (e.g. :class:`pymatsolver.Pardiso`,
+    :class:`pymatsolver.Mumps` and :class:`SolverKrylov`), which refactor a
+    previous solver of the same layout in place. Other solvers factorize every matrix from scratch.
+
+    Every factorization is recorded in :attr:`records`, and :meth:`summary`
+    estimates how much of the factorization time went into the symbolic phase.
+    """
+
+    def __init__(self):
+        self._layouts = {}
+        self.records = []
+
+    def clear(self):
+        """Forget the layouts, their analysis and the records."""
+        self._layouts = {}
+        self.records = []
+
+    def assemble(self, key, A):
+        """System matrix in the fixed layout of a key.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the system matrix.
+        A : scipy.sparse.spmatrix
+            The system matrix.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            ``A`` in the layout of ``key``, sharing its index arrays.
+        """
+        A = _canonical_csr(A)
+        layout = self._layouts.get(key, None)
+        if layout is None or layout.shape != A.shape:
+            layout = self._layouts[key] = _SparsityLayout(A)
+        return layout.project(A)
+
+    def factor(self, key, A, solver, previous=None, **solver_opts):
+        """Factorize a system matrix, reusing the analysis of its layout.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the system matrix, matrices with the same key are expected
+            to share their sparsity pattern.
+        A : scipy.sparse.spmatrix
+            The system matrix.
+        solver : type[pymatsolver.solvers.Base]
+            The solver class.
+        previous : pymatsolver.solvers.Base, optional
+            Previous factorization of the key that is no longer needed. It is
+            refactored in place when the solver supports it, and cleaned
+            otherwise.
+        **solver_opts
+            Keyword arguments of the solver.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+            The factorization of ``A``.
+        """
+        A = self.assemble(key, A)
+        layout = self._layouts[key]
+        traced = getattr(solver, "_simpeg_traced", False)
+        if traced:
+            # the factorization is recorded below, only the solves are traced
+            solver = solver.__bases__[0]
+
+        use_superlu = issubclass(solver, SolverLU)
+        if use_superlu:
+            reused = layout.perm_c is not None
+        else:
+            reused = (
+                layout.n_factorizations > 0
+                and isinstance(previous, solver)
+                and _can_refactor(previous)
+                and np.shares_memory(previous.A.indices, layout.indices)
+            )
+
+        start = time.perf_counter()
+        with profiling.span(
+            f"{solver.__name__}.factor",
+            "solver",
+            shape=list(A.shape),
+            reused_analysis=reused,
+        ):
+            if reused and not use_superlu:
+                previous.factor(A)
+                Ainv = previous
+            else:
+                if previous is not None:
+                    previous.clean()
+                if use_superlu:
+                    Ainv = _ReorderedLU(A, perm_c=layout.perm_c, **solver_opts)
+                    layout.perm_c = Ainv.perm_c
+                else:
+                    Ainv = solver(A, **solver_opts)
+        layout.n_factorizations += 1
+        self.records.append(
+            FactorizationRecord(
+                key=key,
+                solver=solver.__name__,
+                n=A.shape[0],
+                nnz=A.nnz,
+                reused_analysis=reused,
+                time=time.perf_counter() - start,
+            )
+        )
+        if traced and not getattr(Ainv, "_simpeg_traced", False):
+            Ainv.__class__ = profiling._traced_solver(type(Ainv), solver.__name__)
+        return Ainv
+
+    def summary(self):
+        """Factorization times of every key.
+
+        The time of the symbolic phase is estimated as the time of the
+        factorizations doing the analysis minus the mean time of the
+        factorizations reusing it, and is ``nan`` until the analysis has been
+        reused once.
+
+        Returns
+        -------
+        dict
+            For every key, a dictionary with the number of factorizations
+            (``"n_factorizations"``), the number of them that reused the
+            analysis (``"n_reused"``), the total time (``"time"``), the
+            estimated time of the symbolic phase (``"symbolic_time"``) and its
+            fraction of the total time (``"symbolic_fraction"``).
+        """
+        summary = {}
+        for key in dict.fromkeys(r.key for r in self.records):
+            records = [r for r in self.records if r.key == key]
+            analysis = [r.time for r in records if not r.reused_analysis]
+            numeric = [r.time for r in records if r.reused_analysis]
+            total = sum(r.time for r in records)
+            if numeric:
+                symbolic = max(sum(analysis) - len(analysis) * np.mean(numeric), 0.0)
+            else:
+                symbolic = np.nan
+            summary[key] = {
+                "n_factorizations": len(records),
+                "n_reused": len(numeric),
+                "time": total,
+                "symbolic_time": symbolic,
+                "symbolic_fraction": symbolic / total if total > 0 else np.nan,
+            }
+        return summary
+
+    def report(self):
+        """Print the factorization times and symbolic fraction of every key."""
+        print("Factorizations:" + " " * 21 + "calls  reused     time  symbolic")
+        for key, s in self.summary().items():
+            print(
+                "  {0:<32}: {1:6d}, {2:6d}, {3:4.2e}, {4:7.1%}".format(
+                    str(key),
+                    s["n_factorizations"],
+                    s["n_reused"],
+                    s["time"],
+                    s["symbolic_fraction"],
+                )
+            )
+
+
+# The ``tol`` argument of the Krylov solvers of SciPy was renamed to ``rtol``.
+_SCIPY_1_12 = tuple(int(p) for p in scipy.__version__.split(".")[:2]) >= (1, 12)
+
+_KRYLOV_METHODS = {"cg": cg, "minres": minres, "gmres": gmres, "bicgstab": bicgstab}
+
+
+class KrylovConvergenceWarning(UserWarning):
+    pass
+
+
+class SolverKrylov(Base):
+    """Preconditioned Krylov solver with warm starts.
+
+    Solves the system with a preconditioned Krylov method of SciPy instead of
+    factorizing it, so its memory grows with the number of nonzero entries of
+    the matrix rather than with the fill-in of its factors. The preconditioner
+    is built once per matrix and reused by every right hand side, and each
+    solve starts from the previous solution when it is a better initial guess
+    than zero (e.g. the fields of the previous time step).
+
+    Matrices smaller than `direct_threshold` are factorized with a direct
+    solver instead.
+
+    Parameters
+    ----------
+    A : scipy.sparse.spmatrix
+        Matrix to solve with.
+    method : {"auto", "cg", "minres", "gmres", "bicgstab"}, optional
+        Krylov method. ``"auto"`` uses CG for Hermitian positive definite
+        matrices, MINRES for other Hermitian matrices and GMRES otherwise.
+    preconditioner : {"amg", "jacobi", None}, optional
+        Preconditioner. ``"amg"`` uses a smoothed aggregation algebraic
+        multigrid cycle built with ``pyamg``, ``"jacobi"`` the inverse of the
+        diagonal of the matrix.
+    gradient : scipy.sparse.spmatrix, optional
+        Discrete gradient from nodes to edges (e.g. ``mesh.nodal_gradient``)
+        for curl-curl systems, whose large null space makes plain multigrid
+        fail. If given, the ``"amg"`` preconditioner is the sum of a Jacobi
+        smoother on the matrix and of a multigrid correction in the auxiliary
+        nodal space ``gradient.T @ A @ gradient``, in the spirit of the
+        Hiptmair-Xu (AMS) preconditioner.
+    rtol, atol : float, optional
+        Relative and absolute tolerances on the residual norm.
+    maxiter : int, optional
+        Maximum number of iterations of every solve.
+    warm_start : bool, optional
+        Whether to start every solve from the solution of the previous one.
+    reuse_preconditioner : bool, optional
+        Whether :meth:`factor` keeps the preconditioner of the previous
+        matrix, which saves its setup when the matrices are close, e.g. for
+        small model updates.
+    direct_threshold : int, optional
+        Matrices with fewer rows are factorized with `direct_solver`.
+    direct_solver : type[pymatsolver.solvers.Base], optional
+        Direct solver used below `direct_threshold`. Defaults to
+        :func:`get_default_solver`.
+    amg_opts : dict, optional
+        Keyword arguments of :func:`pyamg.smoothed_aggregation_solver`.
+    **kwargs
+        Keyword arguments of :class:`pymatsolver.solvers.Base`.
+
+    Attributes
+    ----------
+    iterations : list of int
+        Number of iterations of every solve, one per right hand side.
+    residuals : list of float
+        Relative residual norm of every solve, one per right hand side.
+
+    Notes
+    -----
+    The solver refactorizes new matrices in place with :meth:`factor`, so a
+    :class:`FactorizationCache` keeps its warm start across models and time
+    step lengths. When a profiler is active, the iterations and residuals of
+    every solve are stored with its span.
+    """
+
+    def __init__(
+        self,
+        A,
+        method="auto",
+        preconditioner="amg",
+        gradient=None,
+        rtol=1e-8,
+        atol=0.0,
+        maxiter=1000,
+        warm_start=True,
+        reuse_preconditioner=False,
+        direct_threshold=50_000,
+        direct_solver=None,
+        amg_opts=None,
+        **kwargs,
+    ):
+        if method not in ("auto", *_KRYLOV_METHODS):
+            raise ValueError(
+                f"method must be 'auto' or one of {list(_KRYLOV_METHODS)}, "
+                f"got {method!r}."
+            )
+        if preconditioner not in ("amg", "jacobi", None):
+            raise ValueError(
+                "preconditioner must be 'amg', 'jacobi' or None, "
+                f"got {preconditioner!r}."
+            )
+        super().__init__(A, **kwargs)
+        self.method = method
+        self.preconditioner = preconditioner
+        self.gradient = gradient
+        self.rtol = rtol
+        self.atol = atol
+        self.maxiter = maxiter
+        self.warm_start = warm_start
+        self.reuse_preconditioner = reuse_preconditioner
+        self.direct_threshold = direct_threshold
+        self.direct_solver = direct_solver
+        self.amg_opts = amg_opts
+        self.iterations = []
+        self.residuals = []
+        self._direct = None
+        self._M = None
+        self._x0 = None
+        self.factor()
+
+    def get_attributes(self):
+        attrs = super().get_attributes()
+        attrs.update(
+            method=self.method,
+            preconditioner=self.preconditioner,
+            gradient=self.gradient,
+            rtol=self.rtol,
+            atol=self.atol,
+            maxiter=self.maxiter,
+            warm_start=self.warm_start,
+            reuse_preconditioner=self.reuse_preconditioner,
+            direct_threshold=self.direct_threshold,
+            direct_solver=self.direct_solver,
+            amg_opts=self.amg_opts,
+        )
+        return attrs
+
+    def factor(self, A=None):
+        """Set up the solver for a new matrix with the same shape.
+
+        The warm start is kept, and so is the preconditioner if
+        `reuse_preconditioner` is ``True``.
+
+        Parameters
+        ----------
+        A : scipy.sparse.spmatrix, optional
+            The new matrix. If ``None``, sets up the current matrix.
+        """
+        if A is not None:
+            if A.shape != self.A.shape:
+                raise ValueError(
+                    f"Expected a matrix of shape {self.A.shape}, got {A.shape}."
+                )
+            self._A = A
+            self._dtype = np.dtype(A.dtype)
+            if not self.reuse_preconditioner:
+                self._M = None
+        if self.A.shape[0] < self.direct_threshold:
+            if self._direct is not None:
+                self._direct.clean()
+            solver = self.direct_solver or get_default_solver()
+            self._direct = solver(self.A)
+        elif self._M is None:
+            self._M = self._build_preconditioner()
+
+    @property
+    def _krylov_method(self):
+        if self.method != "auto":
+            return self.method
+        if self.is_hermitian:
+            return "cg" if self.is_positive_definite else "minres"
+        return "gmres"
+
+    def _build_preconditioner(self):
+        if self.preconditioner is None:
+            return None
+        A = sp.csr_matrix(self.A)
+        # rows without diagonal entry are left unscaled
+        diagonal = A.diagonal()
+        diagonal[diagonal == 0] = 1.0
+        jacobi = sp.diags(1.0 / diagonal)
+        if self.preconditioner == "jacobi":
+            return aslinearoperator(jacobi)
+        if pyamg is None:
+            raise ImportError(
+                "The pyamg package couldn't be found. "
+                "The 'amg' preconditioner of SolverKrylov needs pyamg to be "
+                "installed.\nTry installing pyamg with:\n    pip install pyamg"
+                "\nor use preconditioner='jacobi'."
+            )
+        if self.is_hermitian:
+            symmetry = "hermitian"
+        elif self.is_symmetric:
+            symmetry = "symmetric"
+        else:
+            symmetry = "nonsymmetric"
+        amg_opts = {"symmetry": symmetry, **(self.amg_opts or {})}
+        if self.gradient is None:
+            return pyamg.smoothed_aggregation_solver(A, **amg_opts).aspreconditioner()
+
+        G = sp.csr_matrix(self.gradient)
+        nodal = pyamg.smoothed_aggregation_solver(
+            sp.csr_matrix(G.T @ A @ G), **amg_opts
+        ).aspreconditioner()
+
+        def matvec(r):
+            r = r.ravel()
+            return jacobi @ r + G @ nodal.matvec(G.T @ r)
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+    def _solve_single(self, rhs):
+        return self._solve_multiple(rhs[:, None])[:, 0]
+
+    def _solve_multiple(self, rhs):
+        if self._direct is not None:
+            return self._direct.solve(rhs)
+        x0 = self._x0
+        if not self.warm_start or x0 is None or x0.shape != rhs.shape:
+            x0 = None
+        x = np.empty(rhs.shape, dtype=np.result_type(self.dtype, rhs.dtype))
+        iterations = []
+        residuals = []
+        for i in range(rhs.shape[1]):
+            x[:, i], n_iterations, residual = self._krylov(
+                rhs[:, i], None if x0 is None else x0[:, i]
+            )
+            iterations.append(n_iterations)
+            residuals.append(residual)
+        if self.warm_start:
+            self._x0 = x.copy()
+        self.iterations += iterations
+        self.residuals += residuals
+        profiling.annotate(iterations=iterations, residuals=residuals)
+        return x
+
+    def _krylov(self, b, x0):
+        A = self.A
+        b_norm = np.linalg.norm(b)
+        if b_norm == 0:
+            return np.zeros_like(b), 0, 0.0
+        if x0 is not None and np.linalg.norm(b - A @ x0) >= b_norm:
+            # zero is a better initial guess
+            x0 = None
+
+        method = self._krylov_method
+        n_iterations = 0
+
+        def callback(_):
+            nonlocal n_iterations
+            n_iterations += 1
+
+        kwargs = {
+            "rtol" if _SCIPY_1_12 else "tol": max(self.rtol, self.atol / b_norm),
+            "maxiter": self.maxiter,
+            "M": self._M,
+            "x0": x0,
+            "callback": callback,
+        }
+        if method != "minres":
+            kwargs["atol"] = 0.0
+        if method == "gmres":
+            kwargs["callback_type"] = "pr_norm"
+        x, info = _KRYLOV_METHODS[method](A, b, **kwargs)
+        residual = np.linalg.norm(b - A @ x) / b_norm
+        if info > 0:
+            warnings.warn(
+                f"{method} did not converge after {n_iterations} iterations, "
+                f"the relative residual is {residual:.2e}.",
+                KrylovConvergenceWarning,
+                stacklevel=4,
+            )
+        return x, n_iterations, residual
+
+    def transpose(self):
+        if self._direct is not None:
+            return self._direct.transpose()
+        return super().transpose()
+
+    def clean(self):
+        if self._direct is not None:
+            self._direct.clean()
@@ -0,0 +1,376 @@
+"""
+Storage backends for the fields of simulations.
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .code_utils import validate_integer, validate_type
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+
+def _index_key(index):
+    """Hashable key of an index into a stored field."""
+    key = []
+    for i in index:
+        if isinstance(i, slice):
+            key.append(("slice", i.start, i.stop, i.step))
+        else:
+            i = np.asarray(i)
+            key.append((i.dtype.str, i.shape, i.tobytes()))
+    return tuple(key)
+
+
+class FieldsStorage:
+    """Storage of the fields in memory.
+
+    Storage backends create the arrays holding the known fields of
+    :class:`simpeg.fields.Fields` objects, and read them back. This class
+    stores the fields in NumPy arrays, and is the default backend. Subclasses
+    store the fields outside of memory, and read the fields of the next
+    sources in a background thread while the current ones are being used.
+
+    Parameters
+    ----------
+    read_ahead : bool, optional
+        Whether :meth:`prefetch` reads the requested values in a background
+        thread. Reading ahead arrays held in memory does not pay off, so it
+        is disabled by default for this class.
+
+    Notes
+    -----
+    Backends are selected per simulation with the ``fields_storage``
+    parameter of :class:`simpeg.base.BasePDESimulation`. The background
+    thread is stopped by :meth:`close`, when leaving a ``with`` block using
+    the backend, or when the backend is garbage collected.
+    """
+
+    def __init__(self, read_ahead=False):
+        self.read_ahead = read_ahead
+        self._executor = None
+        self._finalizer = None
+        self._pending = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def read_ahead(self):
+        """Whether values are read ahead in a background thread.
+
+        Returns
+        -------
+        bool
+        """
+        return self._read_ahead
+
+    @read_ahead.setter
+    def read_ahead(self, value):
+        self._read_ahead = validate_type("read_ahead", value, bool)
+
+    def create(self, name, shape, dtype):
+        """Create the array holding a known field, filled with zeros.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field.
+        shape : tuple of int
+            Shape of the array. The second axis runs over the sources, and
+            the third one, if any, over the time steps.
+        dtype : numpy.dtype
+            Data type of the array.
+
+        Returns
+        -------
+        array_like
+            Array supporting NumPy indexing to get and set its values.
+        """
+        return np.zeros(shape, dtype=dtype)
+
+    def resident_nbytes(self, array):
+        """Memory held by an array created by the backend, in bytes.
+
+        Parameters
+        ----------
+        array : array_like
+            Array created by :meth:`create`.
+
+        Returns
+        -------
+        int
+        """
+        return array.nbytes
+
+    def read(self, array, index):
+        """Read values of an array, using the values read ahead if any.
+
+        Parameters
+        ----------
+        array : array_like
+            Array created by :meth:`create`.
+        index : tuple
+            Index of the values.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        pending = self._pending.pop((id(array), _index_key(index)), None)
+        if pending is not None and pending[0] is array:
+            return pending[1].result()
+        return np.asarray(array[index])
+
+    def prefetch(self, array, index):
+        """Start reading values of an array in a background thread.
+
+        The values are returned by the next call to :meth:`read` with the
+        same index. Does nothing if :attr:`read_ahead` is ``False``.
+
+        Parameters
+        ----------
+        array : array_like
+            Array created by :meth:`create`.
+        index : tuple
+            Index of the values.
+        """
+        if not self.read_ahead:
+            return
+        key = (id(array), _index_key(index))
+        if key in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="simpeg-fields"
+            )
+            # stop the thread if the storage is garbage collected before close
+            self._finalizer = weakref.finalize(
+                self, self._executor.shutdown, wait=False
+            )
+        # the array is held with its read, so its id is not reused meanwhile
+        self._pending[key] = (
+            array,
+            self._executor.submit(lambda: np.asarray(array[index])),
+        )
+        # only keep a couple of reads in flight
+        while len(self._pending) > 2:
+            self._pending.popitem(last=False)
+
+    def discard(self, array):
+        """Drop the values of an array read ahead, before it is modified.
+
+        Parameters
+        ----------
+        array : array_like
+            Array created by :meth:`create`.
+        """
+        for key in [key for key in self._pending if key[0] == id(array)]:
+            self._pending.pop(key)[1].result()
+
+    def close(self):
+        """Stop the background thread reading values ahead.
+
+        Reads in flight are finished first. The storage stays usable, and a
+        new thread is started by the next call to :meth:`prefetch`.
+        """
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for _, future in pending:
+            future.cancel()
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+            executor.shutdown(wait=True)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_finalizer"] = None
+        state["_pending"] = OrderedDict()
+        return state
+
+
+class MemmapFieldsStorage(FieldsStorage):
+    """Storage of the fields in memory-mapped temporary files.
+
+    Each field is stored in a :class:`numpy.memmap` in Fortran order, so the
+    values of a source, or of a source and time step, are contiguous on
+    disk. The operating system keeps the recently used pages in memory and
+    writes the others back to disk. The files are removed when the arrays
+    are garbage collected.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory of the temporary files. If ``None``, the default temporary
+        directory is used.
+    read_ahead : bool, optional
+        Whether :meth:`prefetch` reads the requested values in a background
+        thread.
+    """
+
+    def __init__(self, directory=None, read_ahead=True):
+        super().__init__(read_ahead=read_ahead)
+        self.directory = directory
+
+    @property
+    def directory(self):
+        """Directory of the temporary files.
+
+        Returns
+        -------
+        str or None
+        """
+        return self._directory
+
+    @directory.setter
+    def directory(self, value):
+        if value is not None:
+            value = os.fspath(value)
+        self._directory = value
+
+    def create(self, name, shape, dtype):
+        if np.prod(shape) == 0:
+            return np.zeros(shape, dtype=dtype)
+        with tempfile.TemporaryFile(
+            prefix=f"{name}-", suffix=".dat", dir=self.directory
+        ) as file:
+            return np.memmap(file, dtype=dtype, mode="w+", shape=shape, order="F")
+
+    def resident_nbytes(self, array):
+        if isinstance(array, np.memmap):
+            return 0
+        return array.nbytes
+
+
+class _ZarrField:
+    """NumPy style indexing of a zarr array."""
+
+    def __init__(self, array):
+        self.array = array
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    @property
+    def dtype(self):
+        return self.array.dtype
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    def __getitem__(self, index):
+        return self.array.oindex[index]
+
+    def __setitem__(self, index, value):
+        self.array.oindex[index] = value
+
+
+class ZarrFieldsStorage(FieldsStorage):
+    """Storage of the fields in compressed chunked zarr arrays.
+
+    The chunks hold all the mesh values of ``sources_per_chunk`` sources
+    and of a single time step, so the sensitivities read the fields chunk
+    by chunk as they loop over sources, frequencies or time steps.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory in which the arrays are stored. If ``None``, a temporary
+        directory is created. The arrays are removed when they are garbage
+        collected.
+    sources_per_chunk : int, optional
+        Number of sources per chunk.
+    read_ahead : bool, optional
+        Whether :meth:`prefetch` reads the requested values in a background
+        thread.
+    """
+
+    def __init__(self, directory=None, sources_per_chunk=1, read_ahead=True):
+        if zarr is None:
+            raise ImportError(
+                "ZarrFieldsStorage requires the 'zarr' package. "
+                "You can install it with: pip install zarr"
+            )
+        super().__init__(read_ahead=read_ahead)
+        self.directory = directory
+        self.sources_per_chunk = sources_per_chunk
+
+    @property
+    def directory(self):
+        """Directory in which the arrays are stored.
+
+        Returns
+        -------
+        str or None
+        """
+        return self._directory
+
+    @directory.setter
+    def directory(self, value):
+        if value is not None:
+            value = os.fspath(value)
+        self._directory = value
+
+    @property
+    def sources_per_chunk(self):
+        """Number of sources per chunk.
+
+        Returns
+        -------
+        int
+        """
+        return self._sources_per_chunk
+
+    @sources_per_chunk.setter
+    def sources_per_chunk(self, value):
+        self._sources_per_chunk = validate_integer(
+            "sources_per_chunk", value, min_val=1
+        )
+
+    def _chunks(self, shape):
+        chunks = [max(shape[0], 1), max(min(self.sources_per_chunk, shape[1]), 1)]
+        return tuple(chunks + [1] * (len(shape) - 2))
+
+    def create(self, name, shape, dtype):
+        directory = self.directory
+        if directory is None:
+            directory = tempfile.gettempdir()
+        path = os.path.join(directory, f"simpeg-{name}-{uuid.uuid4().hex}.zarr")
+        array = zarr.open_array(
+            store=path,
+            mode="w",
+            shape=shape,
+            chunks=self._chunks(shape),
+            dtype=dtype,
+            fill_value=0,
+        )
+        field = _ZarrField(array)
+        weakref.finalize(field, shutil.rmtree, path, ignore_errors=True)
+        return field
+
+    def resident_nbytes(self, array):
+        if isinstance(array, _ZarrField):
+            return 0
+        return array.nbytes
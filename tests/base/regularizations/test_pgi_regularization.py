@@ -6,7 +6,7 @@ import numpy as np
 from scipy.stats import multivariate_normal
 
 from simpeg import regularization
-from simpeg.maps import Wires
+from simpeg.maps import IdentityMap, Wires
 from simpeg.utils import WeightedGaussianMixture, mkvc
 from simpeg.utils.solver_utils import get_default_solver
 
@@ -486,6 +486,44 @@ def test_removed_mref():
         pgi.mref
 
 
+@pytest.mark.parametrize("covariance_type", ["full", "tied", "diag", "spherical"])
+def test_cached_residuals(covariance_type):
+    """Test the residuals shared by the evaluation and the gradient."""
+    rng = np.random.default_rng(seed=42)
+    mesh = discretize.TensorMesh([50])
+    samples = np.r_[
+        rng.normal(-2.0, 0.5, size=(25, 2)), rng.normal(2.0, 0.5, size=(25, 2))
+    ]
+    gmm = WeightedGaussianMixture(
+        mesh=mesh, n_components=2, covariance_type=covariance_type, random_state=0
+    )
+    gmm.fit(samples)
+    wires = Wires(("s0", mesh.nC), ("s1", mesh.nC))
+    maplist = [IdentityMap(nP=mesh.nC), IdentityMap(nP=mesh.nC)]
+    smallness = regularization.PGIsmallness(
+        gmm, mesh=mesh, wiresmap=wires, maplist=maplist
+    )
+    model = mkvc(samples)
+
+    value = smallness(model)
+    r0, r1 = smallness._residual_cache[3:]
+    smallness.deriv(model)
+    assert smallness._residual_cache[3] is r0
+
+    # Batched products match the products done cluster by cluster
+    membership = smallness.compute_quasi_geology_model()
+    expected = np.zeros_like(r0)
+    for k in range(gmm.n_components):
+        selection = membership == k
+        expected[selection] = r0[selection] @ smallness._precision_matrix(k).T
+    np.testing.assert_allclose(r1, expected)
+    assert value == pytest.approx(mkvc(r0).dot(mkvc(expected)))
+
+    smallness.reference_model = smallness.reference_model + 1.0
+    smallness(model)
+    assert smallness._residual_cache[3] is not r0
+
+
 class TestCheckWeights:
     """Test the ``WeightedGaussianMixture._check_weights`` method."""
 
@@ -211,6 +211,8 @@ class FieldsTest_Alias(unittest.TestCase):
             knownFields={"e": "E"},
             aliasFields={"b": ["e", "F", alias]},
         )
+        # only pass the requested sources to the alias functions
+        F.alias_cache_size = 0
         e = np.random.rand(F.mesh.nE, 1)
         F[self.Src0, "e"] = e
         F[self.Src0, "b"]
@@ -226,10 +228,61 @@ class FieldsTest_Alias(unittest.TestCase):
             knownFields={"e": "E"},
             aliasFields={"b": ["e", "F", alias]},
         )
+        # only pass the requested sources to the alias functions
+        F.alias_cache_size = 0
         e = np.random.rand(F.mesh.nE, 2)
         F[[self.Src0, self.Src1], "e"] = e
         F[[self.Src0, self.Src1], "b"]
 
+    def test_alias_cache(self):
+        count = [0]
+
+        def alias(e, ind):
+            count[0] += 1
+            return self.F.mesh.edge_curl * e
+
+        F = fields.Fields(
+            self.simulation,
+            knownFields={"e": "E"},
+            aliasFields={"b": ["e", "F", alias]},
+        )
+        e = np.random.rand(F.mesh.nE, F.survey.nSrc)
+        F[:, "e"] = e
+        b = F.mesh.edge_curl * e
+        # a single source is evaluated alone, and not cached
+        np.testing.assert_equal(F[self.Src1, "b"], b[:, [1]])
+        self.assertEqual(count[0], 1)
+        self.assertEqual(F.nbytes, e.nbytes)
+        # evaluated once for all sources
+        np.testing.assert_equal(F[:, "b"], b)
+        np.testing.assert_equal(F[self.Src0, "b"], b[:, [0]])
+        np.testing.assert_equal(F[self.Src1, "b"], b[:, [1]])
+        self.assertEqual(count[0], 2)
+        self.assertEqual(F.nbytes, e.nbytes + b.nbytes)
+        # the values returned can be modified without changing the cache
+        for values in (F[:, "b"], F[self.Src0, "b"]):
+            values[:] = 0.0
+        np.testing.assert_equal(F[:, "b"], b)
+        self.assertEqual(count[0], 2)
+
+        # setting a known field clears the cache
+        F[self.Src0, "e"] = 2 * e[:, 0]
+        np.testing.assert_equal(F[self.Src0, "b"], 2 * b[:, [0]])
+        self.assertEqual(count[0], 3)
+
+        # fields over budget are evaluated on every access
+        F.alias_cache_size = b.nbytes - 1
+        self.assertEqual(F.nbytes, e.nbytes)
+        F[:, "b"]
+        F[:, "b"]
+        self.assertEqual(count[0], 5)
+
+        F.alias_cache_size = b.nbytes
+        F.prefetch("b")
+        self.assertEqual(count[0], 6)
+        F[self.Src1, "b"]
+        self.assertEqual(count[0], 6)
+
 
 class FieldsTest_Time(unittest.TestCase):
     def setUp(self):
@@ -454,6 +507,8 @@ class FieldsTest_Time_Aliased(unittest.TestCase):
             knownFields={"e": "E"},
             aliasFields={"b": ["e", "F", alias]},
         )
+        # only pass the requested sources to the alias functions
+        F.alias_cache_size = 0
         e = np.random.rand(F.mesh.nE, 1, nT)
         F[self.Src0, "e", :] = e
         F[self.Src0, "b", :]
@@ -477,6 +532,8 @@ class FieldsTest_Time_Aliased(unittest.TestCase):
             knownFields={"e": "E"},
             aliasFields={"b": ["e", "F", alias]},
         )
+        # only pass the requested sources to the alias functions
+        F.alias_cache_size = 0
         e = np.random.rand(F.mesh.nE, 2, nT)
         F[[self.Src0, self.Src1], "e", :] = e
         count[0] = 0
@@ -490,6 +547,47 @@ class FieldsTest_Time_Aliased(unittest.TestCase):
         F[[self.Src0, self.Src1], "b", 1]
         self.assertTrue(count[0] == 1)  # ensure that this is called only once.
 
+    def test_alias_cache(self):
+        nT = self.F.simulation.nT + 1
+        count = [0]
+
+        def alias(e, srcInd, timeInd):
+            count[0] += 1
+            self.assertTrue(srcInd == self.F.survey.source_list)
+            return self.F.mesh.edge_curl * e + timeInd
+
+        F = fields.TimeFields(
+            self.simulation,
+            knownFields={"e": "E"},
+            aliasFields={"b": ["e", "F", alias]},
+        )
+        e = np.random.rand(F.mesh.nE, F.survey.nSrc, nT)
+        F[:, "e", :] = e
+        b = np.stack([F.mesh.edge_curl * e[:, :, i] + i for i in range(nT)], axis=2)
+        # evaluated once for all sources and times
+        np.testing.assert_equal(F[:, "b", 1:3], b[:, :, 1:3])
+        np.testing.assert_equal(F[self.Src1, "b", :], b[:, 1, :])
+        np.testing.assert_equal(F[self.Src0, "b", 2], b[:, [0], 2])
+        self.assertEqual(count[0], nT)
+        values = F[self.Src0, "b", 2]
+        values[:] = 0.0
+        np.testing.assert_equal(F[self.Src0, "b", 2], b[:, [0], 2])
+
+        def integrated(e, srcInd):
+            count[0] += 1
+            return e.sum(axis=2)
+
+        F = fields.TimeFields(
+            self.simulation,
+            knownFields={"e": "E"},
+            aliasFields={"b": ["e", "F", integrated]},
+        )
+        F[:, "e", :] = e
+        count[0] = 0
+        np.testing.assert_equal(F[:, "b"], e.sum(axis=2))
+        np.testing.assert_equal(F[self.Src1, "b"], e[:, [1]].sum(axis=2))
+        self.assertEqual(count[0], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 import re
 
 from simpeg.base import with_property_mass_matrices, BasePDESimulation
+from simpeg.base._mass_matrices import _color_graph
 from simpeg import props, maps
 import unittest
 import discretize
@@ -11,6 +12,7 @@ from discretize.utils import Zero
 import scipy.sparse as sp
 import pytest
 
+from pymatsolver import SolverLU
 from simpeg.utils.solver_utils import get_default_solver
 
 
@@ -841,3 +843,93 @@ def test_bad_mesh():
     with pytest.raises(TypeError):
         # should error on anything besides a discretize.base.BaseMesh
         BasePDESimulation(np.array([1, 2, 3]))
+
+
+@pytest.mark.parametrize("n_components", [1, 3, 6])
+@pytest.mark.parametrize(
+    "mesh",
+    [
+        discretize.TensorMesh([4, 5, 3]),
+        discretize.CurvilinearMesh(
+            discretize.utils.example_curvilinear_grid([3, 4, 3], "rotate")
+        ),
+    ],
+    ids=["tensor", "curvilinear"],
+)
+def test_mass_matrices_from_operator(mesh, n_components):
+    rng = np.random.default_rng(seed=0)
+    sim = SimpleSim(mesh, sigmaMap=maps.ExpMap())
+    m0 = rng.normal(size=mesh.n_cells * n_components)
+
+    for name, inner_product in [
+        ("MeSigma", mesh.get_edge_inner_product),
+        ("MfSigma", mesh.get_face_inner_product),
+    ]:
+        sim.model = m0
+        M = getattr(sim, name)
+        np.testing.assert_allclose(
+            M.toarray(), inner_product(sim.sigma).toarray(), rtol=1e-10, atol=1e-14
+        )
+
+        # derivatives with respect to the model
+        u = rng.normal(size=M.shape[0])
+
+        def func(m, prop=name, vec=u):
+            sim.model = m
+            deriv = getattr(sim, f"{prop}Deriv")
+            return getattr(sim, prop) @ vec, lambda v: deriv(vec, v)
+
+        assert check_derivative(func, m0, plotIt=False, num=3, random_seed=5)
+
+    # the operators are reused, and only the values change with the model
+    sim.model = m0
+    M0 = sim.MeSigma
+    sim.model = m0 + 1.0
+    M1 = sim.MeSigma
+    assert M1 is not M0
+    assert np.shares_memory(M1.indices, M0.indices)
+    np.testing.assert_allclose(M1.data, np.e * M0.data)
+
+    # the values of released matrices are overwritten by the next model
+    operator = sim._get_inner_product_operator("E", sim.sigma.size)
+    assert np.shares_memory(M1.data, operator._last_values["matrix"])
+    del M1
+    sim.model = m0
+    assert np.shares_memory(sim.MeSigma.data, operator._last_values["matrix"])
+    np.testing.assert_allclose(sim.MeSigma.data, M0.data)
+
+    # the operators are shared by the simulations on the same mesh
+    other = SimpleSim(mesh, sigmaMap=maps.ExpMap())
+    other.model = m0 + 1.0
+    assert other._get_inner_product_operator("E", sim.sigma.size) is operator
+    np.testing.assert_allclose(other.MeSigma.data, np.e * M0.data)
+    np.testing.assert_allclose(sim.MeSigma.data, M0.data)
+
+
+def test_color_graph():
+    mesh = discretize.TensorMesh([6, 5, 4])
+    graph = mesh.average_edge_to_cell @ mesh.average_edge_to_cell.T
+    colors = _color_graph(graph)
+    assert colors.min() == 0
+    rows, cols = sp.triu(graph, k=1).nonzero()
+    assert np.all(colors[rows] != colors[cols])
+
+
+@pytest.mark.parametrize("reuse", [True, False])
+def test_factor_system(reuse):
+    mesh = discretize.TensorMesh([4, 5, 3])
+    sim = SimpleSim(mesh, sigmaMap=maps.ExpMap())
+    sim.solver = SolverLU
+    sim.reuse_symbolic_factorization = reuse
+    curl = mesh.edge_curl
+    b = np.ones(mesh.n_edges, dtype=complex)
+
+    Ainv = None
+    for m in [0.0, 1.0]:
+        sim.model = np.full(mesh.n_cells, m)
+        A = curl.T @ curl + 1j * sim.MeSigma
+        Ainv = sim._factor_system("A", A, previous=Ainv)
+        np.testing.assert_allclose(A @ (Ainv * b), b, atol=1e-10)
+
+    reused = [r.reused_analysis for r in sim.factorization_cache.records]
+    assert reused == ([False, True] if reuse else [])
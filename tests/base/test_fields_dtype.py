@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import discretize
+from simpeg import maps
+from simpeg.electromagnetics import frequency_domain as fdem
+from simpeg.electromagnetics import time_domain as tdem
+from simpeg.electromagnetics.static import resistivity as dc
+
+
+@pytest.fixture
+def mesh():
+    return discretize.TensorMesh([[(10.0, 8)]] * 3, origin="CCC")
+
+
+def dc_simulation(mesh, **kwargs):
+    rx = dc.receivers.Dipole(
+        locations_m=np.array([[-20.0, 0, 0], [0.0, 0, 0]]),
+        locations_n=np.array([[-10.0, 0, 0], [10.0, 0, 0]]),
+    )
+    src = dc.sources.Dipole([rx], [-30.0, 0, 0], [30.0, 0, 0])
+    return dc.Simulation3DNodal(
+        mesh, survey=dc.Survey([src]), sigmaMap=maps.ExpMap(), **kwargs
+    )
+
+
+def fdem_simulation(mesh, **kwargs):
+    rx = fdem.receivers.PointMagneticFluxDensitySecondary(
+        np.array([[0.0, 0.0, 20.0]]), orientation="z", component="imag"
+    )
+    src = fdem.sources.MagDipole([rx], frequency=100.0, location=[0.0, 0.0, 25.0])
+    return fdem.Simulation3DElectricField(
+        mesh, survey=fdem.Survey([src]), sigmaMap=maps.ExpMap(), **kwargs
+    )
+
+
+def tdem_simulation(mesh, **kwargs):
+    rx = tdem.receivers.PointMagneticFluxTimeDerivative(
+        np.array([[0.0, 0.0, 20.0]]), np.logspace(-5, -4, 3), orientation="z"
+    )
+    src = tdem.sources.MagDipole([rx], location=[0.0, 0.0, 25.0])
+    return tdem.Simulation3DElectricField(
+        mesh,
+        survey=tdem.Survey([src]),
+        sigmaMap=maps.ExpMap(),
+        time_steps=[(1e-6, 10), (1e-5, 10)],
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "make_simulation, stored",
+    [
+        (dc_simulation, np.float32),
+        (fdem_simulation, np.complex64),
+        (tdem_simulation, np.float32),
+    ],
+)
+def test_single_precision_fields(mesh, make_simulation, stored):
+    m = np.full(mesh.n_cells, np.log(1e-2))
+    sim = make_simulation(mesh, fields_dtype=np.float32)
+    f = sim.fields(m)
+    (field,) = f._fields.values()
+    assert field.dtype == stored
+    # the fields are upcast when they are accessed
+    name = next(iter(f.knownFields))
+    assert f[:, name].dtype == np.result_type(stored, np.float64)
+
+    if make_simulation is tdem_simulation:
+        # compare the data, the time stepping is kept in double precision
+        d = sim.dpred(m, f=f)
+        sim.fields_dtype = np.float64
+        np.testing.assert_allclose(d, sim.dpred(m), rtol=1e-5)
+        return
+
+    errors = sim.fields_dtype_error(m, random_seed=0)
+    assert set(errors) == {"dpred", "Jvec", "Jtvec"}
+    assert all(0 < error < 1e-4 for error in errors.values())
+    assert sim.fields_dtype is np.float32
+
+    errors = sim.fields_dtype_error(m, fields_dtype=np.float64, random_seed=0)
+    assert all(error == 0 for error in errors.values())
+
+
+def test_fields_dtype_validation(mesh):
+    sim = dc_simulation(mesh)
+    assert sim.fields_dtype is np.float64
+    with pytest.raises(TypeError, match="fields_dtype"):
+        sim.fields_dtype = np.float16
+
+
+def test_fields_dtype_clears_stored_sensitivities(mesh):
+    m = np.zeros(mesh.n_cells)
+    sim = dc_simulation(mesh, storeJ=True)
+    J = sim.getJ(m)
+    assert sim.getJ(m) is J
+    sim.fields_dtype = np.float32
+    assert sim.getJ(m) is not J
@@ -0,0 +1,218 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+import discretize
+from simpeg import fields, maps, simulation, survey
+from simpeg.electromagnetics import frequency_domain as fdem
+from simpeg.electromagnetics import time_domain as tdem
+from simpeg.utils.storage_utils import (
+    FieldsStorage,
+    MemmapFieldsStorage,
+    ZarrFieldsStorage,
+)
+
+
+def make_storage(backend, tmp_path):
+    if backend == "memory":
+        return FieldsStorage()
+    if backend == "memmap":
+        return MemmapFieldsStorage(directory=tmp_path)
+    pytest.importorskip("zarr")
+    return ZarrFieldsStorage(directory=tmp_path, sources_per_chunk=2)
+
+
+@pytest.fixture
+def mesh():
+    return discretize.TensorMesh([[(10.0, 8)]] * 3, origin="CCC")
+
+
+@pytest.fixture
+def base_simulation(mesh):
+    rx = survey.BaseRx(np.zeros((1, 3)))
+    source_list = [survey.BaseSrc([rx], location=np.zeros(3)) for _ in range(3)]
+    sim = simulation.BaseTimeSimulation(
+        survey=survey.BaseSurvey(source_list), time_steps=[(1e-3, 4)]
+    )
+    sim.mesh = mesh
+    return sim
+
+
+@pytest.mark.parametrize("backend", ["memory", "memmap", "zarr"])
+def test_fields_round_trip(base_simulation, backend, tmp_path):
+    storage = make_storage(backend, tmp_path)
+    f = fields.Fields(base_simulation, knownFields={"e": "E"}, dtype=complex)
+    f.storage = storage
+    rng = np.random.default_rng(seed=0)
+    e = rng.normal(size=(f.mesh.n_edges, 3)) + 1j * rng.normal(size=(f.mesh.n_edges, 3))
+    src_list = f.survey.source_list
+    f[src_list[:2], "e"] = e[:, :2]
+    f[src_list[2], "e"] = e[:, 2]
+    np.testing.assert_array_equal(f[:, "e"], e)
+    np.testing.assert_array_equal(f[src_list[1], "e"], e[:, [1]])
+
+    streamed = list(f.stream(src_list, "e"))
+    for i, values in enumerate(streamed):
+        np.testing.assert_array_equal(values, e[:, [i]])
+    if backend == "memory":
+        assert f.nbytes == e.nbytes
+    else:
+        assert f.nbytes == 0
+
+
+@pytest.mark.parametrize("backend", ["memory", "memmap", "zarr"])
+def test_time_fields_round_trip(base_simulation, backend, tmp_path):
+    storage = make_storage(backend, tmp_path)
+    f = fields.TimeFields(base_simulation, knownFields={"phi": "CC"})
+    f.storage = storage
+    rng = np.random.default_rng(seed=0)
+    phi = rng.normal(size=(f.mesh.n_cells, 3, 5))
+    for i in range(5):
+        f[:, "phi", i] = phi[:, :, i]
+    np.testing.assert_array_equal(f[:, "phi", :], phi)
+    src = f.survey.source_list[1]
+    np.testing.assert_array_equal(f[src, "phi", 2], phi[:, [1], 2])
+    for i, values in enumerate(f.stream(f.survey.source_list, "phi")):
+        np.testing.assert_array_equal(values, phi[:, i, :])
+    for i, values in enumerate(f.stream(f.survey.source_list, "phi", 3)):
+        np.testing.assert_array_equal(values, phi[:, [i], 3])
+
+
+def test_prefetch_and_discard():
+    storage = FieldsStorage(read_ahead=True)
+    array = storage.create("e", (4, 3), np.float64)
+    index = (slice(None), [1])
+    storage.prefetch(array, index)
+    assert len(storage._pending) == 1
+    np.testing.assert_array_equal(storage.read(array, index), np.zeros((4, 1)))
+    assert not storage._pending
+
+    storage.prefetch(array, index)
+    storage.discard(array)
+    array[:, 1] = 1.0
+    np.testing.assert_array_equal(storage.read(array, index), np.ones((4, 1)))
+
+    # the array is held until read, so no other array reuses its id
+    storage.prefetch(array, index)
+    array_ref = weakref.ref(array)
+    del array
+    gc.collect()
+    assert array_ref() is not None
+    other = storage.create("e", (4, 3), np.float64)
+    other[:] = 2.0
+    np.testing.assert_array_equal(storage.read(other, index), np.full((4, 1), 2.0))
+
+    # reads ahead are only done on request
+    storage = FieldsStorage()
+    storage.prefetch(other, index)
+    assert not storage._pending
+
+
+def test_close_stops_read_ahead():
+    index = (slice(None), [1])
+    with FieldsStorage(read_ahead=True) as storage:
+        array = storage.create("e", (4, 3), np.float64)
+        storage.prefetch(array, index)
+        executor = storage._executor
+    assert storage._executor is None
+    assert not storage._pending
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+    # the storage stays usable after being closed
+    storage.prefetch(array, index)
+    np.testing.assert_array_equal(storage.read(array, index), np.zeros((4, 1)))
+
+    # the thread is also stopped when the storage is garbage collected
+    executor = storage._executor
+    del storage
+    gc.collect()
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+def test_storage_fixed_once_stored(base_simulation):
+    f = fields.Fields(base_simulation, knownFields={"e": "E"})
+    f[:, "e"] = 1.0
+    with pytest.raises(AttributeError):
+        f.storage = MemmapFieldsStorage()
+
+
+@pytest.mark.parametrize("backend", ["memmap", "zarr"])
+def test_fdem_sensitivities(mesh, backend):
+    if backend == "zarr":
+        pytest.importorskip("zarr")
+    rx = fdem.receivers.PointMagneticFluxDensitySecondary(
+        np.array([[0.0, 0.0, 20.0]]), orientation="z", component="imag"
+    )
+    source_list = [
+        fdem.sources.MagDipole([rx], frequency=frequency, location=[0.0, 0.0, 25.0])
+        for frequency in [10.0, 10.0, 100.0]
+    ]
+
+    def make_simulation(fields_storage):
+        return fdem.Simulation3DElectricField(
+            mesh,
+            survey=fdem.Survey(source_list),
+            sigmaMap=maps.ExpMap(),
+            fields_storage=fields_storage,
+        )
+
+    m = np.full(mesh.n_cells, np.log(1e-2))
+    rng = np.random.default_rng(seed=0)
+    v = rng.normal(size=mesh.n_cells)
+    w = rng.normal(size=len(source_list))
+
+    expected = make_simulation("memory")
+    sim = make_simulation(backend)
+    assert isinstance(sim.fields_storage, FieldsStorage)
+    f = sim.fields(m)
+    np.testing.assert_allclose(sim.dpred(m, f=f), expected.dpred(m))
+    np.testing.assert_allclose(sim.Jvec(m, v, f=f), expected.Jvec(m, v))
+    np.testing.assert_allclose(sim.Jtvec(m, w, f=f), expected.Jtvec(m, w))
+
+
+@pytest.mark.parametrize("backend", ["memmap", "zarr"])
+def test_tdem_sensitivities(mesh, backend):
+    if backend == "zarr":
+        pytest.importorskip("zarr")
+    rx = tdem.receivers.PointMagneticFluxTimeDerivative(
+        np.array([[0.0, 0.0, 20.0]]), np.logspace(-4, -3, 3), orientation="z"
+    )
+    source_list = [
+        tdem.sources.MagDipole([rx], location=[x, 0.0, 25.0]) for x in [-10.0, 10.0]
+    ]
+
+    def make_simulation(fields_storage):
+        return tdem.Simulation3DMagneticFluxDensity(
+            mesh,
+            survey=tdem.Survey(source_list),
+            sigmaMap=maps.ExpMap(),
+            time_steps=[(1e-4, 10)],
+            fields_storage=fields_storage,
+        )
+
+    m = np.full(mesh.n_cells, np.log(1e-2))
+    rng = np.random.default_rng(seed=0)
+    v = rng.normal(size=mesh.n_cells)
+    expected = make_simulation("memory")
+    w = rng.normal(size=expected.survey.nD)
+
+    sim = make_simulation(backend)
+    f = sim.fields(m)
+    np.testing.assert_allclose(sim.dpred(m, f=f), expected.dpred(m))
+    np.testing.assert_allclose(sim.Jvec(m, v, f=f), expected.Jvec(m, v))
+    np.testing.assert_allclose(sim.Jtvec(m, w, f=f), expected.Jtvec(m, w))
+
+
+def test_fields_storage_validation(mesh):
+    sim = fdem.Simulation3DElectricField(mesh, survey=fdem.Survey([]))
+    assert type(sim.fields_storage) is FieldsStorage
+    sim.fields_storage = "memmap"
+    assert isinstance(sim.fields_storage, MemmapFieldsStorage)
+    with pytest.raises(ValueError):
+        sim.fields_storage = "hdf5"
+    with pytest.raises(TypeError):
+        sim.fields_storage = np.zeros
@@ -1,4 +1,5 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -118,6 +119,26 @@ class DataMisfitTest(unittest.TestCase):
         self.assertTrue(np.all(reg1.reference_model == m0))
         self.assertTrue(np.all(reg2.reference_model == m0))
 
+    def test_concurrent_fields_and_misfit(self):
+        reg = regularization.WeightedLeastSquares(self.mesh)
+        opt = optimization.InexactGaussNewton(maxIter=1)
+        dmis = self.dmis0 + self.dmis1
+        serial_prob = inverse_problem.BaseInvProblem(dmis, reg, opt)
+        f_serial = serial_prob.getFields(self.model)
+        phi_serial = dmis(self.model, f=f_serial)
+        g_serial = dmis.deriv(self.model, f=f_serial)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dmis.executor = executor
+            invProb = inverse_problem.BaseInvProblem(dmis, reg, opt, executor=executor)
+            f = invProb.getFields(self.model)
+            phi = dmis(self.model, f=f)
+            g = dmis.deriv(self.model, f=f)
+
+        self.assertEqual(sorted(invProb.fields_times), [0, 1])
+        self.assertEqual(phi, phi_serial)
+        np.testing.assert_array_equal(g, g_serial)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,8 @@
+import functools
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import numpy as np
 import scipy.sparse as sp
 import pytest
@@ -480,5 +485,84 @@ class TestMultiplierValidation:
             _validate_multiplier(multiplier)
 
 
+class TestConcurrentCombo:
+    """Test evaluating combo objective functions with an executor."""
+
+    n_params = 20
+
+    def get_combo(self, executor=None):
+        rng = np.random.default_rng(seed=41)
+        objfcts = [
+            objective_function.L2ObjectiveFunction(
+                W=sp.diags(rng.uniform(size=self.n_params))
+            )
+            for _ in range(4)
+        ]
+        return objective_function.ComboObjectiveFunction(
+            objfcts=objfcts, multipliers=[0.3, 1.7, 0.0, 2.1], executor=executor
+        )
+
+    @pytest.mark.parametrize(
+        "executor_class",
+        (
+            ThreadPoolExecutor,
+            # forking after numba started its threading layer can hang the
+            # interpreter at exit, so start fresh processes instead
+            functools.partial(
+                ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+            ),
+        ),
+        ids=["threads", "processes"],
+    )
+    def test_matches_serial(self, executor_class):
+        """Concurrent evaluations match the serial ones bit for bit."""
+        rng = np.random.default_rng(seed=5)
+        m = rng.uniform(size=self.n_params)
+        v = rng.uniform(size=self.n_params)
+        serial = self.get_combo()
+        with executor_class(max_workers=2) as executor:
+            concurrent = self.get_combo(executor=executor)
+            assert concurrent(m) == serial(m)
+            np.testing.assert_array_equal(concurrent.deriv(m), serial.deriv(m))
+            np.testing.assert_array_equal(concurrent.deriv2(m, v), serial.deriv2(m, v))
+
+    def test_term_times(self):
+        """Per-term times are reported, skipping terms with zero multiplier."""
+        counter = utils.Counter()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            combo = self.get_combo(executor=executor)
+            combo.counter = counter
+            combo(np.ones(self.n_params))
+        assert sorted(combo.term_times) == [0, 1, 3]
+        assert all(t >= 0 for t in combo.term_times.values())
+        assert "ComboObjectiveFunction.__call__[1: L2ObjectiveFunction]" in (
+            counter._timeList
+        )
+
+    def test_invalid_executor(self):
+        with pytest.raises(TypeError, match="executor must be an instance of"):
+            self.get_combo(executor="threads")
+
+    def test_operations_keep_executor(self):
+        """Combos built by adding or scaling a combo keep its executor."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            combo = self.get_combo(executor=executor)
+            other = objective_function.L2ObjectiveFunction(nP=self.n_params)
+            assert (combo + other).executor is executor
+            assert (other + combo).executor is executor
+            assert (2.0 * combo).executor is executor
+            assert (combo / 2.0).executor is executor
+            assert (other + other).executor is None
+
+    def test_pickle_drops_executor(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            combo = self.get_combo(executor=executor)
+            unpickled = pickle.loads(pickle.dumps(combo))
+        assert combo.executor is executor
+        assert unpickled.executor is None
+        m = np.ones(self.n_params)
+        assert unpickled(m) == self.get_combo()(m)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,158 @@
+import json
+import warnings
+
+import numpy as np
+import pytest
+
+import discretize
+from simpeg import (
+    data_misfit,
+    directives,
+    inverse_problem,
+    inversion,
+    maps,
+    optimization,
+    profiling,
+    regularization,
+    simulation,
+)
+from simpeg.electromagnetics.static import resistivity as dc
+from simpeg.profiling import Profiler, span
+
+
+@pytest.fixture
+def linear_inversion():
+    mesh = discretize.TensorMesh([30])
+    sim = simulation.ExponentialSinusoidSimulation(
+        mesh=mesh, n_kernels=10, model_map=maps.IdentityMap(mesh)
+    )
+    m = np.linspace(0, 1, mesh.n_cells)
+    data = sim.make_synthetic_data(m, noise_floor=0.1, add_noise=False)
+    dmis = data_misfit.L2DataMisfit(data=data, simulation=sim)
+    reg = regularization.WeightedLeastSquares(mesh)
+    opt = optimization.InexactGaussNewton(maxIter=2)
+    inv_prob = inverse_problem.BaseInvProblem(dmis, reg, opt, beta=1.0)
+    inv = inversion.BaseInversion(
+        inv_prob, directiveList=[directives.BetaSchedule(coolingFactor=2)]
+    )
+    return inv, np.zeros(mesh.n_cells)
+
+
+def test_disabled():
+    assert not profiling.is_enabled()
+    with span("nothing") as s:
+        assert s is None
+
+
+class _Warner:
+    @profiling.traced("test")
+    def warn(self):
+        warnings.warn("from the caller", UserWarning, stacklevel=2)
+
+
+def test_traced_warning_stacklevel():
+    # warnings of traced methods are attributed to the caller when disabled
+    with pytest.warns(UserWarning) as record:
+        _Warner().warn()
+    assert record[0].filename == __file__
+    with Profiler() as profiler:
+        _Warner().warn()
+    assert [s.name for s in profiler.spans] == ["_Warner.warn"]
+
+
+def test_nesting():
+    with Profiler() as profiler:
+        assert profiling.is_enabled()
+        with span("outer", "test", size=3):
+            with span("inner"):
+                pass
+        with pytest.raises(RuntimeError):
+            Profiler().start()
+    assert not profiling.is_enabled()
+    # spans are not recorded after the profiler stops
+    with span("ignored"):
+        pass
+
+    outer, inner = profiler.spans
+    assert (outer.name, outer.category, outer.args) == ("outer", "test", {"size": 3})
+    assert outer.parent is None and outer.depth == 0
+    assert inner.parent == outer.index and inner.depth == 1
+    assert outer.wall_time >= inner.wall_time >= 0
+    assert outer.start <= inner.start
+    assert outer.peak_rss is None or outer.peak_rss >= outer.rss_start
+
+
+def test_inversion_spans(linear_inversion, tmp_path):
+    inv, m0 = linear_inversion
+    with Profiler() as profiler:
+        inv.run(m0)
+    names = {s.name for s in profiler.spans}
+    for name in [
+        "BaseInversion.run",
+        "BaseInvProblem.evalFunction",
+        "ExponentialSinusoidSimulation.fields",
+        "ExponentialSinusoidSimulation.Jvec",
+        "ExponentialSinusoidSimulation.Jtvec",
+        "L2DataMisfit.__call__",
+        "WeightedLeastSquares.deriv2",
+        "BetaSchedule.endIter",
+    ]:
+        assert name in names
+
+    # Data misfit evaluations are nested within the objective function
+    spans = profiler.spans
+    for s in spans:
+        if s.name == "L2DataMisfit.__call__":
+            assert spans[s.parent].name == "ComboObjectiveFunction.__call__"
+
+    trace = profiler.to_chrome_trace(tmp_path / "trace.json")
+    with open(tmp_path / "trace.json") as f:
+        assert json.load(f) == json.loads(json.dumps(trace))
+    assert len(trace["traceEvents"]) == len(spans)
+    assert {e["ph"] for e in trace["traceEvents"]} == {"X"}
+
+    records = profiler.to_records()
+    assert records[0]["name"] == "BaseInversion.run"
+    table = profiler.to_dataframe()
+    assert len(table) == len(spans)
+    assert {"wall_time", "cpu_time", "peak_rss"} <= set(table.columns)
+
+
+def test_solver_spans():
+    mesh = discretize.TensorMesh([np.ones(8)] * 3, origin="CCN")
+    rx = dc.receivers.Dipole(
+        locations_m=np.array([[-2.0, 0, 0], [0.0, 0, 0]]),
+        locations_n=np.array([[-1.0, 0, 0], [1.0, 0, 0]]),
+    )
+    src = dc.sources.Dipole([rx], [-3.0, 0, 0], [3.0, 0, 0])
+    sim = dc.Simulation3DNodal(
+        mesh, survey=dc.Survey([src]), sigmaMap=maps.ExpMap(mesh)
+    )
+    m = np.zeros(mesh.n_cells)
+    solver = sim.solver
+    with Profiler(track_memory=False) as profiler:
+        sim.dpred(m)
+    # the solver class is only replaced while profiling
+    assert sim.solver is solver
+
+    names = [s.name for s in profiler.spans]
+    assert f"{solver.__name__}.factor" in names
+    assert f"{solver.__name__}.solve" in names
+    factor = next(s for s in profiler.spans if s.name.endswith(".factor"))
+    assert factor.args["shape"] == [mesh.n_nodes, mesh.n_nodes]
+    assert profiler.spans[factor.parent].name == "Simulation3DNodal.fields"
+    assert all(s.rss_start is None for s in profiler.spans)
+
+
+def test_annotate():
+    # nothing happens without a profiler or an open span
+    profiling.annotate(ignored=True)
+    with Profiler(track_memory=False) as profiler:
+        profiling.annotate(ignored=True)
+        with span("outer", size=3):
+            with span("inner"):
+                profiling.annotate(iterations=[4, 5])
+            profiling.annotate(residual=1e-9)
+    outer, inner = profiler.spans
+    assert outer.args == {"size": 3, "residual": 1e-9}
+    assert inner.args == {"iterations": [4, 5]}
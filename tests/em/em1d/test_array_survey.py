@@ -0,0 +1,162 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import simpeg.electromagnetics.frequency_domain as fdem
+import simpeg.electromagnetics.time_domain as tdem
+from simpeg import data, maps
+
+THICKNESSES = np.r_[10.0, 20.0, 40.0]
+SIGMA = np.r_[0.01, 0.1, 0.02, 0.005]
+LOCATIONS = np.c_[
+    np.linspace(0.0, 100.0, 4), np.zeros(4), np.r_[30.0, 35.0, 28.0, 50.0]
+]
+
+
+def fdem_templates():
+    rx = fdem.receivers.PointMagneticFieldSecondary(
+        np.array([[7.86, 0.0, 0.0]]),
+        orientation="z",
+        component="both",
+        use_source_receiver_offset=True,
+    )
+    return [
+        fdem.sources.MagDipole([rx], frequency=f, location=np.zeros(3))
+        for f in [382.0, 7970.0]
+    ]
+
+
+def tdem_templates():
+    receiver_list = [
+        tdem.receivers.PointMagneticFluxTimeDerivative(
+            np.array([[0.0, 0.0, 0.0]]),
+            np.logspace(-5, -3, 6),
+            orientation="z",
+            use_source_receiver_offset=True,
+        ),
+        tdem.receivers.PointMagneticFluxDensity(
+            np.array([[0.0, 0.0, 60.0]]), np.logspace(-5, -3, 4), orientation="z"
+        ),
+    ]
+    return [
+        tdem.sources.CircularLoop(
+            receiver_list, location=np.r_[0.0, 0.0, 30.0], radius=10.0
+        )
+    ]
+
+
+def explicit_survey(module, templates):
+    """List based survey equivalent to the array survey."""
+    source_list = []
+    for location in LOCATIONS:
+        for template in templates:
+            receiver_list = []
+            for rx in template.receiver_list:
+                if rx.use_source_receiver_offset:
+                    rx_locations = location + rx.locations
+                else:
+                    rx_locations = rx.locations + location - template.location
+                kwargs = {"orientation": rx.orientation}
+                if module is tdem:
+                    args = (rx_locations, rx.times)
+                else:
+                    args = (rx_locations,)
+                    kwargs["component"] = rx.component
+                receiver_list.append(type(rx)(*args, **kwargs))
+            if module is tdem:
+                src = tdem.sources.CircularLoop(
+                    receiver_list, location=location, radius=template.radius
+                )
+            else:
+                src = fdem.sources.MagDipole(
+                    receiver_list, frequency=template.frequency, location=location
+                )
+            source_list.append(src)
+    return module.Survey(source_list)
+
+
+@pytest.mark.parametrize(
+    "module, templates", [(fdem, fdem_templates), (tdem, tdem_templates)]
+)
+class TestArraySurvey:
+    def test_counts(self, module, templates):
+        survey = module.survey.ArraySurvey(templates(), LOCATIONS)
+        expected = explicit_survey(module, templates())
+        assert "_source_list" not in survey.__dict__
+        assert survey.nSrc == expected.nSrc
+        assert survey.nD == expected.nD
+        np.testing.assert_array_equal(survey.vnD, expected.vnD)
+        np.testing.assert_array_equal(
+            survey.data_offsets, np.r_[0, np.cumsum(expected.vnD)]
+        )
+
+    def test_sources(self, module, templates):
+        survey = module.survey.ArraySurvey(templates(), LOCATIONS)
+        expected = explicit_survey(module, templates())
+        for src, src_expected in zip(survey.source_list, expected.source_list):
+            np.testing.assert_allclose(src.location, src_expected.location)
+            for rx, rx_expected in zip(src.receiver_list, src_expected.receiver_list):
+                np.testing.assert_allclose(rx.locations, rx_expected.locations)
+                assert not rx.use_source_receiver_offset
+
+    def test_slices(self, module, templates):
+        survey = module.survey.ArraySurvey(templates(), LOCATIONS)
+        slices = survey.get_all_slices()
+        assert len(slices) == sum(len(src.receiver_list) for src in survey.source_list)
+        for (src, rx), expected in slices.items():
+            assert survey.get_slice(src, rx) == expected
+        other_src = templates()[0]
+        with pytest.raises(KeyError):
+            survey.get_slice(other_src, other_src.receiver_list[0])
+
+    def test_pickle(self, module, templates):
+        survey = module.survey.ArraySurvey(templates(), LOCATIONS)
+        survey.get_all_slices()
+        state = survey.__getstate__()
+        assert "_source_list" not in state
+        assert "_all_slices" not in state
+        survey_copy = pickle.loads(pickle.dumps(survey))
+        assert survey_copy.nD == survey.nD
+        for src, src_copy in zip(survey.source_list, survey_copy.source_list):
+            np.testing.assert_allclose(src.location, src_copy.location)
+
+    def test_source_list_is_read_only(self, module, templates):
+        survey = module.survey.ArraySurvey(templates(), LOCATIONS)
+        with pytest.raises(AttributeError):
+            survey.source_list = []
+
+    def test_simulation_and_data(self, module, templates):
+        survey = module.survey.ArraySurvey(templates(), LOCATIONS)
+        expected = explicit_survey(module, templates())
+        dpreds = []
+        jacobians = []
+        for srv in (survey, expected):
+            sim = module.Simulation1DLayered(
+                survey=srv,
+                thicknesses=THICKNESSES,
+                sigmaMap=maps.IdentityMap(nP=len(SIGMA)),
+            )
+            dpreds.append(sim.dpred(SIGMA))
+            jacobians.append(sim.getJ(SIGMA)["ds"])
+        # the simulation works from the templates, without building the sources
+        assert "_source_list" not in survey.__dict__
+        np.testing.assert_allclose(dpreds[0], dpreds[1])
+        np.testing.assert_allclose(jacobians[0], jacobians[1])
+
+        data_object = data.Data(survey, dobs=dpreds[0])
+        src = survey.source_list[-1]
+        rx = src.receiver_list[-1]
+        np.testing.assert_allclose(
+            data_object[src, rx], dpreds[0][survey.get_slice(src, rx)]
+        )
+
+
+def test_frequencies():
+    survey = fdem.survey.ArraySurvey(fdem_templates(), LOCATIONS)
+    assert survey.frequencies == [382.0, 7970.0]
+    assert survey.num_frequencies == 2
+    assert survey.num_sources_by_frequency == {382.0: 4, 7970.0: 4}
+    sources = survey.get_sources_by_frequency(7970.0)
+    assert len(sources) == 4
+    assert all(src.frequency == 7970.0 for src in sources)
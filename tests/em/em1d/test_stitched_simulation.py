@@ -0,0 +1,172 @@
+import numpy as np
+import pytest
+
+import simpeg.electromagnetics.frequency_domain as fdem
+import simpeg.electromagnetics.time_domain as tdem
+from discretize import tests
+from simpeg import maps
+
+THICKNESSES = np.r_[10.0, 20.0, 40.0]
+N_SOUNDING = 4
+N_LAYER = len(THICKNESSES) + 1
+LOCATIONS = np.c_[
+    np.linspace(0.0, 300.0, N_SOUNDING),
+    np.zeros(N_SOUNDING),
+    np.r_[30.0, 35.0, 28.0, 40.0],
+]
+TOPO = np.c_[LOCATIONS[:, :2], np.r_[0.0, 2.0, -1.0, 5.0]]
+SIGMA = np.outer(np.r_[1.0, 2.0, 0.5, 1.5], np.r_[0.01, 0.1, 0.02, 0.005]).ravel()
+
+
+def fdem_templates():
+    receiver_list = [
+        fdem.receivers.PointMagneticFieldSecondary(
+            np.array([[7.86, 0.0, 0.0]]),
+            orientation="z",
+            component="both",
+            use_source_receiver_offset=True,
+        ),
+        fdem.receivers.PointMagneticField(
+            np.array([[7.86, 0.0, 0.0]]),
+            orientation="z",
+            component="real",
+            use_source_receiver_offset=True,
+        ),
+    ]
+    return [
+        fdem.sources.MagDipole(receiver_list, frequency=f, location=np.zeros(3))
+        for f in [382.0, 7970.0]
+    ]
+
+
+def tdem_templates():
+    receiver_list = [
+        tdem.receivers.PointMagneticFluxTimeDerivative(
+            np.array([[0.0, 0.0, 0.0]]),
+            np.logspace(-5, -3, 6),
+            orientation="z",
+            use_source_receiver_offset=True,
+        ),
+        tdem.receivers.PointMagneticFluxDensity(
+            np.array([[0.0, 0.0, 0.0]]),
+            np.logspace(-5, -3, 4),
+            orientation="z",
+            use_source_receiver_offset=True,
+        ),
+    ]
+    return [tdem.sources.CircularLoop(receiver_list, location=np.zeros(3), radius=10.0)]
+
+
+@pytest.mark.parametrize(
+    "module, templates", [(fdem, fdem_templates), (tdem, tdem_templates)]
+)
+class TestStitchedSimulation:
+    def get_simulation(self, module, templates, **kwargs):
+        survey = module.survey.ArraySurvey(templates(), LOCATIONS)
+        return module.Simulation1DLayeredStitched(
+            survey=survey, thicknesses=THICKNESSES, topo=TOPO, **kwargs
+        )
+
+    def test_dpred(self, module, templates):
+        sim = self.get_simulation(
+            module, templates, sigmaMap=maps.IdentityMap(nP=len(SIGMA))
+        )
+        dpred = sim.dpred(SIGMA)
+        assert dpred.shape == (sim.survey.nD,)
+
+        expected = []
+        for i in range(N_SOUNDING):
+            survey = module.survey.ArraySurvey(templates(), LOCATIONS[i : i + 1])
+            sim_1d = module.Simulation1DLayered(
+                survey=survey,
+                thicknesses=THICKNESSES,
+                topo=TOPO[i],
+                sigmaMap=maps.IdentityMap(nP=N_LAYER),
+            )
+            expected.append(sim_1d.dpred(SIGMA[i * N_LAYER : (i + 1) * N_LAYER]))
+        np.testing.assert_allclose(dpred, np.concatenate(expected), rtol=1e-6)
+
+    def test_chunks(self, module, templates):
+        sim = self.get_simulation(
+            module, templates, sigmaMap=maps.IdentityMap(nP=len(SIGMA))
+        )
+        dpred = sim.dpred(SIGMA)
+        sim.n_soundings_per_chunk = 1
+        np.testing.assert_allclose(sim.dpred(SIGMA), dpred)
+
+    def test_processes(self, module, templates):
+        m0 = np.log(SIGMA)
+        sim = self.get_simulation(
+            module, templates, sigmaMap=maps.ExpMap(nP=len(SIGMA))
+        )
+        sim_parallel = self.get_simulation(
+            module,
+            templates,
+            sigmaMap=maps.ExpMap(nP=len(SIGMA)),
+            n_soundings_per_chunk=1,
+            n_processes=2,
+        )
+        np.testing.assert_allclose(sim_parallel.dpred(m0), sim.dpred(m0))
+        np.testing.assert_allclose(
+            sim_parallel.getJ(m0)["ds"].toarray(), sim.getJ(m0)["ds"].toarray()
+        )
+
+    def test_sensitivity_is_block_diagonal(self, module, templates):
+        sim = self.get_simulation(
+            module, templates, sigmaMap=maps.ExpMap(nP=len(SIGMA))
+        )
+        J = sim.getJ(np.log(SIGMA))["ds"]
+        assert J.shape == (sim.survey.nD, N_SOUNDING * N_LAYER)
+        assert J.blocksize == (sim.survey.nD // N_SOUNDING, N_LAYER)
+
+    def test_derivative_sigma(self, module, templates):
+        sim = self.get_simulation(
+            module, templates, sigmaMap=maps.ExpMap(nP=len(SIGMA))
+        )
+        m0 = np.log(SIGMA)
+
+        def fun(m):
+            return sim.dpred(m), lambda v: sim.Jvec(m, v)
+
+        assert tests.check_derivative(
+            fun, m0, num=4, plotIt=False, eps=1e-15, random_seed=42
+        )
+
+        v = np.random.default_rng(0).normal(size=sim.survey.nD)
+        w = np.random.default_rng(1).normal(size=len(m0))
+        np.testing.assert_allclose(v @ sim.Jvec(m0, w), w @ sim.Jtvec(m0, v))
+        J = sim.getJ(m0)["ds"] @ sim.sigmaDeriv
+        np.testing.assert_allclose(
+            sim.getJtJdiag(m0), np.asarray(J.multiply(J).sum(axis=0)).ravel()
+        )
+
+    def test_derivative_height(self, module, templates):
+        wires = maps.Wires(("sigma", len(SIGMA)), ("h", N_SOUNDING))
+        sim = self.get_simulation(
+            module,
+            templates,
+            sigmaMap=maps.ExpMap() * wires.sigma,
+            hMap=wires.h,
+        )
+        m0 = np.r_[np.log(SIGMA), LOCATIONS[:, 2] - TOPO[:, 2]]
+        sim_sigma = self.get_simulation(
+            module, templates, sigmaMap=maps.ExpMap(nP=len(SIGMA))
+        )
+        np.testing.assert_allclose(
+            sim.dpred(m0), sim_sigma.dpred(np.log(SIGMA)), rtol=1e-10
+        )
+
+        def fun(m):
+            return sim.dpred(m), lambda v: sim.Jvec(m, v)
+
+        assert tests.check_derivative(
+            fun, m0, num=4, plotIt=False, eps=1e-15, random_seed=42
+        )
+
+
+def test_source_below_topography():
+    survey = fdem.survey.ArraySurvey(fdem_templates(), LOCATIONS)
+    with pytest.raises(ValueError, match="above the topography"):
+        fdem.Simulation1DLayeredStitched(
+            survey=survey, thicknesses=THICKNESSES, topo=np.r_[0.0, 0.0, 50.0]
+        )
@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+from discretize import TensorMesh, TreeMesh
+
+from simpeg import maps
+from simpeg.electromagnetics import natural_source as nsem
+from simpeg.electromagnetics.natural_source.utils import frequency_band_mesh
+
+
+@pytest.fixture
+def mesh():
+    h = [(100.0, 4, -1.5), (100.0, 8), (100.0, 4, 1.5)]
+    return TensorMesh([h, h, h], "CCC")
+
+
+@pytest.fixture
+def locations():
+    return np.c_[np.linspace(-200.0, 200.0, 3), np.zeros(3), np.zeros(3)]
+
+
+@pytest.fixture
+def survey(locations):
+    receivers = [
+        nsem.receivers.Impedance(locations, orientation=orientation, component=comp)
+        for orientation in ["xy", "yx"]
+        for comp in ["real", "imag"]
+    ]
+    source_list = [
+        nsem.sources.PlanewaveXYPrimary(receivers, frequency=frequency)
+        for frequency in [100.0, 1.0, 10.0]
+    ]
+    return nsem.Survey(source_list)
+
+
+@pytest.fixture
+def sigma_primary(mesh):
+    return np.where(mesh.cell_centers[:, 2] > 0, 1e-8, 1e-2)
+
+
+def test_frequency_band_mesh(mesh, locations):
+    low = frequency_band_mesh(mesh, locations, [1.0, 3.0], 1e-2)
+    high = frequency_band_mesh(mesh, locations, [1000.0, 3000.0], 1e-2)
+    for band_mesh in [low, high]:
+        assert isinstance(band_mesh, TreeMesh)
+        # as fine as the model near the receivers, and coarser away from them
+        assert min(h.min() for h in band_mesh.h) == 100.0
+        assert band_mesh.n_cells < mesh.n_cells
+        # aligned on the surface of the model mesh
+        assert np.any(band_mesh.nodes[:, 2] == 0.0)
+        # the band meshes stay within the model mesh
+        assert np.all(band_mesh.nodes.min(axis=0) >= mesh.nodes.min(axis=0))
+        assert np.all(band_mesh.nodes.max(axis=0) <= mesh.nodes.max(axis=0))
+    # the mesh of the high frequencies is smaller
+    extent = [np.ptp(band_mesh.nodes, axis=0) for band_mesh in [low, high]]
+    assert np.all(extent[1] < extent[0])
+
+
+def test_multi_mesh_simulation(mesh, survey, sigma_primary):
+    sim = nsem.Simulation3DPrimarySecondaryMultiMesh(
+        mesh,
+        survey,
+        sigmaPrimary=sigma_primary,
+        sigmaMap=maps.ExpMap(mesh),
+        n_bands=2,
+    )
+    assert [list(band) for band in sim.bands] == [[1.0, 10.0], [100.0]]
+    assert len(sim.band_meshes) == 2
+
+    m = np.log(sigma_primary)
+    d = sim.dpred(m)
+    assert d.shape == (survey.nD,)
+
+    # the data of each band end up at the position of their source
+    slices = survey.get_all_slices()
+    for band_sim in sim.simulations:
+        band_d = band_sim.dpred(band_sim.model)
+        i = 0
+        for band_src in band_sim.survey.source_list:
+            (src,) = [
+                s for s in survey.source_list if s.frequency == band_src.frequency
+            ]
+            for rx in src.receiver_list:
+                n = rx.nD
+                np.testing.assert_array_equal(d[slices[src, rx]], band_d[i : i + n])
+                i += n
+
+    rng = np.random.default_rng(seed=42)
+    v = rng.normal(size=mesh.n_cells)
+    w = rng.normal(size=survey.nD)
+    f = sim.fields(m)
+    vJw = w @ sim.Jvec(m, v, f=f)
+    wJtv = v @ sim.Jtvec(m, w, f=f)
+    np.testing.assert_allclose(vJw, wJtv, rtol=1e-8)
+
+
+def test_multi_mesh_validation(mesh, survey, sigma_primary, locations):
+    with pytest.raises(ValueError, match="sigmaPrimary"):
+        nsem.Simulation3DPrimarySecondaryMultiMesh(mesh, survey, sigma_primary[:-1])
+    with pytest.raises(ValueError, match="band meshes"):
+        nsem.Simulation3DPrimarySecondaryMultiMesh(
+            mesh, survey, sigma_primary, band_meshes=[mesh] * 4
+        )
+    rx = nsem.receivers.Impedance(locations, orientation="xy")
+    with pytest.raises(TypeError, match="PlanewaveXYPrimary"):
+        nsem.Simulation3DPrimarySecondaryMultiMesh(
+            mesh,
+            nsem.Survey([nsem.sources.Planewave([rx], frequency=1.0)]),
+            sigma_primary,
+        )
+
+
+def test_multi_mesh_accuracy(mesh, survey, sigma_primary):
+    sigma = sigma_primary.copy()
+    x, y, z = mesh.cell_centers.T
+    sigma[(np.abs(x) < 250) & (np.abs(y) < 250) & (z < -50) & (z > -350)] = 1e-1
+    m = np.log(sigma)
+
+    sim = nsem.Simulation3DPrimarySecondaryMultiMesh(
+        mesh,
+        survey,
+        sigmaPrimary=sigma_primary,
+        sigmaMap=maps.ExpMap(mesh),
+        n_bands=2,
+    )
+    for band_mesh in sim.band_meshes:
+        assert band_mesh.n_cells < mesh.n_cells
+    d = sim.dpred(m)
+
+    single_mesh_survey = nsem.Survey(
+        [
+            nsem.sources.PlanewaveXYPrimary(src.receiver_list, src.frequency)
+            for src in survey.source_list
+        ]
+    )
+    single_mesh_sim = nsem.Simulation3DPrimarySecondary(
+        mesh,
+        survey=single_mesh_survey,
+        sigmaPrimary=sigma_primary,
+        sigmaMap=maps.ExpMap(mesh),
+    )
+    d_single = single_mesh_sim.dpred(m)
+
+    slices = survey.get_all_slices()
+    for src in survey.source_list:
+        for rx in src.receiver_list:
+            expected = d_single[slices[src, rx]]
+            np.testing.assert_allclose(
+                d[slices[src, rx]], expected, atol=0.02 * np.abs(expected).max()
+            )
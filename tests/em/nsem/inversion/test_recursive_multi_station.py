@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from simpeg import maps, tests
+from simpeg.electromagnetics import natural_source as nsem
+
+COMPONENTS = ["real", "imag", "app_res", "phase"]
+THICKNESSES = np.array([300.0, 200.0, 100.0])
+
+
+def get_survey(locations, frequencies):
+    source_list = []
+    for frequency in frequencies:
+        receivers = [
+            nsem.receivers.Impedance(locations, orientation="xy", component=comp)
+            for comp in COMPONENTS
+        ]
+        source_list.append(nsem.sources.Planewave(receivers, frequency))
+    return nsem.Survey(source_list)
+
+
+@pytest.fixture
+def locations():
+    return np.c_[np.linspace(0.0, 1000.0, 5), np.zeros(5), np.zeros(5)]
+
+
+@pytest.fixture
+def model(locations):
+    rng = np.random.default_rng(seed=4)
+    return np.log(10 ** rng.uniform(-3, 0, size=(len(locations), 4))).reshape(-1)
+
+
+def test_multi_station_vs_single_stations(locations, model):
+    frequencies = np.logspace(-2, 3, 6)
+    sim = nsem.Simulation1DRecursiveMultiStation(
+        survey=get_survey(locations, frequencies),
+        thicknesses=THICKNESSES,
+        sigmaMap=maps.ExpMap(),
+    )
+    # stations are numbered in their order of appearance
+    np.testing.assert_array_equal(sim.station_locations, locations)
+    d = sim.dpred(model).reshape(len(frequencies), len(COMPONENTS), -1)
+    J = sim.getJ(model)
+    assert sp.issparse(J)
+    assert J.nnz == sim.survey.nD * 4
+    J = J.toarray().reshape(len(frequencies), len(COMPONENTS), len(locations), -1)
+
+    single_survey = get_survey(np.zeros((1, 3)), frequencies)
+    for i, station_model in enumerate(model.reshape(len(locations), -1)):
+        single = nsem.Simulation1DRecursive(
+            survey=single_survey, thicknesses=THICKNESSES, sigmaMap=maps.IdentityMap()
+        )
+        sigma = np.exp(station_model)
+        np.testing.assert_allclose(
+            d[:, :, i].reshape(-1), single.dpred(sigma), rtol=1e-12
+        )
+        J_single = single.getJ(sigma)["sigma"]
+        np.testing.assert_allclose(
+            J[:, :, i, 4 * i : 4 * i + 4].reshape(-1, 4), J_single, rtol=1e-10
+        )
+        # no sensitivity to the layers of the other stations
+        others = np.delete(np.arange(J.shape[-1]), np.s_[4 * i : 4 * i + 4])
+        np.testing.assert_array_equal(J[:, :, i][..., others], 0.0)
+
+
+def test_multi_station_derivatives(locations, model):
+    sim = nsem.Simulation1DRecursiveMultiStation(
+        survey=get_survey(locations, np.logspace(-1, 2, 4)),
+        thicknesses=THICKNESSES,
+        rhoMap=maps.ExpMap(),
+    )
+
+    def fun(x):
+        return sim.dpred(x), lambda v: sim.Jvec(x, v)
+
+    assert tests.check_derivative(fun, model, num=4, plotIt=False, random_seed=12)
+
+    rng = np.random.default_rng(seed=7)
+    v = rng.normal(size=model.size)
+    w = rng.normal(size=sim.survey.nD)
+    np.testing.assert_allclose(
+        w @ sim.Jvec(model, v), v @ sim.Jtvec(model, w), rtol=1e-10
+    )
+
+    W = sp.diags(rng.uniform(1, 2, size=sim.survey.nD))
+    J = sim.getJ(model) @ sim.sigmaDeriv
+    np.testing.assert_allclose(
+        sim.getJtJdiag(model, W=W), np.sum((W @ J).toarray() ** 2, axis=0)
+    )
+
+
+def test_multi_station_validation(locations):
+    survey = get_survey(locations, [1.0])
+    sim = nsem.Simulation1DRecursiveMultiStation(
+        survey=survey, thicknesses=THICKNESSES, sigmaMap=maps.IdentityMap()
+    )
+    with pytest.raises(ValueError, match="20 values"):
+        sim.dpred(np.ones(19))
+    with pytest.raises(NotImplementedError, match="thicknesses"):
+        nsem.Simulation1DRecursiveMultiStation(
+            survey=survey, thicknesses=THICKNESSES, thicknessesMap=maps.IdentityMap()
+        )
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from discretize import TensorMesh
+
+from simpeg import maps
+from simpeg.electromagnetics import natural_source as nsem
+
+
+@pytest.fixture
+def mesh():
+    h = [(40.0, 5, -1.4), (40.0, 20), (40.0, 5, 1.4)]
+    return TensorMesh([h, h], "CC")
+
+
+@pytest.fixture
+def model(mesh):
+    sigma = np.where(mesh.cell_centers[:, 1] < 0.0, 1e-2, 1e-8)
+    in_block = np.all(np.abs(mesh.cell_centers - [0.0, -150.0]) < 100.0, axis=1)
+    sigma[in_block] = 1e-1
+    return np.log(sigma)
+
+
+@pytest.fixture
+def survey():
+    locations = np.c_[np.linspace(-200.0, 200.0, 3), np.zeros(3)]
+    source_list = []
+    for frequency in [10.0, 1.0]:
+        receivers = [
+            nsem.receivers.Impedance(locations, orientation=orientation, component=comp)
+            for comp in ["real", "imag"]
+            for orientation in ["yx", "xy"]
+        ]
+        source_list.append(nsem.sources.Planewave(receivers, frequency))
+    return nsem.Survey(source_list)
+
+
+def test_boundary_fields_cache(mesh, model):
+    rx = nsem.receivers.Impedance(np.c_[0.0, 0.0], orientation="xy")
+    survey = nsem.Survey([nsem.sources.Planewave([rx], 1.0)])
+    sim = nsem.Simulation2DElectricField(mesh, survey=survey, sigmaMap=maps.ExpMap())
+    f_left, f_right = sim.boundary_fields(model)
+
+    # changing the interior of the model keeps the 1D fields
+    interior = model.copy()
+    interior[np.argmin(np.abs(mesh.cell_centers).sum(axis=1))] += 1.0
+    sim.model = interior
+    assert sim.boundary_fields()[0] is f_left
+    assert sim.boundary_fields()[1] is f_right
+    fresh = nsem.Simulation2DElectricField(mesh, survey=survey, sigmaMap=maps.ExpMap())
+    np.testing.assert_allclose(sim.dpred(interior), fresh.dpred(interior))
+
+    # changing a boundary column solves the 1D problems again
+    boundary = interior.copy()
+    boundary[np.argmin(mesh.cell_centers[:, 0])] += 1.0
+    sim.model = boundary
+    assert sim.boundary_fields()[0] is not f_left
+
+
+def test_tetm_simulation(mesh, model, survey):
+    sim = nsem.Simulation2DTETM(mesh, survey, sigmaMap=maps.ExpMap())
+    assert len(sim.simulations) == 4
+    d = sim.dpred(model)
+
+    # the data of each polarization match the simulation of that polarization
+    for orientation, simulation_class, mapping in [
+        ("xy", nsem.Simulation2DElectricField, {"sigmaMap": maps.ExpMap()}),
+        (
+            "yx",
+            nsem.Simulation2DMagneticField,
+            {"rhoMap": maps.ReciprocalMap() * maps.ExpMap()},
+        ),
+    ]:
+        source_list = [
+            nsem.sources.Planewave(
+                [rx for rx in src.receiver_list if rx.orientation == orientation],
+                src.frequency,
+            )
+            for src in survey.source_list
+        ]
+        mode_sim = simulation_class(mesh, survey=nsem.Survey(source_list), **mapping)
+        mode_d = mode_sim.dpred(model)
+        slices = survey.get_all_slices()
+        i = 0
+        for src, mode_src in zip(survey.source_list, source_list):
+            for rx in mode_src.receiver_list:
+                n = rx.nD
+                np.testing.assert_allclose(
+                    d[slices[src, rx]], mode_d[i : i + n], rtol=1e-10
+                )
+                i += n
+
+    rng = np.random.default_rng(seed=42)
+    v = rng.normal(size=mesh.n_cells)
+    w = rng.normal(size=survey.nD)
+    f = sim.fields(model)
+    vJw = w @ sim.Jvec(model, v, f=f)
+    wJtv = v @ sim.Jtvec(model, w, f=f)
+    np.testing.assert_allclose(vJw, wJtv, rtol=1e-8)
+
+
+def test_tetm_multiprocessing(mesh, model, survey):
+    serial = nsem.Simulation2DTETM(mesh, survey, sigmaMap=maps.ExpMap())
+    parallel = nsem.Simulation2DTETM(
+        mesh, survey, sigmaMap=maps.ExpMap(), n_processes=2
+    )
+    try:
+        rng = np.random.default_rng(seed=0)
+        v = rng.normal(size=mesh.n_cells)
+        w = rng.normal(size=survey.nD)
+        np.testing.assert_allclose(parallel.dpred(model), serial.dpred(model))
+        np.testing.assert_allclose(
+            parallel.Jvec(model, v), serial.Jvec(model, v), rtol=1e-10, atol=1e-20
+        )
+        np.testing.assert_allclose(
+            parallel.Jtvec(model, w), serial.Jtvec(model, w), rtol=1e-10, atol=1e-20
+        )
+    finally:
+        parallel.join()
+
+
+def test_tetm_validation(mesh):
+    rx = nsem.receivers.Impedance(np.c_[0.0, 0.0], orientation="xx")
+    survey = nsem.Survey([nsem.sources.Planewave([rx], 1.0)])
+    with pytest.raises(TypeError, match="xy and yx"):
+        nsem.Simulation2DTETM(mesh, survey)
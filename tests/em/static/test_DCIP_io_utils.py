@@ -193,6 +193,86 @@ class Test_DCIP_IO(unittest.TestCase):
         self.assertTrue(passed)
         print("READ/WRITE METHODS FOR DCIP3D DATA PASSED!")
 
+    def test_dcip3d_mixed_receivers(self):
+        rx_locations = np.c_[np.linspace(0, 100, 6), np.zeros(6), np.zeros(6)]
+        source_list = [
+            dc.sources.Dipole(
+                [
+                    dc.receivers.Pole(rx_locations[:3]),
+                    dc.receivers.Dipole(rx_locations[3:5], rx_locations[4:6]),
+                ],
+                np.r_[-50.0, 0.0, 0.0],
+                np.r_[-25.0, 0.0, 0.0],
+            ),
+            dc.sources.Pole(
+                [dc.receivers.Dipole(rx_locations[:-1], rx_locations[1:])],
+                np.r_[150.0, 0.0, 0.0],
+            ),
+        ]
+        survey = dc.survey.Survey(source_list)
+        dobs = np.arange(survey.nD, dtype=float)
+        data3D = data.Data(survey, dobs=dobs, standard_deviation=0.1 + dobs)
+
+        file_name = self.dir_path + "/dcip3d_mixed.txt"
+        io_utils.write_dcip3d_ubc(file_name, data3D, "volt", "dobs")
+
+        # Reorder the receivers of the first source, dipoles before poles
+        with open(file_name) as fid:
+            lines = fid.readlines()
+        rx_lines = [line for line in lines[2:9] if line.strip()]
+        with open(file_name, "w") as fid:
+            fid.writelines(lines[:2] + rx_lines[3:] + rx_lines[:3] + lines[9:])
+
+        data_read, sort_index = io_utils.read_dcip3d_ubc(
+            file_name, "volt", output_sorting=True
+        )
+        np.testing.assert_array_equal(sort_index[:5], [2, 3, 4, 0, 1])
+        np.testing.assert_allclose(data_read.dobs, dobs)
+        np.testing.assert_allclose(data_read.standard_deviation, 0.1 + dobs)
+        np.testing.assert_allclose(data_read.survey.locations_m, survey.locations_m)
+        self.assertIsInstance(data_read.survey.source_list[1], dc.sources.Pole)
+
+    def test_dcip_xyz_output_sorting(self):
+        survey_type = ["dipole-dipole", "pole-dipole"]
+        source_list = []
+        for stype in survey_type:
+            source_list += utils.generate_dcip_sources_line(
+                stype,
+                "volt",
+                "3D",
+                np.array([-100, 50, 100, -50]),
+                self.topo,
+                self.num_rx_per_src,
+                self.station_spacing,
+            )
+        survey = dc.survey.Survey(source_list)
+        rng = np.random.default_rng(seed=42)
+        dobs = rng.uniform(size=survey.nD)
+        data3D = data.Data(survey, dobs=dobs, standard_deviation=0.1 * dobs)
+        extra = np.arange(survey.nD, dtype=float)
+
+        file_name = self.dir_path + "/dcip_xyz.txt"
+        io_utils.write_dcip_xyz(
+            file_name,
+            data3D,
+            data_header="V",
+            uncertainties_header="UNCERT",
+            out_dict={"ID": extra},
+        )
+
+        # Swap the data and location columns to check headers are respected
+        data_read, out_dict, sort_index = io_utils.read_dcip_xyz(
+            file_name,
+            "volt",
+            data_header="UNCERT",
+            uncertainties_header="V",
+            dict_headers=["ID"],
+            output_sorting=True,
+        )
+        np.testing.assert_allclose(data_read.dobs, 0.1 * dobs[sort_index])
+        np.testing.assert_allclose(data_read.standard_deviation, dobs[sort_index])
+        np.testing.assert_allclose(out_dict["ID"], sort_index)
+
     def tearDown(self):
         # Clean up the working directory
         shutil.rmtree("./dcip_io_tests")
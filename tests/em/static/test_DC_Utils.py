@@ -277,6 +277,76 @@ class DCUtilsTests_survey_from_ABMN(unittest.TestCase):
         passed = np.allclose(A, B)
         self.assertTrue(passed)
 
+    def test_generate_survey_groups_within_tolerance(self):
+        # Shuffle the rows and perturb them below the tolerance
+        rng = np.random.default_rng(seed=42)
+        shuffle = rng.permutation(self.survey.nD)
+        locations = [
+            loc[shuffle] + rng.uniform(-1e-5, 1e-5, size=loc.shape)
+            for loc in (
+                self.survey.locations_a,
+                self.survey.locations_b,
+                self.survey.locations_m,
+                self.survey.locations_n,
+            )
+        ]
+        with self.assertWarns(UserWarning):
+            survey_new, sorting_index = utils.generate_survey_from_abmn_locations(
+                locations_a=locations[0],
+                locations_b=locations[1],
+                locations_m=locations[2],
+                locations_n=locations[3],
+                data_type="volt",
+                output_sorting=True,
+            )
+
+        # Sources sharing A and B locations are merged
+        unique_ab = np.unique(
+            np.c_[self.survey.locations_a, self.survey.locations_b], axis=0
+        )
+        self.assertEqual(survey_new.nSrc, len(unique_ab))
+        self.assertEqual(survey_new.nD, self.survey.nD)
+        np.testing.assert_array_equal(np.sort(sorting_index), np.arange(self.survey.nD))
+        np.testing.assert_allclose(
+            np.c_[tuple(loc[sorting_index] for loc in locations)],
+            np.c_[
+                survey_new.locations_a,
+                survey_new.locations_b,
+                survey_new.locations_m,
+                survey_new.locations_n,
+            ],
+            atol=1e-4,
+        )
+
+    def test_generate_survey_merges_across_rounding_boundary(self):
+        # A locations 0.4 * tolerance apart on each side of a rounding boundary
+        tolerance = 1e-3
+        locations_a = np.array([[0.3e-3, 0.0, 0.0], [0.7e-3, 0.0, 0.0]])
+        locations_b = np.array([[10.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+        locations_m = np.array([[20.0, 0.0, 0.0], [30.0, 0.0, 0.0]])
+        locations_n = np.array([[30.0, 0.0, 0.0], [40.0, 0.0, 0.0]])
+        survey_new = utils.generate_survey_from_abmn_locations(
+            locations_a=locations_a,
+            locations_b=locations_b,
+            locations_m=locations_m,
+            locations_n=locations_n,
+            data_type="volt",
+            tolerance=tolerance,
+        )
+        self.assertEqual(survey_new.nSrc, 1)
+        np.testing.assert_array_equal(survey_new.locations_m, locations_m)
+
+        # locations farther apart than the tolerance are kept apart
+        survey_new = utils.generate_survey_from_abmn_locations(
+            locations_a=locations_a * 3,
+            locations_b=locations_b,
+            locations_m=locations_m,
+            locations_n=locations_n,
+            data_type="volt",
+            tolerance=tolerance,
+        )
+        self.assertEqual(survey_new.nSrc, 2)
+
     def test_get_source_locations(self):
         # Sources have pole and dipole which impacts unique return
         is_rx = np.all(
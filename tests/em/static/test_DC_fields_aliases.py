@@ -0,0 +1,75 @@
+"""
+Test the aliased DC fields evaluated for one or several sources.
+"""
+
+import numpy as np
+import pytest
+import discretize
+
+from simpeg import maps
+from simpeg.electromagnetics import resistivity as dc
+
+
+def get_survey(dim):
+    locations = np.c_[np.linspace(-40.0, 40.0, 5), np.zeros(5), np.zeros(5)][:, -dim:]
+    rx = dc.receivers.Dipole(locations[:-1], locations[1:])
+    source_list = [
+        dc.sources.Dipole([rx], locations[i], locations[j])
+        for i, j in [(0, 1), (1, 3), (2, 4)]
+    ]
+    return dc.Survey(source_list)
+
+
+def assert_same(values, expected):
+    atol = 1e-10 * np.abs(expected).max()
+    np.testing.assert_allclose(values, expected, rtol=1e-10, atol=atol)
+
+
+@pytest.mark.parametrize(
+    "simulation_class", [dc.Simulation3DCellCentered, dc.Simulation3DNodal]
+)
+def test_aliases_3d(simulation_class):
+    """Aliases evaluated in bulk match the ones of each source."""
+    mesh = discretize.TensorMesh([[(20.0, 8)]] * 3, origin="CCN")
+    simulation = simulation_class(mesh, survey=get_survey(3), sigmaMap=maps.ExpMap())
+    fields = simulation.fields(np.full(mesh.n_cells, np.log(1e-2)))
+    source_list = fields.survey.source_list
+    for name in fields.aliasFields:
+        # each source on its own
+        fields.alias_cache_size = 0
+        expected = [fields[src, name] for src in source_list]
+        assert_same(fields[:, name], np.hstack(expected))
+
+        # all sources at once, then from the cache
+        fields.alias_cache_size = 512 * 1024**2
+        fields.clear_alias_cache()
+        assert_same(fields[:, name], np.hstack(expected))
+        assert_same(fields[source_list[::2], name], np.hstack(expected[::2]))
+        for src, values in zip(source_list, expected):
+            assert_same(fields[src, name], values)
+
+
+@pytest.mark.parametrize(
+    "simulation_class", [dc.Simulation2DCellCentered, dc.Simulation2DNodal]
+)
+def test_aliases_2d(simulation_class):
+    """Aliases integrated over the wavenumbers match the ones of each source."""
+    mesh = discretize.TensorMesh([[(20.0, 8)]] * 2, origin="CN")
+    simulation = simulation_class(
+        mesh, survey=get_survey(2), sigmaMap=maps.ExpMap(), nky=3
+    )
+    fields = simulation.fields(np.full(mesh.n_cells, np.log(1e-2)))
+    source_list = fields.survey.source_list
+    for name in fields.aliasFields:
+        # each source on its own
+        fields.alias_cache_size = 0
+        expected = [fields[src, name] for src in source_list]
+        assert_same(fields[:, name], np.hstack(expected))
+
+        # all sources at once, then from the cache
+        fields.alias_cache_size = 512 * 1024**2
+        fields.clear_alias_cache()
+        assert_same(fields[:, name], np.hstack(expected))
+        assert_same(fields[source_list[::2], name], np.hstack(expected[::2]))
+        for src, values in zip(source_list, expected):
+            assert_same(fields[src, name], values)
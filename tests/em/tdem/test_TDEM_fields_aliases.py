@@ -0,0 +1,77 @@
+"""
+Test the aliased TDEM fields evaluated for one or several sources.
+"""
+
+import numpy as np
+import pytest
+import discretize
+
+from simpeg import maps
+from simpeg.electromagnetics import time_domain as tdem
+
+
+SIMULATIONS = [
+    tdem.Simulation3DMagneticFluxDensity,
+    tdem.Simulation3DElectricField,
+    tdem.Simulation3DMagneticField,
+    tdem.Simulation3DCurrentDensity,
+]
+
+
+@pytest.fixture(params=SIMULATIONS, ids=lambda cls: cls.__name__)
+def fields(request):
+    h = [(20.0, 2, -1.3), (20.0, 6), (20.0, 2, 1.3)]
+    mesh = discretize.TensorMesh([h, h, h], "CCC")
+    rx = tdem.receivers.PointMagneticFluxTimeDerivative(
+        np.c_[20.0, 0.0, 0.0], np.logspace(-5, -4, 3), orientation="z"
+    )
+    source_list = [
+        tdem.sources.MagDipole(
+            [rx], location=location, waveform=tdem.sources.StepOffWaveform()
+        )
+        for location in [[0.0, 0.0, 0.0], [20.0, 20.0, 0.0], [-20.0, 0.0, 20.0]]
+    ]
+    simulation = request.param(
+        mesh,
+        survey=tdem.Survey(source_list),
+        sigmaMap=maps.ExpMap(),
+        time_steps=[(1e-5, 4)],
+    )
+    return simulation.fields(np.full(mesh.n_cells, np.log(1e-2)))
+
+
+def assert_same(values, expected):
+    atol = 1e-10 * np.abs(expected).max()
+    np.testing.assert_allclose(values, expected, rtol=1e-10, atol=atol)
+
+
+@pytest.mark.parametrize("time_index", [slice(None), 2])
+def test_aliases(fields, time_index):
+    """Aliases evaluated in bulk match the ones of each source."""
+    source_list = fields.survey.source_list
+    for name in fields.aliasFields:
+        # each source on its own
+        fields.alias_cache_size = 0
+        try:
+            expected = [fields[src, name, time_index] for src in source_list]
+        except (AttributeError, NotImplementedError) as error:
+            # aliases this formulation does not provide fail the same way in bulk
+            with pytest.raises(type(error)):
+                fields[:, name, time_index]
+            continue
+        # sources along the second axis, time steps along the third one
+        expected_all = np.concatenate(
+            [values.reshape(values.shape[0], 1, -1) for values in expected], axis=1
+        )
+        values = fields[:, name, time_index]
+        assert_same(values.reshape(expected_all.shape), expected_all)
+
+        # all sources at once, then from the cache
+        fields.alias_cache_size = 512 * 1024**2
+        fields.clear_alias_cache()
+        values = fields[:, name, time_index]
+        assert_same(values.reshape(expected_all.shape), expected_all)
+        values = fields[source_list[::2], name, time_index]
+        assert_same(values.reshape(expected_all[:, ::2].shape), expected_all[:, ::2])
+        for src, values in zip(source_list, expected):
+            assert_same(fields[src, name, time_index], values)
@@ -0,0 +1,47 @@
+import discretize
+import numpy as np
+import pytest
+
+from simpeg import maps
+from simpeg.electromagnetics import time_domain as tdem
+
+TIMES = np.logspace(-5, -4, 3)
+
+
+def get_survey(locations):
+    source_list = []
+    for location in locations:
+        rx = tdem.receivers.PointMagneticFluxTimeDerivative(
+            np.c_[20.0, 0.0, 0.0], TIMES, orientation="z"
+        )
+        source_list.append(
+            tdem.sources.MagDipole(
+                [rx], location=location, waveform=tdem.sources.StepOffWaveform()
+            )
+        )
+    return tdem.Survey(source_list)
+
+
+@pytest.mark.parametrize(
+    "simulation_class",
+    [tdem.Simulation3DCurrentDensity, tdem.Simulation3DMagneticField],
+)
+def test_dbdt_multiple_sources(simulation_class):
+    """dB/dt data of several sources match the data of each source alone."""
+    h = [(20.0, 4, -1.3), (20.0, 8), (20.0, 4, 1.3)]
+    mesh = discretize.TensorMesh([h, h, h], "CCC")
+    model = np.full(mesh.n_cells, np.log(1e-2))
+    locations = [np.r_[0.0, 0.0, 0.0], np.r_[20.0, 20.0, 0.0]]
+
+    def dpred(locations):
+        sim = simulation_class(
+            mesh,
+            survey=get_survey(locations),
+            sigmaMap=maps.ExpMap(),
+            time_steps=[(1e-5, 10)],
+        )
+        return sim.dpred(model)
+
+    d = dpred(locations)
+    d_single = np.concatenate([dpred([location]) for location in locations])
+    np.testing.assert_allclose(d, d_single, rtol=1e-10, atol=1e-20)
@@ -6,6 +6,8 @@ from simpeg.electromagnetics.utils import (
 )
 import discretize
 import unittest
+from unittest.mock import patch
+from simpeg.electromagnetics.utils import current_utils
 from simpeg.utils import download
 
 
@@ -73,6 +75,49 @@ class TreeMeshLineCurrentTest(unittest.TestCase):
         np.testing.assert_allclose(out1[sort1], out2[sort2])
 
 
+class LineCurrentCacheTest(unittest.TestCase):
+    def test_vectorized_integral(self):
+        rng = np.random.default_rng(seed=0)
+        h = rng.uniform(1, 2, size=(5, 3))
+        a = rng.uniform(0, 1, size=(5, 3))
+        b = rng.uniform(0, 1, size=(5, 3))
+        sx, sy, sz = getStraightLineCurrentIntegral(*h.T, *a.T, *b.T)
+        self.assertEqual(sx.shape, (5, 4))
+        for i in range(5):
+            s = getStraightLineCurrentIntegral(*h[i], *a[i], *b[i])
+            np.testing.assert_allclose(np.c_[sx[i], sy[i], sz[i]].T, s)
+
+    def test_source_term_cache(self):
+        h = np.ones(16)
+        mesh = discretize.TreeMesh((h, h, h))
+        mesh.refine(4)
+        locs = np.array([[0.5, 0.5, 2.0], [3.0, 3.0, 3.0], [5.0, 5.0, 4.0]])
+
+        with patch(
+            "simpeg.electromagnetics.utils.current_utils._poly_line_source_tree",
+            wraps=current_utils._poly_line_source_tree,
+        ) as source_term:
+            out1 = segmented_line_current_source_term(mesh, locs)
+            # same wire, as a different array
+            out2 = segmented_line_current_source_term(mesh, locs.tolist())
+            self.assertEqual(source_term.call_count, 1)
+            # the results are copies of the cached source term
+            out2[:] = 0.0
+            np.testing.assert_array_equal(
+                segmented_line_current_source_term(mesh, locs), out1
+            )
+            self.assertEqual(source_term.call_count, 1)
+
+            # another mesh or wire is computed again
+            other_mesh = discretize.TreeMesh((h, h, h))
+            other_mesh.refine(4)
+            np.testing.assert_array_equal(
+                segmented_line_current_source_term(other_mesh, locs), out1
+            )
+            segmented_line_current_source_term(mesh, locs[:2])
+            self.assertEqual(source_term.call_count, 3)
+
+
 class LineCurrentFacesTest(unittest.TestCase):
     def setUp(self):
         dh = 1
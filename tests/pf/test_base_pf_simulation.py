@@ -2,7 +2,9 @@
 Test BasePFSimulation class
 """
 
+import pickle
 import re
+import time
 import pytest
 import numpy as np
 from discretize import CylindricalMesh, TensorMesh, TreeMesh
@@ -60,6 +62,12 @@ def mock_survey_class():
     return MockSurvey
 
 
+def _worker_state_keys(_):
+    """Keys of the state attached by a worker process."""
+    time.sleep(0.5)
+    return sorted(simpeg.potential_fields.base._worker_state)
+
+
 class TestEngine:
     """
     Test the engine property and some of its relations with other attributes
@@ -346,3 +354,170 @@ class TestDeprecationIndActive:
         simulation = mock_simulation_class(tensor_mesh, active_cells=ind_active)
         with pytest.warns(FutureWarning):
             simulation.ind_active
+
+
+class TestBlockEvaluation:
+    """
+    Test the evaluation of blocks of receivers with the geoana engine
+    """
+
+    @pytest.fixture
+    def mesh(self):
+        mesh = TensorMesh((6, 5, 4), origin="CCN")
+        return mesh
+
+    @pytest.fixture
+    def active_cells(self, mesh):
+        return mesh.cell_centers[:, 2] < -0.3
+
+    @pytest.fixture
+    def receiver_locations(self):
+        x, y = np.meshgrid(np.linspace(-0.4, 0.4, 4), np.linspace(-0.3, 0.3, 3))
+        return np.c_[x.ravel(), y.ravel(), np.full(x.size, 0.1)]
+
+    @pytest.fixture(params=["gravity", "magnetic_scalar", "magnetic_vector"])
+    def simulation_kwargs(self, request, receiver_locations, active_cells):
+        n_active = active_cells.sum()
+        if request.param == "gravity":
+            receivers = [
+                gravity.receivers.Point(receiver_locations, components=["gz", "guv"]),
+                gravity.receivers.Point(receiver_locations[:5], components="gx"),
+            ]
+            survey = gravity.Survey(gravity.sources.SourceField(receivers))
+            return dict(
+                simulation_class=gravity.Simulation3DIntegral,
+                survey=survey,
+                rhoMap=simpeg.maps.IdentityMap(nP=n_active),
+            )
+        receivers = [
+            magnetics.receivers.Point(
+                receiver_locations, components=["tmi", "bx", "byz", "tmi_z"]
+            ),
+            magnetics.receivers.Point(receiver_locations[:5], components="bz"),
+        ]
+        survey = magnetics.Survey(
+            magnetics.sources.UniformBackgroundField(
+                receiver_list=receivers,
+                amplitude=55_000,
+                inclination=45.0,
+                declination=12.0,
+            )
+        )
+        model_type = request.param.split("_")[1]
+        n_params = n_active if model_type == "scalar" else 3 * n_active
+        return dict(
+            simulation_class=magnetics.Simulation3DIntegral,
+            survey=survey,
+            chiMap=simpeg.maps.IdentityMap(nP=n_params),
+            model_type=model_type,
+        )
+
+    def get_simulation(self, mesh, active_cells, kwargs, **extra_kwargs):
+        kwargs = kwargs.copy()
+        simulation_class = kwargs.pop("simulation_class")
+        simulation = simulation_class(
+            mesh, active_cells=active_cells, **kwargs, **extra_kwargs
+        )
+        mapping = kwargs.get("rhoMap", kwargs.get("chiMap"))
+        simulation.model = np.random.default_rng(seed=42).uniform(size=mapping.nP)
+        return simulation
+
+    def per_location_rows(self, simulation):
+        return np.concatenate(
+            [
+                simulation.evaluate_integral(location, components)
+                for location, components in (
+                    simulation.survey._location_component_iterator()
+                )
+            ]
+        )
+
+    @pytest.mark.parametrize("store_sensitivities", ["ram", "forward_only"])
+    def test_evaluate_integral_blocks(
+        self, mesh, active_cells, simulation_kwargs, store_sensitivities
+    ):
+        """Test if a block of receivers matches one receiver at a time."""
+        simulation = self.get_simulation(
+            mesh,
+            active_cells,
+            simulation_kwargs,
+            store_sensitivities=store_sensitivities,
+        )
+        receiver = simulation.survey.source_field.receiver_list[0]
+        block = simulation.evaluate_integral(receiver.locations, receiver.components)
+        expected = np.stack(
+            [
+                simulation.evaluate_integral(location, receiver.components)
+                for location in receiver.locations
+            ]
+        )
+        assert block.shape == expected.shape
+        np.testing.assert_allclose(block, expected, rtol=1e-6)
+
+    @pytest.mark.parametrize("n_processes", [1, 2])
+    @pytest.mark.parametrize("store_sensitivities", ["ram", "forward_only"])
+    def test_linear_operator(
+        self,
+        mesh,
+        active_cells,
+        simulation_kwargs,
+        store_sensitivities,
+        n_processes,
+        monkeypatch,
+    ):
+        """Test the linear operator built from blocks of a few receivers."""
+        # Split each receiver object in blocks of two locations
+        n_active = active_cells.sum()
+        monkeypatch.setattr(simpeg.potential_fields.base, "_BLOCK_SIZE", 16 * n_active)
+        simulation = self.get_simulation(
+            mesh,
+            active_cells,
+            simulation_kwargs,
+            store_sensitivities=store_sensitivities,
+            n_processes=n_processes,
+        )
+        kernel = simulation.linear_operator()
+        np.testing.assert_allclose(
+            kernel, self.per_location_rows(simulation), rtol=1e-6
+        )
+
+    def test_persistent_worker_pool(self, mesh, active_cells, simulation_kwargs):
+        """Test if the worker pool and the shared nodes are reused."""
+        simulation = self.get_simulation(
+            mesh,
+            active_cells,
+            simulation_kwargs,
+            store_sensitivities="forward_only",
+            n_processes=2,
+        )
+        expected = simulation.linear_operator()
+        pool = simpeg.potential_fields.base._worker_pools[2]
+        shared_nodes = simulation._shared_nodes
+        # Change the model, the workers should use the new one
+        simulation.model = 2 * simulation.model
+        np.testing.assert_allclose(simulation.linear_operator(), 2 * expected)
+        assert simpeg.potential_fields.base._worker_pools[2] is pool
+        assert simulation._shared_nodes is shared_nodes
+        # The shared nodes are not pickled with the simulation
+        copied = pickle.loads(pickle.dumps(simulation))
+        assert copied._shared_nodes is None
+        np.testing.assert_allclose(copied.linear_operator(), 2 * expected)
+        assert simpeg.potential_fields.base._worker_pools[2] is pool
+        # The idle workers don't keep the simulation
+        assert pool.map(_worker_state_keys, range(2), chunksize=1) == [[], []]
+
+    def test_close_worker_pools(self, mesh, active_cells, simulation_kwargs):
+        """Test if the worker pool is stopped and started again when needed."""
+        simulation = self.get_simulation(
+            mesh,
+            active_cells,
+            simulation_kwargs,
+            store_sensitivities="forward_only",
+            n_processes=2,
+        )
+        expected = simulation.linear_operator()
+        pool = simpeg.potential_fields.base._worker_pools[2]
+        simpeg.potential_fields.close_worker_pools()
+        assert not simpeg.potential_fields.base._worker_pools
+        np.testing.assert_allclose(simulation.linear_operator(), expected)
+        assert simpeg.potential_fields.base._worker_pools[2] is not pool
@@ -0,0 +1,229 @@
+"""
+Test the sensitivities of gridded surveys stored as FFTs of layer kernels.
+"""
+
+import re
+
+import discretize
+import numpy as np
+import pytest
+from scipy.sparse import diags
+from scipy.sparse.linalg import LinearOperator
+
+from simpeg import maps
+from simpeg.potential_fields import gravity, magnetics
+
+
+@pytest.fixture
+def mesh():
+    """Tensor mesh with uniform horizontal cells and variable vertical ones."""
+    hx, hy, hz = [(10.0, 7)], [(10.0, 6)], [(5.0, 2), (10.0, 3)]
+    return discretize.TensorMesh([hx, hy, hz], origin="CCN")
+
+
+@pytest.fixture
+def active_cells(mesh):
+    """Active cells below a topography with a step."""
+    x, _, z = mesh.cell_centers.T
+    return z < np.where(x > 0, -5.0, -10.0)
+
+
+@pytest.fixture
+def receiver_locations():
+    """Partial grid of receivers, offset from the centers of the cells."""
+    i, j = np.meshgrid(np.arange(9), np.arange(-1, 8))
+    keep = (i + j) % 3 != 0
+    x = -32.5 + 10.0 * i[keep]
+    y = -26.0 + 10.0 * j[keep]
+    return np.c_[x, y, np.full(x.size, 3.0)]
+
+
+def build_simulation(
+    mesh, active_cells, receiver_locations, kind, store_sensitivities, engine
+):
+    n_active = int(active_cells.sum())
+    if kind == "gravity":
+        receivers = [
+            gravity.receivers.Point(receiver_locations, components=["gz", "gxy"]),
+            gravity.receivers.Point(receiver_locations[:4], components="gx"),
+        ]
+        survey = gravity.Survey(gravity.sources.SourceField(receivers))
+        return gravity.Simulation3DIntegral(
+            mesh,
+            survey=survey,
+            active_cells=active_cells,
+            rhoMap=maps.IdentityMap(nP=n_active),
+            store_sensitivities=store_sensitivities,
+            engine=engine,
+        )
+    model_type = "vector" if kind == "magnetic_vector" else "scalar"
+    is_amplitude_data = kind == "magnetic_amplitude"
+    components = ["bx", "by", "bz"] if is_amplitude_data else ["tmi", "bx", "byz"]
+    receivers = [magnetics.receivers.Point(receiver_locations, components=components)]
+    source_field = magnetics.sources.UniformBackgroundField(
+        receiver_list=receivers, amplitude=50_000, inclination=60, declination=20
+    )
+    n_params = 3 * n_active if model_type == "vector" else n_active
+    return magnetics.Simulation3DIntegral(
+        mesh,
+        survey=magnetics.Survey(source_field),
+        active_cells=active_cells,
+        chiMap=maps.IdentityMap(nP=n_params),
+        model_type=model_type,
+        is_amplitude_data=is_amplitude_data,
+        store_sensitivities=store_sensitivities,
+        engine=engine,
+    )
+
+
+class TestAgainstDenseSensitivities:
+    """
+    Compare the FFT sensitivities with the dense sensitivity matrix.
+    """
+
+    @pytest.fixture(
+        params=["gravity", "magnetic_scalar", "magnetic_vector", "magnetic_amplitude"]
+    )
+    def kind(self, request):
+        return request.param
+
+    @pytest.fixture(params=["geoana", "choclo"])
+    def simulations(self, request, mesh, active_cells, receiver_locations, kind):
+        return [
+            build_simulation(
+                mesh, active_cells, receiver_locations, kind, store, request.param
+            )
+            for store in ("fft", "ram")
+        ]
+
+    @pytest.fixture
+    def model(self, simulations):
+        n_params = simulations[1].G.shape[1]
+        return np.random.default_rng(seed=40).uniform(size=n_params)
+
+    def test_operator(self, simulations):
+        simulation, simulation_ram = simulations
+        assert isinstance(simulation.G, LinearOperator)
+        assert simulation.G.shape == simulation_ram.G.shape
+
+    def test_dpred(self, simulations, model):
+        simulation, simulation_ram = simulations
+        expected = simulation_ram.dpred(model)
+        atol = 1e-6 * np.abs(expected).max()
+        np.testing.assert_allclose(simulation.dpred(model), expected, atol=atol)
+
+    def test_Jvec(self, simulations, model):
+        simulation, simulation_ram = simulations
+        vector = np.random.default_rng(seed=41).normal(size=model.size)
+        expected = simulation_ram.Jvec(model, vector)
+        atol = 1e-6 * np.abs(expected).max()
+        np.testing.assert_allclose(simulation.Jvec(model, vector), expected, atol=atol)
+
+    def test_Jtvec(self, simulations, model):
+        simulation, simulation_ram = simulations
+        n_data = simulation_ram.survey.nD
+        if getattr(simulation_ram, "is_amplitude_data", False):
+            n_data //= 3
+        vector = np.random.default_rng(seed=42).normal(size=n_data)
+        expected = simulation_ram.Jtvec(model, vector)
+        atol = 1e-6 * np.abs(expected).max()
+        np.testing.assert_allclose(simulation.Jtvec(model, vector), expected, atol=atol)
+
+    def test_getJtJdiag(self, simulations, model):
+        simulation, simulation_ram = simulations
+        n_data = simulation_ram.survey.nD
+        if getattr(simulation_ram, "is_amplitude_data", False):
+            n_data //= 3
+        weights = np.random.default_rng(seed=43).uniform(size=n_data)
+        expected = simulation_ram.getJtJdiag(model, W=diags(weights))
+        atol = 1e-6 * np.abs(expected).max()
+        np.testing.assert_allclose(
+            simulation.getJtJdiag(model, W=diags(weights)), expected, atol=atol
+        )
+
+
+class TestInvalidGeometry:
+    """
+    Test the fallback on meshes and surveys that don't define BTTB sensitivities.
+    """
+
+    def check_fallback(self, simulation, msg):
+        """Check that the dense sensitivity matrix is used, with a warning."""
+        with pytest.warns(UserWarning, match=msg):
+            G = simulation.G
+        assert isinstance(G, np.ndarray)
+        simulation.store_sensitivities = "ram"
+        del simulation._G
+        np.testing.assert_allclose(G, simulation.G)
+
+    def test_tree_mesh(self, receiver_locations):
+        mesh = discretize.TreeMesh([8, 8, 8], origin="CCN")
+        mesh.refine(2)
+        simulation = build_simulation(
+            mesh,
+            np.ones(mesh.n_cells, dtype=bool),
+            receiver_locations,
+            "gravity",
+            "fft",
+            "geoana",
+        )
+        msg = re.escape('store_sensitivities="fft" requires a 3D TensorMesh')
+        self.check_fallback(simulation, msg)
+
+    def test_non_uniform_cells(self, receiver_locations):
+        hx = [(10.0, 3), (10.0, 3, 1.3)]
+        mesh = discretize.TensorMesh([hx, [(10.0, 6)], [(5.0, 4)]], origin="CCN")
+        simulation = build_simulation(
+            mesh,
+            np.ones(mesh.n_cells, dtype=bool),
+            receiver_locations,
+            "gravity",
+            "fft",
+            "geoana",
+        )
+        msg = "requires uniform cell sizes along the x direction"
+        self.check_fallback(simulation, msg)
+
+    @pytest.mark.parametrize("problem", ["height", "spacing"])
+    def test_receivers_off_grid(self, mesh, active_cells, receiver_locations, problem):
+        receiver_locations = receiver_locations.copy()
+        if problem == "height":
+            receiver_locations[0, 2] += 1.0
+            msg = "requires every receiver at the same height"
+        else:
+            receiver_locations[0, 0] += 2.5
+            msg = "requires the receivers on a grid"
+        simulation = build_simulation(
+            mesh, active_cells, receiver_locations, "gravity", "fft", "choclo"
+        )
+        self.check_fallback(simulation, msg)
+
+    def test_fallback_getJtJdiag(self, mesh, active_cells, receiver_locations):
+        receiver_locations = receiver_locations.copy()
+        receiver_locations[0, 0] += 2.5
+        simulations = [
+            build_simulation(
+                mesh,
+                active_cells,
+                receiver_locations,
+                "magnetic_scalar",
+                store,
+                "choclo",
+            )
+            for store in ("fft", "ram")
+        ]
+        model = np.ones(simulations[1].G.shape[1])
+        with pytest.warns(UserWarning, match="requires the receivers on a grid"):
+            jtj_diag = simulations[0].getJtJdiag(model)
+        np.testing.assert_allclose(jtj_diag, simulations[1].getJtJdiag(model))
+
+    def test_gradient_tensor(self, mesh, active_cells, receiver_locations):
+        simulation = build_simulation(
+            mesh, active_cells, receiver_locations, "magnetic_scalar", "fft", "choclo"
+        )
+        msg = re.escape(
+            "Storing the gradient tensor is not available with "
+            'store_sensitivities="fft".'
+        )
+        with pytest.raises(ValueError, match=msg):
+            simulation.store_gradient_tensor = True
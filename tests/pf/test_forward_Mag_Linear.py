@@ -5,6 +5,7 @@ import re
 import discretize
 import numpy as np
 import pytest
+import scipy.sparse as sp
 from geoana.em.static import MagneticPrism
 from scipy.constants import mu_0
 
@@ -892,6 +893,193 @@ class TestsMagSimulation:
             mag.Simulation3DIntegral(mag_mesh, engine="choclo")
 
 
+class TestAmplitudeWithoutBuildingG:
+    """
+    Test amplitude data with choclo and ``store_sensitivities="forward_only"``.
+
+    Compare the results computed on the fly against the ones obtained with the
+    sensitivity matrix stored in memory.
+    """
+
+    atol_ratio = 1e-10
+
+    @pytest.fixture
+    def mesh(self):
+        h = [(1.0, 8)]
+        return discretize.TensorMesh([h, h, h], "CCN")
+
+    @pytest.fixture
+    def survey(self):
+        x = np.linspace(-4, 4, 4)
+        xx, yy = np.meshgrid(x, x)
+        locations = np.c_[xx.ravel(), yy.ravel(), np.full(xx.size, 1.0)]
+        # Use a different order of the components in the second receiver
+        receivers = [
+            mag.Point(locations[:6], components=["bx", "by", "bz"]),
+            mag.Point(locations[6:], components=["bz", "bx", "by"]),
+        ]
+        source_field = mag.UniformBackgroundField(
+            receiver_list=receivers, amplitude=50_000, inclination=60, declination=20
+        )
+        return mag.Survey(source_field)
+
+    def build_simulations(self, mesh, survey, model_type, numba_parallel):
+        n_params = mesh.n_cells if model_type == "scalar" else 3 * mesh.n_cells
+        return (
+            mag.Simulation3DIntegral(
+                mesh,
+                survey=survey,
+                chiMap=maps.IdentityMap(nP=n_params),
+                model_type=model_type,
+                is_amplitude_data=True,
+                engine="choclo",
+                numba_parallel=numba_parallel,
+                store_sensitivities=store,
+                sensitivity_dtype=np.float64,
+            )
+            for store in ("forward_only", "ram")
+        )
+
+    @pytest.mark.parametrize("model_type", ["scalar", "vector"])
+    @pytest.mark.parametrize("numba_parallel", [True, False])
+    @pytest.mark.parametrize("method", ["dpred", "Jvec", "Jtvec", "getJtJdiag"])
+    def test_against_stored_g(self, mesh, survey, model_type, numba_parallel, method):
+        simulation_fo, simulation_ram = self.build_simulations(
+            mesh, survey, model_type, numba_parallel
+        )
+        rng = np.random.default_rng(seed=42)
+        n_data = survey.nD // 3
+        model = rng.uniform(0.01, 0.1, size=simulation_ram.chiMap.nP)
+        match method:
+            case "dpred":
+                args = ()
+            case "Jvec":
+                args = (rng.normal(size=model.size),)
+            case "Jtvec":
+                args = (rng.normal(size=n_data),)
+            case "getJtJdiag":
+                args = (sp.diags(rng.uniform(1, 2, size=n_data)),)
+
+        result = getattr(simulation_fo, method)(model, *args)
+        expected = getattr(simulation_ram, method)(model, *args)
+        atol = np.max(np.abs(expected)) * self.atol_ratio
+        np.testing.assert_allclose(result, expected, atol=atol)
+        np.testing.assert_allclose(simulation_fo.ampDeriv, simulation_ram.ampDeriv)
+        # The sensitivity matrix should never be built
+        assert simulation_fo._G is None
+
+    def test_invalid_components(self, mesh):
+        receivers = mag.Point(np.array([[0.0, 0.0, 1.0]]), components=["bx", "bz"])
+        source_field = mag.UniformBackgroundField(
+            receiver_list=[receivers], amplitude=50_000, inclination=60, declination=20
+        )
+        simulation = mag.Simulation3DIntegral(
+            mesh,
+            survey=mag.Survey(source_field),
+            chiMap=maps.IdentityMap(nP=mesh.n_cells),
+            is_amplitude_data=True,
+            engine="choclo",
+            store_sensitivities="forward_only",
+        )
+        msg = "Amplitude data require receivers with the 'bx', 'by' and 'bz'"
+        with pytest.raises(ValueError, match=msg):
+            simulation.dpred(np.ones(mesh.n_cells))
+
+
+class TestGradientTensor:
+    """
+    Test the sensitivity matrix built from the stored gradient tensor.
+    """
+
+    @pytest.fixture
+    def mesh(self):
+        h = [(1.0, 6)]
+        return discretize.TensorMesh([h, h, h], "CCN")
+
+    def build_survey(self, components, inclination=60.0):
+        x = np.linspace(-3, 3, 3)
+        xx, yy = np.meshgrid(x, x)
+        locations = np.c_[xx.ravel(), yy.ravel(), np.full(xx.size, 1.0)]
+        receivers = [
+            mag.Point(locations[:4], components=components),
+            mag.Point(locations[4:], components=["tmi", "bz"]),
+        ]
+        source_field = mag.UniformBackgroundField(
+            receiver_list=receivers,
+            amplitude=50_000,
+            inclination=inclination,
+            declination=20,
+        )
+        return mag.Survey(source_field)
+
+    def build_simulation(self, mesh, survey, model_type, **kwargs):
+        n_params = mesh.n_cells if model_type == "scalar" else 3 * mesh.n_cells
+        return mag.Simulation3DIntegral(
+            mesh,
+            survey=survey,
+            chiMap=maps.IdentityMap(nP=n_params),
+            model_type=model_type,
+            engine="choclo",
+            sensitivity_dtype=np.float64,
+            **kwargs,
+        )
+
+    @pytest.mark.parametrize("model_type", ["scalar", "vector"])
+    @pytest.mark.parametrize(
+        "components", [["bx", "by", "bz", "tmi"], ["tmi", "bxx", "tmi_z", "by"]]
+    )
+    def test_sensitivity_matrix(self, mesh, model_type, components):
+        survey = self.build_survey(components)
+        simulation = self.build_simulation(
+            mesh, survey, model_type, store_gradient_tensor=True
+        )
+        expected = self.build_simulation(mesh, survey, model_type).G
+        atol = np.max(np.abs(expected)) * 1e-12
+        np.testing.assert_allclose(simulation.G, expected, atol=atol)
+
+    @pytest.mark.parametrize("model_type", ["scalar", "vector"])
+    def test_reuse_tensor(self, mesh, model_type):
+        """
+        Changing the regional field or the components should rebuild G with
+        the same stored tensor.
+        """
+        simulation = self.build_simulation(
+            mesh,
+            self.build_survey(["bx", "tmi"]),
+            model_type,
+            store_gradient_tensor=True,
+        )
+        simulation.G
+        tensor = simulation._stored_gradient_tensor
+        simulation.survey.source_field.inclination = -30.0
+        expected = self.build_simulation(
+            mesh, self.build_survey(["bx", "tmi"], inclination=-30.0), model_type
+        ).G
+        atol = np.max(np.abs(expected)) * 1e-12
+        np.testing.assert_allclose(simulation.G, expected, atol=atol)
+
+        survey = self.build_survey(["bz", "by"], inclination=-30.0)
+        simulation.survey = survey
+        expected = self.build_simulation(mesh, survey, model_type).G
+        np.testing.assert_allclose(simulation.G, expected, atol=atol)
+        assert simulation._stored_gradient_tensor is tensor
+
+    def test_invalid_engine(self, mesh):
+        msg = 'Storing the gradient tensor is only available with engine="choclo"'
+        with pytest.raises(ValueError, match=msg):
+            mag.Simulation3DIntegral(mesh, engine="geoana", store_gradient_tensor=True)
+
+    def test_invalid_forward_only(self, mesh):
+        msg = "Storing the gradient tensor is not available with"
+        with pytest.raises(ValueError, match=msg):
+            mag.Simulation3DIntegral(
+                mesh,
+                engine="choclo",
+                store_sensitivities="forward_only",
+                store_gradient_tensor=True,
+            )
+
+
 def test_removed_modeltype():
     """Test if accesing removed modelType property raises error."""
     h = [[(2, 2)], [(2, 2)], [(2, 2)]]
@@ -0,0 +1,251 @@
+"""
+Test equivalent sources fitted in overlapping windows.
+"""
+
+import pickle
+import re
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+from discretize import TensorMesh
+
+from simpeg import maps
+from simpeg.data import Data
+from simpeg.potential_fields import WindowedEquivalentSources, gravity, magnetics
+
+
+def gravity_survey(locations, components="gz"):
+    receivers = gravity.receivers.Point(locations, components=components)
+    return gravity.Survey(gravity.sources.SourceField([receivers]))
+
+
+def magnetic_survey(locations, components="tmi"):
+    receivers = magnetics.receivers.Point(locations, components=components)
+    source_field = magnetics.sources.UniformBackgroundField(
+        receiver_list=[receivers], amplitude=50_000, inclination=60, declination=10
+    )
+    return magnetics.Survey(source_field)
+
+
+@pytest.fixture(params=["gravity", "magnetics"])
+def make_survey(request):
+    return gravity_survey if request.param == "gravity" else magnetic_survey
+
+
+def true_fields(survey):
+    """Fields of a layer of sources under the center of the survey."""
+    h = [(40.0, 10)]
+    mesh = TensorMesh([h, h], origin="CC")
+    model = np.exp(-np.sum(mesh.cell_centers**2, axis=1) / 100.0**2)
+    if isinstance(survey, gravity.Survey):
+        simulation_class, map_name = gravity.SimulationEquivalentSourceLayer, "rhoMap"
+    else:
+        simulation_class, map_name = magnetics.SimulationEquivalentSourceLayer, "chiMap"
+    simulation = simulation_class(
+        mesh,
+        -150.0,
+        -200.0,
+        survey=survey,
+        **{map_name: maps.IdentityMap(nP=mesh.n_cells)},
+    )
+    return simulation.dpred(model)
+
+
+@pytest.fixture
+def locations():
+    """Scattered receivers on a survey with varying height."""
+    rng = np.random.default_rng(seed=7)
+    x, y = rng.uniform(-400, 400, size=(2, 800))
+    z = 20.0 + 2.0 * rng.normal(size=x.size)
+    return np.c_[x, y, z]
+
+
+def grid(height):
+    x, y = np.meshgrid(np.linspace(-350, 350, 15), np.linspace(-350, 350, 15))
+    return np.c_[x.ravel(), y.ravel(), np.full(x.size, height)]
+
+
+class TestPredictions:
+    """
+    Compare the predictions of the fitted sources with the true fields.
+    """
+
+    @pytest.fixture
+    def data(self, make_survey, locations):
+        survey = make_survey(locations)
+        return Data(survey, dobs=true_fields(survey))
+
+    @pytest.mark.parametrize("height", [20.0, 80.0])
+    def test_predict(self, make_survey, data, height):
+        sources = WindowedEquivalentSources(window_size=300, cell_size=40, depth=100)
+        sources.fit(data)
+        assert sources.n_windows == 25
+        expected = true_fields(make_survey(grid(height)))
+        np.testing.assert_allclose(
+            sources.predict(grid(height)),
+            expected,
+            atol=0.05 * np.abs(expected).max(),
+        )
+
+    def test_predict_other_component(self, data):
+        if not isinstance(data.survey, gravity.Survey):
+            pytest.skip()
+        sources = WindowedEquivalentSources(window_size=300, cell_size=40, depth=100)
+        sources.fit(data)
+        expected = true_fields(gravity_survey(grid(40.0), components="gzz"))
+        np.testing.assert_allclose(
+            sources.predict(grid(40.0), component="gzz"),
+            expected,
+            atol=0.1 * np.abs(expected).max(),
+        )
+
+    def test_block_average(self, make_survey, data):
+        sources = WindowedEquivalentSources(
+            window_size=300, cell_size=40, depth=100, block_size=50.0
+        )
+        sources.fit(data)
+        expected = true_fields(make_survey(grid(40.0)))
+        np.testing.assert_allclose(
+            sources.predict(grid(40.0)),
+            expected,
+            atol=0.05 * np.abs(expected).max(),
+        )
+
+    def test_processes(self, data):
+        kwargs = dict(window_size=300, cell_size=40, depth=100)
+        serial = WindowedEquivalentSources(**kwargs).fit(data)
+        parallel = WindowedEquivalentSources(n_processes=2, **kwargs).fit(data)
+        np.testing.assert_allclose(
+            parallel.predict(grid(40.0)), serial.predict(grid(40.0))
+        )
+
+    def test_window_tasks(self, data):
+        """Tasks sent to the workers only carry the layer of their window."""
+        sources = WindowedEquivalentSources(window_size=300, cell_size=40, depth=100)
+        tasks = []
+        map_tasks = sources._map
+
+        def record(function, window_tasks):
+            window_tasks = list(window_tasks)
+            tasks.extend(window_tasks)
+            return map_tasks(function, window_tasks)
+
+        sources._map = record
+        sources.fit(data)
+        sources.predict(grid(40.0))
+        assert len(tasks) == 2 * sources.n_windows
+        sizes = []
+        for task in tasks:
+            assert not any(isinstance(item, WindowedEquivalentSources) for item in task)
+            layers = [
+                item for item in task if any(item is layer for layer in sources._layers)
+            ]
+            assert len(layers) == 1
+            sizes.append(len(pickle.dumps(task)))
+        # a task is much smaller than all the fitted layers together
+        assert max(sizes) < len(pickle.dumps(sources._layers)) / 5
+
+    def test_locations_outside_survey(self, data):
+        sources = WindowedEquivalentSources(window_size=300, cell_size=40, depth=100)
+        sources.fit(data)
+        far = np.array([[2000.0, 0.0, 20.0], [0.0, -2000.0, 20.0]])
+        assert np.all(np.isfinite(sources.predict(far)))
+
+
+def test_uncovered_windows():
+    """Windows without data use the nearest fitted window."""
+    x, y = np.meshgrid(np.linspace(-400, 400, 17), np.linspace(-400, 400, 17))
+    keep = (np.abs(x) > 250) | (np.abs(y) > 250)
+    locations = np.c_[x[keep], y[keep], np.full(keep.sum(), 20.0)]
+    survey = gravity_survey(locations)
+    data = Data(survey, dobs=true_fields(survey))
+    sources = WindowedEquivalentSources(
+        window_size=200, cell_size=40, depth=100, overlap=0.0
+    )
+    sources.fit(data)
+    assert sources.n_windows == 12
+    assert np.all(np.isfinite(sources.predict(grid(20.0))))
+
+
+class TestInvalid:
+    """
+    Test errors of the windowed equivalent sources.
+    """
+
+    def test_several_components(self, locations):
+        survey = gravity_survey(locations, components=["gz", "gzz"])
+        data = Data(survey, dobs=np.ones(survey.nD))
+        sources = WindowedEquivalentSources(window_size=300, cell_size=40, depth=100)
+        with pytest.raises(ValueError, match="requires data of a single component"):
+            sources.fit(data)
+
+    def test_not_fitted(self):
+        sources = WindowedEquivalentSources(window_size=300, cell_size=40, depth=100)
+        msg = re.escape("must be fitted with 'fit' first")
+        with pytest.raises(AttributeError, match=msg):
+            sources.predict(grid(40.0))
+
+    def test_partial_standard_deviations(self, locations):
+        survey = gravity_survey(locations)
+        standard_deviation = np.ones(survey.nD)
+        standard_deviation[0] = 0.0
+        data = Data(
+            survey, dobs=np.ones(survey.nD), standard_deviation=standard_deviation
+        )
+        sources = WindowedEquivalentSources(window_size=300, cell_size=40, depth=100)
+        with pytest.raises(ValueError, match="requires positive standard deviations"):
+            sources.fit(data)
+
+    @pytest.mark.parametrize("overlap", [-0.1, 1.0])
+    def test_overlap(self, overlap):
+        with pytest.raises(ValueError):
+            WindowedEquivalentSources(
+                window_size=300, cell_size=40, depth=100, overlap=overlap
+            )
+
+
+EXIT_SCRIPT = """
+import numpy as np
+from discretize import TensorMesh
+from simpeg import maps
+from simpeg.data import Data
+from simpeg.potential_fields import WindowedEquivalentSources, magnetics
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(seed=7)
+    x, y = rng.uniform(-400, 400, size=(2, 300))
+    receivers = magnetics.receivers.Point(np.c_[x, y, np.full(x.size, 20.0)])
+    survey = magnetics.Survey(
+        magnetics.sources.UniformBackgroundField(
+            receiver_list=[receivers], amplitude=50_000, inclination=60, declination=10
+        )
+    )
+    h = [(40.0, 10)]
+    mesh = TensorMesh([h, h, [(40.0, 4)]], origin="CCN")
+    simulation = magnetics.Simulation3DIntegral(
+        mesh,
+        survey=survey,
+        chiMap=maps.IdentityMap(nP=mesh.n_cells),
+        engine="choclo",
+        numba_parallel=True,
+    )
+    dobs = simulation.dpred(np.full(mesh.n_cells, 1e-3))
+    sources = WindowedEquivalentSources(
+        window_size=300, cell_size=40, depth=100, n_processes=2
+    )
+    sources.fit(Data(survey, dobs=dobs))
+"""
+
+
+def test_interpreter_exits(tmp_path):
+    """
+    The interpreter exits after using the worker pool and numba threads.
+    """
+    pytest.importorskip("choclo")
+    script = tmp_path / "script.py"
+    script.write_text(textwrap.dedent(EXIT_SCRIPT))
+    result = subprocess.run([sys.executable, str(script)], timeout=300)
+    assert result.returncode == 0
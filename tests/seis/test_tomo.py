@@ -1,6 +1,7 @@
 import re
 
 import numpy as np
+import scipy.sparse as sp
 import unittest
 
 import discretize
@@ -8,7 +9,11 @@ import pytest
 
 from simpeg.seismic import straight_ray_tomography as tomo
 from simpeg import tests, maps, utils
-from simpeg.seismic.straight_ray_tomography.simulation import Simulation2DIntegral
+from simpeg.seismic.straight_ray_tomography.simulation import (
+    Simulation2DIntegral,
+    Simulation3DIntegral,
+)
+from simpeg.seismic.straight_ray_tomography._ray_tracing import ray_cell_lengths
 
 TOL = 1e-5
 FLR = 1e-14
@@ -53,7 +58,7 @@ def test_required_mesh_arg():
 
 def test_bad_mesh_type():
     mesh = discretize.CylindricalMesh([3, 3, 3])
-    msg = "mesh must be an instance of TensorMesh, not CylindricalMesh"
+    msg = "mesh must be an instance of TensorMesh or TreeMesh, not CylindricalMesh"
     with pytest.raises(TypeError, match=msg):
         Simulation2DIntegral(mesh)
 
@@ -65,5 +70,77 @@ def test_bad_mesh_dim():
         Simulation2DIntegral(mesh)
 
 
+def test_bad_mesh_dim_3d():
+    mesh = discretize.TensorMesh([3, 3])
+    msg = re.escape("Simulation3DIntegral mesh must be 3D, received a 2D mesh.")
+    with pytest.raises(ValueError, match=msg):
+        Simulation3DIntegral(mesh)
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_ray_lengths_sum(dim):
+    """Rays inside the mesh are fully accounted for, others are clipped."""
+    rng = np.random.default_rng(42)
+    mesh = discretize.TensorMesh([rng.uniform(0.5, 1.5, 9) for _ in range(dim)])
+    upper = mesh.nodes[-1]
+    origins = rng.uniform(0, 1, (50, dim)) * upper
+    ends = rng.uniform(0, 1, (50, dim)) * upper
+    A = ray_cell_lengths(mesh, origins, ends)
+    np.testing.assert_allclose(A.sum(axis=1).A1, np.linalg.norm(ends - origins, axis=1))
+
+    # A ray along the x axis that starts outside of the mesh
+    origin = np.r_[-10.0, 0.5 * upper[1:]]
+    end = np.r_[0.5 * upper[0], 0.5 * upper[1:]]
+    A = ray_cell_lengths(mesh, origin, end)
+    np.testing.assert_allclose(A.sum(), 0.5 * upper[0])
+
+
+def test_tree_matches_tensor():
+    rng = np.random.default_rng(7)
+    tensor_mesh = discretize.TensorMesh([8, 8, 8])
+    tree_mesh = discretize.TreeMesh([8, 8, 8], diagonal_balance=False)
+    tree_mesh.refine(3)
+    origins = rng.uniform(-0.1, 1.1, (100, 3))
+    ends = rng.uniform(-0.1, 1.1, (100, 3))
+
+    A_tensor = ray_cell_lengths(tensor_mesh, origins, ends)
+    A_tree = ray_cell_lengths(tree_mesh, origins, ends)
+    tree_inds = tree_mesh.get_containing_cells(tensor_mesh.cell_centers)
+    np.testing.assert_allclose(A_tree[:, tree_inds].toarray(), A_tensor.toarray())
+
+    # Coarser tree cells get the sum of their finest level segments
+    coarse_mesh = discretize.TreeMesh([8, 8, 8], diagonal_balance=False)
+    coarse_mesh.refine(2)
+    A_coarse = ray_cell_lengths(coarse_mesh, origins, ends)
+    coarse_inds = coarse_mesh.get_containing_cells(tensor_mesh.cell_centers)
+    P = sp.csr_matrix(
+        (np.ones(tensor_mesh.n_cells), (np.arange(tensor_mesh.n_cells), coarse_inds)),
+        shape=(tensor_mesh.n_cells, coarse_mesh.n_cells),
+    )
+    np.testing.assert_allclose(A_coarse.toarray(), (A_tensor @ P).toarray())
+
+
+def test_deriv_3d_tree():
+    mesh = discretize.TreeMesh([8, 8, 8], diagonal_balance=False)
+    mesh.refine_ball([0.5, 0.5, 0.5], 0.3, 3)
+    y = np.linspace(0.05, 0.95, 4)
+    rx = tomo.Rx(locations=np.c_[y * 0 + 0.95, y, 0.5 + y * 0])
+    source_list = [
+        tomo.Src(location=np.r_[0.05, yi, 0.3], receiver_list=[rx]) for yi in y
+    ]
+    survey = tomo.Survey(source_list)
+    sim = Simulation3DIntegral(
+        mesh, survey=survey, slownessMap=maps.IdentityMap(nP=mesh.n_cells)
+    )
+    assert sim.A.shape == (survey.nD, mesh.n_cells)
+
+    s = np.random.default_rng(3).uniform(1, 2, mesh.n_cells)
+
+    def fun(x):
+        return sim.dpred(x), lambda x: sim.Jvec(s, x)
+
+    assert tests.check_derivative(fun, s, num=4, plotIt=False, random_seed=664)
+
+
 if __name__ == "__main__":
     unittest.main()
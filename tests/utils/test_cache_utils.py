@@ -0,0 +1,220 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import discretize
+from simpeg import (
+    data_misfit,
+    inverse_problem,
+    maps,
+    optimization,
+    regularization,
+    simulation,
+)
+from simpeg.utils import GarbageCollectionPolicy, ModelCache, model_fingerprint
+
+
+def test_fingerprint():
+    m = np.linspace(0, 1, 10)
+    assert model_fingerprint(m) == model_fingerprint(m.copy())
+    assert model_fingerprint(m) != model_fingerprint(m + 1e-15)
+    assert model_fingerprint(m) != model_fingerprint(m.astype(np.float32))
+    assert model_fingerprint(m) != model_fingerprint(m.reshape(2, 5))
+    # Non contiguous arrays
+    assert model_fingerprint(m[::2]) == model_fingerprint(m[::2].copy())
+
+
+class TestModelCache:
+    def test_lookup_by_value(self):
+        cache = ModelCache(max_models=2)
+        m = np.ones(4)
+        cache.put("sim", m, "fields", np.zeros(4))
+        assert cache.get("sim", m.copy()) is not None
+        assert cache.get("other_sim", m) is None
+        assert cache.get("sim", m, "dpred") is None
+        assert cache.get("sim", 2 * m) is None
+        assert cache.hits == 1
+        assert cache.misses == 3
+
+    def test_lru_eviction(self):
+        cache = ModelCache(max_models=2)
+        models = [i * np.ones(3) for i in range(3)]
+        for m in models[:2]:
+            cache.put("sim", m, "fields", m)
+            cache.put("sim", m, "dpred", m)
+        # Use the first model so the second one is evicted
+        cache.get("sim", models[0])
+        cache.put("sim", models[2], "fields", models[2])
+        assert len(cache) == 2
+        assert cache.get("sim", models[0]) is not None
+        assert cache.get("sim", models[1]) is None
+        assert cache.get("sim", models[2]) is not None
+
+    def test_memory_budget(self):
+        cache = ModelCache(max_models=10, max_bytes=3 * 8 * 100)
+        for i in range(5):
+            m = np.full(2, i)
+            cache.put("sim", m, "fields", np.zeros(100))
+        assert len(cache) == 3
+        assert cache.nbytes == 3 * 8 * 100
+        cache.max_bytes = 0
+        assert len(cache) == 0
+
+    def test_get_or_compute(self):
+        cache = ModelCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return np.ones(2)
+
+        m = np.arange(3.0)
+        cache.get_or_compute("sim", m, "fields", compute)
+        cache.get_or_compute("sim", m.copy(), "fields", compute)
+        assert len(calls) == 1
+
+    def test_pickle_is_empty(self):
+        cache = ModelCache(max_models=3)
+        cache.put("sim", np.ones(2), "fields", np.ones(2))
+        new_cache = pickle.loads(pickle.dumps(cache))
+        assert len(new_cache) == 0
+        assert new_cache.max_models == 3
+        new_cache.put("sim", np.ones(2), "fields", np.ones(2))
+        assert len(new_cache) == 1
+
+
+@pytest.mark.parametrize("policy", ["always", "never", "auto"])
+def test_gc_policy(policy):
+    gc_policy = GarbageCollectionPolicy(policy=policy, memory_threshold=1e12)
+    first, second = gc_policy(), gc_policy()
+    if policy == "always":
+        assert first and second
+    elif policy == "never":
+        assert not first and not second
+    else:
+        assert first
+        # memory can't be measured on every platform
+        assert not second or gc_policy._last_usage is None
+
+
+class CountingSimulation(simulation.ExponentialSinusoidSimulation):
+    n_fields = 0
+
+    def fields(self, m):
+        self.n_fields += 1
+        return super().fields(m)
+
+
+def test_inverse_problem_reuses_fields():
+    mesh = discretize.TensorMesh([20])
+    sim = CountingSimulation(mesh=mesh, n_kernels=5, model_map=maps.IdentityMap(mesh))
+    m = np.linspace(0, 1, mesh.n_cells)
+    data = sim.make_synthetic_data(m, noise_floor=0.1, add_noise=False)
+    sim.n_fields = 0
+
+    dmis = data_misfit.L2DataMisfit(data=data, simulation=sim)
+    reg = regularization.WeightedLeastSquares(mesh)
+    opt = optimization.InexactGaussNewton(maxIter=1)
+    inv_prob = inverse_problem.BaseInvProblem(dmis, reg, opt)
+    assert dmis.fields_cache is inv_prob.fields_cache
+    inv_prob.phi_d = inv_prob.phi_m = np.nan
+
+    # Line search evaluation followed by the full evaluation at an equal model
+    inv_prob.evalFunction(m, return_g=False, return_H=False)
+    assert sim.n_fields == 1
+    inv_prob.evalFunction(m.copy())
+    assert sim.n_fields == 1
+    # The data misfit uses the shared cache as well
+    dmis.deriv(m.copy())
+    assert sim.n_fields == 1
+
+    inv_prob.evalFunction(2 * m)
+    assert sim.n_fields == 2
+
+
+def test_discard():
+    cache = ModelCache(max_models=3)
+    for m in (np.ones(2), np.zeros(2)):
+        cache.put("sim", m, "fields", m)
+        cache.put("other_sim", m, "fields", m)
+    cache.put("sim", 2 * np.ones(2), "fields", np.ones(2))
+    cache.discard("sim")
+    assert len(cache) == 2
+    assert cache.get("sim", np.ones(2)) is None
+    assert cache.get("other_sim", np.ones(2)) is not None
+
+
+@pytest.fixture
+def inversion_problem():
+    mesh = discretize.TensorMesh([20])
+    sim = CountingSimulation(mesh=mesh, n_kernels=5, model_map=maps.IdentityMap(mesh))
+    m = np.linspace(0, 1, mesh.n_cells)
+    data = sim.make_synthetic_data(m, noise_floor=0.1, add_noise=False)
+    sim.n_fields = 0
+    dmis = data_misfit.L2DataMisfit(data=data, simulation=sim)
+    reg = regularization.WeightedLeastSquares(mesh)
+    opt = optimization.InexactGaussNewton(maxIter=1)
+    return inverse_problem.BaseInvProblem(dmis, reg, opt), m
+
+
+def test_simulation_changes_discard_fields(inversion_problem):
+    inv_prob, m = inversion_problem
+    sim = inv_prob.dmisfit.objfcts[0].simulation
+    inv_prob.getFields(m, store=True)
+    assert inv_prob.fields_cache.get(sim, m) is not None
+    sim.survey = sim.survey
+    assert inv_prob.fields_cache.get(sim, m) is None
+    inv_prob.getFields(m, store=True)
+    sim.model_map = maps.IdentityMap(sim.mesh)
+    assert inv_prob.fields_cache.get(sim, m) is None
+
+
+def test_residual_uses_given_fields(inversion_problem):
+    inv_prob, m = inversion_problem
+    dmis = inv_prob.dmisfit.objfcts[0]
+    dmis.residual(m)
+    other_fields = dmis.simulation.fields(2 * m)
+    np.testing.assert_allclose(
+        dmis.residual(m, f=other_fields),
+        dmis.simulation.dpred(2 * m) - dmis.data.dobs,
+    )
+
+
+def test_deprecated_warmstart(inversion_problem):
+    inv_prob, m = inversion_problem
+    sim = inv_prob.dmisfit.objfcts[0].simulation
+    inv_prob.fields_cache.max_models = 2
+    with pytest.warns(FutureWarning, match="'warmstart' has been deprecated"):
+        assert inv_prob.warmstart == []
+    with pytest.warns(FutureWarning, match="'deleteWarmstart' has been deprecated"):
+        inv_prob.getFields(m, store=True, deleteWarmstart=False)
+    assert len(inv_prob.fields_cache) == 1
+    with pytest.warns(FutureWarning, match="'deleteWarmstart' has been deprecated"):
+        f = inv_prob.getFields(2 * m, store=True, deleteWarmstart=True)
+    assert len(inv_prob.fields_cache) == 1
+    with pytest.warns(FutureWarning, match="'warmstart' has been deprecated"):
+        warmstart = inv_prob.warmstart
+    assert len(warmstart) == 1
+    np.testing.assert_array_equal(warmstart[0][0], 2 * m)
+    assert warmstart[0][1][0] is f[0]
+
+    # legacy list of (m, f) tuples
+    with pytest.warns(FutureWarning, match="'warmstart' has been deprecated"):
+        inv_prob.warmstart = []
+    assert len(inv_prob.fields_cache) == 0
+    with pytest.warns(FutureWarning, match="'warmstart' has been deprecated"):
+        inv_prob.warmstart = [(m, f)]
+    assert inv_prob.fields_cache.get(sim, m) is f[0]
+    with pytest.raises(TypeError):
+        with pytest.warns(FutureWarning, match="'warmstart' has been deprecated"):
+            inv_prob.warmstart = [m]
+
+
+def test_get_fields_store(inversion_problem):
+    inv_prob, m = inversion_problem
+    sim = inv_prob.dmisfit.objfcts[0].simulation
+    inv_prob.getFields(m)
+    assert inv_prob.fields_cache.get(sim, m) is None
+    f = inv_prob.getFields(m, store=True)
+    assert inv_prob.fields_cache.get(sim, m) is f[0]
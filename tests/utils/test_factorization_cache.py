@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+from discretize import TensorMesh
+from pymatsolver import Solver, SolverLU
+from pymatsolver.solvers import Base
+
+from simpeg.utils.solver_utils import FactorizationCache
+
+
+class RefactoringLU(Base):
+    """Solver with a ``factor`` method, like Pardiso and Mumps."""
+
+    def __init__(self, A, **kwargs):
+        super().__init__(A, **kwargs)
+        self.factor(A)
+
+    def factor(self, A=None):
+        if A is not None:
+            self._A = A
+            self.n_factor = getattr(self, "n_factor", 0) + 1
+        self.solver = splu(sp.csc_matrix(self.A))
+
+    def _solve_single(self, rhs):
+        return self.solver.solve(rhs.astype(self.dtype))
+
+    _solve_multiple = _solve_single
+
+
+def system_matrix(mesh, sigma, frequency):
+    curl = mesh.edge_curl
+    return (
+        curl.T @ mesh.get_face_inner_product() @ curl
+        + 1j * frequency * mesh.get_edge_inner_product(sigma)
+    )
+
+
+@pytest.fixture
+def mesh():
+    return TensorMesh([6, 5, 4])
+
+
+def test_superlu_reuses_ordering(mesh):
+    rng = np.random.default_rng(seed=0)
+    cache = FactorizationCache()
+    for frequency in [1.0, 10.0, 100.0]:
+        A = system_matrix(mesh, rng.uniform(1, 2, mesh.n_cells), frequency)
+        Ainv = cache.factor("A", A, SolverLU)
+        b = rng.normal(size=(A.shape[0], 2)) + 0j
+        np.testing.assert_allclose(A @ (Ainv * b), b, atol=1e-10)
+        np.testing.assert_allclose(A.T @ (Ainv.T * b[:, 0]), b[:, 0], atol=1e-10)
+
+    assert [r.reused_analysis for r in cache.records] == [False, True, True]
+    summary = cache.summary()["A"]
+    assert summary["n_factorizations"] == 3
+    assert summary["n_reused"] == 2
+    assert summary["symbolic_time"] >= 0
+
+
+def test_refactor_previous_in_place(mesh):
+    cache = FactorizationCache()
+    sigma = np.ones(mesh.n_cells)
+    Ainv = cache.factor("A", system_matrix(mesh, sigma, 1.0), RefactoringLU)
+    A = system_matrix(mesh, 2 * sigma, 1.0)
+    Ainv_new = cache.factor("A", A, RefactoringLU, previous=Ainv)
+    assert Ainv_new is Ainv
+    assert Ainv.n_factor == 2
+    b = np.ones(A.shape[0], dtype=complex)
+    np.testing.assert_allclose(A @ (Ainv_new * b), b, atol=1e-10)
+    assert [r.reused_analysis for r in cache.records] == [False, True]
+
+
+def test_solver_without_reuse(mesh):
+    cache = FactorizationCache()
+    for _ in range(2):
+        cache.factor("A", system_matrix(mesh, np.ones(mesh.n_cells), 1.0), Solver)
+    assert not any(r.reused_analysis for r in cache.records)
+    assert np.isnan(cache.summary()["A"]["symbolic_time"])
+
+
+def test_layout_grows_with_new_entries():
+    cache = FactorizationCache()
+    A = sp.csr_matrix(np.array([[1.0, 0, 2], [0, 3, 0], [4, 0, 5]]))
+    B = sp.csr_matrix(np.array([[1.0, 7, 0], [0, 3, 0], [4, 0, 5]]))
+    A_fixed = cache.assemble("A", A)
+    np.testing.assert_array_equal(A_fixed.toarray(), A.toarray())
+
+    B_fixed = cache.assemble("A", B)
+    A_fixed = cache.assemble("A", A)
+    np.testing.assert_array_equal(B_fixed.toarray(), B.toarray())
+    np.testing.assert_array_equal(A_fixed.toarray(), A.toarray())
+    assert A_fixed.nnz == B_fixed.nnz == 6
+    assert np.shares_memory(A_fixed.indices, B_fixed.indices)
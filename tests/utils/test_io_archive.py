@@ -0,0 +1,251 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import discretize
+from simpeg import (
+    data_misfit,
+    directives,
+    inverse_problem,
+    inversion,
+    maps,
+    optimization,
+    regularization,
+    simulation,
+)
+from simpeg.data import Data
+from simpeg.electromagnetics import frequency_domain as fdem
+from simpeg.electromagnetics import time_domain as tdem
+from simpeg.electromagnetics.static import resistivity as dc
+from simpeg.potential_fields import gravity, magnetics
+from simpeg.utils.io_utils import read_archive, write_archive
+
+
+def dc_data():
+    rx_locations = np.c_[np.linspace(0, 50, 6), np.zeros(6), np.zeros(6)]
+    source_list = [
+        dc.sources.Dipole(
+            [
+                dc.receivers.Dipole(rx_locations[:-1], rx_locations[1:]),
+                dc.receivers.Pole(rx_locations, data_type="apparent_resistivity"),
+            ],
+            np.r_[-20.0, 0.0, 0.0],
+            np.r_[-10.0, 0.0, 0.0],
+            current=2.0,
+        ),
+        dc.sources.Pole([dc.receivers.Pole(rx_locations[:3])], np.r_[80.0, 0, 0]),
+    ]
+    survey = dc.survey.Survey(source_list)
+    dobs = np.arange(survey.nD, dtype=float)
+    return Data(survey, dobs=dobs, standard_deviation=0.1 + dobs)
+
+
+def magnetics_data():
+    receiver_list = [
+        magnetics.receivers.Point(np.random.default_rng(0).uniform(size=(5, 3))),
+        magnetics.receivers.Point(np.ones((2, 3)), components=["bx", "bz"]),
+    ]
+    source_field = magnetics.sources.UniformBackgroundField(
+        receiver_list, amplitude=50000.0, inclination=60.0, declination=10.0
+    )
+    survey = magnetics.survey.Survey(source_field)
+    return Data(survey, dobs=np.linspace(0, 1, survey.nD))
+
+
+def gravity_data():
+    receiver_list = [gravity.receivers.Point(np.ones((4, 3)), components=["gz"])]
+    survey = gravity.survey.Survey(gravity.sources.SourceField(receiver_list))
+    return Data(survey, dobs=np.ones(survey.nD), standard_deviation=np.ones(4))
+
+
+def tdem_data():
+    rx = tdem.receivers.PointMagneticFluxTimeDerivative(
+        np.zeros((1, 3)),
+        np.logspace(-5, -3, 5),
+        orientation="z",
+        use_source_receiver_offset=True,
+    )
+    src = tdem.sources.CircularLoop([rx], location=np.zeros(3), radius=10.0)
+    locations = np.c_[np.arange(3.0), np.zeros(3), np.full(3, 30.0)]
+    survey = tdem.survey.ArraySurvey(src, locations)
+    return Data(survey, dobs=np.ones(survey.nD), standard_deviation=np.ones(15))
+
+
+def assert_same_data(data_read, data_expected):
+    np.testing.assert_allclose(data_read.dobs, data_expected.dobs)
+    np.testing.assert_allclose(
+        data_read.standard_deviation, data_expected.standard_deviation
+    )
+    survey_read, survey = data_read.survey, data_expected.survey
+    assert type(survey_read) is type(survey)
+    assert survey_read.nSrc == survey.nSrc
+    np.testing.assert_array_equal(survey_read.vnD, survey.vnD)
+    for src_read, src in zip(survey_read.source_list, survey.source_list):
+        assert type(src_read) is type(src)
+        np.testing.assert_allclose(src_read.location, src.location)
+        for rx_read, rx in zip(src_read.receiver_list, src.receiver_list):
+            assert type(rx_read) is type(rx)
+            np.testing.assert_allclose(rx_read.locations, rx.locations)
+
+
+@pytest.mark.parametrize("suffix", ["", ".zip"])
+@pytest.mark.parametrize(
+    "make_data", [dc_data, magnetics_data, gravity_data, tdem_data]
+)
+def test_data_round_trip(tmp_path, suffix, make_data):
+    data_object = make_data()
+    path = str(tmp_path / f"archive{suffix}")
+    write_archive(path, data=data_object)
+    out = read_archive(path)
+    assert_same_data(out["data"], data_object)
+    assert out["models"] is None
+    assert out["inversion"] is None
+
+
+def test_dc_survey_details(tmp_path):
+    data_object = dc_data()
+    path = str(tmp_path / "archive")
+    write_archive(path, data=data_object)
+    survey = read_archive(path)["data"].survey
+    src = survey.source_list[0]
+    np.testing.assert_array_equal(src.current, [2.0, -2.0])
+    assert src.receiver_list[0].data_type == "volt"
+    assert src.receiver_list[1].data_type == "apparent_resistivity"
+
+
+def test_magnetics_survey_details(tmp_path):
+    path = str(tmp_path / "archive")
+    write_archive(path, data=magnetics_data())
+    survey = read_archive(path)["data"].survey
+    assert survey.source_field.inclination == 60.0
+    assert survey.source_field.receiver_list[1].components == ["bx", "bz"]
+
+
+def test_array_survey_templates(tmp_path):
+    rx = fdem.receivers.PointMagneticFieldSecondary(
+        np.array([[7.86, 0.0, 0.0]]),
+        orientation="z",
+        component="both",
+        data_type="ppm",
+        use_source_receiver_offset=True,
+    )
+    sources = [
+        fdem.sources.MagDipole([rx], frequency=f, location=np.zeros(3), moment=2.0)
+        for f in [382.0, 7970.0]
+    ]
+    locations = np.c_[np.arange(4.0), np.zeros(4), np.full(4, 30.0)]
+    survey = fdem.survey.ArraySurvey(sources, locations)
+    path = str(tmp_path / "fdem")
+    write_archive(path, data=Data(survey, dobs=np.ones(survey.nD)))
+    survey_read = read_archive(path)["data"].survey
+    assert type(survey_read) is fdem.survey.ArraySurvey
+    src = survey_read.source_templates[1]
+    assert src.frequency == 7970.0
+    assert src.moment == 2.0
+    rx_read = src.receiver_list[0]
+    assert rx_read.data_type == "ppm"
+    assert rx_read.use_source_receiver_offset
+    np.testing.assert_array_equal(rx_read.locations, rx.locations)
+
+    waveform = tdem.sources.TriangularWaveform(
+        start_time=0.0, peak_time=1e-3, off_time=2e-3
+    )
+    rx = tdem.receivers.PointMagneticFluxTimeDerivative(
+        np.zeros((1, 3)), np.logspace(-5, -3, 5), orientation="z"
+    )
+    src = tdem.sources.CircularLoop(
+        [rx], location=np.zeros(3), radius=10.0, waveform=waveform
+    )
+    survey = tdem.survey.ArraySurvey(src, locations)
+    path = str(tmp_path / "tdem.zip")
+    write_archive(path, data=Data(survey, dobs=np.ones(survey.nD)))
+    src_read = read_archive(path)["data"].survey.source_templates[0]
+    assert src_read.radius == 10.0
+    assert isinstance(src_read.waveform, tdem.sources.TriangularWaveform)
+    np.testing.assert_array_equal(src_read.waveform.ramp_on, waveform.ramp_on)
+    np.testing.assert_array_equal(src_read.waveform.ramp_off, waveform.ramp_off)
+
+
+def test_array_survey_unknown_class(tmp_path):
+    """Classes of the templates are only looked up among the EM sources."""
+    path = str(tmp_path / "archive")
+    write_archive(path, data=tdem_data())
+    manifest_file = os.path.join(path, "manifest.json")
+    with open(manifest_file) as fid:
+        manifest = json.load(fid)
+    # not a TDEM source
+    manifest["data"]["survey"]["templates"][0]["class"] = "ArraySurvey"
+    with open(manifest_file, "w") as fid:
+        json.dump(manifest, fid)
+    with pytest.raises(ValueError, match="Unknown class 'ArraySurvey'"):
+        read_archive(path)
+
+
+def test_models_are_memory_mapped(tmp_path):
+    path = str(tmp_path / "archive")
+    models = {"m0": np.ones(10), "recovered": np.arange(10.0)}
+    write_archive(path, models=models, weights={"sensitivity": np.full(10, 2.0)})
+
+    out = read_archive(path)
+    assert isinstance(out["models"]["recovered"], np.memmap)
+    np.testing.assert_array_equal(out["models"]["recovered"], models["recovered"])
+    np.testing.assert_array_equal(out["weights"]["sensitivity"], 2.0)
+
+    out = read_archive(path, mmap_mode=None)
+    assert not isinstance(out["models"]["m0"], np.memmap)
+
+
+def test_overwrite_and_version(tmp_path):
+    path = str(tmp_path / "archive")
+    write_archive(path, models={"m": np.ones(3)})
+    with pytest.raises(FileExistsError):
+        write_archive(path, models={"m": np.ones(3)})
+    write_archive(path, models={"m": np.zeros(3)}, overwrite=True)
+    np.testing.assert_array_equal(read_archive(path)["models"]["m"], 0.0)
+
+    manifest_file = os.path.join(path, "manifest.json")
+    with open(manifest_file) as fid:
+        manifest = json.load(fid)
+    manifest["version"] += 1
+    with open(manifest_file, "w") as fid:
+        json.dump(manifest, fid)
+    with pytest.raises(ValueError, match="newer than the supported version"):
+        read_archive(path)
+
+
+def test_unsupported_survey(tmp_path):
+    mesh = discretize.TensorMesh([5])
+    sim = simulation.ExponentialSinusoidSimulation(
+        mesh=mesh, n_kernels=3, model_map=maps.IdentityMap(mesh)
+    )
+    data_object = sim.make_synthetic_data(np.ones(5), add_noise=False)
+    with pytest.raises(TypeError, match="Cannot store"):
+        write_archive(str(tmp_path / "archive"), data=data_object)
+
+
+def test_inversion_state_directive(tmp_path):
+    mesh = discretize.TensorMesh([20])
+    sim = simulation.ExponentialSinusoidSimulation(
+        mesh=mesh, n_kernels=5, model_map=maps.IdentityMap(mesh)
+    )
+    data_object = sim.make_synthetic_data(
+        np.linspace(0, 1, 20), noise_floor=0.1, add_noise=False
+    )
+    dmis = data_misfit.L2DataMisfit(data=data_object, simulation=sim)
+    reg = regularization.WeightedLeastSquares(mesh)
+    opt = optimization.InexactGaussNewton(maxIter=2)
+    inv_prob = inverse_problem.BaseInvProblem(dmis, reg, opt, beta=2.0)
+    directive = directives.SaveInversionStateEveryIteration(
+        directory=str(tmp_path), name="state"
+    )
+    inv = inversion.BaseInversion(inv_prob, directiveList=[directive])
+    m = inv.run(np.zeros(20))
+
+    path = os.path.join(str(tmp_path), f"{opt.iter:03d}-{directive.fileName}")
+    state = read_archive(path)["inversion"]
+    np.testing.assert_allclose(state["model"], m)
+    assert state["beta"] == 2.0
+    assert state["iteration"] == opt.iter
+    assert state["phi_d"] == pytest.approx(inv_prob.phi_d)
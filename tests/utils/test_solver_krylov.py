@@ -0,0 +1,199 @@
+import warnings
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.electromagnetics.static import resistivity as dc
+from simpeg.profiling import Profiler
+from simpeg.utils.solver_utils import (
+    FactorizationCache,
+    KrylovConvergenceWarning,
+    SolverKrylov,
+)
+
+pytest.importorskip("pyamg")
+
+
+@pytest.fixture
+def mesh():
+    return discretize.TensorMesh([8, 7, 6])
+
+
+def nodal_system(mesh, sigma):
+    G = mesh.nodal_gradient
+    return G.T @ mesh.get_edge_inner_product(sigma) @ G + sp.eye(mesh.n_nodes)
+
+
+def edge_system(mesh, sigma, frequency=None):
+    C = mesh.edge_curl
+    A = C.T @ mesh.get_face_inner_product() @ C
+    M = mesh.get_edge_inner_product(sigma)
+    if frequency is None:
+        return A + 1e-2 * M
+    return A + 1j * frequency * M
+
+
+@pytest.mark.parametrize(
+    "method, preconditioner",
+    [
+        ("auto", "amg"),
+        ("cg", "jacobi"),
+        ("minres", "amg"),
+        ("gmres", None),
+        ("bicgstab", "amg"),
+    ],
+)
+def test_solve(mesh, method, preconditioner):
+    rng = np.random.default_rng(seed=0)
+    A = nodal_system(mesh, rng.uniform(1, 10, mesh.n_cells))
+    Ainv = SolverKrylov(
+        A,
+        method=method,
+        preconditioner=preconditioner,
+        is_positive_definite=True,
+        rtol=1e-10,
+        direct_threshold=0,
+    )
+    b = rng.normal(size=(A.shape[0], 2))
+    np.testing.assert_allclose(A @ (Ainv * b), b, atol=1e-7)
+    np.testing.assert_allclose(A @ (Ainv * b[:, 0]), b[:, 0], atol=1e-7)
+    assert len(Ainv.iterations) == len(Ainv.residuals) == 3
+    assert max(Ainv.residuals) < 1e-9
+
+
+def test_jacobi_zero_diagonal(mesh):
+    # saddle point system with a zero diagonal entry
+    rng = np.random.default_rng(seed=0)
+    K = nodal_system(mesh, rng.uniform(1, 10, mesh.n_cells))
+    c = sp.csr_matrix(np.ones((K.shape[0], 1)) / K.shape[0])
+    A = sp.bmat([[K, c], [c.T, None]], format="csr")
+    Ainv = SolverKrylov(
+        A, method="gmres", preconditioner="jacobi", rtol=1e-10, direct_threshold=0
+    )
+    b = rng.normal(size=A.shape[0])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", KrylovConvergenceWarning)
+        x = Ainv * b
+    np.testing.assert_allclose(A @ x, b, atol=1e-7)
+
+
+def test_auxiliary_space_preconditioner(mesh):
+    rng = np.random.default_rng(seed=0)
+    A = edge_system(mesh, rng.uniform(1, 10, mesh.n_cells))
+    b = rng.normal(size=A.shape[0])
+    iterations = {}
+    for gradient in [None, mesh.nodal_gradient]:
+        Ainv = SolverKrylov(
+            A, gradient=gradient, is_positive_definite=True, direct_threshold=0
+        )
+        np.testing.assert_allclose(A @ (Ainv * b), b, atol=1e-6)
+        iterations[gradient is None] = Ainv.iterations[0]
+    assert iterations[False] < iterations[True]
+
+
+def test_complex_symmetric(mesh):
+    rng = np.random.default_rng(seed=0)
+    A = edge_system(mesh, rng.uniform(1, 10, mesh.n_cells), frequency=1e2)
+    Ainv = SolverKrylov(A, gradient=mesh.nodal_gradient, direct_threshold=0)
+    assert Ainv._krylov_method == "gmres"
+    b = rng.normal(size=A.shape[0]) + 1j * rng.normal(size=A.shape[0])
+    np.testing.assert_allclose(A @ (Ainv * b), b, atol=1e-6)
+    np.testing.assert_allclose(A.T @ (Ainv.T * b), b, atol=1e-6)
+
+
+def test_warm_start(mesh):
+    rng = np.random.default_rng(seed=0)
+    A = nodal_system(mesh, rng.uniform(1, 10, mesh.n_cells))
+    Ainv = SolverKrylov(A, preconditioner="jacobi", direct_threshold=0)
+    b = rng.normal(size=A.shape[0])
+    Ainv * b
+    Ainv * (b + 1e-6 * rng.normal(size=A.shape[0]))
+    cold, warm = Ainv.iterations
+    assert warm < cold
+
+    # a new matrix keeps the warm start
+    Ainv.factor(nodal_system(mesh, rng.uniform(1, 10, mesh.n_cells)))
+    Ainv * b
+    assert Ainv.iterations[-1] < cold
+
+
+def test_reuse_preconditioner(mesh):
+    A = nodal_system(mesh, np.ones(mesh.n_cells))
+    Ainv = SolverKrylov(A, reuse_preconditioner=True, direct_threshold=0)
+    M = Ainv._M
+    Ainv.factor(2 * A)
+    assert Ainv._M is M
+    Ainv.reuse_preconditioner = False
+    Ainv.factor(A)
+    assert Ainv._M is not M
+
+
+def test_direct_threshold(mesh):
+    A = nodal_system(mesh, np.ones(mesh.n_cells))
+    Ainv = SolverKrylov(A, direct_solver=SolverLU)
+    assert isinstance(Ainv._direct, SolverLU)
+    b = np.ones(A.shape[0])
+    np.testing.assert_allclose(A @ (Ainv * b), b, atol=1e-10)
+    assert Ainv.iterations == []
+
+
+def test_no_convergence(mesh):
+    A = nodal_system(mesh, np.ones(mesh.n_cells))
+    Ainv = SolverKrylov(A, preconditioner=None, maxiter=2, direct_threshold=0)
+    b = np.random.default_rng(seed=0).normal(size=A.shape[0])
+    with pytest.warns(KrylovConvergenceWarning):
+        Ainv * b
+
+
+def test_invalid_options(mesh):
+    A = nodal_system(mesh, np.ones(mesh.n_cells))
+    with pytest.raises(ValueError, match="method"):
+        SolverKrylov(A, method="lsqr")
+    with pytest.raises(ValueError, match="preconditioner"):
+        SolverKrylov(A, preconditioner="ilu")
+
+
+def test_cache_refactors_in_place(mesh):
+    cache = FactorizationCache()
+    Ainv = None
+    for sigma in [1.0, 2.0]:
+        A = nodal_system(mesh, sigma * np.ones(mesh.n_cells))
+        Ainv_new = cache.factor("A", A, SolverKrylov, previous=Ainv, direct_threshold=0)
+        assert Ainv is None or Ainv_new is Ainv
+        Ainv = Ainv_new
+    assert [r.reused_analysis for r in cache.records] == [False, True]
+
+
+def test_simulation_iterations():
+    mesh = discretize.TensorMesh([np.ones(8)] * 3, origin="CCN")
+    rx = dc.receivers.Dipole(
+        locations_m=np.array([[-2.0, 0, 0], [0.0, 0, 0]]),
+        locations_n=np.array([[-1.0, 0, 0], [1.0, 0, 0]]),
+    )
+    src = dc.sources.Dipole([rx], [-3.0, 0, 0], [3.0, 0, 0])
+    survey = dc.Survey([src])
+    m = np.zeros(mesh.n_cells)
+    kwargs = {"survey": survey, "sigmaMap": maps.ExpMap(mesh)}
+    d_direct = dc.Simulation3DNodal(mesh, solver=SolverLU, **kwargs).dpred(m)
+
+    sim = dc.Simulation3DNodal(
+        mesh,
+        solver=SolverKrylov,
+        solver_opts={"direct_threshold": 0, "rtol": 1e-12},
+        **kwargs,
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", KrylovConvergenceWarning)
+        with Profiler(track_memory=False) as profiler:
+            d_krylov = sim.dpred(m)
+    np.testing.assert_allclose(d_krylov, d_direct, rtol=1e-6)
+    # the nodal DC system is symmetric positive definite
+    assert sim.Ainv._krylov_method == "cg"
+
+    (solve,) = [s for s in profiler.spans if s.name == "SolverKrylov.solve"]
+    assert solve.args["iterations"] == sim.Ainv.iterations
+    assert solve.args["residuals"] == sim.Ainv.residuals